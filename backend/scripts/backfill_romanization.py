@@ -0,0 +1,36 @@
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add the backend src directory to the Python path
+backend_root = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_root))
+
+from src.db.seed.romanization import backfill_romanization
+from src.database import async_session_factory
+from src.services.ngram_index import invalidate_ngram_index
+from src.services.vocab_artifact import invalidate_vocab_artifact
+
+
+async def run(overwrite: bool):
+    start = time.perf_counter()
+    async with async_session_factory() as db:
+        updated = await backfill_romanization(db, overwrite=overwrite)
+    print(f"Done in {time.perf_counter() - start:.2f}s")
+    if updated:
+        invalidate_vocab_artifact()
+        invalidate_ngram_index()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Generate Revised Romanization for words missing it"
+    )
+    parser.add_argument(
+        "--overwrite",
+        action="store_true",
+        help="Regenerate every word, replacing existing romanizations",
+    )
+    asyncio.run(run(parser.parse_args().overwrite))
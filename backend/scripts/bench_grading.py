@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Throughput of answer grading over the real catalog.
+
+Compiles an answer key per word, then grades perturbed answers - exact,
+one jamo or letter changed, a dropped space, something unrelated - the way
+learners type them, on a single core. Reports, per answer kind:
+
+    comparisons/s      Myers edit distances, one typed answer against one
+                       accepted variant (the kernel)
+    answers graded/s   AnswerKey.grade end to end: normalizing, the exact
+                       lookup, comparing against every variant worth trying
+                       and classifying the result
+
+Usage:
+    python scripts/bench_grading.py [--db data/hagxwon.db] [--answers 200000]
+"""
+
+import argparse
+import random
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+backend_root = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_root))
+
+from src.config import SQLITE_DB_PATH  # noqa: E402
+from tools.grading import AnswerKey, normalize  # noqa: E402
+from tools.hangul import compose, decompose, to_jamo  # noqa: E402
+
+
+def typo(text: str, rng: random.Random) -> str:
+    """Change one letter, or one jamo of a syllable."""
+    if not text:
+        return text
+    i = rng.randrange(len(text))
+    parts = decompose(text[i])
+    if parts is not None:
+        initial, medial, final = parts
+        char = compose(initial, (medial + 1) % 21, final)
+    else:
+        char = rng.choice("abcdefghijklmnopqrstuvwxyz")
+    return text[:i] + char + text[i + 1 :]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--db", default=SQLITE_DB_PATH)
+    parser.add_argument("--answers", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with sqlite3.connect(args.db) as conn:
+        rows = conn.execute(
+            "SELECT korean, english, romanization FROM words"
+        ).fetchall()
+    if not rows:
+        sys.exit(f"No words in {args.db}")
+
+    start = time.perf_counter()
+    keys = [AnswerKey(*row) for row in rows]
+    compile_s = time.perf_counter() - start
+    print(f"📚 {len(keys)} words, keys compiled in {compile_s * 1000:.1f} ms")
+
+    rng = random.Random(args.seed)
+    kinds = {
+        "korean exact": lambda k, r: r[0],
+        "korean jamo typo": lambda k, r: typo(r[0], rng),
+        "english typo": lambda k, r: typo(r[1].split(",")[0], rng),
+        "english spacing": lambda k, r: r[1].split(",")[0].replace(" ", ""),
+        "wrong word": lambda k, r: rng.choice(rows)[1],
+    }
+    per_kind = args.answers // len(kinds)
+    for name, make in kinds.items():
+        picks = [rng.randrange(len(keys)) for _ in range(per_kind)]
+        cases = [(keys[i], make(keys[i], rows[i])) for i in picks]
+
+        # Every (accepted answer, typed answer) pair grading may compare
+        pairs = []
+        for key, answer in cases:
+            typed = normalize(answer)
+            if any("가" <= c <= "힣" for c in typed):
+                jamo = to_jamo(typed)
+                pairs += [(p, jamo) for _, p in key.patterns["korean"]]
+            else:
+                pairs += [
+                    (p, typed)
+                    for target in ("english", "romanization")
+                    for _, p in key.patterns[target]
+                ]
+
+        start = time.perf_counter()
+        for pattern, text in pairs:
+            pattern.distance(text)
+        kernel_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for key, answer in cases:
+            key.grade(answer)
+        grade_s = time.perf_counter() - start
+        print(
+            f"  {name:<18} {len(pairs) / kernel_s:>10,.0f} comparisons/s  "
+            f"{per_kind / grade_s:>10,.0f} answers graded/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+End-to-end throughput of the AI paths against the local fake Groq server.
+
+Starts tools/fake_groq.py on a background thread, points the app at it via
+GROQ_BASE_URL and drives, with ``--concurrency`` requests in flight:
+
+    practice  POST /api/words/{id}/practice   (distinct words, cache cold)
+    rounds    GET  /api/game/round?enhance=true (inline, no round pool)
+    connect   GroqService.test_connection()    (called directly)
+
+Rate limits are lifted unless --rpm/--tpm are given, so the numbers show
+the app's own overhead on top of the fake's latency profile.
+
+Usage:
+    python scripts/bench_llm_paths.py [--requests 200] [--concurrency 20]
+        [--latency-ms 300] [--latency-dist lognormal] [--error-rate 0.0]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+backend_root = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_root))
+
+from tools.fake_groq import (  # noqa: E402
+    LATENCY_DISTRIBUTIONS,
+    FakeGroqProfile,
+    serve_in_thread,
+)
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def drive(client, requests, concurrency):
+    """Issue (method, url, json) requests with bounded concurrency."""
+    semaphore = asyncio.Semaphore(concurrency)
+    samples, failures = [], 0
+
+    async def one(method, url, body):
+        nonlocal failures
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.request(method, url, json=body)
+            samples.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 400:
+                failures += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(*request) for request in requests))
+    return samples, failures, time.perf_counter() - start
+
+
+async def drive_calls(call, requests, concurrency):
+    """Await ``call()`` ``requests`` times with bounded concurrency."""
+    semaphore = asyncio.Semaphore(concurrency)
+    samples, failures = [], 0
+
+    async def one():
+        nonlocal failures
+        async with semaphore:
+            start = time.perf_counter()
+            result = await call()
+            samples.append((time.perf_counter() - start) * 1000)
+            if "error" in result:
+                failures += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return samples, failures, time.perf_counter() - start
+
+
+def report(name, count, samples, failures, elapsed):
+    print(
+        f"{name:9} {count:5} requests  "
+        f"{count / elapsed:8.1f} req/s  "
+        f"p50 {statistics.median(samples):8.1f}ms  "
+        f"p99 {percentile(samples, 0.99):8.1f}ms  "
+        f"failed {failures}"
+    )
+
+
+async def run(word_ids, requests, concurrency):
+    import httpx
+
+    from src.database import engine, init_db
+    from src.main import app
+    from src.services.groq_service import groq_service
+
+    engine.echo = False
+    await init_db()
+
+    phases = {
+        "practice": [
+            ("POST", f"/api/words/{word_id}/practice", {"practice_type": t})
+            for word_id in word_ids
+            for t in ("definition", "example")
+        ][:requests],
+        "rounds": [
+            ("GET", "/api/game/round?count=10&enhance=true", None)
+        ]
+        * requests,
+    }
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", timeout=120
+    ) as client:
+        for name, batch in phases.items():
+            samples, failures, elapsed = await drive(
+                client, batch, concurrency
+            )
+            report(name, len(batch), samples, failures, elapsed)
+
+        # The connection check is no longer behind an endpoint
+        samples, failures, elapsed = await drive_calls(
+            groq_service.test_connection, requests, concurrency
+        )
+        report("connect", requests, samples, failures, elapsed)
+
+    metrics = groq_service.metrics()
+    print(
+        f"upstream calls {metrics['upstream_calls']}, "
+        f"coalesced {metrics['coalesced']}, hedges {metrics['hedges']}, "
+        f"breaker {metrics['breaker']['state']}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark AI paths against a fake Groq"
+    )
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument(
+        "--latency-dist", choices=LATENCY_DISTRIBUTIONS, default="lognormal"
+    )
+    parser.add_argument("--latency-sigma", type=float, default=0.5)
+    parser.add_argument("--tokens-per-second", type=float, default=500.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rpm", type=int, default=1_000_000)
+    parser.add_argument("--tpm", type=int, default=1_000_000_000)
+    parser.add_argument(
+        "--db", default=str(backend_root / "data" / "hagxwon.db")
+    )
+    args = parser.parse_args()
+
+    server, base_url = serve_in_thread(
+        FakeGroqProfile(
+            latency_ms=args.latency_ms,
+            latency_dist=args.latency_dist,
+            latency_sigma=args.latency_sigma,
+            tokens_per_second=args.tokens_per_second,
+            error_rate=args.error_rate,
+        )
+    )
+    print(f"🤖 Fake Groq at {base_url}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_copy = Path(tmp) / "bench.db"
+        shutil.copy(args.db, db_copy)
+        with sqlite3.connect(db_copy) as conn:
+            word_ids = [row[0] for row in conn.execute("SELECT id FROM words")]
+
+        # Must be set before the app (and GroqService) is imported
+        os.environ.update(
+            {
+                "SQLITE_DB_PATH": str(db_copy),
+                "VOCAB_ARTIFACT_PATH": str(Path(tmp) / "vocab.hxv"),
+                "GROQ_BASE_URL": base_url,
+                "GROQ_API_KEY": "fake",
+                "GROQ_REQUESTS_PER_MINUTE": str(args.rpm),
+                "GROQ_TOKENS_PER_MINUTE": str(args.tpm),
+            }
+        )
+        logging.disable(logging.WARNING)
+        try:
+            asyncio.run(run(word_ids, args.requests, args.concurrency))
+        finally:
+            server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
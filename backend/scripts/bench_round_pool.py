@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Latency benchmark for GET /api/game/round with and without the round pool.
+
+Runs the app in process against a throwaway copy of the database. Groq is
+replaced by a stub that answers after ``--llm-ms`` milliseconds, so enhanced
+rounds cost what a real completion would without needing an API key.
+Requests are paced (``--interval-ms`` apart) the way players fetch rounds,
+giving the pool time to refill between them.
+
+Usage:
+    python scripts/bench_round_pool.py [--requests 200] [--llm-ms 800]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+backend_root = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_root))
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def measure(client, url: str, requests: int, interval_ms: int):
+    samples = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = await client.get(url)
+        samples.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+        await asyncio.sleep(interval_ms / 1000)
+    return samples
+
+
+async def run(requests: int, llm_ms: int, interval_ms: int):
+    import httpx
+
+    from src.database import engine, init_db
+    from src.main import app
+    from src.services.groq_service import groq_service
+    from src.services.round_pool import round_pool
+
+    async def fake_completion(prompt, *args, **kwargs):
+        await asyncio.sleep(llm_ms / 1000)
+        # Numbered "1. 한국어 → english" lines list the words to enhance
+        words = [
+            line.split(". ", 1)[1].split(" → ")[0]
+            for line in prompt.splitlines()
+            if " → " in line and line[:1].isdigit()
+        ]
+        items = [
+            {"korean": word, "hint": "hint", "distractors": ["a", "b", "c"]}
+            for word in words
+        ]
+        return {"content": json.dumps({"items": items})}
+
+    groq_service.generate_completion = fake_completion
+    engine.echo = False
+    await init_db()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        for enhance in (False, True):
+            url = f"/api/game/round?count=10&enhance={str(enhance).lower()}"
+            n = requests if not enhance else max(10, requests // 10)
+
+            inline = await measure(client, url, n, 0)
+
+            await round_pool.start(warm=[(None, 10, enhance)])
+            await asyncio.sleep((llm_ms if enhance else 50) * 3 / 1000)
+            pooled = await measure(client, url, n, interval_ms)
+            metrics = round_pool.metrics()
+            await round_pool.stop()
+
+            label = "enhanced" if enhance else "basic"
+            print(f"{label} rounds ({n} requests):")
+            for name, samples in (("inline", inline), ("pooled", pooled)):
+                print(
+                    f"  {name:6}  p50 {statistics.median(samples):8.2f}ms  "
+                    f"p99 {percentile(samples, 0.99):8.2f}ms"
+                )
+            print(f"  pool hits {metrics['hits']}, misses {metrics['misses']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the round pool")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--llm-ms", type=int, default=800)
+    parser.add_argument("--interval-ms", type=int, default=500)
+    parser.add_argument(
+        "--db", default=str(backend_root / "data" / "hagxwon.db")
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_copy = Path(tmp) / "bench.db"
+        shutil.copy(args.db, db_copy)
+        # Must be set before the app (and its engine) is imported
+        os.environ["SQLITE_DB_PATH"] = str(db_copy)
+        os.environ["VOCAB_ARTIFACT_PATH"] = str(Path(tmp) / "vocab.hxv")
+        logging.disable(logging.WARNING)
+        asyncio.run(run(args.requests, args.llm_ms, args.interval_ms))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for the streaming seed loaders.
+
+Generates synthetic word/sentence/group corpora of increasing size, seeds a
+throwaway SQLite database with each one in a fresh subprocess and reports
+peak traced Python memory and peak RSS. With streaming loaders the peaks
+should stay roughly flat as the corpus grows.
+
+Usage:
+    python scripts/bench_seed_memory.py [--sizes 10000 50000 100000] [--ndjson]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+backend_root = Path(__file__).parent.parent
+
+
+def write_corpus(directory: Path, size: int, ndjson: bool) -> dict:
+    """Write synthetic seed files and return their paths."""
+    suffix = ".ndjson" if ndjson else ".json"
+    words_path = directory / f"words{suffix}"
+    sentences_path = directory / f"sentences{suffix}"
+    groups_path = directory / f"groups{suffix}"
+
+    def word(i):
+        return {
+            "id": i,
+            "word": f"단어{i}",
+            "romanization": f"daneo{i}",
+            "pos": "n",
+            "meaning": f"word number {i}",
+        }
+
+    def sentence(i):
+        return {
+            "word_id": i,
+            "example_kr": f"이것은 {i}번째 예문입니다.",
+            "example_en": f"This is example sentence number {i}.",
+        }
+
+    group_count = max(1, size // 1000)
+
+    def group_words(g):
+        return [
+            {"hangul": f"단어{i}", "romanization": None, "english": [f"w{i}"]}
+            for i in range(g * 1000 + 1, min(size, (g + 1) * 1000) + 1)
+        ]
+
+    with open(words_path, "w", encoding="utf-8") as wf, open(
+        sentences_path, "w", encoding="utf-8"
+    ) as sf, open(groups_path, "w", encoding="utf-8") as gf:
+        if ndjson:
+            for i in range(1, size + 1):
+                wf.write(json.dumps(word(i), ensure_ascii=False) + "\n")
+                sf.write(json.dumps(sentence(i), ensure_ascii=False) + "\n")
+            for g in range(group_count):
+                gf.write(
+                    json.dumps(
+                        {"name": f"Group {g}", "words": group_words(g)},
+                        ensure_ascii=False,
+                    )
+                    + "\n"
+                )
+        else:
+            wf.write("[")
+            sf.write("[")
+            for i in range(1, size + 1):
+                sep = "," if i > 1 else ""
+                wf.write(sep + json.dumps(word(i), ensure_ascii=False))
+                sf.write(sep + json.dumps(sentence(i), ensure_ascii=False))
+            wf.write("]")
+            sf.write("]")
+            gf.write('{"groups": {')
+            for g in range(group_count):
+                sep = "," if g > 0 else ""
+                gf.write(
+                    f'{sep}"Group {g}": '
+                    + json.dumps({"words": group_words(g)}, ensure_ascii=False)
+                )
+            gf.write("}}")
+
+    return {
+        "words": str(words_path),
+        "sentences": str(sentences_path),
+        "groups": str(groups_path),
+    }
+
+
+async def seed(paths: dict) -> None:
+    sys.path.insert(0, str(backend_root))
+    from src.database import async_session_factory, init_db
+    from src.db.seed.words import load_words
+    from src.db.seed.groups import load_groups
+    from src.db.seed.sentences import load_sentences
+
+    await init_db()
+    async with async_session_factory() as db:
+        await load_words(db, paths["words"])
+    async with async_session_factory() as db:
+        await load_sentences(db, paths["sentences"])
+    async with async_session_factory() as db:
+        await load_groups(db, paths["groups"])
+
+
+def run_child(size: int, ndjson: bool) -> None:
+    """Seed one corpus and print a JSON line with the measurements."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        paths = write_corpus(tmp_path, size, ndjson)
+        # Must be set before src.database is imported
+        os.environ["SQLITE_DB_PATH"] = str(tmp_path / "bench.db")
+
+        tracemalloc.start()
+        baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        start = time.perf_counter()
+        asyncio.run(seed(paths))
+        elapsed = time.perf_counter() - start
+        _, traced_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    print(
+        json.dumps(
+            {
+                "size": size,
+                "seconds": round(elapsed, 2),
+                "traced_peak_mb": round(traced_peak / 1e6, 1),
+                "rss_growth_mb": round((peak_rss - baseline_rss) / 1024, 1),
+            }
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 50_000, 100_000]
+    )
+    parser.add_argument("--ndjson", action="store_true")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.ndjson)
+        return
+
+    print(f"{'records':>10} {'seconds':>8} {'traced MB':>10} {'RSS +MB':>8}")
+    for size in args.sizes:
+        cmd = [sys.executable, __file__, "--child", str(size)]
+        if args.ndjson:
+            cmd.append("--ndjson")
+        out = subprocess.run(
+            cmd, capture_output=True, text=True, check=True, cwd=backend_root
+        ).stdout
+        result = json.loads(out.strip().splitlines()[-1])
+        print(
+            f"{result['size']:>10} {result['seconds']:>8} "
+            f"{result['traced_peak_mb']:>10} {result['rss_growth_mb']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
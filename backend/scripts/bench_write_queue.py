@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Load test for the write-behind queue.
+
+Runs against a throwaway copy of the database, in two parts:
+
+* write path: concurrent writers inserting activity logs and wrong inputs,
+  once with a session and commit per row and once through the queue;
+* HTTP: concurrent POST /api/logs and POST /api/mistakes requests at the app
+  (in process, over an ASGI transport), first with the queue worker stopped
+  - every request then commits its own transaction, like the old routes
+  did - and then with it running.
+
+The HTTP numbers include client and server sharing one event loop, so they
+understate the gain a real deployment sees.
+
+Usage:
+    python scripts/bench_write_queue.py [--requests 5000] [--concurrency 200]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+backend_root = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_root))
+
+
+async def fire(client, total: int, concurrency: int) -> float:
+    """Send ``total`` write requests, ``concurrency`` at a time."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with semaphore:
+            if i % 2:
+                response = await client.post(
+                    "/api/mistakes",
+                    json={"word_id": 1 + i % 50, "input_text": f"wrong {i}"},
+                )
+            else:
+                response = await client.post(
+                    "/api/logs",
+                    json={
+                        "session_id": 1,
+                        "word_id": 1 + i % 50,
+                        "activity_type": "flashcard",
+                        "correct": bool(i % 3),
+                        "score": i % 10,
+                    },
+                )
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    return time.perf_counter() - start
+
+
+def make_row(i: int):
+    """Alternate activity logs and wrong inputs."""
+    if i % 2:
+        return "wrong_inputs", {
+            "word_id": 1 + i % 50,
+            "input_text": f"wrong {i}",
+            "timestamp": datetime.utcnow(),
+        }
+    return "activity_logs", {
+        "session_id": 1,
+        "word_id": 1 + i % 50,
+        "activity_type": "flashcard",
+        "correct": bool(i % 3),
+        "score": i % 10,
+        "timestamp": datetime.utcnow(),
+    }
+
+
+async def bench_write_path(total: int, concurrency: int):
+    from src.database import async_session_factory
+    from src.models.activity_log import ActivityLog
+    from src.models.wrong_input import WrongInput
+    from src.services.ingest import insert_activity_logs, insert_wrong_inputs
+    from src.services.write_queue import WriteBehindQueue
+
+    models = {"activity_logs": ActivityLog, "wrong_inputs": WrongInput}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def direct(i):
+        async with semaphore:
+            kind, row = make_row(i)
+            async with async_session_factory() as db:
+                db.add(models[kind](**row))
+                await db.commit()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(direct(i) for i in range(total)))
+    direct_time = time.perf_counter() - start
+
+    queue = WriteBehindQueue()
+    queue.register("activity_logs", insert_activity_logs)
+    queue.register("wrong_inputs", insert_wrong_inputs)
+    await queue.start()
+
+    async def queued(i):
+        async with semaphore:
+            await (await queue.submit(*make_row(i)))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(queued(i) for i in range(total)))
+    queued_time = time.perf_counter() - start
+    metrics = queue.metrics()
+    await queue.stop()
+
+    print("Write path:")
+    print(f"  🐢 commit per row:     {total / direct_time:8.0f} rows/s")
+    print(f"  🚀 write-behind queue: {total / queued_time:8.0f} rows/s")
+    print(
+        f"     {metrics['batches']} batches, avg {metrics['avg_batch_size']} "
+        f"rows; speedup x{direct_time / queued_time:.1f}"
+    )
+
+
+async def run(total: int, concurrency: int):
+    import httpx
+
+    from src.config import SQLITE_DB_PATH, VOCAB_ARTIFACT_PATH
+    from src.database import engine, init_db
+    from src.main import app
+    from src.services.vocab_artifact import build_vocab_artifact
+    from src.services.write_queue import write_queue
+
+    engine.echo = False
+    await init_db()
+    build_vocab_artifact(SQLITE_DB_PATH, VOCAB_ARTIFACT_PATH)
+    await bench_write_path(total, concurrency)
+
+    print("HTTP:")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        direct = await fire(client, total, concurrency)
+        print(
+            f"  🐢 commit per request: {total / direct:8.0f} writes/s "
+            f"({direct:.2f}s)"
+        )
+
+        for counter in ("flushed_rows", "batches", "max_batch_size"):
+            setattr(write_queue, counter, 0)
+        await write_queue.start()
+        queued = await fire(client, total, concurrency)
+        metrics = write_queue.metrics()
+        await write_queue.stop()
+        print(
+            f"  🚀 write-behind queue: {total / queued:8.0f} writes/s "
+            f"({queued:.2f}s)"
+        )
+        print(
+            f"     {metrics['batches']} batches, avg {metrics['avg_batch_size']} "
+            f"rows, max {metrics['max_batch_size']}; "
+            f"speedup x{direct / queued:.1f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batched writes")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument(
+        "--db", default=str(backend_root / "data" / "hagxwon.db")
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_copy = Path(tmp) / "bench.db"
+        shutil.copy(args.db, db_copy)
+        # Must be set before the app (and its engine) is imported
+        os.environ["SQLITE_DB_PATH"] = str(db_copy)
+        os.environ["VOCAB_ARTIFACT_PATH"] = str(Path(tmp) / "vocab.hxv")
+        logging.disable(logging.WARNING)
+        asyncio.run(run(args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Embed the word catalog into the local vector index behind
+GET /api/words/{id}/related.
+
+Words created or edited through the API are added to the running index in
+memory; rebuild after bulk imports or to fold those changes into the file.
+
+Usage:
+    python scripts/build_vector_index.py [--db data/hagxwon.db] [--quantize int8] [--lists 64]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add the backend src directory to the Python path
+backend_root = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_root))
+
+from src.config import EMBEDDING_BACKEND, SQLITE_DB_PATH, VECTOR_INDEX_PATH
+from src.services.vector_index import build_vector_index, create_embedder
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build the local embedding index over words and sentences"
+    )
+    parser.add_argument("--db", default=SQLITE_DB_PATH)
+    parser.add_argument("--out", default=VECTOR_INDEX_PATH)
+    parser.add_argument("--embedder", default=EMBEDDING_BACKEND)
+    parser.add_argument(
+        "--quantize", choices=("float32", "int8"), default="float32"
+    )
+    parser.add_argument(
+        "--lists",
+        type=int,
+        default=0,
+        help="IVF lists for approximate search (0: exact only)",
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    counts = build_vector_index(
+        args.db,
+        args.out,
+        embedder=create_embedder(args.embedder),
+        quantize=args.quantize,
+        n_lists=args.lists,
+    )
+    duration = time.perf_counter() - start
+
+    size_kb = Path(args.out).stat().st_size / 1024
+    print(
+        f"✅ Built {args.out} ({size_kb:.0f} KB) in {duration:.2f}s: "
+        f"{counts['n_words']} words, {counts['n_sentences']} sentences, "
+        f"dim {counts['dim']}, {counts['n_lists']} IVF lists"
+    )
+
+
+if __name__ == "__main__":
+    main()
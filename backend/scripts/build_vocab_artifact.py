@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Compile the word catalog into a memory-mapped vocabulary artifact.
+
+Read endpoints and game rounds serve from the artifact while it exists; any
+catalog write through the API removes it so reads fall back to SQLite until
+this script is run again.
+
+Usage:
+    python scripts/build_vocab_artifact.py [--db data/hagxwon.db] [--out data/vocab.hxv]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add the backend src directory to the Python path
+backend_root = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_root))
+
+from src.config import SQLITE_DB_PATH, VOCAB_ARTIFACT_PATH
+from src.services.vocab_artifact import build_vocab_artifact
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build the memory-mapped vocabulary artifact"
+    )
+    parser.add_argument("--db", default=SQLITE_DB_PATH)
+    parser.add_argument("--out", default=VOCAB_ARTIFACT_PATH)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    counts = build_vocab_artifact(args.db, args.out)
+    duration = time.perf_counter() - start
+
+    size_kb = Path(args.out).stat().st_size / 1024
+    print(
+        f"✅ Built {args.out} ({size_kb:.0f} KB) in {duration:.2f}s: "
+        f"{counts['n_words']} words, {counts['n_sentences']} sentences, "
+        f"{counts['n_groups']} groups"
+    )
+
+
+if __name__ == "__main__":
+    main()
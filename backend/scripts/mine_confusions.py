@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Mine confusion pairs from wrong inputs for GET /api/words/{id}/confusions.
+
+Reads only the wrong inputs added since the previous run (the watermark is
+kept in ``job_watermarks``), so it can be run from cron as often as wanted.
+
+Usage:
+    python scripts/mine_confusions.py [--db data/hagxwon.db] [--batch-size 50000] [--max-batches N]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add the backend src directory to the Python path
+backend_root = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_root))
+
+from sqlalchemy import create_engine
+from sqlmodel import SQLModel
+
+from src.config import CONFUSION_BATCH_SIZE, SQLITE_DB_PATH
+from src.models import JobWatermark, WordConfusion
+from src.services.confusions import mine_confusions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Fold new wrong inputs into word confusion pairs"
+    )
+    parser.add_argument("--db", default=SQLITE_DB_PATH)
+    parser.add_argument("--batch-size", type=int, default=CONFUSION_BATCH_SIZE)
+    parser.add_argument("--max-batches", type=int)
+    args = parser.parse_args()
+
+    # Databases from before the job existed lack its tables
+    SQLModel.metadata.create_all(
+        create_engine(f"sqlite:///{args.db}"),
+        tables=[WordConfusion.__table__, JobWatermark.__table__],
+    )
+
+    start = time.perf_counter()
+    stats = mine_confusions(args.db, args.batch_size, args.max_batches)
+    duration = time.perf_counter() - start
+
+    rate = stats["rows"] / duration if duration else 0
+    print(
+        f"✅ Read {stats['rows']} wrong inputs in {duration:.2f}s "
+        f"({rate:,.0f}/s): {stats['groups']} distinct answers, "
+        f"{stats['confusions']} confusions, watermark {stats['watermark']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
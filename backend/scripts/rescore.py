@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Recompute every game_results row from its game_items.
+
+Items are streamed out of SQLite in session order, chunk by chunk, scored
+with the vectorized tools.batch_score.score_sessions and written back with
+one executemany UPDATE per chunk, keeping leaderboard entries in step.
+Run this after changing the scoring formula.
+
+Usage:
+    python scripts/rescore.py [--db data/hagxwon.db] [--chunk-size 200000] [--dry-run]
+"""
+
+import argparse
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add the backend directory to the Python path
+backend_root = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_root))
+
+from src.config import SQLITE_DB_PATH
+from tools.batch_score import score_sessions
+
+ITEMS_QUERY = """
+    SELECT gi.session_id, gi.correct, gi.time_ms, gs.duration_sec
+    FROM game_items gi
+    JOIN game_sessions gs ON gs.id = gi.session_id
+    ORDER BY gi.session_id
+"""
+
+UPDATE_QUERY = """
+    UPDATE game_results
+    SET total = ?, correct = ?, accuracy = ?, wpm = ?, score = ?
+    WHERE session_id = ?
+"""
+
+LEADERBOARD_UPDATE_QUERY = """
+    UPDATE leaderboard_entries SET accuracy = ?, score = ?
+    WHERE session_id = ?
+"""
+
+
+def iter_session_chunks(conn: sqlite3.Connection, chunk_size: int):
+    """Yield item arrays holding only complete sessions.
+
+    The rows of the last session in a chunk may continue in the next one,
+    so they are held back and prepended to the following chunk.
+    """
+    cursor = conn.execute(ITEMS_QUERY)
+    carry = np.empty((0, 4), dtype=np.int64)
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        block = np.array(rows, dtype=np.int64)
+        if len(carry):
+            block = np.concatenate([carry, block])
+        # Split off the trailing (possibly incomplete) session
+        cut = np.searchsorted(block[:, 0], block[-1, 0], side="left")
+        carry = block[cut:]
+        if cut:
+            yield block[:cut]
+    if len(carry):
+        yield carry
+
+
+def rescore(db_path: str, chunk_size: int, dry_run: bool = False) -> dict:
+    conn = sqlite3.connect(db_path)
+    try:
+        # Keep the ordered scan and the per-session updates index-driven
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_game_items_session_id "
+            "ON game_items (session_id)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_game_results_session_id "
+            "ON game_results (session_id)"
+        )
+        conn.commit()
+        has_leaderboard = conn.execute(
+            "SELECT 1 FROM sqlite_master "
+            "WHERE type = 'table' AND name = 'leaderboard_entries'"
+        ).fetchone()
+
+        sessions = items = updated = 0
+        for block in iter_session_chunks(conn, chunk_size):
+            result = score_sessions(
+                block[:, 0], block[:, 1], block[:, 2], duration_sec=block[:, 3]
+            )
+            sessions += len(result)
+            items += len(block)
+            if dry_run:
+                continue
+            params = zip(
+                result.total.tolist(),
+                result.correct.tolist(),
+                result.accuracy.tolist(),
+                result.wpm.tolist(),
+                result.score.tolist(),
+                result.session_id.tolist(),
+            )
+            updated += conn.executemany(UPDATE_QUERY, params).rowcount
+            if has_leaderboard:
+                conn.executemany(
+                    LEADERBOARD_UPDATE_QUERY,
+                    zip(
+                        result.accuracy.tolist(),
+                        result.score.tolist(),
+                        result.session_id.tolist(),
+                    ),
+                )
+            conn.commit()
+    finally:
+        conn.close()
+
+    return {"sessions": sessions, "items": items, "updated": updated}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Rescore game_results from game_items"
+    )
+    parser.add_argument("--db", default=SQLITE_DB_PATH)
+    parser.add_argument("--chunk-size", type=int, default=200_000)
+    parser.add_argument(
+        "--dry-run", action="store_true", help="score without writing"
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    stats = rescore(args.db, args.chunk_size, args.dry_run)
+    duration = time.perf_counter() - start
+    print(
+        f"✅ Scored {stats['items']} items across {stats['sessions']} sessions "
+        f"in {duration:.2f}s; updated {stats['updated']} results"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,13 @@
 #!/usr/bin/env python3
 """
 Database reset and reseed script for the Korean learning app.
-This script completely clears the database and reseeds it with fresh data.
+This script clears the database and reseeds it with fresh data.
+
+Use --scope catalog or --scope history to reset only one side; the default
+resets everything.
 """
 
+import argparse
 import asyncio
 import sys
 from pathlib import Path
@@ -13,85 +17,25 @@ backend_root = Path(__file__).parent.parent
 sys.path.insert(0, str(backend_root))
 
 from sqlalchemy import text
-from src.database import async_session_factory, engine
+from src.database import async_session_factory
+from src.db.reset import ResetScope, reset_tables
 from src.db.seed.words import load_words
 from src.db.seed.groups import load_groups
 from src.db.seed.sentences import load_sentences
 
 
-async def clear_all_tables():
-    """Clear all data from all tables in the correct order to avoid foreign key constraints."""
-    print("🗑️  Clearing all database tables...")
-
-    async with async_session_factory() as db:
-        try:
-            # Clear tables in reverse dependency order to avoid foreign key constraints
-            tables_to_clear = [
-                "word_group_map",  # Association table first
-                "sample_sentences",
-                "activity_logs",
-                "word_stats",
-                "wrong_inputs",
-                "word_review_items",
-                "words",
-                "word_groups",
-                "study_sessions",
-            ]
-
-            for table in tables_to_clear:
-                try:
-                    await db.execute(text(f"DELETE FROM {table}"))
-                    print(f"   ✅ Cleared {table}")
-                except Exception as e:
-                    print(f"   ⚠️  Warning: Could not clear {table}: {e}")
-
-            await db.commit()
-            print("✅ All tables cleared successfully")
-
-        except Exception as e:
-            print(f"❌ Error clearing tables: {e}")
-            await db.rollback()
-            raise
-
-
-async def reset_auto_increment():
-    """Reset auto-increment counters for all tables."""
-    print("🔄 Resetting auto-increment counters...")
+async def reset_tables_for_scope(scope: ResetScope):
+    """Drop and recreate the tables in scope in a single transaction."""
+    print(f"🗑️  Resetting {scope.value} tables...")
 
-    async with async_session_factory() as db:
-        try:
-            # Reset SQLite sequences
-            tables_with_auto_increment = [
-                "words",
-                "word_groups",
-                "sample_sentences",
-                "activity_logs",
-                "word_stats",
-                "wrong_inputs",
-                "word_review_items",
-                "study_sessions",
-            ]
-
-            for table in tables_with_auto_increment:
-                try:
-                    await db.execute(
-                        text(
-                            f"DELETE FROM sqlite_sequence WHERE name='{table}'"
-                        )
-                    )
-                    print(f"   ✅ Reset auto-increment for {table}")
-                except Exception as e:
-                    print(
-                        f"   ⚠️  Warning: Could not reset auto-increment for {table}: {e}"
-                    )
-
-            await db.commit()
-            print("✅ Auto-increment counters reset successfully")
-
-        except Exception as e:
-            print(f"❌ Error resetting auto-increment: {e}")
-            await db.rollback()
-            raise
+    try:
+        tables = await reset_tables(scope)
+        for table in tables:
+            print(f"   ✅ Reset {table}")
+        print("✅ Tables reset successfully")
+    except Exception as e:
+        print(f"❌ Error resetting tables: {e}")
+        raise
 
 
 async def seed_all_data():
@@ -165,22 +109,20 @@ async def verify_data():
             raise
 
 
-async def main():
+async def main(scope: ResetScope = ResetScope.ALL):
     """Main function to reset and reseed the database."""
     print("🚀 Starting database reset and reseed process...")
     print("=" * 60)
 
     try:
-        # Step 1: Clear all existing data
-        await clear_all_tables()
-
-        # Step 2: Reset auto-increment counters
-        await reset_auto_increment()
+        # Step 1: Drop and recreate the tables in scope
+        await reset_tables_for_scope(scope)
 
-        # Step 3: Seed fresh data
-        await seed_all_data()
+        # Step 2: Seed fresh catalog data (history resets keep the catalog)
+        if scope != ResetScope.HISTORY:
+            await seed_all_data()
 
-        # Step 4: Verify the results
+        # Step 3: Verify the results
         await verify_data()
 
         print("\n" + "=" * 60)
@@ -195,4 +137,12 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Reset and reseed the database")
+    parser.add_argument(
+        "--scope",
+        type=ResetScope,
+        choices=list(ResetScope),
+        default=ResetScope.ALL,
+        help="catalog, history or all tables (default: all)",
+    )
+    asyncio.run(main(parser.parse_args().scope))
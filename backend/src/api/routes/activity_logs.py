@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException
+import logging
+from fastapi import APIRouter, Body, Depends, HTTPException
 
 # Removed unused AsyncSession import
 from sqlalchemy import select
@@ -8,9 +9,20 @@ from contextlib import asynccontextmanager  # Added import
 from ...models.activity_log import ActivityLog
 from ...models.activity_type import ActivityType
 from ...schemas.activity_log import ActivityLogCreate, ActivityLogResponse
+from ...services.ingest import (
+    insert_activity_logs,
+    missing_session_ids,
+    missing_word_ids,
+)
+from ...services.write_queue import write_queue
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/logs", tags=["activity_logs"])
 
+# Largest batch accepted in one request (one transaction)
+MAX_BATCH_SIZE = 1000
+
 
 @router.get("", response_model=List[ActivityLogResponse])
 async def list_activity_logs(
@@ -40,34 +52,78 @@ async def list_activity_logs(
 
 
 @router.post("", response_model=ActivityLogResponse, status_code=201)
-async def create_activity_log(
-    log: ActivityLogCreate, db_cm: asynccontextmanager = Depends(get_db)
+async def create_activity_log(log: ActivityLogCreate):
+    """Create a new activity log entry.
+
+    The row is written by the write-behind queue together with whatever
+    other logs arrive in the same flush window.
+    """
+    db_log = ActivityLog(**log.dict())
+    row = db_log.model_dump(exclude={"id"})
+
+    try:
+        db_log.id = await (await write_queue.submit("activity_logs", row))
+        return db_log
+    except (
+        Exception
+    ) as e:  # Catch specific exceptions if possible (e.g., IntegrityError)
+        logger.error(f"Failed to create activity log: {e}")
+        # Provide a more informative error message if possible
+        detail = "Failed to create activity log."
+        if "FOREIGN KEY constraint failed" in str(e):
+            detail += " Ensure session_id and word_id exist."
+        elif "UNIQUE constraint failed" in str(e):
+            detail += " Duplicate entry detected."  # Example
+        raise HTTPException(
+            status_code=400,  # Or 500 for unexpected errors
+            detail=detail,
+        )
+
+
+@router.post(
+    "/batch", response_model=List[ActivityLogResponse], status_code=201
+)
+async def create_activity_logs_batch(
+    logs: List[ActivityLogCreate] = Body(
+        ..., min_length=1, max_length=MAX_BATCH_SIZE
+    ),
+    db_cm: asynccontextmanager = Depends(get_db),
 ):
-    """Create a new activity log entry"""
+    """Create many activity log entries in one transaction.
+
+    Session and word ids are checked with one IN query each; nothing is
+    written if any of them is unknown.
+    """
+    db_logs = [ActivityLog(**log.dict()) for log in logs]
+    rows = [db_log.model_dump(exclude={"id"}) for db_log in db_logs]
+
     async with db_cm as db:
-        db_log = ActivityLog(**log.dict())
-        db.add(db_log)
+        conn = await db.connection()
+        missing_sessions = await missing_session_ids(
+            conn, (log.session_id for log in logs)
+        )
+        missing_words = await missing_word_ids(
+            conn, (log.word_id for log in logs)
+        )
+        if missing_sessions or missing_words:
+            raise HTTPException(
+                status_code=404,
+                detail={
+                    "missing_session_ids": sorted(missing_sessions),
+                    "missing_word_ids": sorted(missing_words),
+                },
+            )
 
         try:
+            ids = await insert_activity_logs(conn, rows)
             await db.commit()
-            await db.refresh(db_log)
-            return db_log
-        except (
-            Exception
-        ) as e:  # Catch specific exceptions if possible (e.g., IntegrityError)
+        except Exception as e:
             await db.rollback()
-            # Log the error for debugging
-            import logging
-
-            logger = logging.getLogger(__name__)
-            logger.error(f"Failed to create activity log: {e}")
-            # Provide a more informative error message if possible
-            detail = "Failed to create activity log."
-            if "FOREIGN KEY constraint failed" in str(e):
-                detail += " Ensure session_id and word_id exist."
-            elif "UNIQUE constraint failed" in str(e):
-                detail += " Duplicate entry detected."  # Example
+            logger.error(f"Failed to create activity logs: {e}")
             raise HTTPException(
-                status_code=400,  # Or 500 for unexpected errors
-                detail=detail,
+                status_code=500, detail="Failed to create activity logs."
             )
+
+    for db_log, log_id in zip(db_logs, ids):
+        db_log.id = log_id
+    return db_logs
@@ -1,76 +1,85 @@
+import asyncio
+
 from fastapi import APIRouter, HTTPException
-from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...database import async_session_factory
+from ...db.init_db import reset_session
+from ...db.reset import ResetScope, reset_tables
 from ...db.seed.words import load_words
 from ...db.seed.groups import load_groups
 from ...db.seed.sentences import load_sentences
+from ...db.seed.romanization import backfill_romanization
+from ...services.confusions import mine_confusions
+from ...services.leaderboard import rebuild_leaderboard
+from ...services.word_latency import rebuild_latencies
+from ...services.vocab_artifact import invalidate_vocab_artifact
+from ...services.vector_index import invalidate_vector_index
+from ...services.ngram_index import build_ngram_index
+from ...services.sentence_index import invalidate_sentence_index
+from ...services.groq_service import groq_service
+from ...services.practice_cache import practice_cache
+from ...services.practice_stream import stream_latency
+from ...services.round_pool import round_pool
+from ...services.write_queue import write_queue
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 
+async def reseed_catalog():
+    """Reload words, groups and sentences from the seed files"""
+    async with async_session_factory() as db:
+        await load_words(db)
+
+    async with async_session_factory() as db:
+        await load_groups(db)
+
+    async with async_session_factory() as db:
+        await load_sentences(db)
+
+    async with async_session_factory() as db:
+        await backfill_romanization(db)
+
+    invalidate_vocab_artifact()
+    invalidate_vector_index()
+    invalidate_sentence_index()
+    await asyncio.to_thread(build_ngram_index)
+
+
 @router.post("/reset/all")
 async def reset_database():
     """Reset entire database and reseed with fresh data"""
     try:
-        # Clear all tables in reverse dependency order
-        async with async_session_factory() as db:
-            tables_to_clear = [
-                "word_group_map",  # Association table first
-                "sample_sentences",
-                "activity_logs",
-                "word_stats",
-                "wrong_inputs",
-                "word_review_items",
-                "words",
-                "word_groups",
-                "study_sessions",
-            ]
-
-            for table in tables_to_clear:
-                try:
-                    await db.execute(text(f"DELETE FROM {table}"))
-                except Exception:
-                    pass  # Table might not exist
-
-            # Reset auto-increment counters
-            tables_with_auto_increment = [
-                "words",
-                "word_groups",
-                "sample_sentences",
-                "activity_logs",
-                "word_stats",
-                "wrong_inputs",
-                "word_review_items",
-                "study_sessions",
-            ]
-
-            for table in tables_with_auto_increment:
-                try:
-                    await db.execute(
-                        text(
-                            f"DELETE FROM sqlite_sequence WHERE name='{table}'"
-                        )
-                    )
-                except Exception:
-                    pass  # Sequence might not exist
+        await reset_tables(ResetScope.ALL)
+        await reseed_catalog()
 
-            await db.commit()
+        return {
+            "status": "success",
+            "message": "Database fully reset and reseeded with fresh Korean learning data",
+        }
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Database reset failed: {str(e)}"
+        )
 
-        # Reseed with fresh data
-        async with async_session_factory() as db:
-            await load_words(db)
 
-        async with async_session_factory() as db:
-            await load_groups(db)
+@router.post("/reset/scope/{scope}")
+async def reset_scope(scope: ResetScope, reseed: bool = True):
+    """Reset catalog tables, learner-history tables, or both.
 
-        async with async_session_factory() as db:
-            await load_sentences(db)
+    The catalog is reseeded afterwards unless ``reseed=false``; resetting
+    history alone never touches the catalog.
+    """
+    try:
+        tables = await reset_tables(scope)
+        reseeded = reseed and scope != ResetScope.HISTORY
+        if reseeded:
+            await reseed_catalog()
 
         return {
             "status": "success",
-            "message": "Database fully reset and reseeded with fresh Korean learning data",
+            "scope": scope.value,
+            "tables": tables,
+            "reseeded": reseeded,
         }
     except Exception as e:
         raise HTTPException(
@@ -78,6 +87,71 @@ async def reset_database():
         )
 
 
+@router.post("/leaderboard/rebuild")
+async def rebuild_leaderboards():
+    """Rebuild all leaderboards from stored game results"""
+    try:
+        async with async_session_factory() as db:
+            count = await rebuild_leaderboard(db)
+            await db.commit()
+        return {"status": "success", "results_indexed": count}
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Leaderboard rebuild failed: {str(e)}"
+        )
+
+
+@router.post("/latency/rebuild")
+async def rebuild_word_latencies():
+    """Rebuild per-word latency sketches from stored game items"""
+    try:
+        async with async_session_factory() as db:
+            count = await rebuild_latencies(db)
+            await db.commit()
+        return {"status": "success", "items_indexed": count}
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Latency rebuild failed: {str(e)}"
+        )
+
+
+@router.post("/confusions/mine")
+async def mine_word_confusions():
+    """Fold wrong inputs logged since the last run into confusion pairs"""
+    try:
+        # Mistakes still in the write-behind queue are picked up next run
+        stats = await asyncio.get_running_loop().run_in_executor(
+            None, mine_confusions
+        )
+        return {"status": "success", **stats}
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Confusion mining failed: {str(e)}"
+        )
+
+
+@router.get("/write-queue")
+async def write_queue_metrics():
+    """Queue depth and batch sizes of the write-behind queue"""
+    return write_queue.metrics()
+
+
+@router.get("/round-pool")
+async def round_pool_metrics():
+    """Hit/miss counts and pooled rounds per key"""
+    return round_pool.metrics()
+
+
+@router.get("/llm")
+async def llm_metrics():
+    """Upstream Groq calls, coalescing, rate-limit queues and practice caching"""
+    return {
+        **groq_service.metrics(),
+        "practice_cache": practice_cache.metrics(),
+        "practice_stream": stream_latency.metrics(),
+    }
+
+
 @router.post("/reset/session/{session_id}")
 async def reset_study_session(session_id: int):
     """Reset specific study session data"""
@@ -1,89 +1,52 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Response,
+    WebSocket,
+)
 from sqlalchemy import select, desc, func
 from contextlib import asynccontextmanager
 from typing import List, Optional
-from datetime import datetime
 import logging
 
+from ...config import GAME_STREAM_MAX_PREFETCH, GAME_STREAM_PREFETCH
 from ...database import get_db
 from ...models.game_session import GameSession
 from ...models.game_result import GameResult
-from ...models.game_item import GameItem
-from ...models.word import Word
-from ...models.word_review_schedule import WordReviewSchedule
-from tools.score import score_round_from_dict
-from tools.srs import schedule_review_from_dict
-from tools.agent_quiz import AgentQuizGenerator
-from ...services.groq_service import groq_service
+from ...services.game_results import (
+    ResultAlreadyRecorded,
+    create_game_result,
+    has_result,
+    record_answers,
+)
+from ...services.game_stream import GameStream
+from ...services.grading import grade_answers
+from ...services.round_pool import round_pool
+from ...services.leaderboard import (
+    LeaderboardWindow,
+    session_rank,
+    top_entries,
+)
 from ...schemas.game import (
     GameSessionCreate,
     GameSessionResponse,
     GameSubmitRequest,
     GameSubmitResponse,
     GameRoundResponse,
-    GameRoundItem,
     GameStatsResponse,
     GameStatsItem,
+    GradeRequest,
+    GradeResult,
+    LeaderboardResponse,
+    LeaderboardRankResponse,
 )
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/game", tags=["game"])
 
 
-async def update_word_srs_schedule(db, word_id: int, correct: bool):
-    """Update SRS schedule for a word based on performance."""
-    # Get existing schedule
-    schedule_query = select(WordReviewSchedule).where(
-        WordReviewSchedule.word_id == word_id
-    )
-    schedule_result = await db.execute(schedule_query)
-    existing_schedule = schedule_result.scalar_one_or_none()
-
-    # Convert to dict format for SRS tool
-    current_schedule_dict = None
-    if existing_schedule:
-        current_schedule_dict = {
-            "word_id": existing_schedule.word_id,
-            "next_review": existing_schedule.next_review.isoformat(),
-            "interval_days": existing_schedule.interval_days,
-            "ease_factor": existing_schedule.ease_factor,
-            "repetitions": existing_schedule.repetitions,
-            "last_reviewed": existing_schedule.last_reviewed.isoformat(),
-        }
-
-    # Calculate new schedule using SRS tool
-    new_schedule_dict = schedule_review_from_dict(
-        word_id, correct, current_schedule_dict
-    )
-
-    # Update or create schedule in database
-    if existing_schedule:
-        existing_schedule.next_review = datetime.fromisoformat(
-            new_schedule_dict["next_review"]
-        )
-        existing_schedule.interval_days = new_schedule_dict["interval_days"]
-        existing_schedule.ease_factor = new_schedule_dict["ease_factor"]
-        existing_schedule.repetitions = new_schedule_dict["repetitions"]
-        existing_schedule.last_reviewed = datetime.fromisoformat(
-            new_schedule_dict["last_reviewed"]
-        )
-        existing_schedule.updated_at = datetime.utcnow()
-    else:
-        new_schedule = WordReviewSchedule(
-            word_id=new_schedule_dict["word_id"],
-            next_review=datetime.fromisoformat(
-                new_schedule_dict["next_review"]
-            ),
-            interval_days=new_schedule_dict["interval_days"],
-            ease_factor=new_schedule_dict["ease_factor"],
-            repetitions=new_schedule_dict["repetitions"],
-            last_reviewed=datetime.fromisoformat(
-                new_schedule_dict["last_reviewed"]
-            ),
-        )
-        db.add(new_schedule)
-
-
 @router.post("/sessions", response_model=GameSessionResponse)
 async def create_game_session(
     session_data: GameSessionCreate,
@@ -122,106 +85,68 @@ async def get_game_round(
     enhance: bool = Query(
         default=False, description="Use AI to generate hints and distractors"
     ),
-    db_cm: asynccontextmanager = Depends(get_db),
 ):
-    """Get words for a game round."""
-    async with db_cm as db:
-        try:
-            # Build query for words
-            query = select(Word)
-
-            # Filter by TOPIK level if specified
-            if level:
-                if level.upper() == "TOPIK1":
-                    query = query.where(Word.topik_level.in_([1, 2]))
-                elif level.upper() == "TOPIK2":
-                    query = query.where(Word.topik_level.in_([3, 4, 5, 6]))
-                else:
-                    # Try to parse as integer
-                    try:
-                        level_int = int(level)
-                        query = query.where(Word.topik_level == level_int)
-                    except ValueError:
-                        pass  # Ignore invalid level, use all words
-
-            # Order randomly and limit
-            query = query.order_by(func.random()).limit(count)
+    """Get words for a game round.
+
+    Rounds come pre-built and pre-serialized from the round pool, which
+    refills in the background; a cold key builds its round inline.
+    """
+    try:
+        payload = await round_pool.get(count, level, enhance)
+    except Exception as e:
+        logger.error(f"Error getting game round: {e}")
+        raise HTTPException(status_code=500, detail="Failed to get game round")
+
+    if payload is None:
+        raise HTTPException(
+            status_code=404,
+            detail="No words found for the specified criteria",
+        )
+    return Response(content=payload, media_type="application/json")
 
-            result = await db.execute(query)
-            words = result.scalars().all()
 
-            if not words:
-                raise HTTPException(
-                    status_code=404,
-                    detail="No words found for the specified criteria",
-                )
+@router.post("/grade", response_model=List[GradeResult])
+async def grade_round(
+    request: GradeRequest,
+    db_cm: asynccontextmanager = Depends(get_db),
+):
+    """Grade typed answers for a round in one call.
 
-            # Convert to game round items
-            if enhance:
-                # Use AI to generate hints and distractors
-                try:
-                    agent_generator = AgentQuizGenerator(groq_service)
-                    words_data = [
-                        {
-                            "id": word.id,
-                            "korean": word.korean,
-                            "english": word.english,
-                        }
-                        for word in words
-                    ]
-
-                    quiz_items = await agent_generator.generate_quiz_items(
-                        words_data, level or "TOPIK1"
-                    )
-
-                    items = [
-                        GameRoundItem(
-                            word_id=item.word_id,
-                            korean=item.korean,
-                            english=item.answer_en,
-                            hint=item.hint,
-                            distractors=item.distractors,
-                        )
-                        for item in quiz_items
-                    ]
-                except Exception as e:
-                    logger.error(
-                        f"AI enhancement failed, falling back to basic items: {e}"
-                    )
-                    # Fallback to basic items
-                    items = [
-                        GameRoundItem(
-                            word_id=word.id,
-                            korean=word.korean,
-                            english=word.english,
-                            hint=None,
-                            distractors=None,
-                        )
-                        for word in words
-                    ]
-            else:
-                # Basic items without AI enhancement
-                items = [
-                    GameRoundItem(
-                        word_id=word.id,
-                        korean=word.korean,
-                        english=word.english,
-                        hint=None,
-                        distractors=None,
-                    )
-                    for word in words
-                ]
-
-            return GameRoundResponse(
-                items=items, count=len(items), level=level
-            )
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error getting game round: {e}")
-            raise HTTPException(
-                status_code=500, detail="Failed to get game round"
-            )
+    Each input is compared with the word's Korean (jamo by jamo), English
+    glosses and romanization; small slips come back as ``near_miss`` with
+    the accepted answer they were closest to, and count as correct.
+    """
+    async with db_cm as db:
+        grades = await grade_answers(
+            db,
+            [(item.word_id, item.input_text) for item in request.items],
+            request.expected,
+        )
+    missing = sorted(
+        {
+            item.word_id
+            for item, grade in zip(request.items, grades)
+            if grade is None
+        }
+    )
+    if missing:
+        raise HTTPException(
+            status_code=404, detail=f"Words not found: {missing}"
+        )
+    return [
+        GradeResult(
+            word_id=item.word_id,
+            input_text=item.input_text,
+            verdict=grade.verdict,
+            correct=grade.accepted,
+            distance=grade.distance,
+            target=grade.target,
+            matched=grade.matched,
+            similarity=grade.similarity,
+            reason=grade.reason,
+        )
+        for item, grade in zip(request.items, grades)
+    ]
 
 
 @router.post("/submit", response_model=GameSubmitResponse)
@@ -243,9 +168,12 @@ async def submit_game_results(
                 raise HTTPException(
                     status_code=404, detail="Game session not found"
                 )
+            if await has_result(db, session.id):
+                raise ResultAlreadyRecorded(session.id)
 
-            # Use scoring tool to calculate results
-            items_for_scoring = [
+            # Items, SRS schedules and latency sketches go through the same
+            # path as the game stream's answers, in the result's transaction
+            answers = [
                 {
                     "word_id": item.word_id,
                     "correct": item.correct,
@@ -253,45 +181,18 @@ async def submit_game_results(
                 }
                 for item in submit_data.items
             ]
-
-            scoring_result = score_round_from_dict(
-                items_for_scoring, session.duration_sec
-            )
-
-            # Create game result using tool-calculated values
-            game_result = GameResult(
-                session_id=submit_data.session_id,
-                total=scoring_result["total"],
-                correct=scoring_result["correct"],
-                accuracy=scoring_result["accuracy"],
-                wpm=scoring_result["wpm"],
-                score=scoring_result["score"],
-            )
-
-            db.add(game_result)
-            await db.flush()  # Get the ID
-
-            # Create game items and update SRS schedules
-            for item_data in submit_data.items:
-                # Create game item
-                game_item = GameItem(
-                    session_id=submit_data.session_id,
-                    word_id=item_data.word_id,
-                    correct=item_data.correct,
-                    time_ms=item_data.time_ms,
-                )
-                db.add(game_item)
-
-                # Update SRS schedule for this word
-                await update_word_srs_schedule(
-                    db, item_data.word_id, item_data.correct
-                )
-
+            await record_answers(db, session.id, answers)
+            game_result = await create_game_result(db, session, answers)
             await db.commit()
 
             return GameSubmitResponse(success=True, result_id=game_result.id)
         except HTTPException:
             raise
+        except ResultAlreadyRecorded:
+            await db.rollback()
+            raise HTTPException(
+                status_code=409, detail="Game results already submitted"
+            )
         except Exception as e:
             logger.error(f"Error submitting game results: {e}")
             await db.rollback()
@@ -300,6 +201,41 @@ async def submit_game_results(
             )
 
 
+@router.websocket("/ws/{session_id}")
+async def game_stream(
+    websocket: WebSocket,
+    session_id: int,
+    level: Optional[str] = None,
+    enhance: bool = False,
+    prefetch: int = GAME_STREAM_PREFETCH,
+    db_cm: asynccontextmanager = Depends(get_db),
+):
+    """Play a game over a WebSocket.
+
+    Items are pushed ``prefetch`` ahead of the learner and answers are
+    stored as they arrive, acked in batches; see services.game_stream for
+    the message protocol.
+    """
+    async with db_cm as db:
+        session = (
+            await db.execute(
+                select(GameSession).where(GameSession.id == session_id)
+            )
+        ).scalar_one_or_none()
+        finished = session is not None and await has_result(db, session_id)
+
+    if session is None:
+        await websocket.close(code=4404, reason="Game session not found")
+        return
+    if finished:
+        await websocket.close(code=4409, reason="Game already finished")
+        return
+
+    await websocket.accept()
+    prefetch = max(1, min(prefetch, GAME_STREAM_MAX_PREFETCH))
+    await GameStream(websocket, session, level, enhance, prefetch).run()
+
+
 @router.get("/stats", response_model=GameStatsResponse)
 async def get_game_stats(
     limit: int = Query(default=10, ge=1, le=100),
@@ -345,3 +281,49 @@ async def get_game_stats(
             raise HTTPException(
                 status_code=500, detail="Failed to get game stats"
             )
+
+
+@router.get("/leaderboard", response_model=LeaderboardResponse)
+async def get_leaderboard(
+    mode: str = Query(..., description="Game mode, e.g. flashcards"),
+    window: LeaderboardWindow = Query(default=LeaderboardWindow.ALL_TIME),
+    limit: int = Query(default=10, ge=1, le=100),
+    period: Optional[str] = Query(
+        default=None,
+        description="Past period key (e.g. 2025-05-05 or 2025-W19); defaults to the current one",
+    ),
+    db_cm: asynccontextmanager = Depends(get_db),
+):
+    """Get the best scores for a mode in a time window."""
+    async with db_cm as db:
+        try:
+            return await top_entries(db, mode, window, limit, period)
+        except Exception as e:
+            logger.error(f"Error getting leaderboard: {e}")
+            raise HTTPException(
+                status_code=500, detail="Failed to get leaderboard"
+            )
+
+
+@router.get(
+    "/leaderboard/rank/{session_id}", response_model=LeaderboardRankResponse
+)
+async def get_leaderboard_rank(
+    session_id: int,
+    window: LeaderboardWindow = Query(default=LeaderboardWindow.ALL_TIME),
+    db_cm: asynccontextmanager = Depends(get_db),
+):
+    """Get a session's rank on its mode's leaderboard."""
+    async with db_cm as db:
+        try:
+            rank = await session_rank(db, session_id, window)
+        except Exception as e:
+            logger.error(f"Error getting leaderboard rank: {e}")
+            raise HTTPException(
+                status_code=500, detail="Failed to get leaderboard rank"
+            )
+        if rank is None:
+            raise HTTPException(
+                status_code=404, detail="No leaderboard entry for session"
+            )
+        return rank
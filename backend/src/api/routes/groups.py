@@ -7,11 +7,22 @@ from contextlib import asynccontextmanager
 from ...models.group import WordGroup
 from ...models.word import Word, word_group_map
 from ...models.study_session import StudySession
+from ...config import PRACTICE_BATCH_MAX_TOKENS
 from ...schemas.group import (
     WordGroupCreate,
     WordGroupUpdate,
     WordGroupResponse,
+    GroupPracticeResponse,
 )
+from ...schemas.word import PracticeRequest, PracticeResponse
+from ...services.groq_service import groq_service
+from ...services.llm_scheduler import Priority, llm_priority
+from ...services.practice_cache import load_practice, save_practice
+from ...services.vocab_artifact import (
+    get_vocab_artifact,
+    invalidate_vocab_artifact,
+)
+from tools.agent_practice import AgentPracticeGenerator
 import logging
 
 logger = logging.getLogger(__name__)
@@ -76,6 +87,9 @@ async def get_group_words(
     limit: int = 100,
     db_cm: asynccontextmanager = Depends(get_db),
 ):
+    artifact = get_vocab_artifact()
+    if artifact is not None:
+        return artifact.get_group_words(group_id, skip, limit)
     async with db_cm as db:
         query = (
             select(Word)
@@ -106,6 +120,75 @@ async def get_group_study_sessions(
         return result.scalars().all()
 
 
+@router.post("/{group_id}/practice", response_model=GroupPracticeResponse)
+async def create_group_practice(
+    group_id: int,
+    request: PracticeRequest,
+    db_cm: asynccontextmanager = Depends(get_db),
+):
+    """Generate practice content for every word in a group
+
+    Words are packed many to a prompt rather than one call per word, and
+    each word's content is cached on its own.
+    """
+    practice_type = request.practice_type or "definition"
+    async with db_cm as db:
+        group = await db.get(WordGroup, group_id)
+        if not group:
+            raise HTTPException(status_code=404, detail="Group not found")
+        result = await db.execute(
+            select(Word.id, Word.korean, Word.english)
+            .join(word_group_map, Word.id == word_group_map.c.word_id)
+            .filter(word_group_map.c.group_id == group_id)
+            .order_by(Word.id)
+        )
+        words = [row._asdict() for row in result.all()]
+        contents = await load_practice(db, words, practice_type)
+
+    # The session is released; generation can take a while
+    missing = [word for word in words if word["id"] not in contents]
+    if missing:
+        try:
+            generator = AgentPracticeGenerator(
+                groq_service, max_tokens=PRACTICE_BATCH_MAX_TOKENS
+            )
+            # Bulk generation yields the rate limit to interactive calls
+            with llm_priority(Priority.BATCH):
+                generated = await generator.generate_practice(
+                    missing, practice_type
+                )
+            await save_practice(missing, practice_type, generated)
+        except Exception as e:
+            logger.error(
+                f"Failed to generate practice content for group {group_id}: {e}"
+            )
+            raise HTTPException(
+                status_code=500, detail="Failed to generate practice content"
+            ) from e
+        if not generated:
+            raise HTTPException(
+                status_code=500, detail="Failed to generate practice content"
+            )
+        contents.update(generated)
+
+    return GroupPracticeResponse(
+        group_id=group_id,
+        type=practice_type,
+        items=[
+            PracticeResponse(
+                content=contents[word["id"]],
+                type=practice_type,
+                word_id=word["id"],
+            )
+            for word in words
+            if word["id"] in contents
+        ],
+        failed_word_ids=[
+            word["id"] for word in words if word["id"] not in contents
+        ],
+    )
+
+
 # @router.post("", response_model=WordGroupResponse)
 # async def create_group(
 #     group: WordGroupCreate, db: AsyncSession = Depends(get_db)
@@ -194,6 +277,7 @@ async def add_word_to_group(
             )
             await db.execute(stmt)
             await db.commit()
+            invalidate_vocab_artifact()
             return {"message": "Word added to group successfully"}
         except (
             Exception
@@ -260,6 +344,7 @@ async def add_words_to_group(
                 word_group_map.insert().prefix_with("OR IGNORE"), values
             )  # Use OR IGNORE for SQLite to skip duplicates
             await db.commit()
+            invalidate_vocab_artifact()
             # Get actual count added if needed (more complex query)
             # Could query word_group_map count before/after or use returning
             # clause if DB supports
@@ -292,6 +377,7 @@ async def remove_word_from_group(
         try:
             result = await db.execute(stmt)
             await db.commit()
+            invalidate_vocab_artifact()
             if result.rowcount == 0:
                 # Check if group or word exists to give a more specific error
                 group_exists = (
@@ -346,6 +432,7 @@ async def delete_group(
             # If not, you might need to delete them manually first.
             await db.delete(group)
             await db.commit()
+            invalidate_vocab_artifact()
             return {"message": "Group deleted successfully"}
         except Exception as e:
             await db.rollback()
@@ -1,5 +1,5 @@
 import logging
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
 
 # Removed unused AsyncSession import
 from sqlalchemy import select, func
@@ -7,14 +7,24 @@ from typing import List
 from ...database import get_db
 from contextlib import asynccontextmanager  # Added import
 from ...models.wrong_input import WrongInput
-from ...models.word_stats import WordStats
 from ...models.word import Word
-from ...schemas.wrong_input import WrongInputCreate, WrongInputResponse
+from ...models.word_confusion import WordConfusion
+from ...schemas.wrong_input import (
+    ConfusionResponse,
+    WrongInputCreate,
+    WrongInputResponse,
+)
+from ...services.grading import answer_keys
+from ...services.ingest import insert_wrong_inputs
+from ...services.write_queue import write_queue
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["mistakes"])
 
+# Largest batch accepted in one request (one transaction)
+MAX_BATCH_SIZE = 1000
+
 
 @router.get(
     "/words/{word_id}/mistakes", response_model=List[WrongInputResponse]
@@ -47,69 +57,145 @@ async def get_word_mistakes(
         return result.scalars().all()
 
 
+@router.get(
+    "/words/{word_id}/confusions", response_model=List[ConfusionResponse]
+)
+async def get_word_confusions(
+    word_id: int,
+    limit: int = Query(10, ge=1, le=100),
+    db_cm: asynccontextmanager = Depends(get_db),
+):
+    """Words learners answered with instead of this one, most often first.
+
+    Counts come from the confusion mining job (scripts/mine_confusions.py
+    or POST /api/admin/confusions/mine), so they lag the newest mistakes.
+    """
+    async with db_cm as db:
+        word_exists_res = await db.execute(
+            select(func.count(Word.id)).filter(Word.id == word_id)
+        )
+        if word_exists_res.scalar() == 0:
+            raise HTTPException(status_code=404, detail="Word not found")
+
+        result = await db.execute(
+            select(
+                WordConfusion.confused_with_id,
+                Word.korean,
+                Word.english,
+                WordConfusion.count,
+            )
+            .join(Word, Word.id == WordConfusion.confused_with_id)
+            .where(WordConfusion.word_id == word_id)
+            .order_by(
+                WordConfusion.count.desc(), WordConfusion.confused_with_id
+            )
+            .limit(limit)
+        )
+        return [
+            ConfusionResponse(
+                word_id=other_id, korean=korean, english=english, count=count
+            )
+            for other_id, korean, english, count in result.all()
+        ]
+
+
 @router.post("/mistakes", response_model=WrongInputResponse, status_code=201)
 async def log_mistake(
     mistake: WrongInputCreate, db_cm: asynccontextmanager = Depends(get_db)
 ):
-    """Log a wrong input and update word stats"""
+    """Log a wrong input and update word stats.
+
+    Both writes go through the write-behind queue, batched with other
+    mistakes arriving in the same flush window. The response says how far
+    the input was from the word (see ``POST /api/game/grade``).
+    """
     logger.info(
         f"Logging mistake for word {mistake.word_id}: {mistake.input_text}"
     )
+    # Verify word exists first; its answer key doubles as the check
     async with db_cm as db:
-        try:
-            # Verify word exists first
-            word_res = await db.execute(
-                select(Word.id).filter(Word.id == mistake.word_id)
-            )
-            if not word_res.scalar_one_or_none():
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"Word with id {mistake.word_id} not found",
-                )
-
-            # Create wrong input entry
-            db_mistake = WrongInput(**mistake.dict())
-            db.add(db_mistake)
-
-            # Update word stats
-            result = await db.execute(
-                select(WordStats).filter(WordStats.word_id == mistake.word_id)
+        keys = await answer_keys.load(db, [mistake.word_id])
+        others = await answer_keys.catalog(db)
+    if mistake.word_id not in keys:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Word with id {mistake.word_id} not found",
+        )
+    grade = keys[mistake.word_id].grade(mistake.input_text, others=others)
+
+    # Insert the entry and adjust word stats in the next flush; the request
+    # session is released first so it doesn't hold a pooled connection
+    db_mistake = WrongInput(**mistake.dict())
+    row = db_mistake.model_dump(exclude={"id"})
+    try:
+        db_mistake.id = await (await write_queue.submit("wrong_inputs", row))
+        return WrongInputResponse(
+            **db_mistake.model_dump(),
+            verdict=grade.verdict,
+            distance=grade.distance,
+        )
+    except Exception as e:
+        logger.error(f"Failed to log mistake: {e}")
+        # Check for specific errors like foreign key violation if word_id is invalid
+        raise HTTPException(status_code=500, detail="Failed to log mistake")
+
+
+@router.post(
+    "/mistakes/batch",
+    response_model=List[WrongInputResponse],
+    status_code=201,
+)
+async def log_mistakes_batch(
+    mistakes: List[WrongInputCreate] = Body(
+        ..., min_length=1, max_length=MAX_BATCH_SIZE
+    ),
+    db_cm: asynccontextmanager = Depends(get_db),
+):
+    """Log many wrong inputs and update word stats in one transaction.
+
+    Word ids are checked with a single IN query (while loading their
+    answer keys for grading), the inputs are inserted with executemany and
+    all stats changes are one set-based UPDATE.
+    """
+    db_mistakes = [WrongInput(**mistake.dict()) for mistake in mistakes]
+    rows = [m.model_dump(exclude={"id"}) for m in db_mistakes]
+
+    async with db_cm as db:
+        keys = await answer_keys.load(db, {m.word_id for m in mistakes})
+        others = await answer_keys.catalog(db)
+        missing = {m.word_id for m in mistakes} - keys.keys()
+        if missing:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Words not found: {sorted(missing)}",
             )
-            word_stats = result.scalar_one_or_none()
-
-            if word_stats:
-                logger.info(
-                    f"Current streak: {word_stats.current_streak}, Ease factor: {word_stats.ease_factor}"
-                )
-                # Reset streak since there was a mistake
-                word_stats.current_streak = 0
-                # Adjust ease factor (ensure it doesn't go below minimum)
-                word_stats.ease_factor = max(1.3, word_stats.ease_factor - 0.2)
-                # Reduce interval (ensure it doesn't go below minimum)
-                word_stats.interval_days = max(
-                    1, word_stats.interval_days // 2
-                )
-                logger.info(
-                    f"Updated: Streak reset, New ease factor: {word_stats.ease_factor}, New interval: {word_stats.interval_days}"
-                )
-            else:
-                # Handle case where WordStats might not exist yet for the word
-                logger.warning(
-                    f"No WordStats found for word_id {mistake.word_id}. Cannot update stats."
-                )
 
+        try:
+            conn = await db.connection()
+            ids = await insert_wrong_inputs(conn, rows)
             await db.commit()
-            await db.refresh(db_mistake)
-            return db_mistake
-
         except Exception as e:
-            await db.rollback()  # Rollback on error
-            logger.error(f"Failed to log mistake: {e}")
-            # Check for specific errors like foreign key violation if word_id is invalid
+            await db.rollback()
+            logger.error(f"Failed to log mistakes: {e}")
             raise HTTPException(
-                status_code=500, detail="Failed to log mistake"
+                status_code=500, detail="Failed to log mistakes"
             )
 
+    responses = []
+    for db_mistake, mistake_id in zip(db_mistakes, ids):
+        db_mistake.id = mistake_id
+        grade = keys[db_mistake.word_id].grade(
+            db_mistake.input_text, others=others
+        )
+        responses.append(
+            WrongInputResponse(
+                **db_mistake.model_dump(),
+                verdict=grade.verdict,
+                distance=grade.distance,
+            )
+        )
+    return responses
+
 
 @router.get("/mistakes/stats", response_model=dict)
 async def get_mistake_stats(
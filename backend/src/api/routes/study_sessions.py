@@ -2,7 +2,7 @@ import logging
 from fastapi import APIRouter, Depends, HTTPException
 
 # Removed unused AsyncSession import
-from sqlalchemy import select
+from sqlalchemy import case, cast, Float, select, update
 from typing import List
 from datetime import datetime
 from ...database import get_db
@@ -14,7 +14,12 @@ from ...schemas.study_session import (
     StudySessionUpdate,
     StudySessionResponse,
 )
-from ...schemas.session_stats import SessionStatsResponse, SessionStatsBase
+from ...schemas.session_stats import (
+    SessionStatsResponse,
+    SessionStatsBase,
+    SessionStatsCounters,
+    SessionStatsIncrement,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -219,3 +224,70 @@ async def update_session_stats(
             raise HTTPException(
                 status_code=500, detail="Failed to update session stats"
             )
+
+
+@router.post(
+    "/{session_id}/stats/increment", response_model=SessionStatsCounters
+)
+async def increment_session_stats(
+    session_id: int,
+    delta: SessionStatsIncrement,
+    db_cm: asynccontextmanager = Depends(get_db),
+):
+    """Add answered/correct counts to a session's stats.
+
+    The deltas and the derived accuracy are applied by a single
+    UPDATE ... RETURNING, so concurrent clients never overwrite each other.
+    """
+    if delta.correct > delta.shown:
+        raise HTTPException(
+            status_code=400, detail="correct cannot exceed shown"
+        )
+
+    total_shown = SessionStats.total_shown + delta.shown
+    total_correct = SessionStats.total_correct + delta.correct
+    query = (
+        update(SessionStats)
+        .where(SessionStats.session_id == session_id)
+        .values(
+            total_shown=total_shown,
+            total_correct=total_correct,
+            accuracy=case(
+                (total_shown > 0, cast(total_correct, Float) / total_shown),
+                else_=0.0,
+            ),
+        )
+        .returning(
+            SessionStats.session_id,
+            SessionStats.total_shown,
+            SessionStats.total_correct,
+            SessionStats.accuracy,
+            SessionStats.level,
+        )
+    )
+
+    async with db_cm as db:
+        try:
+            row = (await db.execute(query)).first()
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            logger.error(
+                f"Failed to increment stats for session {session_id}: {str(e)}"
+            )
+            raise HTTPException(
+                status_code=500, detail="Failed to update session stats"
+            )
+
+        if row is None:
+            session_res = await db.execute(
+                select(StudySession.id).filter(StudySession.id == session_id)
+            )
+            if not session_res.scalar_one_or_none():
+                raise HTTPException(
+                    status_code=404, detail="Session not found"
+                )
+            raise HTTPException(
+                status_code=404, detail="Session stats not found"
+            )
+        return row._asdict()
@@ -1,24 +1,54 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
-from typing import List
+from typing import Callable, List
 from ...database import get_db
 from contextlib import asynccontextmanager
+from tools.romanize import romanize
 from ...models.word import Word
 from ...models.sample_sentence import SampleSentence
 from ...models.word_stats import WordStats
+from ...models.word_latency import WordLatency
 from ...schemas.word import (
     WordCreate,
     WordUpdate,
     WordResponse,
+    RelatedWordResponse,
     PracticeRequest,
     PracticeResponse,
+    PracticeType,
 )
 from ...schemas.sample_sentence import (
     SampleSentenceCreate,
     SampleSentenceResponse,
 )
 from ...schemas.word_stats import WordStatsResponse, WordStatsUpdate
+from ...schemas.word_latency import WordLatencyResponse, SlowWordResponse
 from ...services.groq_service import groq_service
+from ...services.practice_cache import load_practice, save_practice
+from ...services.practice_stream import practice_events
+from ...services.word_latency import latency_summary, slowest_words
+from ...services.vocab_artifact import (
+    get_vocab_artifact,
+    invalidate_vocab_artifact,
+)
+from ...services.ngram_index import (
+    load_ngram_index,
+    ngram_index_word,
+    ngram_unindex_word,
+)
+from ...services.sentence_index import (
+    load_sentence_index,
+    sentence_index_add,
+    sentence_index_word,
+    sentence_unindex_word,
+)
+from ...services.vector_index import (
+    get_vector_index,
+    index_sentence,
+    index_word,
+    unindex_word,
+)
 import logging
 
 router = APIRouter(prefix="/words", tags=["words"])
@@ -27,6 +57,20 @@ router = APIRouter(prefix="/words", tags=["words"])
 logger = logging.getLogger(__name__)
 
 
+def _after_commit(what: str, *hooks: Callable[[], None]) -> None:
+    """Run cache and index updates for a committed catalog write.
+
+    The write already happened, so a failing hook is logged and the rest
+    still run; answering with an error would make the client retry into a
+    duplicate.
+    """
+    for hook in hooks:
+        try:
+            hook()
+        except Exception as e:
+            logger.error(f"Index update after {what} failed: {e}")
+
+
 @router.get("", response_model=List[WordResponse])
 async def list_words(
     skip: int = 0,
@@ -34,15 +78,47 @@ async def list_words(
     db_cm: asynccontextmanager = Depends(get_db),
 ):
     """List all words with pagination"""
+    artifact = get_vocab_artifact()
+    if artifact is not None:
+        return artifact.list_words(skip, limit)
     async with db_cm as db:
         query = select(Word).offset(skip).limit(limit)
         result = await db.execute(query)
         return result.scalars().all()
 
 
+@router.get("/latency/slowest", response_model=List[SlowWordResponse])
+async def list_slowest_words(
+    limit: int = Query(default=10, ge=1, le=100),
+    min_count: int = Query(default=3, ge=1),
+    db_cm: asynccontextmanager = Depends(get_db),
+):
+    """Rank words by p90 answer time (slowest recall first)"""
+    async with db_cm as db:
+        return await slowest_words(db, limit, min_count)
+
+
+@router.get("/search", response_model=List[RelatedWordResponse])
+async def search_words(
+    q: str = Query(min_length=1, max_length=100),
+    limit: int = Query(default=10, ge=1, le=50),
+    db_cm: asynccontextmanager = Depends(get_db),
+):
+    """Typo-tolerant lookup by Korean, English or romanization"""
+    index = await load_ngram_index()
+    matches = index.lookup([q], limit)[0]
+    return await _scored_words(db_cm, matches)
+
+
 @router.get("/{word_id}", response_model=WordResponse)
 async def get_word(word_id: int, db_cm: asynccontextmanager = Depends(get_db)):
     """Get a single word by ID"""
+    artifact = get_vocab_artifact()
+    if artifact is not None:
+        word = artifact.get_word(word_id)
+        if not word:
+            raise HTTPException(status_code=404, detail="Word not found")
+        return word
     async with db_cm as db:
         result = await db.execute(select(Word).filter(Word.id == word_id))
         word = result.scalar_one_or_none()
@@ -55,15 +131,15 @@ async def get_word(word_id: int, db_cm: asynccontextmanager = Depends(get_db)):
 async def create_word(
     word: WordCreate, db_cm: asynccontextmanager = Depends(get_db)
 ):
-    """Create a new word"""
+    """Create a new word; romanization is generated when not given"""
     async with db_cm as db:
         db_word = Word(**word.dict())
+        if not db_word.romanization:
+            db_word.romanization = romanize(db_word.korean)
         db.add(db_word)
         try:
             await db.commit()
             await db.refresh(db_word)
-            # Consider creating WordStats here too if it should always exist
-            return db_word
         except Exception as e:  # Catch potential IntegrityError for duplicates
             await db.rollback()
             import logging
@@ -79,6 +155,20 @@ async def create_word(
                 status_code=500, detail="Failed to create word"
             ) from e
 
+    _after_commit(
+        f"creating word {db_word.id}",
+        invalidate_vocab_artifact,
+        lambda: sentence_index_word(
+            db_word.id, db_word.korean, db_word.part_of_speech
+        ),
+        lambda: index_word(db_word.id, db_word.korean, db_word.english),
+        lambda: ngram_index_word(
+            db_word.id, db_word.korean, db_word.english, db_word.romanization
+        ),
+    )
+    # Consider creating WordStats here too if it should always exist
+    return db_word
+
 
 @router.put("/{word_id}", response_model=WordResponse)
 async def update_word(
@@ -94,12 +184,17 @@ async def update_word(
             raise HTTPException(status_code=404, detail="Word not found")
 
         update_data = word.dict(exclude_unset=True)
+        # New Korean without a new romanization makes the old one stale
+        if "korean" in update_data or "romanization" in update_data:
+            if not update_data.get("romanization"):
+                update_data["romanization"] = romanize(
+                    update_data.get("korean", db_word.korean)
+                )
         for key, value in update_data.items():
             setattr(db_word, key, value)
         try:
             await db.commit()
             await db.refresh(db_word)
-            return db_word
         except Exception as e:
             await db.rollback()
             import logging
@@ -110,6 +205,29 @@ async def update_word(
                 status_code=500, detail="Failed to update word"
             ) from e
 
+    hooks = [invalidate_vocab_artifact]
+    if "korean" in update_data or "english" in update_data:
+        hooks.append(
+            lambda: index_word(db_word.id, db_word.korean, db_word.english)
+        )
+    if update_data.keys() & {"korean", "part_of_speech"}:
+        hooks.append(
+            lambda: sentence_index_word(
+                db_word.id, db_word.korean, db_word.part_of_speech
+            )
+        )
+    if update_data.keys() & {"korean", "english", "romanization"}:
+        hooks.append(
+            lambda: ngram_index_word(
+                db_word.id,
+                db_word.korean,
+                db_word.english,
+                db_word.romanization,
+            )
+        )
+    _after_commit(f"updating word {word_id}", *hooks)
+    return db_word
+
 
 @router.delete("/{word_id}")
 async def delete_word(
@@ -126,7 +244,6 @@ async def delete_word(
             # Cascading deletes should handle related sentences, stats, group maps etc.
             await db.delete(word)
             await db.commit()
-            return {"message": f"Word {word_id} deleted successfully"}
         except Exception as e:
             await db.rollback()
             import logging
@@ -138,28 +255,43 @@ async def delete_word(
                 status_code=500, detail="Failed to delete word"
             ) from e
 
+    _after_commit(
+        f"deleting word {word_id}",
+        invalidate_vocab_artifact,
+        lambda: unindex_word(word_id),
+        lambda: ngram_unindex_word(word_id),
+        lambda: sentence_unindex_word(word_id),
+    )
+    return {"message": f"Word {word_id} deleted successfully"}
+
 
 @router.get(
     "/{word_id}/sentences", response_model=List[SampleSentenceResponse]
 )
 async def get_word_sentences(
-    word_id: int, db_cm: asynccontextmanager = Depends(get_db)
+    word_id: int,
+    limit: int = Query(default=50, ge=1, le=500),
+    db_cm: asynccontextmanager = Depends(get_db),
 ):
-    """Get all sample sentences for a word"""
-    async with db_cm as db:
-        # First verify word exists
-        result = await db.execute(
-            select(Word.id).filter(Word.id == word_id)
-        )  # Only select ID
-        if not result.scalar_one_or_none():
-            raise HTTPException(status_code=404, detail="Word not found")
+    """Sample sentences that use a word, shortest first.
+
+    Includes sentences seeded for other words (their ``word_id``), found
+    through the sentence inverted index.
+    """
+    artifact = get_vocab_artifact()
+    if artifact is not None:
+        exists = artifact.get_word(word_id) is not None
+    else:
+        async with db_cm as db:
+            result = await db.execute(
+                select(Word.id).filter(Word.id == word_id)
+            )  # Only select ID
+            exists = result.scalar_one_or_none() is not None
+    if not exists:
+        raise HTTPException(status_code=404, detail="Word not found")
 
-        # Get sentences
-        result = await db.execute(
-            select(SampleSentence).filter(SampleSentence.word_id == word_id)
-        )
-        logger.info(f"Retrieved sentences for word_id: {word_id}")
-        return result.scalars().all()
+    index = await load_sentence_index()
+    return index.sentences_for(word_id, limit)
 
 
 @router.post("/{word_id}/sentences", response_model=SampleSentenceResponse)
@@ -183,7 +315,6 @@ async def add_word_sentence(
         try:
             await db.commit()
             await db.refresh(db_sentence)
-            return db_sentence
         except Exception as e:
             await db.rollback()
             import logging
@@ -194,6 +325,62 @@ async def add_word_sentence(
                 status_code=500, detail="Failed to add sentence"
             ) from e
 
+    _after_commit(
+        f"adding sentence {db_sentence.id}",
+        invalidate_vocab_artifact,
+        lambda: index_sentence(
+            word_id, db_sentence.sentence_korean, db_sentence.sentence_english
+        ),
+        lambda: sentence_index_add(
+            db_sentence.id,
+            word_id,
+            db_sentence.sentence_korean,
+            db_sentence.sentence_english,
+        ),
+    )
+    return db_sentence
+
+
+@router.get("/{word_id}/related", response_model=List[RelatedWordResponse])
+async def get_related_words(
+    word_id: int,
+    limit: int = Query(default=10, ge=1, le=50),
+    db_cm: asynccontextmanager = Depends(get_db),
+):
+    """Words closest to a word: by meaning in the embedding index if one
+    is built, by spelling in the n-gram index otherwise"""
+    index = get_vector_index()
+    if index is not None:
+        related = index.related_words(word_id, limit)
+    else:
+        # No embedding index built: fall back to spelling similarity
+        ngrams = await load_ngram_index()
+        related = ngrams.related([word_id], limit)[0]
+    if related is None:
+        raise HTTPException(status_code=404, detail="Word not found")
+    return await _scored_words(db_cm, related)
+
+
+async def _scored_words(db_cm, scored):
+    """Word records for (word_id, score) pairs, in order, with the score."""
+    artifact = get_vocab_artifact()
+    if artifact is not None:
+        words = {wid: artifact.get_word(wid) for wid, _ in scored}
+    else:
+        async with db_cm as db:
+            result = await db.execute(
+                select(Word).filter(Word.id.in_([wid for wid, _ in scored]))
+            )
+            words = {
+                word.id: WordResponse.model_validate(word).model_dump()
+                for word in result.scalars().all()
+            }
+    return [
+        {**words[wid], "score": score}
+        for wid, score in scored
+        if words.get(wid)
+    ]
+
 
 @router.get("/{word_id}/stats", response_model=WordStatsResponse)
 async def get_word_stats(
@@ -266,6 +453,25 @@ async def update_word_stats(
             ) from e
 
 
+@router.get("/{word_id}/latency", response_model=WordLatencyResponse)
+async def get_word_latency(
+    word_id: int, db_cm: asynccontextmanager = Depends(get_db)
+):
+    """Get answer-time percentiles and accuracy for a word"""
+    async with db_cm as db:
+        result = await db.execute(
+            select(WordLatency).filter(WordLatency.word_id == word_id)
+        )
+        row = result.scalar_one_or_none()
+        if row is None:
+            word_res = await db.execute(
+                select(Word.id).filter(Word.id == word_id)
+            )
+            if not word_res.scalar_one_or_none():
+                raise HTTPException(status_code=404, detail="Word not found")
+        return latency_summary(word_id, row)
+
+
 @router.post("/{word_id}/practice", response_model=PracticeResponse)
 async def create_practice_content(
     word_id: int,
@@ -280,36 +486,88 @@ async def create_practice_content(
         if not word:
             raise HTTPException(status_code=404, detail="Word not found")
 
-        # Generate practice content using Groq service
-        try:
-            groq_response = await groq_service.generate_practice_content(
-                korean_word=word.korean,
-                english_translation=word.english,
-                practice_type=request.practice_type or "definition",
+        practice_type = request.practice_type or "definition"
+        word_data = {
+            "id": word.id,
+            "korean": word.korean,
+            "english": word.english,
+        }
+        stored = await load_practice(db, [word_data], practice_type)
+        cached = stored.get(word_id)
+        if cached is not None:
+            return PracticeResponse(
+                content=cached, type=practice_type, word_id=word_id
             )
 
-            # Check if Groq service returned an error
-            if "error" in groq_response:
-                logger.error(f"Groq service error: {groq_response}")
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"AI service error: {groq_response.get('message', 'Unknown error')}",
-                )
+    # The session is released; generation can take a while
+    try:
+        groq_response = await groq_service.generate_practice_content(
+            korean_word=word_data["korean"],
+            english_translation=word_data["english"],
+            practice_type=practice_type,
+        )
 
-            # Return successful response
-            return PracticeResponse(
-                content=groq_response["content"],
-                type=request.practice_type or "definition",
-                word_id=word_id,
+        # Check if Groq service returned an error
+        if groq_response.get("error") in (
+            "groq_overloaded",
+            "groq_circuit_open",
+        ):
+            raise HTTPException(
+                status_code=503,
+                detail=groq_response["message"],
+                headers={"Retry-After": "5"},
+            )
+        if "error" in groq_response:
+            logger.error(f"Groq service error: {groq_response}")
+            raise HTTPException(
+                status_code=500,
+                detail=f"AI service error: {groq_response.get('message', 'Unknown error')}",
             )
 
-        except HTTPException:
-            # Re-raise HTTP exceptions (like 404, 500)
-            raise
-        except Exception as e:
-            logger.error(
-                f"Unexpected error generating practice content for word {word_id}: {e}"
+        await save_practice(
+            [word_data], practice_type, {word_id: groq_response["content"]}
+        )
+
+        # Return successful response
+        return PracticeResponse(
+            content=groq_response["content"],
+            type=practice_type,
+            word_id=word_id,
+        )
+
+    except HTTPException:
+        # Re-raise HTTP exceptions (like 404, 500)
+        raise
+    except Exception as e:
+        logger.error(
+            f"Unexpected error generating practice content for word {word_id}: {e}"
+        )
+        raise HTTPException(
+            status_code=500, detail="Failed to generate practice content"
+        ) from e
+
+
+@router.get("/{word_id}/practice/stream")
+async def stream_practice_content(
+    word_id: int,
+    practice_type: PracticeType = "definition",
+    db_cm: asynccontextmanager = Depends(get_db),
+):
+    """Stream AI-powered practice content for a word as server-sent events"""
+    async with db_cm as db:
+        result = await db.execute(
+            select(Word.id, Word.korean, Word.english).filter(
+                Word.id == word_id
             )
-            raise HTTPException(
-                status_code=500, detail="Failed to generate practice content"
-            ) from e
+        )
+        row = result.first()
+        if row is None:
+            raise HTTPException(status_code=404, detail="Word not found")
+        word = row._asdict()
+        stored = await load_practice(db, [word], practice_type)
+
+    return StreamingResponse(
+        practice_events(word, practice_type, stored.get(word_id)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
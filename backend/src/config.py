@@ -7,10 +7,88 @@ PROJECT_ROOT = Path(__file__).resolve().parent.parent
 # Database configurations
 SQLITE_DB_PATH = os.getenv("SQLITE_DB_PATH", "./data/hagxwon.db")
 print(f"Using database at: {SQLITE_DB_PATH}")
-VECTOR_DB_PATH = str(PROJECT_ROOT / "database" / "vector_store")
+VECTOR_DB_PATH = os.getenv(
+    "VECTOR_DB_PATH", str(PROJECT_ROOT / "database" / "vector_store")
+)
+VECTOR_INDEX_PATH = str(Path(VECTOR_DB_PATH) / "catalog.hxe")
+NGRAM_INDEX_PATH = os.getenv(
+    "NGRAM_INDEX_PATH", str(Path(SQLITE_DB_PATH).parent / "ngram_index.npz")
+)
+VOCAB_ARTIFACT_PATH = os.getenv(
+    "VOCAB_ARTIFACT_PATH", str(Path(SQLITE_DB_PATH).parent / "vocab.hxv")
+)
+# Replaced on every catalog write, so every worker sees every write by stat
+CATALOG_VERSION_PATH = os.getenv(
+    "CATALOG_VERSION_PATH",
+    str(Path(SQLITE_DB_PATH).parent / "catalog.version"),
+)
+
+# Write-behind queue for activity logs and mistakes
+WRITE_QUEUE_MAX_SIZE = int(os.getenv("WRITE_QUEUE_MAX_SIZE", "10000"))
+WRITE_QUEUE_BATCH_ROWS = int(os.getenv("WRITE_QUEUE_BATCH_ROWS", "500"))
+WRITE_QUEUE_FLUSH_MS = int(os.getenv("WRITE_QUEUE_FLUSH_MS", "20"))
+
+# Pre-built game rounds per (level, count, enhance) key
+ROUND_POOL_SIZE = int(os.getenv("ROUND_POOL_SIZE", "8"))
+ROUND_POOL_MAX_KEYS = int(os.getenv("ROUND_POOL_MAX_KEYS", "32"))
+ROUND_POOL_BUILDERS = int(os.getenv("ROUND_POOL_BUILDERS", "2"))
+
+# WebSocket game stream: items sent ahead of the learner, answer ack batching
+GAME_STREAM_PREFETCH = int(os.getenv("GAME_STREAM_PREFETCH", "3"))
+GAME_STREAM_MAX_PREFETCH = int(os.getenv("GAME_STREAM_MAX_PREFETCH", "20"))
+GAME_STREAM_ACK_BATCH = int(os.getenv("GAME_STREAM_ACK_BATCH", "5"))
+GAME_STREAM_ACK_MS = int(os.getenv("GAME_STREAM_ACK_MS", "500"))
+
+# Batched practice generation: completion budget per call, cached entries
+PRACTICE_BATCH_MAX_TOKENS = int(os.getenv("PRACTICE_BATCH_MAX_TOKENS", "4000"))
+PRACTICE_CACHE_SIZE = int(os.getenv("PRACTICE_CACHE_SIZE", "5000"))
+
+# Compiled answer keys kept for server-side grading
+ANSWER_KEY_CACHE_SIZE = int(os.getenv("ANSWER_KEY_CACHE_SIZE", "10000"))
+
+# Confusion mining: wrong inputs read per transaction
+CONFUSION_BATCH_SIZE = int(os.getenv("CONFUSION_BATCH_SIZE", "50000"))
+
+# Groq rate limits shared by all LLM calls, and how long each priority class
+# may queue for them before the call is shed
+GROQ_REQUESTS_PER_MINUTE = int(os.getenv("GROQ_REQUESTS_PER_MINUTE", "30"))
+GROQ_TOKENS_PER_MINUTE = int(os.getenv("GROQ_TOKENS_PER_MINUTE", "8000"))
+LLM_SLO_INTERACTIVE_MS = int(os.getenv("LLM_SLO_INTERACTIVE_MS", "3000"))
+LLM_SLO_PREFETCH_MS = int(os.getenv("LLM_SLO_PREFETCH_MS", "20000"))
+LLM_SLO_BATCH_MS = int(os.getenv("LLM_SLO_BATCH_MS", "120000"))
+
+# Groq endpoint; point at tools/fake_groq.py for offline load testing
+GROQ_BASE_URL = os.getenv("GROQ_BASE_URL") or None
+# Upstream calls in flight at once (worker threads for the blocking client)
+GROQ_MAX_CONCURRENCY = int(os.getenv("GROQ_MAX_CONCURRENCY", "32"))
+
+# Groq degradation handling: SDK timeout, circuit breaker, hedged retries
+# (a second attempt for interactive calls that opt in - short, deterministic
+# prompts - still running after the delay; 0, the default, disables it).
+# The latency SLO covers completions of up to GROQ_BREAKER_SLO_TOKENS and
+# grows in proportion for longer ones
+GROQ_TIMEOUT_S = float(os.getenv("GROQ_TIMEOUT_S", "20"))
+GROQ_BREAKER_FAILURES = int(os.getenv("GROQ_BREAKER_FAILURES", "5"))
+GROQ_BREAKER_LATENCY_SLO_MS = int(
+    os.getenv("GROQ_BREAKER_LATENCY_SLO_MS", "10000")
+)
+GROQ_BREAKER_SLO_TOKENS = int(os.getenv("GROQ_BREAKER_SLO_TOKENS", "300"))
+GROQ_BREAKER_RESET_S = float(os.getenv("GROQ_BREAKER_RESET_S", "30"))
+GROQ_HEDGE_AFTER_MS = int(os.getenv("GROQ_HEDGE_AFTER_MS", "0"))
+
+# Readiness: background probe of the database and Groq, cached between runs
+HEALTH_PROBE_INTERVAL_S = float(os.getenv("HEALTH_PROBE_INTERVAL_S", "30"))
+HEALTH_PROBE_TIMEOUT_S = float(os.getenv("HEALTH_PROBE_TIMEOUT_S", "5"))
+
+# Related-word index: "hashing" (no model needed) or "sentence-transformers"
+# (uses EMBEDDING_MODEL); IVF lists scanned per query
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "hashing")
+VECTOR_IVF_NPROBE = int(os.getenv("VECTOR_IVF_NPROBE", "8"))
 
 # Model configurations
-EMBEDDING_MODEL = "sentence-transformers/all-mpnet-base-v2"
+EMBEDDING_MODEL = os.getenv(
+    "EMBEDDING_MODEL", "sentence-transformers/all-mpnet-base-v2"
+)
 LLM_MODEL = "gpt-3.5-turbo"
 
 # Agent configurations
@@ -41,7 +41,20 @@ async def get_db():
         raise
 
 
+def _create_missing_indexes(conn) -> None:
+    """create_all skips tables that exist, and with them any index added
+    to the model later; create those here."""
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                index.create(conn, checkfirst=True)
+            except Exception as e:
+                # e.g. a new unique index over rows that violate it
+                logger.error(f"Could not create index {index.name}: {e}")
+
+
 # Database initialization
 async def init_db():
     async with engine.begin() as conn:
         await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.run_sync(_create_missing_indexes)
@@ -0,0 +1,102 @@
+"""
+Scoped database reset.
+
+Tables are dropped and recreated from the model metadata inside a single
+transaction instead of being emptied row by row, so a reset takes the same
+time whether history holds a hundred rows or a hundred million.
+"""
+
+import logging
+from enum import Enum
+from typing import List
+
+from sqlmodel import SQLModel
+
+from .. import models  # noqa: F401  (registers every table on the metadata)
+from ..database import engine
+from ..services.ngram_index import invalidate_ngram_index
+from ..services.sentence_index import invalidate_sentence_index
+from ..services.vector_index import invalidate_vector_index
+from ..services.vocab_artifact import invalidate_vocab_artifact
+
+logger = logging.getLogger(__name__)
+
+
+# The word catalog, rebuilt from the seed files (plus content generated
+# from it, which would point at the wrong words after a reseed)
+CATALOG_TABLES = [
+    "words",
+    "word_groups",
+    "word_group_map",
+    "sample_sentences",
+    "practice_contents",
+]
+
+# Everything a learner produces while studying or playing
+HISTORY_TABLES = [
+    "study_sessions",
+    "session_stats",
+    "session_words_shown",
+    "activity_logs",
+    "word_stats",
+    "wrong_inputs",
+    "word_review_items",
+    "word_review_schedules",
+    "game_sessions",
+    "game_results",
+    "game_items",
+    "leaderboard_entries",
+    "word_latency",
+    "word_confusions",
+    "job_watermarks",  # Only the confusion job's, which follows wrong_inputs
+]
+
+
+class ResetScope(str, Enum):
+    CATALOG = "catalog"
+    HISTORY = "history"
+    ALL = "all"
+
+
+def tables_for_scope(scope: ResetScope) -> List[str]:
+    if scope == ResetScope.CATALOG:
+        return list(CATALOG_TABLES)
+    if scope == ResetScope.HISTORY:
+        return list(HISTORY_TABLES)
+    return CATALOG_TABLES + HISTORY_TABLES
+
+
+async def reset_tables(scope: ResetScope) -> List[str]:
+    """Drop and recreate the tables in ``scope`` in one transaction.
+
+    Resetting only the catalog keeps learner history in place; history rows
+    keep their word ids, which line up again once the same seed files are
+    reloaded (ids restart from 1 in seed order).
+
+    Returns:
+        Names of the tables that were reset
+    """
+    names = tables_for_scope(scope)
+    tables = [SQLModel.metadata.tables[name] for name in names]
+
+    async with engine.connect() as conn:
+        # pysqlite only opens transactions before DML, so under a plain
+        # engine.begin() every DROP and CREATE commits on its own and a
+        # failed create_all loses tables; open the transaction ourselves
+        await conn.exec_driver_sql("BEGIN IMMEDIATE")
+        try:
+            await conn.run_sync(SQLModel.metadata.drop_all, tables=tables)
+            await conn.run_sync(SQLModel.metadata.create_all, tables=tables)
+        except BaseException:
+            await conn.rollback()
+            raise
+        await conn.commit()
+
+    if scope != ResetScope.HISTORY:
+        invalidate_vocab_artifact()
+        invalidate_vector_index()
+        invalidate_sentence_index()
+        invalidate_ngram_index()
+
+    logger.info(f"Reset {scope.value} tables: {', '.join(names)}")
+    return names
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -5,6 +6,11 @@ from ...database import get_db
 from .words import load_words
 from .sentences import load_sentences
 from .groups import load_groups
+from .romanization import backfill_romanization
+from ...services.vocab_artifact import invalidate_vocab_artifact
+from ...services.vector_index import invalidate_vector_index
+from ...services.ngram_index import build_ngram_index
+from ...services.sentence_index import invalidate_sentence_index
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +26,11 @@ async def seed_all():
             await load_words(db)
             await load_sentences(db)
             await load_groups(db)
+            await backfill_romanization(db)
+            invalidate_vocab_artifact()
+            invalidate_vector_index()
+            invalidate_sentence_index()
+            await asyncio.to_thread(build_ngram_index)
 
             duration = (datetime.now() - start_time).total_seconds()
             logger.info(f"Seeding completed in {duration:.2f} seconds")
@@ -28,4 +39,10 @@ async def seed_all():
             raise
 
 
-__all__ = ["load_words", "load_sentences", "load_groups", "seed_all"]
+__all__ = [
+    "load_words",
+    "load_sentences",
+    "load_groups",
+    "backfill_romanization",
+    "seed_all",
+]
@@ -1,30 +1,98 @@
-import json
 from datetime import datetime
+from typing import Any, Dict, Iterator, Tuple
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.sql import func
+from tools.romanize import romanize
 from ...models.group import WordGroup
 from ...models.word import Word, word_group_map
+from .stream import (
+    SEED_BATCH_SIZE,
+    batched,
+    is_ndjson,
+    iter_json_object,
+    iter_ndjson,
+)
+
+
+def iter_groups(db_path: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Stream (group_name, group_info) pairs from a groups seed file.
+
+    JSON files use the ``{"groups": {name: info}}`` layout; NDJSON files hold
+    one group per line with the name under ``"name"``.
+    """
+    with open(db_path, "r", encoding="utf-8") as f:
+        if is_ndjson(db_path):
+            for group_info in iter_ndjson(f):
+                yield group_info.pop("name"), group_info
+        else:
+            yield from iter_json_object(f, ("groups",))
+
+
+async def _resolve_word_ids(
+    db: AsyncSession, group_name: str, word_objs: list
+) -> list:
+    """Map a batch of group words to word ids, inserting missing words"""
+    valid = []
+    for word_obj in word_objs:
+        if not word_obj.get("hangul") or not word_obj.get("english"):
+            print(f"⚠️ Skipping invalid word: {word_obj}")
+            continue
+        valid.append(word_obj)
+    if not valid:
+        return []
+
+    hanguls = {word_obj["hangul"] for word_obj in valid}
+    lookup_query = (
+        select(Word.korean, func.min(Word.id))
+        .where(Word.korean.in_(hanguls))
+        .group_by(Word.korean)
+    )
+    word_lookup = dict((await db.execute(lookup_query)).all())
+
+    # Insert missing words
+    missing = {}
+    for word_obj in valid:
+        hangul = word_obj["hangul"]
+        if hangul in word_lookup or hangul in missing:
+            continue
+        english = word_obj["english"]
+        missing[hangul] = {
+            "korean": hangul,
+            "english": (
+                ", ".join(english)
+                if isinstance(english, list)
+                else str(english)
+            ),
+            "part_of_speech": "noun",
+            "romanization": word_obj.get("romanization") or romanize(hangul),
+            "source_type": "group_generated",
+            "source_details": f"auto from group: {group_name}",
+            "added_by_agent": "seed_script",
+            "created_at": datetime.utcnow(),
+        }
+    if missing:
+        await db.execute(insert(Word), list(missing.values()))
+        word_lookup.update((await db.execute(lookup_query)).all())
+
+    return [word_lookup[word_obj["hangul"]] for word_obj in valid]
 
 
 async def load_groups(
-    db: AsyncSession, db_path: str = "assets/data/processed/word_groups.json"
+    db: AsyncSession,
+    db_path: str = "assets/data/processed/word_groups.json",
+    batch_size: int = SEED_BATCH_SIZE,
 ) -> None:
     """Seed database with word groups and their word associations"""
     try:
         print("\n🌱 Loading word groups...")
         start_time = datetime.now()
 
-        with open(db_path, "r", encoding="utf-8") as f:
-            groups_data = json.load(f)
-
-        # Load all existing words (map: korean -> Word object)
-        existing_words = await db.execute(select(Word))
-        word_lookup = {word.korean: word for word in existing_words.scalars()}
-
         group_count = 0
         link_count = 0
 
-        for group_name, group_info in groups_data["groups"].items():
+        for group_name, group_info in iter_groups(db_path):
             db_group = WordGroup(
                 name=group_name,
                 description=group_info.get("description"),
@@ -34,46 +102,18 @@ async def load_groups(
             db.add(db_group)
             await db.flush()
 
-            word_ids = []
-            for word_obj in group_info.get("words", []):
-                hangul = word_obj.get("hangul")
-                english = word_obj.get("english")
-                romanization = word_obj.get("romanization")
-
-                if not hangul or not english:
-                    print(f"⚠️ Skipping invalid word: {word_obj}")
-                    continue
-
-                # Insert missing words
-                if hangul not in word_lookup:
-                    new_word = Word(
-                        korean=hangul,
-                        english=(
-                            ", ".join(english)
-                            if isinstance(english, list)
-                            else str(english)
-                        ),
-                        part_of_speech="noun",
-                        romanization=romanization,
-                        source_type="group_generated",
-                        source_details=f"auto from group: {group_name}",
-                        added_by_agent="seed_script",
-                        created_at=datetime.utcnow(),
-                    )
-                    db.add(new_word)
-                    await db.flush()
-                    word_lookup[hangul] = new_word
-
-                word_ids.append(word_lookup[hangul].id)
-
-            if word_ids:
-                values = [
-                    {"word_id": wid, "group_id": db_group.id}
-                    for wid in word_ids
-                ]
-                await db.execute(word_group_map.insert(), values)
-                link_count += len(word_ids)
+            for word_batch in batched(group_info.get("words", []), batch_size):
+                word_ids = await _resolve_word_ids(db, group_name, word_batch)
+                if word_ids:
+                    values = [
+                        {"word_id": wid, "group_id": db_group.id}
+                        for wid in word_ids
+                    ]
+                    await db.execute(word_group_map.insert(), values)
+                    link_count += len(word_ids)
 
+            # Keep the identity map from growing with the number of groups
+            db.expunge(db_group)
             group_count += 1
 
         await db.commit()
@@ -0,0 +1,35 @@
+from sqlalchemy import or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from tools.romanize import romanize
+from ...models.word import Word
+
+
+async def backfill_romanization(
+    db: AsyncSession, overwrite: bool = False
+) -> int:
+    """Fill in romanization for words that have none.
+
+    Uses the Revised Romanization tables in tools/romanize.py, so it needs
+    no LLM and takes well under a second for the whole catalog. With
+    ``overwrite`` every word is regenerated. The caller invalidates derived
+    indexes when anything changed.
+
+    Returns:
+        Number of words updated
+    """
+    query = select(Word.id, Word.korean)
+    if not overwrite:
+        query = query.where(
+            or_(Word.romanization.is_(None), Word.romanization == "")
+        )
+    rows = [
+        {"id": word_id, "romanization": romanize(korean)}
+        for word_id, korean in (await db.execute(query)).all()
+    ]
+    if rows:
+        # Bulk UPDATE by primary key: one executemany
+        await db.execute(update(Word), rows)
+        await db.commit()
+    print(f"Backfilled romanization for {len(rows)} words")
+    return len(rows)
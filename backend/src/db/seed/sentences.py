@@ -1,32 +1,36 @@
-import json
 from datetime import datetime
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from ...models.sample_sentence import SampleSentence
+from .stream import SEED_BATCH_SIZE, batched, iter_records
 
 
 async def load_sentences(
     db: AsyncSession,
     db_path: str = "assets/data/processed/korean_sentences_2000.json",
+    batch_size: int = SEED_BATCH_SIZE,
 ) -> None:
-    """Seed database with sample sentences"""
+    """Seed database with sample sentences, streaming the file in batches"""
     try:
         print("\nLoading sample sentences...")
         start_time = datetime.now()
 
-        with open(db_path, "r", encoding="utf-8") as f:
-            sentences_data = json.load(f)
-
-        for item in sentences_data:
-            sentence = SampleSentence(
-                word_id=item["word_id"],
-                sentence_korean=item["example_kr"],
-                sentence_english=item["example_en"],
-            )
-            db.add(sentence)
+        total = 0
+        for batch in batched(iter_records(db_path), batch_size):
+            rows = [
+                {
+                    "word_id": item["word_id"],
+                    "sentence_korean": item["example_kr"],
+                    "sentence_english": item["example_en"],
+                }
+                for item in batch
+            ]
+            await db.execute(insert(SampleSentence), rows)
+            total += len(rows)
         await db.commit()
 
         end_time = datetime.now()
-        print(f"Successfully loaded {len(sentences_data)} sentences")
+        print(f"Successfully loaded {total} sentences")
         print(
             f"Duration: {(end_time - start_time).total_seconds():.2f} seconds"
         )
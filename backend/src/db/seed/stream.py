@@ -0,0 +1,232 @@
+"""
+Incremental readers for seed files.
+
+Seed files can be either a regular JSON document or NDJSON (one record per
+line, ``.ndjson`` / ``.jsonl``). JSON documents are read through a sliding buffer,
+so only one record is held in memory at a time no matter how large the file
+is. Each value is scanned once - bracket depth and string state carry over
+from one chunk to the next - and handed to ``json.JSONDecoder.raw_decode``
+only when it is complete, so a value spanning many chunks costs linear time.
+"""
+
+import json
+import re
+from itertools import islice
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Sequence, TextIO, Tuple
+
+# Records per INSERT batch when seeding
+SEED_BATCH_SIZE = 500
+
+NDJSON_SUFFIXES = {".ndjson", ".jsonl"}
+
+_CHUNK_SIZE = 64 * 1024
+_WHITESPACE = " \t\r\n"
+
+# Characters that can end the value being scanned, by scanner state
+_STRUCTURE = re.compile(r'[\[\]{}"]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+_SCALAR_END = re.compile(r"[\s,:\]}]")
+
+
+class _JsonStream:
+    """Sliding-window tokenizer over a text file object."""
+
+    def __init__(self, fp: TextIO, chunk_size: int = _CHUNK_SIZE):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+        # Scanner state for the value being read; see _value_end
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._scalar = False
+
+    def _read(self) -> str:
+        if self.eof:
+            return ""
+        chunk = self.fp.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+        return chunk
+
+    def _fill(self) -> bool:
+        """Read another chunk, dropping the consumed prefix of the buffer."""
+        chunk = self._read()
+        if not chunk:
+            return False
+        self.buf = self.buf[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(
+                f"Expected {char!r} in seed file, found {found or 'EOF'!r}"
+            )
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        first = self.peek()
+        self._depth = 0
+        self._in_string = self._escaped = False
+        # A number can decode "successfully" from a truncated buffer, so
+        # scalars run to the next delimiter
+        self._scalar = first not in '[{"'
+        if self._value_end(self.buf, self.pos) < 0:
+            # Collect chunks until the value ends and join them once
+            parts = [self.buf[self.pos :]]
+            while True:
+                chunk = self._read()
+                if not chunk:
+                    break  # Truncated; raw_decode reports where
+                parts.append(chunk)
+                if self._value_end(chunk, 0) >= 0:
+                    break
+            self.buf = "".join(parts)
+            self.pos = 0
+        obj, self.pos = self.decoder.raw_decode(self.buf, self.pos)
+        return obj
+
+    def _value_end(self, text: str, i: int) -> int:
+        """Index in ``text`` just past the value being scanned, or -1.
+
+        Scans from ``i`` for the character that closes the value; when
+        ``text`` runs out first, the state is kept so the next chunk
+        carries on where this one stopped.
+        """
+        if self._scalar:
+            match = _SCALAR_END.search(text, i)
+            return match.start() if match else -1
+        while True:
+            if self._escaped:
+                if i >= len(text):
+                    return -1
+                i += 1
+                self._escaped = False
+            pattern = _STRING_SPECIAL if self._in_string else _STRUCTURE
+            match = pattern.search(text, i)
+            if not match:
+                return -1
+            i = match.end()
+            char = match.group()
+            if char == "\\":
+                self._escaped = True
+            elif char == '"':
+                self._in_string = not self._in_string
+                if not self._in_string and self._depth == 0:
+                    return i
+            elif char in "[{":
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if self._depth <= 0:
+                    return i
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        """Yield the key/value pairs of the object at the cursor."""
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key, self.value()
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+            self.expect("}")
+            return
+
+    def elements(self) -> Iterator[Any]:
+        """Yield the elements of the array at the cursor."""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+            self.expect("]")
+            return
+
+    def descend(self, key: str) -> None:
+        """Move the cursor to the value of ``key`` in the current object."""
+        self.expect("{")
+        while self.peek() != "}":
+            current = self.value()
+            self.expect(":")
+            if current == key:
+                return
+            self.value()  # skip sibling value
+            if self.peek() == ",":
+                self.pos += 1
+        raise KeyError(f"Key {key!r} not found in seed file")
+
+
+def iter_json_array(fp: TextIO, path: Sequence[str] = ()) -> Iterator[Any]:
+    """Yield elements of the JSON array found at ``path`` one at a time."""
+    stream = _JsonStream(fp)
+    for key in path:
+        stream.descend(key)
+    yield from stream.elements()
+
+
+def iter_json_object(
+    fp: TextIO, path: Sequence[str] = ()
+) -> Iterator[Tuple[str, Any]]:
+    """Yield (key, value) pairs of the JSON object found at ``path``."""
+    stream = _JsonStream(fp)
+    for key in path:
+        stream.descend(key)
+    yield from stream.items()
+
+
+def iter_ndjson(fp: TextIO) -> Iterator[Any]:
+    """Yield one record per non-empty line."""
+    for line in fp:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def is_ndjson(path: str | Path) -> bool:
+    return Path(path).suffix.lower() in NDJSON_SUFFIXES
+
+
+def iter_records(path: str | Path) -> Iterator[Any]:
+    """Stream records from a JSON array file or an NDJSON file."""
+    with open(path, "r", encoding="utf-8") as f:
+        if is_ndjson(path):
+            yield from iter_ndjson(f)
+        else:
+            yield from iter_json_array(f)
+
+
+def batched(records: Iterable[Any], size: int = SEED_BATCH_SIZE) -> Iterator[List[Any]]:
+    """Group an iterable into lists of at most ``size`` items."""
+    it = iter(records)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
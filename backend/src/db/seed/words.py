@@ -1,33 +1,38 @@
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from tools.romanize import romanize
 from ...models.word import Word
+from .stream import SEED_BATCH_SIZE, batched, iter_records
 
 
-async def load_words(db: AsyncSession) -> None:
-    """Seed database with initial words"""
-    from pathlib import Path
-    import json
-
-    word_data_path = Path("assets/data/processed/korean_words_2000.json")
-
+async def load_words(
+    db: AsyncSession,
+    db_path: str = "assets/data/processed/korean_words_2000.json",
+    batch_size: int = SEED_BATCH_SIZE,
+) -> None:
+    """Seed database with initial words, streaming the file in batches"""
     try:
-        with open(word_data_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        for item in data:
+        total = 0
+        for batch in batched(iter_records(db_path), batch_size):
             # Convert raw JSON data to expected schema
-            word = Word(
-                korean=item.get("word", ""),  # Use "word" field from JSON
-                english=item.get("meaning", ""),
-                part_of_speech=item.get("pos"),  # Use "pos" field from JSON
-                romanization=item.get("romanization"),
-                topik_level=item.get("topik_level"),
-                source_type="initial_seed",
-                source_details="korean_words_2000.json",
-            )
-            db.add(word)
+            rows = [
+                {
+                    "korean": item.get("word", ""),  # "word" field from JSON
+                    "english": item.get("meaning", ""),
+                    "part_of_speech": item.get("pos"),  # "pos" field
+                    "romanization": item.get("romanization")
+                    or romanize(item.get("word", "")),
+                    "topik_level": item.get("topik_level"),
+                    "source_type": "initial_seed",
+                    "source_details": "korean_words_2000.json",
+                }
+                for item in batch
+            ]
+            await db.execute(insert(Word), rows)
+            total += len(rows)
 
         await db.commit()
-        print(f"Successfully seeded {len(data)} words")
+        print(f"Successfully seeded {total} words")
 
     except Exception as e:
         print(f"Error seeding words: {str(e)}")
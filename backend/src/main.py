@@ -1,4 +1,5 @@
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.sql import select
 
@@ -15,7 +16,12 @@ from .api.routes.game import router as game_router
 from .database import init_db, async_session_factory, get_db
 from .models.word import Word
 from .db.seed import seed_all  # Import the seeding function
-from .services.groq_service import groq_service
+from .services.health import health_monitor
+from .services.ngram_index import get_ngram_index
+from .services.sentence_index import get_sentence_index
+from .services.round_pool import round_pool
+from .services.write_queue import write_queue
+import asyncio
 import os
 import logging  # Import logging
 from dotenv import load_dotenv
@@ -64,34 +70,34 @@ async def list_routes():
     ]
 
 
+@app.get("/health/live")
+async def liveness():
+    """The process is up and serving requests; touches no dependency."""
+    return {"status": "alive"}
+
+
+@app.get("/health/ready")
+async def readiness():
+    """Cached dependency status from the background health probe."""
+    status = await health_monitor.status()
+    return JSONResponse(
+        status_code=200 if status["ready"] else 503, content=status
+    )
+
+
 @app.get("/health")
 async def health_check():
-    """Enhanced health check with database and Groq API validation."""
-    health_status = {"status": "healthy", "database": "ok", "groq_api": "ok"}
-
-    # Check database connection
-    try:
-        async with async_session_factory() as db:
-            # Try a simple query to verify database connectivity
-            result = await db.execute(select(Word).limit(1))
-            result.scalar_one_or_none()  # This will raise if DB is not accessible
-    except Exception as e:
-        logger.error(f"Database health check failed: {e}")
-        health_status["database"] = "error"
-        health_status["status"] = "unhealthy"
-
-    # Check Groq API connectivity
-    try:
-        groq_test_result = await groq_service.test_connection()
-        if "error" in groq_test_result:
-            health_status["groq_api"] = "error"
-            health_status["status"] = "unhealthy"
-    except Exception as e:
-        logger.error(f"Groq API health check failed: {e}")
-        health_status["groq_api"] = "error"
-        health_status["status"] = "unhealthy"
-
-    return health_status
+    """Database and Groq API status (cached; see /health/ready)."""
+    status = await health_monitor.status()
+    healthy = status.get("database") == "ok" and status.get("groq_api") in (
+        "ok",
+        "degraded",
+    )
+    return {
+        "status": "healthy" if healthy else "unhealthy",
+        "database": status.get("database", "unknown"),
+        "groq_api": status.get("groq_api", "unknown"),
+    }
 
 
 @app.on_event("startup")
@@ -100,6 +106,7 @@ async def startup_event():
     logger.info("Initializing database...")
     await init_db()
     logger.info("Database initialization check complete.")
+    await write_queue.start()
 
     # Check if seeding is needed
     async with async_session_factory() as db:
@@ -134,3 +141,22 @@ async def startup_event():
             )
             # Decide if the app should fail to start on other DB errors
             # raise e
+
+    # Load (or build) the n-gram and sentence indexes off the event loop
+    for load_index in (get_ngram_index, get_sentence_index):
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, load_index)
+        except Exception as e:
+            logger.error(f"Failed to load {load_index.__name__}: {e}")
+
+    # Keep default rounds ready before the first request
+    await round_pool.start(warm=[(None, 10, False)])
+    await health_monitor.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop probes and round refills, flush queued writes before exiting"""
+    await health_monitor.stop()
+    await round_pool.stop()
+    await write_queue.stop()
@@ -15,6 +15,11 @@ from .game_session import GameSession
 from .game_result import GameResult
 from .game_item import GameItem
 from .word_review_schedule import WordReviewSchedule
+from .leaderboard_entry import LeaderboardEntry
+from .word_latency import WordLatency
+from .practice_content import PracticeContent
+from .word_confusion import WordConfusion
+from .job_watermark import JobWatermark
 
 # Update export order
 __all__ = [
@@ -32,4 +37,9 @@ __all__ = [
     "GameResult",
     "GameItem",
     "WordReviewSchedule",
+    "LeaderboardEntry",
+    "WordLatency",
+    "PracticeContent",
+    "WordConfusion",
+    "JobWatermark",
 ]
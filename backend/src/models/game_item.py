@@ -10,7 +10,9 @@ class GameItem(SQLModel, table=True):
     __tablename__ = "game_items"
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    session_id: int = Field(foreign_key="game_sessions.id", nullable=False)
+    session_id: int = Field(
+        foreign_key="game_sessions.id", nullable=False, index=True
+    )
     word_id: int = Field(foreign_key="words.id", nullable=False)
     correct: bool = Field(nullable=False)
     time_ms: int = Field(nullable=False)  # time taken in milliseconds
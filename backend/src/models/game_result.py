@@ -10,7 +10,13 @@ class GameResult(SQLModel, table=True):
     __tablename__ = "game_results"
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    session_id: int = Field(foreign_key="game_sessions.id", nullable=False)
+    # One result per session: a game is scored once
+    session_id: int = Field(
+        foreign_key="game_sessions.id",
+        nullable=False,
+        index=True,
+        unique=True,
+    )
     total: int = Field(nullable=False)
     correct: int = Field(nullable=False)
     accuracy: float = Field(nullable=False)  # percentage 0-100
@@ -0,0 +1,12 @@
+from sqlmodel import SQLModel, Field
+from datetime import datetime
+
+
+class JobWatermark(SQLModel, table=True):
+    """Highest source row id a batch job has processed"""
+
+    __tablename__ = "job_watermarks"
+
+    name: str = Field(primary_key=True)
+    last_id: int = Field(default=0)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
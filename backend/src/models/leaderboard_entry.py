@@ -0,0 +1,35 @@
+from sqlmodel import SQLModel, Field, Index
+from datetime import datetime
+from typing import Optional
+
+
+class LeaderboardEntry(SQLModel, table=True):
+    __tablename__ = "leaderboard_entries"
+    __table_args__ = (
+        # Serves top-K scans and rank counts for one board without sorting
+        Index(
+            "ix_leaderboard_board_score",
+            "mode",
+            "time_window",
+            "period_key",
+            "score",
+        ),
+        # A session is on each window's board once
+        Index(
+            "ux_leaderboard_session_window",
+            "session_id",
+            "time_window",
+            unique=True,
+        ),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    session_id: int = Field(
+        foreign_key="game_sessions.id", nullable=False, index=True
+    )
+    mode: str = Field(nullable=False)
+    time_window: str = Field(nullable=False)  # "daily", "weekly", "all_time"
+    period_key: str = Field(nullable=False)  # "2025-05-05", "2025-W19", "all"
+    score: int = Field(nullable=False)
+    accuracy: float = Field(nullable=False)
+    ended_at: datetime = Field(nullable=False)
@@ -0,0 +1,23 @@
+from sqlmodel import SQLModel, Field, UniqueConstraint
+from datetime import datetime
+from typing import Optional
+
+
+class PracticeContent(SQLModel, table=True):
+    __tablename__ = "practice_contents"
+    __table_args__ = (
+        UniqueConstraint(
+            "word_id", "practice_type", name="uq_practice_word_type"
+        ),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    word_id: int = Field(foreign_key="words.id", nullable=False)
+    practice_type: str = Field(nullable=False)
+    # The word as generated from; content is stale once either changes
+    korean: str = Field(nullable=False)
+    english: str = Field(nullable=False)
+    content: str = Field(nullable=False)
+    first_token_ms: Optional[float] = None
+    total_ms: Optional[float] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
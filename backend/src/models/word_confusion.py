@@ -0,0 +1,15 @@
+from sqlmodel import SQLModel, Field
+from datetime import datetime
+
+
+class WordConfusion(SQLModel, table=True):
+    __tablename__ = "word_confusions"
+    # Keyed on the pair and stored without a rowid: one B-tree, no extra
+    # index for the (word_id, ...) lookups the route makes
+    __table_args__ = {"sqlite_with_rowid": False}
+
+    word_id: int = Field(foreign_key="words.id", primary_key=True)
+    # The other word the wrong answer actually named
+    confused_with_id: int = Field(foreign_key="words.id", primary_key=True)
+    count: int = Field(default=0)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
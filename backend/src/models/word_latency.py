@@ -0,0 +1,19 @@
+from sqlmodel import SQLModel, Field
+from datetime import datetime
+from typing import Optional
+
+
+class WordLatency(SQLModel, table=True):
+    __tablename__ = "word_latency"
+
+    word_id: int = Field(foreign_key="words.id", primary_key=True)
+    count: int = Field(default=0)
+    correct_count: int = Field(default=0)
+    total_ms: int = Field(default=0)
+    min_ms: Optional[int] = None
+    max_ms: Optional[int] = None
+    # Quantiles cached from the sketch so reads and rankings skip decoding
+    p50_ms: Optional[float] = None
+    p90_ms: Optional[float] = Field(default=None, index=True)
+    sketch: Optional[bytes] = None  # serialized tools.latency_sketch
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -1,6 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 
 class GameSessionCreate(BaseModel):
@@ -41,6 +41,53 @@ class GameRoundItem(BaseModel):
     distractors: Optional[List[str]] = None
 
 
+class GameStreamAnswer(BaseModel):
+    """An answer sent over the game WebSocket
+
+    Send the typed ``input_text`` to have the server grade it, or
+    ``correct`` when the client already decided (e.g. multiple choice).
+    """
+
+    seq: int
+    word_id: int
+    correct: Optional[bool] = None
+    input_text: Optional[str] = Field(default=None, max_length=200)
+    time_ms: int = Field(ge=0)
+
+    @model_validator(mode="after")
+    def check_graded(self):
+        if self.correct is None and self.input_text is None:
+            raise ValueError("Either correct or input_text is required")
+        return self
+
+
+GradeTarget = Literal["any", "korean", "english", "romanization"]
+
+
+class GradeItem(BaseModel):
+    word_id: int
+    input_text: str = Field(max_length=200)
+
+
+class GradeRequest(BaseModel):
+    items: List[GradeItem] = Field(min_length=1, max_length=500)
+    expected: GradeTarget = "any"
+
+
+class GradeResult(BaseModel):
+    word_id: int
+    input_text: str
+    verdict: str = Field(description="correct, near_miss or wrong")
+    correct: bool = Field(description="Whether it counts (near misses do)")
+    distance: int = Field(description="Edits to the closest answer")
+    target: str = Field(description="korean, english or romanization")
+    matched: str = Field(description="The closest accepted answer")
+    similarity: float
+    reason: Optional[str] = Field(
+        default=None, description="Near misses: spacing, jamo or spelling"
+    )
+
+
 class GameRoundResponse(BaseModel):
     items: List[GameRoundItem]
     count: int
@@ -59,3 +106,27 @@ class GameStatsItem(BaseModel):
 class GameStatsResponse(BaseModel):
     sessions: List[GameStatsItem]
     total_sessions: int
+
+
+class LeaderboardEntryItem(BaseModel):
+    rank: int
+    session_id: int
+    score: int
+    accuracy: float
+    ended_at: datetime
+
+
+class LeaderboardResponse(BaseModel):
+    mode: str
+    window: str
+    period: str
+    entries: List[LeaderboardEntryItem]
+
+
+class LeaderboardRankResponse(BaseModel):
+    session_id: int
+    mode: str
+    window: str
+    period: str
+    rank: int
+    score: int
@@ -1,7 +1,7 @@
 from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime
-from .word import WordResponse
+from .word import PracticeResponse, WordResponse
 
 
 class WordGroupBase(BaseModel):
@@ -31,3 +31,10 @@ class WordGroupResponse(WordGroupBase):
 
     class Config:
         from_attributes = True
+
+
+class GroupPracticeResponse(BaseModel):
+    group_id: int
+    type: str
+    items: List[PracticeResponse]
+    failed_word_ids: List[int] = []
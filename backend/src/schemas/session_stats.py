@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
 
@@ -27,3 +27,18 @@ class SessionStatsResponse(SessionStatsBase):
 
 # Note: The error was from trying to import SessionStatsUpdate which wasn't needed
 # We'll use SessionStatsBase for updates instead
+
+
+class SessionStatsIncrement(BaseModel):
+    """Deltas to add to a session's running totals"""
+
+    shown: int = Field(default=0, ge=0)
+    correct: int = Field(default=0, ge=0)
+
+
+class SessionStatsCounters(BaseModel):
+    session_id: int
+    total_shown: int
+    total_correct: int
+    accuracy: float
+    level: int
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import List, Literal, Optional
 from datetime import datetime
 
 
@@ -26,6 +26,10 @@ class WordResponse(WordBase):
         from_attributes = True
 
 
+class RelatedWordResponse(WordResponse):
+    score: float = Field(description="Cosine similarity to the word")
+
+
 class WordUpdate(WordBase):
     korean: Optional[str] = None
     english: Optional[str] = None
@@ -37,8 +41,12 @@ class WordUpdate(WordBase):
     added_by_agent: Optional[str] = None
 
 
+# Kinds of practice content there is a prompt for
+PracticeType = Literal["definition", "example", "quiz"]
+
+
 class PracticeRequest(BaseModel):
-    practice_type: Optional[str] = Field(
+    practice_type: Optional[PracticeType] = Field(
         default="definition",
         description="Type of practice content to generate",
     )
@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import Optional
+
+
+class WordLatencyResponse(BaseModel):
+    word_id: int
+    count: int
+    correct_count: int
+    accuracy: float  # percentage 0-100
+    mean_ms: Optional[float] = None
+    p50_ms: Optional[float] = None
+    p90_ms: Optional[float] = None
+    min_ms: Optional[int] = None
+    max_ms: Optional[int] = None
+
+
+class SlowWordResponse(WordLatencyResponse):
+    korean: str
+    english: str
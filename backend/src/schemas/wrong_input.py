@@ -1,5 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
+from typing import Optional
 
 
 class WrongInputBase(BaseModel):
@@ -14,6 +15,18 @@ class WrongInputCreate(WrongInputBase):
 class WrongInputResponse(WrongInputBase):
     id: int
     timestamp: datetime
+    # How far the input was from the word, when graded on logging
+    verdict: Optional[str] = None
+    distance: Optional[int] = None
 
     class Config:
         orm_mode = True
+
+
+class ConfusionResponse(BaseModel):
+    """Another word learners answered with when asked for this one"""
+
+    word_id: int = Field(description="The word the answers named")
+    korean: str
+    english: str
+    count: int = Field(description="Wrong answers that named it")
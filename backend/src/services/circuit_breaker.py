@@ -0,0 +1,119 @@
+"""
+Circuit breaker for the Groq integration.
+
+While Groq is failing or crawling, waiting out each call only to fall back
+afterwards makes every enhanced round and practice request slow. The
+breaker counts consecutive failures - errors, and successes that took
+longer than the latency SLO - and after ``failure_threshold`` of them
+opens: calls are refused at once so callers serve their fallback
+immediately. After ``reset_timeout_s`` it lets a single probe call through
+(half-open); the probe's outcome closes the breaker or opens it again.
+"""
+
+import time
+from typing import Dict, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker with a single half-open probe"""
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        latency_slo_ms: float,
+        reset_timeout_s: float,
+    ):
+        self.failure_threshold = failure_threshold
+        self.latency_slo_ms = latency_slo_ms
+        self.reset_timeout_s = reset_timeout_s
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+        self.opened = 0
+        self.rejected = 0
+        self.slow_calls = 0
+
+    @property
+    def state(self) -> str:
+        if (
+            self._state == OPEN
+            and time.monotonic() - self._opened_at >= self.reset_timeout_s
+        ):
+            self._state = HALF_OPEN
+            self._probing = False
+        return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go upstream now.
+
+        Every allowed call must end in record_success, record_failure or
+        abandon.
+        """
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(
+        self,
+        latency_ms: float,
+        check_latency: bool = True,
+        slo_ms: Optional[float] = None,
+    ) -> None:
+        """A call returned; too slow still counts against the upstream.
+
+        ``slo_ms`` replaces ``latency_slo_ms`` for calls expected to take
+        longer, such as long generations.
+        """
+        if slo_ms is None:
+            slo_ms = self.latency_slo_ms
+        if check_latency and latency_ms > slo_ms:
+            self.slow_calls += 1
+            self.record_failure()
+            return
+        self._probing = False
+        self._failures = 0
+        self._state = CLOSED
+
+    def record_failure(self) -> None:
+        self._probing = False
+        self._failures += 1
+        if (
+            self._state == HALF_OPEN
+            or self._failures >= self.failure_threshold
+        ):
+            if self._state != OPEN:
+                self.opened += 1
+            self._state = OPEN
+            self._opened_at = time.monotonic()
+
+    def abandon(self) -> None:
+        """An allowed call never went upstream (e.g. it was shed)."""
+        self._probing = False
+
+    def retry_after(self) -> Optional[float]:
+        """Seconds until the next probe, while open."""
+        if self.state != OPEN:
+            return None
+        return max(
+            0.0, self.reset_timeout_s - (time.monotonic() - self._opened_at)
+        )
+
+    def metrics(self) -> Dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+            "slow_calls": self.slow_calls,
+        }
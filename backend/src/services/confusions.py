@@ -0,0 +1,206 @@
+"""
+Confusion-pair mining over wrong inputs.
+
+A wrong answer is often the right answer to a different word: 눈 typed for
+"snow" when "eye" was asked, or "ginseng" for 인상. The job below reads
+``wrong_inputs`` past its watermark in batches, groups identical answers per
+word, and maps each group to the other catalog word it names - first with a
+hash map of every accepted answer, then by jamo-level edit distance against
+the closest words by spelling from the n-gram index. Counts accumulate in
+``word_confusions`` and the watermark advances in the same transaction, so
+the job can be stopped and rerun at any point and only reads new rows.
+Runs may overlap - the admin endpoint and the cron script - so each batch
+rechecks the watermark under SQLite's write lock before counting, and a
+batch another run already counted is dropped.
+
+Unlike the request handlers this uses a plain ``sqlite3`` connection: the
+job runs from a script and from an executor thread, off the event loop,
+and needs explicit ``BEGIN IMMEDIATE`` transactions, which the async
+session doesn't give.
+
+Answers that are near misses of the word that was asked are typos, not
+confusions, and are skipped - unless they are exactly another word (인상 for
+인삼 is one jamo off, but it is a different word).
+"""
+
+import logging
+import sqlite3
+from collections import Counter, OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from tools.grading import AnswerKey, normalize
+from ..config import CONFUSION_BATCH_SIZE, SQLITE_DB_PATH
+from .ngram_index import NgramIndex
+
+logger = logging.getLogger(__name__)
+
+JOB_NAME = "confusions"
+
+# Words by spelling checked with edit distance when no answer matches exactly
+FUZZY_CANDIDATES = 5
+
+# (word, answer) groups remembered across batches
+MATCH_CACHE_SIZE = 200_000
+
+UPSERT_QUERY = """
+    INSERT INTO word_confusions (word_id, confused_with_id, count, updated_at)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT (word_id, confused_with_id)
+    DO UPDATE SET count = count + excluded.count,
+                  updated_at = excluded.updated_at
+"""
+
+WATERMARK_QUERY = """
+    INSERT INTO job_watermarks (name, last_id, updated_at) VALUES (?, ?, ?)
+    ON CONFLICT (name)
+    DO UPDATE SET last_id = excluded.last_id,
+                  updated_at = excluded.updated_at
+"""
+
+
+def _read_watermark(conn: sqlite3.Connection) -> int:
+    row = conn.execute(
+        "SELECT last_id FROM job_watermarks WHERE name = ?", (JOB_NAME,)
+    ).fetchone()
+    return row[0] if row else 0
+
+
+class ConfusionMatcher:
+    """Maps a wrong answer for one word to the other word it names"""
+
+    def __init__(self, words: Sequence[Tuple[int, str, str, Optional[str]]]):
+        """Compile (id, korean, english, romanization) rows."""
+        self.keys: Dict[int, AnswerKey] = {}
+        self.exact: Dict[str, List[int]] = {}
+        for word_id, korean, english, romanization in words:
+            key = AnswerKey(korean, english, romanization)
+            self.keys[word_id] = key
+            for answer in key.exact:
+                self.exact.setdefault(answer, []).append(word_id)
+        self.index = NgramIndex.build(words)
+        self._cache: "OrderedDict[Tuple[int, str], Optional[int]]" = (
+            OrderedDict()
+        )
+
+    def match(self, groups: Sequence[Tuple[int, str]]) -> List[Optional[int]]:
+        """The confused-with word id for each (word_id, normalized answer).
+
+        None when the word is unknown, the answer is a near miss of the
+        word itself, or it names no other word.
+        """
+        results: List[Optional[int]] = [None] * len(groups)
+        fuzzy = []
+        for i, group in enumerate(groups):
+            if group in self._cache:
+                self._cache.move_to_end(group)
+                results[i] = self._cache[group]
+                continue
+            word_id, answer = group
+            key = self.keys.get(word_id)
+            named = [w for w in self.exact.get(answer, ()) if w != word_id]
+            if key is None or not answer:
+                self._remember(group, None)
+            elif named and answer not in key.exact:
+                # Exactly another word, even if one jamo from this one
+                results[i] = named[0]
+                self._remember(group, named[0])
+            elif key.grade(answer).accepted:
+                self._remember(group, None)
+            else:
+                fuzzy.append(i)
+
+        # Spelled-alike candidates for every unresolved answer in one batch
+        hits = self.index.lookup(
+            [groups[i][1] for i in fuzzy], k=FUZZY_CANDIDATES + 1
+        )
+        for i, candidates in zip(fuzzy, hits):
+            word_id, answer = groups[i]
+            best = None
+            for other, _ in candidates:
+                if other == word_id or other not in self.keys:
+                    continue
+                grade = self.keys[other].grade(answer)
+                if grade.accepted and (
+                    best is None or grade.distance < best[0]
+                ):
+                    best = (grade.distance, other)
+            results[i] = best[1] if best else None
+            self._remember(groups[i], results[i])
+        return results
+
+    def _remember(self, group: Tuple[int, str], match: Optional[int]) -> None:
+        self._cache[group] = match
+        while len(self._cache) > MATCH_CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+
+def mine_confusions(
+    db_path: str = SQLITE_DB_PATH,
+    batch_size: int = CONFUSION_BATCH_SIZE,
+    max_batches: Optional[int] = None,
+) -> Dict[str, int]:
+    """Fold wrong inputs added since the last run into ``word_confusions``.
+
+    Each batch is one transaction that also moves the watermark, so an
+    interrupted run resumes where the last committed batch ended.
+
+    Returns:
+        Rows read, answer groups matched, pairs counted and the watermark
+    """
+    conn = sqlite3.connect(db_path, timeout=30)
+    try:
+        words = conn.execute(
+            "SELECT id, korean, english, romanization FROM words ORDER BY id"
+        ).fetchall()
+        matcher = ConfusionMatcher(words)
+        watermark = _read_watermark(conn)
+
+        stats = {"rows": 0, "groups": 0, "confusions": 0, "batches": 0}
+        while max_batches is None or stats["batches"] < max_batches:
+            rows = conn.execute(
+                "SELECT id, word_id, input_text FROM wrong_inputs "
+                "WHERE id > ? ORDER BY id LIMIT ?",
+                (watermark, batch_size),
+            ).fetchall()
+            if not rows:
+                break
+            groups = Counter(
+                (word_id, normalize(text)) for _, word_id, text in rows
+            )
+            pairs = Counter()
+            for (word_id, _), n, other in zip(
+                groups, groups.values(), matcher.match(list(groups))
+            ):
+                if other is not None:
+                    pairs[(word_id, other)] += n
+
+            now = datetime.utcnow().isoformat(sep=" ")
+            with conn:
+                # Take the write lock before rechecking, so two runs can't
+                # both see the old watermark and count the batch twice
+                conn.execute("BEGIN IMMEDIATE")
+                current = _read_watermark(conn)
+                if current == watermark:
+                    conn.executemany(
+                        UPSERT_QUERY,
+                        [(w, o, n, now) for (w, o), n in pairs.items()],
+                    )
+                    conn.execute(
+                        WATERMARK_QUERY, (JOB_NAME, rows[-1][0], now)
+                    )
+            if current != watermark:
+                # Another run got there first; carry on from its watermark
+                watermark = current
+                continue
+            watermark = rows[-1][0]
+
+            stats["rows"] += len(rows)
+            stats["groups"] += len(groups)
+            stats["confusions"] += sum(pairs.values())
+            stats["batches"] += 1
+        stats["watermark"] = watermark
+        logger.info(f"Confusion mining: {stats}")
+        return stats
+    finally:
+        conn.close()
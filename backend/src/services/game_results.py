@@ -0,0 +1,172 @@
+"""
+Persisting game answers and results.
+
+Shared by the bulk ``POST /game/submit`` and the WebSocket game stream:
+answers update the word's SRS schedule and latency sketch, and a finished
+game gets a scored GameResult plus its leaderboard entries.
+"""
+
+from datetime import datetime
+from typing import Dict, List, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tools.score import score_round_from_dict
+from tools.srs import schedule_review_from_dict
+from ..models.game_item import GameItem
+from ..models.game_result import GameResult
+from ..models.game_session import GameSession
+from ..models.word_review_schedule import WordReviewSchedule
+from .ingest import insert_game_items
+from .leaderboard import record_result
+from .word_latency import record_latencies
+
+
+async def update_word_srs_schedule(db, word_id: int, correct: bool):
+    """Update SRS schedule for a word based on performance."""
+    # Get existing schedule
+    schedule_query = select(WordReviewSchedule).where(
+        WordReviewSchedule.word_id == word_id
+    )
+    schedule_result = await db.execute(schedule_query)
+    existing_schedule = schedule_result.scalar_one_or_none()
+
+    # Convert to dict format for SRS tool
+    current_schedule_dict = None
+    if existing_schedule:
+        current_schedule_dict = {
+            "word_id": existing_schedule.word_id,
+            "next_review": existing_schedule.next_review.isoformat(),
+            "interval_days": existing_schedule.interval_days,
+            "ease_factor": existing_schedule.ease_factor,
+            "repetitions": existing_schedule.repetitions,
+            "last_reviewed": existing_schedule.last_reviewed.isoformat(),
+        }
+
+    # Calculate new schedule using SRS tool
+    new_schedule_dict = schedule_review_from_dict(
+        word_id, correct, current_schedule_dict
+    )
+
+    # Update or create schedule in database
+    if existing_schedule:
+        existing_schedule.next_review = datetime.fromisoformat(
+            new_schedule_dict["next_review"]
+        )
+        existing_schedule.interval_days = new_schedule_dict["interval_days"]
+        existing_schedule.ease_factor = new_schedule_dict["ease_factor"]
+        existing_schedule.repetitions = new_schedule_dict["repetitions"]
+        existing_schedule.last_reviewed = datetime.fromisoformat(
+            new_schedule_dict["last_reviewed"]
+        )
+        existing_schedule.updated_at = datetime.utcnow()
+    else:
+        new_schedule = WordReviewSchedule(
+            word_id=new_schedule_dict["word_id"],
+            next_review=datetime.fromisoformat(
+                new_schedule_dict["next_review"]
+            ),
+            interval_days=new_schedule_dict["interval_days"],
+            ease_factor=new_schedule_dict["ease_factor"],
+            repetitions=new_schedule_dict["repetitions"],
+            last_reviewed=datetime.fromisoformat(
+                new_schedule_dict["last_reviewed"]
+            ),
+        )
+        db.add(new_schedule)
+
+
+async def record_answers(
+    db: AsyncSession, session_id: int, answers: Sequence[Dict]
+) -> None:
+    """Store answered items and apply their SRS and latency updates.
+
+    ``answers`` are dicts with word_id, correct and time_ms; the caller
+    commits.
+    """
+    if not answers:
+        return
+    await insert_game_items(
+        await db.connection(),
+        [
+            {
+                "session_id": session_id,
+                "word_id": answer["word_id"],
+                "correct": answer["correct"],
+                "time_ms": answer["time_ms"],
+            }
+            for answer in answers
+        ],
+    )
+    for answer in answers:
+        await update_word_srs_schedule(
+            db, answer["word_id"], answer["correct"]
+        )
+    await record_latencies(
+        db,
+        (
+            (answer["word_id"], answer["correct"], answer["time_ms"])
+            for answer in answers
+        ),
+    )
+
+
+async def session_items(db: AsyncSession, session_id: int) -> List[Dict]:
+    """Items stored for a session, in answer order."""
+    result = await db.execute(
+        select(GameItem.word_id, GameItem.correct, GameItem.time_ms)
+        .where(GameItem.session_id == session_id)
+        .order_by(GameItem.id)
+    )
+    return [row._asdict() for row in result.all()]
+
+
+class ResultAlreadyRecorded(Exception):
+    """The session was already scored; a game has one result"""
+
+
+async def has_result(db: AsyncSession, session_id: int) -> bool:
+    result = await db.execute(
+        select(GameResult.id).where(GameResult.session_id == session_id)
+    )
+    return result.first() is not None
+
+
+async def create_game_result(
+    db: AsyncSession, session: GameSession, items: List[Dict]
+) -> GameResult:
+    """Score a finished game and add its result and leaderboard entries.
+
+    The result is flushed so its id is available; the caller commits.
+
+    Raises:
+        ResultAlreadyRecorded: if the session already has a result
+    """
+    session_id = session.id  # Unloadable once a failed flush rolls back
+    if await has_result(db, session_id):
+        raise ResultAlreadyRecorded(session_id)
+
+    scoring_result = score_round_from_dict(items, session.duration_sec)
+
+    # Create game result using tool-calculated values
+    game_result = GameResult(
+        session_id=session_id,
+        total=scoring_result["total"],
+        correct=scoring_result["correct"],
+        accuracy=scoring_result["accuracy"],
+        wpm=scoring_result["wpm"],
+        score=scoring_result["score"],
+    )
+
+    try:
+        db.add(game_result)
+        await db.flush()  # Get the ID
+
+        # Keep the per-mode leaderboards current
+        await record_result(db, session, game_result)
+    except IntegrityError as e:
+        # A concurrent submit for the session got past has_result too
+        raise ResultAlreadyRecorded(session_id) from e
+    return game_result
@@ -0,0 +1,321 @@
+"""
+WebSocket game loop: streamed items, incremental answer writes.
+
+Protocol (JSON text frames)::
+
+    server -> {"type": "items", "items": [{"position", "word_id", "korean",
+               "english", "hint", "distractors"}, ...]}
+    client -> {"type": "answer", "seq", "word_id", "correct" | "input_text",
+               "time_ms"}
+    server -> {"type": "graded", "seq", "verdict", "correct", "distance",
+               "matched"}                     (answers sent as input_text)
+    server -> {"type": "ack", "seqs": [...]}
+    client -> {"type": "flush"}                 (ack everything now)
+    client -> {"type": "end"}
+    server -> {"type": "result", "result_id", "total", "correct",
+               "accuracy", "wpm", "score"}
+    server -> {"type": "error", "detail", ...}
+
+The server keeps ``prefetch`` unanswered items on the client, so the next
+card is always there before the learner needs it. Rounds are pulled from
+the round pool item by item: when an enhanced round has to be generated,
+each item goes out as soon as Groq has written it. Answers are buffered and
+written - game item, SRS schedule and latency sketch - once ``ack_batch`` of
+them arrive or ``ack_ms`` after the first unwritten one; only then are they
+acked. Anything already received is written even if the socket drops.
+
+Seqs and acks belong to one connection: a resent seq is re-acked, not
+stored twice, only on the socket it was first sent on. A client that
+reconnects gets fresh items and must not resend unacked answers - the
+server may already have written them, and it only takes answers for items
+served on the current connection.
+
+Typed answers are graded here (jamo-level for Korean, see
+``tools.grading``) against the served item, so the client gets the
+verdict - near misses count as correct - without a separate request. A typed
+answer for a word deleted since it was served gets an error frame and a
+replacement item instead.
+"""
+
+import asyncio
+import logging
+import time
+from collections import Counter, deque
+from typing import AsyncIterator, Deque, Dict, List, Optional
+
+from fastapi import WebSocket, WebSocketDisconnect
+from pydantic import ValidationError
+
+from ..config import GAME_STREAM_ACK_BATCH, GAME_STREAM_ACK_MS
+from ..database import async_session_factory
+from ..models.game_session import GameSession
+from ..schemas.game import GameStreamAnswer
+from .game_results import (
+    ResultAlreadyRecorded,
+    create_game_result,
+    record_answers,
+    session_items,
+)
+from .grading import grade_answers
+from .round_pool import round_pool
+
+logger = logging.getLogger(__name__)
+
+# Items are pulled from the round pool a default-sized round at a time
+ROUND_SIZE = 10
+
+
+class GameStream:
+    """One learner's game over a WebSocket"""
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        session: GameSession,
+        level: Optional[str],
+        enhance: bool,
+        prefetch: int,
+        ack_batch: int = GAME_STREAM_ACK_BATCH,
+        ack_ms: int = GAME_STREAM_ACK_MS,
+    ):
+        self.websocket = websocket
+        self.session = session
+        self.level = level
+        self.enhance = enhance
+        self.prefetch = prefetch
+        self.ack_batch = ack_batch
+        self.ack_ms = ack_ms
+
+        self.upcoming: Deque[Dict] = deque()
+        # Round currently being read from the pool
+        self.feed: Optional[AsyncIterator[List[Dict]]] = None
+        self.outstanding: Counter = Counter()  # word_id -> unanswered sends
+        self.position = 0
+        self.pending: List[GameStreamAnswer] = []
+        self.pending_since: Optional[float] = None  # First unacked answer
+        self.seen_seqs = set()  # Per connection; see the module docstring
+
+    async def run(self) -> None:
+        try:
+            if not await self.top_up():
+                await self.send_error(
+                    "No words found for the specified criteria"
+                )
+                await self.websocket.close(code=4404)
+                return
+            while True:
+                timeout = None
+                if self.pending:
+                    # Counted from the first unacked answer, so a steady
+                    # stream of answers can't keep pushing the ack back
+                    timeout = (
+                        self.pending_since
+                        + self.ack_ms / 1000
+                        - time.monotonic()
+                    )
+                    if timeout <= 0:
+                        await self.flush()
+                        continue
+                try:
+                    message = await asyncio.wait_for(
+                        self.websocket.receive_json(), timeout
+                    )
+                except asyncio.TimeoutError:
+                    await self.flush()
+                    continue
+                except ValueError:
+                    await self.send_error("Messages must be JSON")
+                    continue
+
+                kind = (
+                    message.get("type") if isinstance(message, dict) else None
+                )
+                if kind == "answer":
+                    await self.on_answer(message)
+                elif kind == "flush":
+                    await self.flush()
+                elif kind == "end":
+                    await self.finish()
+                    return
+                else:
+                    await self.send_error(f"Unknown message type: {kind}")
+        except WebSocketDisconnect:
+            logger.info(f"Game stream {self.session.id} disconnected")
+        finally:
+            # Received answers survive a dropped connection (and the
+            # handler being cancelled at shutdown)
+            if self.pending:
+                await asyncio.shield(self.flush(send_ack=False))
+            await self.close_feed()
+
+    async def top_up(self) -> bool:
+        """Send items until ``prefetch`` are waiting on the client.
+
+        Returns False if there are no words to play at all.
+        """
+        missing = self.prefetch - sum(self.outstanding.values())
+        while missing > 0:
+            if not self.upcoming and not await self.pull():
+                break
+            batch = []
+            while self.upcoming and len(batch) < missing:
+                item = self.upcoming.popleft()
+                batch.append({"position": self.position, **item})
+                self.outstanding[item["word_id"]] += 1
+                self.position += 1
+            # Send what's ready before waiting on the rest of the round
+            await self.websocket.send_json({"type": "items", "items": batch})
+            missing -= len(batch)
+        return self.position > 0
+
+    async def pull(self) -> bool:
+        """Wait for the next ready items of the current round.
+
+        Returns False if a fresh round has no words at all.
+        """
+        while True:
+            fresh = self.feed is None
+            if fresh:
+                self.feed = round_pool.stream(
+                    ROUND_SIZE, self.level, self.enhance
+                )
+            try:
+                self.upcoming.extend(await self.feed.__anext__())
+                return True
+            except StopAsyncIteration:
+                await self.close_feed()
+                if fresh:
+                    return False
+
+    async def close_feed(self) -> None:
+        if self.feed is not None:
+            await self.feed.aclose()
+            self.feed = None
+
+    async def on_answer(self, message: Dict) -> None:
+        try:
+            answer = GameStreamAnswer.model_validate(message)
+        except ValidationError as e:
+            await self.send_error(
+                "Invalid answer",
+                errors=e.errors(include_url=False, include_context=False),
+            )
+            return
+
+        if answer.seq in self.seen_seqs:
+            # Resent after a lost ack; already stored or about to be
+            if all(pending.seq != answer.seq for pending in self.pending):
+                await self.websocket.send_json(
+                    {"type": "ack", "seqs": [answer.seq]}
+                )
+            return
+        if self.outstanding[answer.word_id] <= 0:
+            await self.send_error(
+                "Answer for a word that was not served", seq=answer.seq
+            )
+            return
+
+        if answer.input_text is not None and not await self.grade(answer):
+            # Deleted since it was served: nothing to store, send another
+            self.outstanding[answer.word_id] -= 1
+            await self.top_up()
+            return
+        self.seen_seqs.add(answer.seq)
+        self.outstanding[answer.word_id] -= 1
+        if not self.pending:
+            self.pending_since = time.monotonic()
+        self.pending.append(answer)
+        if len(self.pending) >= self.ack_batch:
+            await self.flush()
+        await self.top_up()
+
+    async def grade(self, answer: GameStreamAnswer) -> bool:
+        """Decide ``correct`` from the typed text and tell the client.
+
+        Grades like ``POST /api/game/grade`` (romanization included), so
+        both paths give one verdict for one answer. Returns False, after
+        sending an error, if the word no longer exists.
+        """
+        async with async_session_factory() as db:
+            (grade,) = await grade_answers(
+                db, [(answer.word_id, answer.input_text)]
+            )
+        if grade is None:
+            await self.send_error("Word not found", seq=answer.seq)
+            return False
+        answer.correct = grade.accepted
+        await self.websocket.send_json(
+            {
+                "type": "graded",
+                "seq": answer.seq,
+                "verdict": grade.verdict,
+                "correct": grade.accepted,
+                "distance": grade.distance,
+                "matched": grade.matched,
+            }
+        )
+        return True
+
+    async def flush(self, send_ack: bool = True) -> None:
+        """Write buffered answers in one transaction, then ack them."""
+        if not self.pending:
+            return
+        answers, self.pending = self.pending, []
+        try:
+            async with async_session_factory() as db:
+                await record_answers(
+                    db,
+                    self.session.id,
+                    [answer.model_dump() for answer in answers],
+                )
+                await db.commit()
+        except Exception as e:
+            logger.error(
+                f"Failed to store answers for game {self.session.id}: {e}"
+            )
+            # Keep them for the next flush, one ack_ms from now
+            self.pending = answers + self.pending
+            self.pending_since = time.monotonic()
+            if send_ack:
+                await self.send_error("Failed to store answers")
+            return
+        if send_ack:
+            await self.websocket.send_json(
+                {"type": "ack", "seqs": [answer.seq for answer in answers]}
+            )
+
+    async def finish(self) -> None:
+        """Write what's left, score the game and close the socket."""
+        await self.flush()
+        if self.pending:
+            await self.websocket.close(code=1011)
+            return
+
+        try:
+            async with async_session_factory() as db:
+                items = await session_items(db, self.session.id)
+                game_result = await create_game_result(db, self.session, items)
+                await db.commit()
+        except ResultAlreadyRecorded:
+            # Finished meanwhile, e.g. over POST /game/submit
+            await self.send_error("Game already finished")
+            await self.websocket.close(code=4409)
+            return
+
+        await self.websocket.send_json(
+            {
+                "type": "result",
+                "result_id": game_result.id,
+                "total": game_result.total,
+                "correct": game_result.correct,
+                "accuracy": game_result.accuracy,
+                "wpm": game_result.wpm,
+                "score": game_result.score,
+            }
+        )
+        await self.websocket.close()
+
+    async def send_error(self, detail: str, **extra) -> None:
+        await self.websocket.send_json(
+            {"type": "error", "detail": detail, **extra}
+        )
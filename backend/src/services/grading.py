@@ -0,0 +1,118 @@
+"""
+Server-side answer grading.
+
+Typed answers are graded with ``tools.grading`` against the word's Korean,
+English glosses and romanization. Each word's compiled answer key is
+cached (LRU, dropped whenever ``catalog_generation()`` changes), so grading
+a round costs one lookup for the words not seen yet and then only the
+edit-distance work. The set of every answer in the catalog is cached
+alongside, so an answer that is exactly another word is never let through
+as a near miss of this one.
+"""
+
+from collections import OrderedDict
+from typing import AbstractSet, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tools.grading import AnswerKey, Grade, catalog_answers
+from ..config import ANSWER_KEY_CACHE_SIZE
+from ..models.word import Word
+from .vocab_artifact import catalog_generation, get_vocab_artifact
+
+
+class AnswerKeyCache:
+    """LRU of compiled answer keys by word id"""
+
+    def __init__(self, max_entries: int = ANSWER_KEY_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._keys: "OrderedDict[int, AnswerKey]" = OrderedDict()
+        self._generation = None
+        self._catalog: Optional[AbstractSet[str]] = None
+
+    def _check_generation(self) -> None:
+        generation = catalog_generation()
+        if generation != self._generation:
+            self._keys.clear()
+            self._catalog = None
+            self._generation = generation
+
+    async def catalog(self, db: AsyncSession) -> AbstractSet[str]:
+        """Every normalized answer of every word (see ``catalog_answers``)."""
+        self._check_generation()
+        if self._catalog is None:
+            artifact = get_vocab_artifact()
+            if artifact is not None:
+                rows = [
+                    (w["korean"], w["english"], w["romanization"])
+                    for w in artifact.list_words(0, len(artifact))
+                ]
+            else:
+                result = await db.execute(
+                    select(Word.korean, Word.english, Word.romanization)
+                )
+                rows = result.all()
+            self._catalog = catalog_answers(rows)
+        return self._catalog
+
+    async def load(
+        self, db: AsyncSession, word_ids: Iterable[int]
+    ) -> Dict[int, AnswerKey]:
+        """Answer keys for the given words; unknown ids are missing."""
+        self._check_generation()
+
+        found = {}
+        wanted = set()
+        for word_id in word_ids:
+            key = self._keys.get(word_id)
+            if key is None:
+                wanted.add(word_id)
+            else:
+                self._keys.move_to_end(word_id)
+                found[word_id] = key
+        if not wanted:
+            return found
+
+        artifact = get_vocab_artifact()
+        if artifact is not None:
+            rows = [
+                (w["id"], w["korean"], w["english"], w["romanization"])
+                for w in map(artifact.get_word, wanted)
+                if w is not None
+            ]
+        else:
+            result = await db.execute(
+                select(
+                    Word.id, Word.korean, Word.english, Word.romanization
+                ).where(Word.id.in_(wanted))
+            )
+            rows = result.all()
+
+        for word_id, korean, english, romanization in rows:
+            key = AnswerKey(korean, english, romanization)
+            found[word_id] = self._keys[word_id] = key
+        while len(self._keys) > self.max_entries:
+            self._keys.popitem(last=False)
+        return found
+
+
+answer_keys = AnswerKeyCache()
+
+
+async def grade_answers(
+    db: AsyncSession,
+    answers: Sequence[Tuple[int, str]],
+    expected: str = "any",
+) -> List[Optional[Grade]]:
+    """Grade (word_id, typed text) pairs; None where the word is unknown."""
+    keys = await answer_keys.load(db, (word_id for word_id, _ in answers))
+    others = await answer_keys.catalog(db)
+    return [
+        (
+            keys[word_id].grade(text, expected, others)
+            if word_id in keys
+            else None
+        )
+        for word_id, text in answers
+    ]
@@ -2,17 +2,48 @@
 Groq AI service for generating language learning content.
 """
 
+import asyncio
+import functools
+import hashlib
+import json
 import os
 import logging
-from typing import Dict, Any, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, AsyncIterator, List, Optional
 from groq import Groq
 from dotenv import load_dotenv
 
+from ..config import (
+    GROQ_BASE_URL,
+    GROQ_BREAKER_FAILURES,
+    GROQ_BREAKER_LATENCY_SLO_MS,
+    GROQ_BREAKER_SLO_TOKENS,
+    GROQ_BREAKER_RESET_S,
+    GROQ_HEDGE_AFTER_MS,
+    GROQ_MAX_CONCURRENCY,
+    GROQ_REQUESTS_PER_MINUTE,
+    GROQ_TIMEOUT_S,
+    GROQ_TOKENS_PER_MINUTE,
+    LLM_SLO_BATCH_MS,
+    LLM_SLO_INTERACTIVE_MS,
+    LLM_SLO_PREFETCH_MS,
+)
+from .circuit_breaker import CircuitBreaker
+from .llm_scheduler import LLMScheduler, Priority, current_priority
+
 # Load environment variables
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+MODEL = "openai/gpt-oss-20b"
+PRACTICE_MAX_TOKENS = 300
+
+OVERLOADED_MESSAGE = "Groq rate limit queue is full, try again shortly"
+CIRCUIT_OPEN_MESSAGE = "Groq is failing or too slow, try again shortly"
+
 
 class GroqService:
     """Service for interacting with Groq AI API."""
@@ -25,12 +56,54 @@ class GroqService:
             self.client = None
         else:
             try:
-                self.client = Groq(api_key=self.api_key)
-                logger.info("Groq client initialized successfully")
+                # Fail fast: the circuit breaker and hedging handle
+                # slow or failing calls instead of the SDK's own retries
+                self.client = Groq(
+                    api_key=self.api_key,
+                    base_url=GROQ_BASE_URL,
+                    timeout=GROQ_TIMEOUT_S,
+                    max_retries=0,
+                )
+                logger.info(
+                    f"Groq client initialized successfully"
+                    f"{f' (base URL {GROQ_BASE_URL})' if GROQ_BASE_URL else ''}"
+                )
             except Exception as e:
                 logger.error(f"Failed to initialize Groq client: {e}")
                 self.client = None
 
+        # Every upstream call waits for rate-limit budget by priority
+        self.scheduler = LLMScheduler(
+            GROQ_REQUESTS_PER_MINUTE,
+            GROQ_TOKENS_PER_MINUTE,
+            slo_ms={
+                Priority.INTERACTIVE: LLM_SLO_INTERACTIVE_MS,
+                Priority.PREFETCH: LLM_SLO_PREFETCH_MS,
+                Priority.BATCH: LLM_SLO_BATCH_MS,
+            },
+        )
+
+        # The client is blocking: calls run on these threads, sized for the
+        # upstream concurrency wanted rather than the machine's CPU count
+        self._executor = ThreadPoolExecutor(
+            max_workers=GROQ_MAX_CONCURRENCY, thread_name_prefix="groq"
+        )
+
+        # Refuses calls outright while Groq is failing or crawling
+        self.breaker = CircuitBreaker(
+            failure_threshold=GROQ_BREAKER_FAILURES,
+            latency_slo_ms=GROQ_BREAKER_LATENCY_SLO_MS,
+            reset_timeout_s=GROQ_BREAKER_RESET_S,
+        )
+        self.hedge_after_ms = GROQ_HEDGE_AFTER_MS
+        self.hedges = 0
+        self.hedge_wins = 0
+
+        # Single-flight: identical requests in flight share one upstream call
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.upstream_calls = 0
+        self.coalesced = 0
+
     def is_available(self) -> bool:
         """Check if Groq service is available."""
         return self.client is not None and self.api_key is not None
@@ -43,15 +116,26 @@ class GroqService:
                 "message": "Groq API key not configured or client initialization failed",
             }
 
+        messages = [
+            {
+                "role": "user",
+                "content": "Hello, respond with 'OK' if you can hear me.",
+            }
+        ]
+        if not self.breaker.allow():
+            return {"error": "groq_circuit_open", "message": CIRCUIT_OPEN_MESSAGE}
+        # Health checks never take budget from learners
+        estimate = self._estimate_tokens(messages, 10)
+        if not await self.scheduler.acquire(estimate, Priority.BATCH):
+            self.breaker.abandon()
+            return {"error": "groq_overloaded", "message": OVERLOADED_MESSAGE}
+
+        start = time.monotonic()
         try:
-            completion = self.client.chat.completions.create(
-                model="openai/gpt-oss-20b",
-                messages=[
-                    {
-                        "role": "user",
-                        "content": "Hello, respond with 'OK' if you can hear me.",
-                    }
-                ],
+            completion = await self._run_blocking(
+                self.client.chat.completions.create,
+                model=MODEL,
+                messages=messages,
                 temperature=0.1,
                 max_tokens=10,
             )
@@ -60,26 +144,50 @@ class GroqService:
             tokens_used = (
                 completion.usage.total_tokens if completion.usage else 0
             )
+            self.scheduler.settle(estimate, tokens_used or estimate)
+            self.breaker.record_success((time.monotonic() - start) * 1000)
 
             return {
                 "content": content,
-                "model": "openai/gpt-oss-20b",
+                "model": MODEL,
                 "tokens_used": tokens_used,
             }
 
         except Exception as e:
+            self.scheduler.settle(estimate, 0)
+            self.breaker.record_failure()
             logger.error(f"Groq API test failed: {e}")
             return {
                 "error": "groq_api_error",
                 "message": f"Failed to connect to Groq API: {str(e)}",
             }
 
-    async def generate_completion(self, prompt: str) -> Dict[str, Any]:
+    async def list_models(self) -> List[str]:
+        """IDs of the models the API key can use; costs no tokens."""
+        if not self.is_available():
+            raise RuntimeError(
+                "Groq API key not configured or client initialization failed"
+            )
+        models = await self._run_blocking(self.client.models.list)
+        return [model.id for model in models.data]
+
+    async def generate_completion(
+        self,
+        prompt: str,
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        hedge: bool = False,
+    ) -> Dict[str, Any]:
         """
         Generate a completion using Groq AI with a simple prompt.
 
         Args:
             prompt: The prompt to send to the AI
+            max_tokens: Upper bound on the length of the completion
+            temperature: Sampling temperature
+            hedge: Send a second attempt if an interactive call is still
+                running after GROQ_HEDGE_AFTER_MS. Only for short,
+                deterministic prompts: a hedge can double the spend
 
         Returns:
             Dict with content, model, tokens_used or error information
@@ -90,33 +198,13 @@ class GroqService:
                 "message": "Groq API key not configured or client initialization failed",
             }
 
-        try:
-            completion = self.client.chat.completions.create(
-                model="openai/gpt-oss-20b",
-                messages=[
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=1000,
-            )
-
-            content = completion.choices[0].message.content.strip()
-            tokens_used = (
-                completion.usage.total_tokens if completion.usage else 0
-            )
-
-            return {
-                "content": content,
-                "model": "openai/gpt-oss-20b",
-                "tokens_used": tokens_used,
-            }
-
-        except Exception as e:
-            logger.error(f"Groq completion generation failed: {e}")
-            return {
-                "error": "groq_generation_error",
-                "message": f"Failed to generate completion: {str(e)}",
-            }
+        return await self._complete(
+            [{"role": "user", "content": prompt}],
+            temperature=temperature,
+            max_tokens=max_tokens,
+            failure="Failed to generate completion",
+            hedge=hedge,
+        )
 
     async def generate_practice_content(
         self,
@@ -141,6 +229,36 @@ class GroqService:
                 "message": "Groq API key not configured or client initialization failed",
             }
 
+        return await self._complete(
+            self.practice_messages(
+                korean_word, english_translation, practice_type
+            ),
+            temperature=0.7,
+            max_tokens=PRACTICE_MAX_TOKENS,
+            failure="Failed to generate content",
+        )
+
+    async def stream_practice_content(
+        self,
+        korean_word: str,
+        english_translation: str,
+        practice_type: str = "definition",
+    ) -> AsyncIterator[str]:
+        """Like generate_practice_content, but yield text as it arrives."""
+        async for delta in self.stream_completion(
+            self.practice_messages(
+                korean_word, english_translation, practice_type
+            ),
+            temperature=0.7,
+            max_tokens=PRACTICE_MAX_TOKENS,
+        ):
+            yield delta
+
+    @staticmethod
+    def practice_messages(
+        korean_word: str, english_translation: str, practice_type: str
+    ) -> List[Dict[str, str]]:
+        """Chat messages asking for one kind of practice content."""
         # Create appropriate prompt based on practice type
         prompts = {
             "definition": f"""You are a Korean language tutor. Create a helpful explanation for the Korean word "{korean_word}" which means "{english_translation}". 
@@ -171,38 +289,284 @@ Make it appropriate for intermediate learners. Include the correct answer.""",
 
         prompt = prompts.get(practice_type, prompts["definition"])
 
+        return [
+            {
+                "role": "system",
+                "content": "You are a helpful Korean language tutor focused on clear, educational content.",
+            },
+            {"role": "user", "content": prompt},
+        ]
+
+    async def stream_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat completion, yielding content deltas as they arrive.
+
+        Raises:
+            RuntimeError: If Groq is not configured
+            Exception: Whatever the Groq client raised mid-stream
+        """
+        if not self.is_available():
+            raise RuntimeError(
+                "Groq API key not configured or client initialization failed"
+            )
+        if not self.breaker.allow():
+            raise RuntimeError(CIRCUIT_OPEN_MESSAGE)
+        # Usage isn't reported mid-stream; the reservation stands
+        if not await self.scheduler.acquire(
+            self._estimate_tokens(messages, max_tokens)
+        ):
+            self.breaker.abandon()
+            raise RuntimeError(OVERLOADED_MESSAGE)
+
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+        finished = object()
+
+        def relay(item):
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+            except RuntimeError:
+                stop.set()  # Event loop is gone
+
+        def produce():
+            # The Groq client is blocking; iterate its stream in a thread
+            try:
+                stream = self.client.chat.completions.create(
+                    model=MODEL,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    stream=True,
+                )
+                for chunk in stream:
+                    if stop.is_set():
+                        break
+                    delta = (
+                        chunk.choices[0].delta.content if chunk.choices else None
+                    )
+                    if delta:
+                        relay(delta)
+                relay(finished)
+            except Exception as e:
+                logger.error(f"Groq streaming completion failed: {e}")
+                relay(e)
+
+        loop.run_in_executor(self._executor, produce)
+        start = time.monotonic()
+        first_token_ms = None
         try:
-            completion = self.client.chat.completions.create(
-                model="openai/gpt-oss-20b",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a helpful Korean language tutor focused on clear, educational content.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.7,
-                max_tokens=300,
+            while True:
+                item = await queue.get()
+                if item is finished:
+                    # A stream is judged by how soon it started talking
+                    self.breaker.record_success(
+                        first_token_ms or (time.monotonic() - start) * 1000
+                    )
+                    return
+                if isinstance(item, Exception):
+                    self.breaker.record_failure()
+                    raise item
+                if first_token_ms is None:
+                    first_token_ms = (time.monotonic() - start) * 1000
+                yield item
+        finally:
+            # Stop reading upstream once nobody is listening
+            stop.set()
+            self.breaker.abandon()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Upstream calls, coalescing, rate limiting, breaker and hedging"""
+        return {
+            "upstream_calls": self.upstream_calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight),
+            "scheduler": self.scheduler.metrics(),
+            "breaker": self.breaker.metrics(),
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+        }
+
+    @staticmethod
+    def _estimate_tokens(
+        messages: List[Dict[str, str]], max_tokens: int
+    ) -> int:
+        """Tokens to reserve for a call: rough prompt size plus the cap."""
+        # Hangul runs close to a token per character; ~3 chars is a middle
+        prompt_chars = sum(len(m["content"]) for m in messages)
+        return prompt_chars // 3 + max_tokens
+
+    def _latency_slo_ms(self, max_tokens: int) -> float:
+        """The breaker's latency SLO for a completion of ``max_tokens``:
+        a whole quiz round may take longer than a short answer."""
+        scale = max(1.0, max_tokens / GROQ_BREAKER_SLO_TOKENS)
+        return self.breaker.latency_slo_ms * scale
+
+    @staticmethod
+    def _request_key(messages: List[Dict[str, str]], **params) -> str:
+        """Hash of a request with whitespace in the prompts normalized."""
+        normalized = [
+            {"role": m["role"], "content": " ".join(m["content"].split())}
+            for m in messages
+        ]
+        raw = json.dumps(
+            {"model": MODEL, "messages": normalized, **params},
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    async def _complete(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        failure: str,
+        hedge: bool = False,
+    ) -> Dict[str, Any]:
+        """Run a chat completion, joining an identical one already in flight."""
+        key = self._request_key(
+            messages, temperature=temperature, max_tokens=max_tokens
+        )
+        flight = self._in_flight.get(key)
+        if flight is not None:
+            self.coalesced += 1
+        else:
+            self.upstream_calls += 1
+            flight = asyncio.ensure_future(
+                self._call_upstream(
+                    messages, temperature, max_tokens, failure, hedge
+                )
+            )
+            self._in_flight[key] = flight
+            flight.add_done_callback(lambda _: self._in_flight.pop(key, None))
+
+        # A caller going away must not cancel the call for the others
+        result = await asyncio.shield(flight)
+        return dict(result)
+
+    async def _call_upstream(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        failure: str,
+        hedge: bool = False,
+    ) -> Dict[str, Any]:
+        if not self.breaker.allow():
+            return {"error": "groq_circuit_open", "message": CIRCUIT_OPEN_MESSAGE}
+        estimate = self._estimate_tokens(messages, max_tokens)
+        if not await self.scheduler.acquire(estimate):
+            self.breaker.abandon()
+            return {"error": "groq_overloaded", "message": OVERLOADED_MESSAGE}
+
+        # Only a waiting learner is worth a second attempt; long batch and
+        # prefetch calls are neither latency-bound nor judged by the SLO
+        interactive = current_priority() == Priority.INTERACTIVE
+        start = time.monotonic()
+        try:
+            completion = await self._first_completion(
+                messages,
+                temperature,
+                max_tokens,
+                estimate,
+                hedge=hedge and interactive,
             )
 
             content = completion.choices[0].message.content.strip()
             tokens_used = (
                 completion.usage.total_tokens if completion.usage else 0
             )
+            self.breaker.record_success(
+                (time.monotonic() - start) * 1000,
+                check_latency=interactive,
+                slo_ms=self._latency_slo_ms(max_tokens),
+            )
 
             return {
                 "content": content,
-                "model": "openai/gpt-oss-20b",
+                "model": MODEL,
                 "tokens_used": tokens_used,
             }
 
         except Exception as e:
-            logger.error(f"Groq content generation failed: {e}")
+            self.breaker.record_failure()
+            logger.error(f"Groq completion failed: {e}")
             return {
                 "error": "groq_generation_error",
-                "message": f"Failed to generate content: {str(e)}",
+                "message": f"{failure}: {str(e)}",
             }
 
+    async def _first_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        estimate: int,
+        hedge: bool,
+    ):
+        """First successful completion, hedged with a second attempt if
+        the first is still running after ``hedge_after_ms``."""
+
+        def create():
+            return self.client.chat.completions.create(
+                model=MODEL,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
+
+        attempts = [self._start_attempt(create, estimate)]
+        if hedge and self.hedge_after_ms > 0:
+            done, _ = await asyncio.wait(
+                attempts, timeout=self.hedge_after_ms / 1000
+            )
+            # Hedge only with spare budget; never queue for it
+            if not done and self.scheduler.try_acquire(estimate):
+                self.hedges += 1
+                attempts.append(self._start_attempt(create, estimate))
+
+        pending = set(attempts)
+        error = None
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for attempt in done:
+                if attempt.exception() is None:
+                    if attempt is not attempts[0]:
+                        self.hedge_wins += 1
+                    # The loser runs on in its thread; its result is dropped
+                    return attempt.result()
+                error = attempt.exception()
+        raise error
+
+    async def _run_blocking(self, fn, *args, **kwargs):
+        """Run a blocking client call on the Groq worker threads."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(fn, *args, **kwargs)
+        )
+
+    def _start_attempt(self, create, estimate: int) -> asyncio.Task:
+        def settle(task: asyncio.Task) -> None:
+            # Give back what the attempt didn't use once it is over
+            if task.cancelled() or task.exception() is not None:
+                self.scheduler.settle(estimate, 0)
+                return
+            usage = task.result().usage
+            used = usage.total_tokens if usage else 0
+            self.scheduler.settle(estimate, used or estimate)
+
+        task = asyncio.ensure_future(self._run_blocking(create))
+        task.add_done_callback(settle)
+        return task
+
 
 # Global instance
 groq_service = GroqService()
@@ -0,0 +1,126 @@
+"""
+Cached health snapshot for liveness and readiness probes.
+
+A background task probes the database (``SELECT 1``) and Groq (a models
+list, which costs no tokens) every ``interval_s`` seconds and keeps the
+result, so probes answer from memory instead of running a query and an LLM
+completion each time. The circuit breaker's state is overlaid at read time:
+a Groq that lists models but fails completions shows up as degraded.
+
+Readiness depends on the database only - every AI path has a fallback, so
+a Groq outage degrades the app rather than taking it out of rotation.
+Until ``start()`` is called (tests, scripts) every read probes inline.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import text
+
+from ..config import HEALTH_PROBE_INTERVAL_S, HEALTH_PROBE_TIMEOUT_S
+from ..database import engine
+from .groq_service import groq_service
+
+logger = logging.getLogger(__name__)
+
+
+class HealthMonitor:
+    """Periodic dependency probe with a cached result"""
+
+    def __init__(
+        self,
+        interval_s: float = HEALTH_PROBE_INTERVAL_S,
+        timeout_s: float = HEALTH_PROBE_TIMEOUT_S,
+    ):
+        self.interval_s = interval_s
+        self.timeout_s = timeout_s
+        self._snapshot: Optional[Dict] = None
+        self._checked_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def refresh(self) -> Dict:
+        """Probe every dependency now and cache the result."""
+        database, groq = await asyncio.gather(
+            self._probe(self._check_database()),
+            self._probe(self._check_groq()),
+        )
+        if groq == "ok" and not groq_service.is_available():
+            groq = "unconfigured"
+        self._snapshot = {
+            "database": database,
+            "groq_api": groq,
+            "checked_at": datetime.utcnow().isoformat(),
+        }
+        self._checked_at = time.monotonic()
+        return self._snapshot
+
+    async def status(self) -> Dict:
+        """Latest snapshot with its age and the live breaker state.
+
+        ``ready`` is False before the first probe completes, when the
+        database failed it, or when the snapshot has gone stale.
+        """
+        if not self.running:
+            await self.refresh()
+        if self._snapshot is None:
+            return {"ready": False, "status": "starting"}
+
+        age_s = time.monotonic() - self._checked_at
+        snapshot = dict(self._snapshot, age_s=round(age_s, 3))
+        breaker = groq_service.breaker.state
+        snapshot["groq_breaker"] = breaker
+        if snapshot["groq_api"] == "ok" and breaker != "closed":
+            snapshot["groq_api"] = "degraded"
+
+        stale = self.running and age_s > 3 * self.interval_s
+        snapshot["ready"] = snapshot["database"] == "ok" and not stale
+        snapshot["status"] = (
+            "stale"
+            if stale
+            else ("ready" if snapshot["ready"] else "not_ready")
+        )
+        return snapshot
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Health probe failed: {e}")
+            await asyncio.sleep(self.interval_s)
+
+    async def _probe(self, check) -> str:
+        try:
+            await asyncio.wait_for(check, self.timeout_s)
+            return "ok"
+        except Exception as e:
+            logger.warning(f"Health probe check failed: {e!r}")
+            return "error"
+
+    async def _check_database(self) -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    async def _check_groq(self) -> None:
+        if groq_service.is_available():
+            await groq_service.list_models()
+
+
+# Global instance, started with the app
+health_monitor = HealthMonitor()
@@ -0,0 +1,107 @@
+"""
+Set-based inserts for high-frequency learner events.
+
+Shared by the write-behind queue and the batch ingestion endpoints: each
+function writes a whole list of rows on one connection with executemany
+inserts and at most one extra UPDATE, never a statement per row.
+"""
+
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Set
+
+from sqlalchemy import case, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from ..models.activity_log import ActivityLog
+from ..models.game_item import GameItem
+from ..models.study_session import StudySession
+from ..models.word import Word
+from ..models.word_stats import WordStats
+from ..models.wrong_input import WrongInput
+
+# Halving the interval more than this many times always reaches the floor
+_MAX_HALVINGS = 30
+
+
+async def missing_ids(conn: AsyncConnection, column, ids: Iterable[int]) -> Set[int]:
+    """Ids from ``ids`` with no row in ``column``'s table (one IN query)."""
+    wanted = set(ids)
+    if not wanted:
+        return set()
+    found = await conn.execute(select(column).where(column.in_(wanted)))
+    return wanted - set(found.scalars().all())
+
+
+async def missing_word_ids(conn: AsyncConnection, ids: Iterable[int]) -> Set[int]:
+    return await missing_ids(conn, Word.id, ids)
+
+
+async def missing_session_ids(
+    conn: AsyncConnection, ids: Iterable[int]
+) -> Set[int]:
+    return await missing_ids(conn, StudySession.id, ids)
+
+
+async def insert_activity_logs(
+    conn: AsyncConnection, rows: List[Dict[str, Any]]
+) -> List[int]:
+    """Insert activity logs; returns their ids in row order."""
+    result = await conn.execute(
+        insert(ActivityLog).returning(
+            ActivityLog.id, sort_by_parameter_order=True
+        ),
+        rows,
+    )
+    return result.scalars().all()
+
+
+async def apply_mistake_penalties(
+    conn: AsyncConnection, word_ids: Iterable[int]
+) -> None:
+    """Update the stats of every word that was answered wrong.
+
+    A mistake resets the streak, lowers ease by 0.2 (floor 1.3) and halves
+    the interval (floor 1 day). ``k`` mistakes on one word are folded into
+    ``ease - 0.2k`` and ``interval >> k``, which equals applying the single
+    rule ``k`` times, so the whole batch is one UPDATE.
+    """
+    counts = Counter(word_ids)
+    if not counts:
+        return
+    mistakes = case(
+        {word_id: min(n, _MAX_HALVINGS) for word_id, n in counts.items()},
+        value=WordStats.word_id,
+        else_=0,
+    )
+    await conn.execute(
+        update(WordStats)
+        .where(WordStats.word_id.in_(counts))
+        .values(
+            current_streak=0,
+            ease_factor=func.max(1.3, WordStats.ease_factor - 0.2 * mistakes),
+            interval_days=func.max(
+                1, WordStats.interval_days.op(">>")(mistakes)
+            ),
+        )
+    )
+
+
+async def insert_wrong_inputs(
+    conn: AsyncConnection, rows: List[Dict[str, Any]]
+) -> List[int]:
+    """Insert wrong inputs and penalize their words; returns the new ids."""
+    result = await conn.execute(
+        insert(WrongInput).returning(
+            WrongInput.id, sort_by_parameter_order=True
+        ),
+        rows,
+    )
+    ids = result.scalars().all()
+    await apply_mistake_penalties(conn, (row["word_id"] for row in rows))
+    return ids
+
+
+async def insert_game_items(
+    conn: AsyncConnection, rows: List[Dict[str, Any]]
+) -> None:
+    await conn.execute(insert(GameItem), rows)
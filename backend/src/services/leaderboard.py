@@ -0,0 +1,177 @@
+"""
+Leaderboards of game scores per mode and time window.
+
+Every submitted result is written once per window (daily, weekly, all-time)
+into ``leaderboard_entries``, keyed by the period it falls in. The
+(mode, time_window, period_key, score) index lets top-K read the first K
+index entries and rank-of-session count the entries above a score, so
+neither query sorts or scans the whole results table. A session has one
+entry per window (unique on session_id, time_window): results are only
+recorded once per game.
+
+Rank lookups are O(rank), not O(log n): SQLite counts the index entries
+above the session's score one by one. That stays fast for boards of tens
+of thousands of games; a rank structure (e.g. an order-statistic tree per
+board) would only pay off far beyond that.
+"""
+
+from datetime import datetime
+from enum import Enum
+from typing import Dict, List, Optional
+
+from sqlalchemy import desc, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.game_result import GameResult
+from ..models.game_session import GameSession
+from ..models.leaderboard_entry import LeaderboardEntry
+
+
+class LeaderboardWindow(str, Enum):
+    DAILY = "daily"
+    WEEKLY = "weekly"
+    ALL_TIME = "all_time"
+
+
+def period_key(window: LeaderboardWindow, at: datetime) -> str:
+    """Key of the period that ``at`` falls in for a window."""
+    if window == LeaderboardWindow.DAILY:
+        return at.date().isoformat()
+    if window == LeaderboardWindow.WEEKLY:
+        year, week, _ = at.isocalendar()
+        return f"{year}-W{week:02d}"
+    return "all"
+
+
+def build_entries(
+    session: GameSession, result: GameResult
+) -> List[LeaderboardEntry]:
+    """One entry per window for a finished game."""
+    ended_at = result.ended_at or datetime.utcnow()
+    return [
+        LeaderboardEntry(
+            session_id=session.id,
+            mode=session.mode,
+            time_window=window.value,
+            period_key=period_key(window, ended_at),
+            score=result.score,
+            accuracy=result.accuracy,
+            ended_at=ended_at,
+        )
+        for window in LeaderboardWindow
+    ]
+
+
+async def record_result(
+    db: AsyncSession, session: GameSession, result: GameResult
+) -> None:
+    """Add a result to every window's board (caller commits).
+
+    Flushed here so a second result for the session fails on the unique
+    (session_id, time_window) index now, as an IntegrityError, rather than
+    at the caller's commit.
+    """
+    db.add_all(build_entries(session, result))
+    await db.flush()
+
+
+def _board_filter(mode: str, window: LeaderboardWindow, period: str):
+    return (
+        LeaderboardEntry.mode == mode,
+        LeaderboardEntry.time_window == window.value,
+        LeaderboardEntry.period_key == period,
+    )
+
+
+async def top_entries(
+    db: AsyncSession,
+    mode: str,
+    window: LeaderboardWindow,
+    limit: int = 10,
+    period: Optional[str] = None,
+) -> Dict:
+    """Top ``limit`` scores of a board, with competition ranking."""
+    period = period or period_key(window, datetime.utcnow())
+    query = (
+        select(LeaderboardEntry)
+        .where(*_board_filter(mode, window, period))
+        .order_by(desc(LeaderboardEntry.score), LeaderboardEntry.ended_at)
+        .limit(limit)
+    )
+    entries = (await db.execute(query)).scalars().all()
+
+    ranked = []
+    for position, entry in enumerate(entries, start=1):
+        tied = ranked and ranked[-1]["score"] == entry.score
+        ranked.append(
+            {
+                "rank": ranked[-1]["rank"] if tied else position,
+                "session_id": entry.session_id,
+                "score": entry.score,
+                "accuracy": entry.accuracy,
+                "ended_at": entry.ended_at,
+            }
+        )
+    return {
+        "mode": mode,
+        "window": window.value,
+        "period": period,
+        "entries": ranked,
+    }
+
+
+async def session_rank(
+    db: AsyncSession, session_id: int, window: LeaderboardWindow
+) -> Optional[Dict]:
+    """Rank of a session on the board its result was recorded in.
+
+    Returns None if the session has no leaderboard entry.
+    """
+    entry = (
+        await db.execute(
+            select(LeaderboardEntry).where(
+                LeaderboardEntry.session_id == session_id,
+                LeaderboardEntry.time_window == window.value,
+            )
+        )
+    ).scalar_one_or_none()
+    if entry is None:
+        return None
+
+    better = (
+        await db.execute(
+            select(func.count())
+            .select_from(LeaderboardEntry)
+            .where(
+                *_board_filter(entry.mode, window, entry.period_key),
+                LeaderboardEntry.score > entry.score,
+            )
+        )
+    ).scalar()
+    return {
+        "session_id": session_id,
+        "mode": entry.mode,
+        "window": window.value,
+        "period": entry.period_key,
+        "rank": better + 1,
+        "score": entry.score,
+    }
+
+
+async def rebuild_leaderboard(db: AsyncSession) -> int:
+    """Recreate every entry from game_results (caller commits).
+
+    Returns:
+        Number of results indexed
+    """
+    await db.execute(LeaderboardEntry.__table__.delete())
+    rows = await db.execute(
+        select(GameSession, GameResult).join(
+            GameResult, GameResult.session_id == GameSession.id
+        )
+    )
+    count = 0
+    for session, result in rows.all():
+        db.add_all(build_entries(session, result))
+        count += 1
+    return count
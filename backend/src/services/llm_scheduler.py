@@ -0,0 +1,251 @@
+"""
+Priority scheduler for calls against the Groq rate limit.
+
+Groq limits requests per minute and tokens per minute. Each call has to
+take one request and its estimated tokens from two token buckets before it
+goes upstream; when either runs dry, callers queue by priority class:
+
+    INTERACTIVE  a learner is waiting on the answer
+    PREFETCH     work done ahead of a learner (round pool refills)
+    BATCH        bulk generation and health checks
+
+The queue is served strictly in priority order, so background work only
+uses what interactive traffic leaves over. A call whose expected wait
+already exceeds its class's SLO is shed instead of queued; callers then
+fall back to cached or plain content.
+
+The priority is read from a context variable, so code paths that run in
+the background mark themselves once (``with llm_priority(...)``) and every
+call made underneath, including in tasks they spawn, inherits it.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from tools.latency_sketch import LatencySketch
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    PREFETCH = 1
+    BATCH = 2
+
+
+_priority: ContextVar[Priority] = ContextVar(
+    "llm_priority", default=Priority.INTERACTIVE
+)
+
+
+@contextmanager
+def llm_priority(priority: Priority) -> Iterator[None]:
+    """Run the enclosed LLM calls at ``priority``."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> Priority:
+    return _priority.get()
+
+
+class TokenBucket:
+    """Continuously refilling bucket holding at most one minute's budget"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0  # per second
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(
+            self.capacity, self.level + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def time_until(self, amount: float) -> float:
+        """Seconds until ``amount`` is available (after a refill)."""
+        if amount <= self.level:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        self.level -= amount
+
+    def give_back(self, amount: float) -> None:
+        self.level = min(self.capacity, self.level + amount)
+
+
+class LLMScheduler:
+    """Admits LLM calls under request and token budgets by priority"""
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        slo_ms: Dict[Priority, int],
+    ):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.slo_ms = slo_ms
+        # (priority, arrival, tokens, future)
+        self._waiters: List[Tuple[int, int, float, asyncio.Future]] = []
+        self._arrivals = itertools.count()
+        self._pump: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+        self.queue_ms = {priority: LatencySketch() for priority in Priority}
+        self.admitted = {priority: 0 for priority in Priority}
+        self.shed = {priority: 0 for priority in Priority}
+
+    async def acquire(
+        self, tokens: float, priority: Optional[Priority] = None
+    ) -> bool:
+        """Wait for budget for one call of about ``tokens`` tokens.
+
+        Returns False, without waiting, if the call is shed.
+        """
+        if priority is None:
+            priority = current_priority()
+        # A call larger than a minute's budget still has to fit eventually
+        tokens = min(tokens, self.tokens.capacity)
+        self._refill()
+
+        if not self._pending() and self._ready_in(tokens) == 0:
+            self._grant(tokens)
+            self._admit(priority, 0.0)
+            return True
+
+        if (
+            self.estimated_wait(tokens, priority) * 1000
+            > self.slo_ms[priority]
+        ):
+            self.shed[priority] += 1
+            return False
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        heapq.heappush(
+            self._waiters, (priority, next(self._arrivals), tokens, future)
+        )
+        self._kick(loop)
+        start = time.monotonic()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just as the caller went away
+                self.release(tokens)
+            raise
+        self._admit(priority, (time.monotonic() - start) * 1000)
+        return True
+
+    def try_acquire(self, tokens: float) -> bool:
+        """Take budget only if it is free right now and nobody is queued."""
+        tokens = min(tokens, self.tokens.capacity)
+        self._refill()
+        if self._pending() or self._ready_in(tokens) > 0:
+            return False
+        self._grant(tokens)
+        return True
+
+    def settle(self, estimated: float, used: float) -> None:
+        """Return tokens reserved beyond what a call actually used."""
+        if used < estimated:
+            self.tokens.give_back(estimated - used)
+
+    def release(self, tokens: float) -> None:
+        """Undo a grant whose call never went upstream."""
+        self.requests.give_back(1)
+        self.tokens.give_back(tokens)
+
+    def estimated_wait(
+        self, tokens: float, priority: Optional[Priority] = None
+    ) -> float:
+        """Seconds a new call would queue behind everything ahead of it."""
+        if priority is None:
+            priority = current_priority()
+        self._refill()
+        ahead = [
+            waiter
+            for waiter in self._waiters
+            if waiter[0] <= priority and not waiter[3].done()
+        ]
+        return max(
+            self.requests.time_until(len(ahead) + 1),
+            self.tokens.time_until(sum(w[2] for w in ahead) + tokens),
+        )
+
+    def metrics(self) -> Dict:
+        self._refill()
+        queued = {priority.name.lower(): 0 for priority in Priority}
+        for priority, _, _, future in self._waiters:
+            if not future.done():
+                queued[Priority(priority).name.lower()] += 1
+        return {
+            "requests_available": round(self.requests.level, 2),
+            "tokens_available": round(self.tokens.level),
+            "queued": queued,
+            "admitted": {p.name.lower(): n for p, n in self.admitted.items()},
+            "shed": {p.name.lower(): n for p, n in self.shed.items()},
+            "queue_ms": {
+                p.name.lower(): {
+                    "p50": sketch.quantile(0.5),
+                    "p99": sketch.quantile(0.99),
+                }
+                for p, sketch in self.queue_ms.items()
+            },
+        }
+
+    def _refill(self) -> None:
+        self.requests.refill()
+        self.tokens.refill()
+
+    def _ready_in(self, tokens: float) -> float:
+        return max(self.requests.time_until(1), self.tokens.time_until(tokens))
+
+    def _grant(self, tokens: float) -> None:
+        self.requests.take(1)
+        self.tokens.take(tokens)
+
+    def _admit(self, priority: Priority, waited_ms: float) -> None:
+        self.admitted[priority] += 1
+        self.queue_ms[priority].add(waited_ms)
+
+    def _pending(self) -> bool:
+        while self._waiters and self._waiters[0][3].done():
+            heapq.heappop(self._waiters)
+        return bool(self._waiters)
+
+    def _kick(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._pump is None or self._pump.done():
+            self._wakeup = asyncio.Event()
+            self._pump = loop.create_task(self._run())
+        else:
+            # The head of the queue may have changed
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        while self._pending():
+            _, _, tokens, future = self._waiters[0]
+            self._refill()
+            delay = self._ready_in(tokens)
+            if delay == 0:
+                heapq.heappop(self._waiters)
+                self._grant(tokens)
+                future.set_result(None)
+                continue
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
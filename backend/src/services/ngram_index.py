@@ -0,0 +1,442 @@
+"""
+Character and jamo n-gram TF-IDF index over the word catalog.
+
+A model-free counterpart to the embedding index: words are related when
+they are spelled alike, which is what typo-tolerant search and look-alike
+quiz distractors need. Each word is a sparse, L2-normalised TF-IDF vector
+over
+
+    k:  syllable unigrams and bigrams of ``korean``
+    j:  jamo bigrams and trigrams of ``korean``, so a single wrong
+        consonant or vowel spoils a few features instead of a syllable
+    l:  character trigrams of the ``english`` and ``romanization`` tokens
+
+The matrix is held twice as plain NumPy arrays: CSR by word (a word's own
+vector is the query for related words) and CSC by n-gram (postings walked
+to score queries). A batch of queries is scored together with a single
+``bincount`` over every (query, word) contribution.
+
+The index is built when the catalog is seeded and saved to
+NGRAM_INDEX_PATH; a process without the file builds it from SQLite on
+first use. Words created, edited or deleted through the API are applied
+in memory (new n-grams get the IDF of a term seen once) and the file is
+removed so the next load rebuilds with exact weights. The loaded index is
+keyed on ``catalog_generation()``, so other workers reload after a write;
+request handlers load and build it in a worker thread.
+"""
+
+import asyncio
+import logging
+import math
+import os
+import re
+import sqlite3
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from tools.hangul import to_jamo
+from ..config import NGRAM_INDEX_PATH, SQLITE_DB_PATH
+from .vocab_artifact import catalog_generation
+
+logger = logging.getLogger(__name__)
+
+_HANGUL = re.compile(r"[가-힣]+")
+_LATIN = re.compile(r"[a-z0-9]+")
+# Separates strings in the saved vocabulary and word columns
+_SEP = "\x1f"
+
+Scored = List[Tuple[int, float]]
+
+
+def text_features(text: Optional[str]) -> Counter:
+    """N-gram counts of a text; Hangul and Latin runs get their own kinds."""
+    features = Counter()
+    if not text:
+        return features
+    text = text.lower()
+    for token in _HANGUL.findall(text):
+        features.update(f"k:{char}" for char in token)
+        features.update(f"k:{token[i:i + 2]}" for i in range(len(token) - 1))
+        jamo = f"^{to_jamo(token)}$"
+        for n in (2, 3):
+            features.update(
+                f"j:{jamo[i:i + n]}" for i in range(len(jamo) - n + 1)
+            )
+    for token in _LATIN.findall(text):
+        padded = f"^{token}$"
+        features.update(f"l:{padded[i:i + 3]}" for i in range(len(padded) - 2))
+    return features
+
+
+def word_features(
+    korean: str, english: str, romanization: Optional[str]
+) -> Counter:
+    return (
+        text_features(korean)
+        + text_features(english)
+        + text_features(romanization)
+    )
+
+
+class NgramIndex:
+    """Sparse TF-IDF matrix of the catalog with batched top-k queries"""
+
+    def __init__(
+        self,
+        vocab: List[str],
+        idf: np.ndarray,
+        word_ids: np.ndarray,
+        words: List[Tuple[str, str, Optional[str]]],
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        data: np.ndarray,
+        n_built: int,
+    ):
+        self.vocab = {term: i for i, term in enumerate(vocab)}
+        self.idf = idf
+        self.word_ids = word_ids
+        self.words = words  # (korean, english, romanization) per row
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.n_built = n_built  # Words the IDF was computed over
+
+        self.alive = np.ones(len(word_ids), dtype=bool)
+        self.rows: Dict[int, int] = {
+            int(wid): row for row, wid in enumerate(word_ids)
+        }
+        self._postings: Optional[Tuple[np.ndarray, ...]] = None
+
+    @classmethod
+    def build(
+        cls, words: Iterable[Tuple[int, str, str, Optional[str]]]
+    ) -> "NgramIndex":
+        """Index (id, korean, english, romanization) rows."""
+        words = list(words)
+        counts = [word_features(k, e, r) for _, k, e, r in words]
+        df = Counter(term for features in counts for term in features)
+        vocab = sorted(df)
+        n = len(words)
+        idf = np.array(
+            [math.log((1 + n) / (1 + df[term])) + 1 for term in vocab],
+            dtype=np.float32,
+        )
+        index = cls(
+            vocab,
+            idf,
+            np.array([w[0] for w in words], dtype=np.int64),
+            [(k, e, r) for _, k, e, r in words],
+            np.zeros(1, dtype=np.int64),
+            np.zeros(0, dtype=np.int32),
+            np.zeros(0, dtype=np.float32),
+            n_built=n,
+        )
+        rows = [index._vectorize(features) for features in counts]
+        lengths = [len(cols) for cols, _ in rows]
+        index.indptr = np.concatenate([[0], np.cumsum(lengths)]).astype(
+            np.int64
+        )
+        if rows:
+            index.indices = np.concatenate([cols for cols, _ in rows])
+            index.data = np.concatenate([vals for _, vals in rows])
+        return index
+
+    def __len__(self) -> int:
+        return int(self.alive.sum())
+
+    def word(self, word_id: int) -> Optional[Tuple[str, str, Optional[str]]]:
+        """(korean, english, romanization) of an indexed word."""
+        row = self.rows.get(word_id)
+        return None if row is None else self.words[row]
+
+    def upsert(
+        self,
+        word_id: int,
+        korean: str,
+        english: str,
+        romanization: Optional[str] = None,
+    ) -> None:
+        """Index a created or edited word, replacing its old row."""
+        self.remove(word_id)
+        cols, vals = self._vectorize(
+            word_features(korean, english, romanization), grow=True
+        )
+        self.rows[word_id] = len(self.word_ids)
+        self.word_ids = np.append(self.word_ids, word_id)
+        self.words.append((korean, english, romanization))
+        self.alive = np.append(self.alive, True)
+        self.indices = np.concatenate([self.indices, cols])
+        self.data = np.concatenate([self.data, vals])
+        self.indptr = np.append(self.indptr, len(self.indices))
+        self._postings = None
+
+    def remove(self, word_id: int) -> None:
+        row = self.rows.pop(word_id, None)
+        if row is not None:
+            self.alive[row] = False
+
+    def lookup(self, texts: Sequence[str], k: int = 10) -> List[Scored]:
+        """Best matches for each text (Korean, English or romanization),
+        tolerant of typos."""
+        queries = [self._vectorize(text_features(text)) for text in texts]
+        return self._top_k(self._score(queries), k)
+
+    def related(
+        self, word_ids: Sequence[int], k: int = 10
+    ) -> List[Optional[Scored]]:
+        """Closest words to each word, itself excluded (None if unknown)."""
+        rows = [self.rows.get(wid) for wid in word_ids]
+        queries = [
+            (
+                self.indices[self.indptr[row] : self.indptr[row + 1]],
+                self.data[self.indptr[row] : self.indptr[row + 1]],
+            )
+            for row in rows
+            if row is not None
+        ]
+        scores = self._score(queries)
+        known = [row for row in rows if row is not None]
+        scores[np.arange(len(known)), known] = 0.0
+        found = iter(self._top_k(scores, k))
+        return [None if row is None else next(found) for row in rows]
+
+    def save(self, path: str) -> None:
+        """Write the index as an .npz (atomically renamed into place)."""
+        vocab = [None] * len(self.vocab)
+        for term, i in self.vocab.items():
+            vocab[i] = term
+        alive = self.alive
+        # Compact away removed rows
+        keep = np.flatnonzero(alive)
+        lengths = np.diff(self.indptr)[keep]
+        spans = [
+            np.arange(self.indptr[row], self.indptr[row + 1]) for row in keep
+        ]
+        take = np.concatenate(spans) if spans else np.zeros(0, dtype=int)
+        tmp = f"{path}.tmp.npz"
+        np.savez(
+            tmp,
+            vocab=_pack(vocab),
+            idf=self.idf,
+            word_ids=self.word_ids[keep],
+            words=_pack(
+                [field or "" for row in keep for field in self.words[row]]
+            ),
+            indptr=np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64),
+            indices=self.indices[take],
+            data=self.data[take],
+            n_built=np.array([self.n_built]),
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "NgramIndex":
+        with np.load(path) as arrays:
+            fields = _unpack(arrays["words"])
+            return cls(
+                _unpack(arrays["vocab"]),
+                arrays["idf"],
+                arrays["word_ids"],
+                [
+                    (fields[i], fields[i + 1], fields[i + 2] or None)
+                    for i in range(0, len(fields), 3)
+                ],
+                arrays["indptr"],
+                arrays["indices"],
+                arrays["data"],
+                n_built=int(arrays["n_built"][0]),
+            )
+
+    def _vectorize(
+        self, features: Counter, grow: bool = False
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Sparse L2-normalised TF-IDF (columns, weights) of some counts.
+
+        Unknown n-grams are dropped, or added to the vocabulary with
+        ``grow``.
+        """
+        cols, vals = [], []
+        for term, count in features.items():
+            col = self.vocab.get(term)
+            if col is None:
+                if not grow:
+                    continue
+                col = self.vocab[term] = len(self.vocab)
+                self.idf = np.append(
+                    self.idf,
+                    np.float32(math.log((1 + self.n_built) / 2) + 1),
+                )
+            cols.append(col)
+            vals.append((1 + math.log(count)) * self.idf[col])
+        order = np.argsort(cols)
+        cols = np.array(cols, dtype=np.int32)[order]
+        vals = np.array(vals, dtype=np.float32)[order]
+        norm = np.linalg.norm(vals)
+        return cols, vals / norm if norm else vals
+
+    def _score(self, queries: List[Tuple[np.ndarray, np.ndarray]]):
+        """Dense (queries x rows) cosine scores."""
+        n_rows = len(self.word_ids)
+        term_ptr, term_rows, term_vals = self._csc()
+        q_of, rows, vals = [], [], []
+        for q, (cols, weights) in enumerate(queries):
+            for col, weight in zip(cols, weights):
+                start, stop = term_ptr[col], term_ptr[col + 1]
+                if start == stop:
+                    continue
+                q_of.append(np.full(stop - start, q))
+                rows.append(term_rows[start:stop])
+                vals.append(term_vals[start:stop] * weight)
+        if not rows:
+            return np.zeros((len(queries), n_rows), dtype=np.float32)
+        flat = np.concatenate(q_of) * n_rows + np.concatenate(rows)
+        scores = np.bincount(
+            flat,
+            weights=np.concatenate(vals),
+            minlength=len(queries) * n_rows,
+        ).reshape(len(queries), n_rows)
+        scores[:, ~self.alive] = 0.0
+        return scores
+
+    def _top_k(self, scores: np.ndarray, k: int) -> List[Scored]:
+        results = []
+        for row_scores in scores:
+            if len(row_scores) > k:
+                top = np.argpartition(-row_scores, k)[:k]
+            else:
+                top = np.arange(len(row_scores))
+            top = top[np.argsort(-row_scores[top], kind="stable")]
+            results.append(
+                [
+                    (int(self.word_ids[row]), float(row_scores[row]))
+                    for row in top
+                    if row_scores[row] > 0
+                ]
+            )
+        return results
+
+    def _csc(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Postings: per n-gram, the rows containing it and their weights."""
+        if self._postings is None:
+            order = np.argsort(self.indices, kind="stable")
+            row_of = np.repeat(
+                np.arange(len(self.word_ids)), np.diff(self.indptr)
+            )
+            counts = np.bincount(self.indices, minlength=len(self.vocab))
+            self._postings = (
+                np.concatenate([[0], np.cumsum(counts)]),
+                row_of[order],
+                self.data[order],
+            )
+        return self._postings
+
+
+def _pack(strings: List[str]) -> np.ndarray:
+    return np.frombuffer(_SEP.join(strings).encode("utf-8"), dtype=np.uint8)
+
+
+def _unpack(packed: np.ndarray) -> List[str]:
+    text = packed.tobytes().decode("utf-8")
+    return text.split(_SEP) if text else []
+
+
+def build_ngram_index(
+    db_path: str = SQLITE_DB_PATH,
+    out_path: Optional[str] = NGRAM_INDEX_PATH,
+    generation=None,
+) -> NgramIndex:
+    """Index the catalog of ``db_path``, save it and serve it from now on."""
+    global _index, _generation
+    if generation is None:
+        generation = catalog_generation()
+    conn = sqlite3.connect(db_path)
+    try:
+        words = conn.execute(
+            "SELECT id, korean, english, romanization FROM words ORDER BY id"
+        ).fetchall()
+    finally:
+        conn.close()
+    index = NgramIndex.build(words)
+    if out_path:
+        index.save(out_path)
+    index._csc()
+    _index, _generation = index, generation
+    return index
+
+
+_index: Optional[NgramIndex] = None
+_generation = None  # catalog_generation() the index was loaded for
+
+
+def _load(generation=None) -> NgramIndex:
+    global _index, _generation
+    if generation is None:
+        generation = catalog_generation()
+    try:
+        index = NgramIndex.load(NGRAM_INDEX_PATH)
+        index._csc()
+    except (OSError, ValueError, KeyError):
+        return build_ngram_index(generation=generation)
+    _index, _generation = index, generation
+    return index
+
+
+def get_ngram_index() -> NgramIndex:
+    """The index, loaded from NGRAM_INDEX_PATH or built on first use and
+    again whenever the catalog changed."""
+    if _index is None or _generation != catalog_generation():
+        _load()
+    return _index
+
+
+async def load_ngram_index() -> NgramIndex:
+    """``get_ngram_index`` for handlers: loads and builds run in a
+    thread."""
+    generation = catalog_generation()
+    if _index is None or _generation != generation:
+        await asyncio.to_thread(_load, generation)
+    return _index
+
+
+def _mark_stale() -> None:
+    """Remove the file after this process's own write.
+
+    The in-memory index already has the write, so it stays current rather
+    than being reloaded for the generation the write bumped.
+    """
+    global _generation
+    try:
+        os.remove(NGRAM_INDEX_PATH)
+    except FileNotFoundError:
+        pass
+    if _index is not None:
+        _generation = catalog_generation()
+
+
+def ngram_index_word(
+    word_id: int, korean: str, english: str, romanization: Optional[str]
+) -> None:
+    """Apply a created or edited word to the loaded index, if any."""
+    global _index
+    if _index is not None:
+        try:
+            _index.upsert(word_id, korean, english, romanization)
+        except Exception as e:
+            logger.error(f"Failed to update n-gram index for {word_id}: {e}")
+            _index = None
+    _mark_stale()
+
+
+def ngram_unindex_word(word_id: int) -> None:
+    if _index is not None:
+        _index.remove(word_id)
+    _mark_stale()
+
+
+def invalidate_ngram_index() -> None:
+    """Forget the index after the catalog was replaced wholesale."""
+    global _index
+    _index = None
+    _mark_stale()
@@ -0,0 +1,166 @@
+"""
+Cache of generated practice content per (word, practice type).
+
+Batched group practice fills it one entry per word, so a later request for
+any of those words - alone or in another group - skips the LLM. Entries are
+dropped whenever ``catalog_generation()`` changes, since edited words need
+new content.
+
+Generated content is also persisted in ``practice_contents`` together with
+the word's text at generation time; a stored row is served only while the
+word still reads the same, and survives restarts.
+"""
+
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import PRACTICE_CACHE_SIZE
+from ..database import async_session_factory
+from ..models.practice_content import PracticeContent
+from .vocab_artifact import catalog_generation
+
+
+class PracticeCache:
+    """In-memory LRU of practice content"""
+
+    def __init__(self, max_entries: int = PRACTICE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[int, str], str]" = OrderedDict()
+        self._generation = None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, word_id: int, practice_type: str) -> Optional[str]:
+        self._check_generation()
+        key = (word_id, practice_type)
+        content = self._entries.get(key)
+        if content is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return content
+
+    def get_many(
+        self, word_ids: Iterable[int], practice_type: str
+    ) -> Dict[int, str]:
+        """Cached content for those of ``word_ids`` that have any."""
+        found = {}
+        for word_id in word_ids:
+            content = self.get(word_id, practice_type)
+            if content is not None:
+                found[word_id] = content
+        return found
+
+    def put(self, word_id: int, practice_type: str, content: str) -> None:
+        self._check_generation()
+        key = (word_id, practice_type)
+        self._entries[key] = content
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def metrics(self) -> Dict:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def _check_generation(self) -> None:
+        generation = catalog_generation()
+        if generation != self._generation:
+            self._entries.clear()
+            self._generation = generation
+
+
+# Global instance
+practice_cache = PracticeCache()
+
+
+async def load_practice(
+    db: AsyncSession, words: List[Dict], practice_type: str
+) -> Dict[int, str]:
+    """Cached or stored content for those of ``words`` that have any.
+
+    ``words`` are dicts with id, korean and english.
+    """
+    found = practice_cache.get_many(
+        [word["id"] for word in words], practice_type
+    )
+    missing = {word["id"]: word for word in words if word["id"] not in found}
+    if not missing:
+        return found
+
+    result = await db.execute(
+        select(
+            PracticeContent.word_id,
+            PracticeContent.korean,
+            PracticeContent.english,
+            PracticeContent.content,
+        ).where(
+            PracticeContent.practice_type == practice_type,
+            PracticeContent.word_id.in_(missing),
+        )
+    )
+    for word_id, korean, english, content in result.all():
+        word = missing[word_id]
+        if (korean, english) == (word["korean"], word["english"]):
+            practice_cache.put(word_id, practice_type, content)
+            found[word_id] = content
+    return found
+
+
+async def save_practice(
+    words: List[Dict],
+    practice_type: str,
+    contents: Dict[int, str],
+    first_token_ms: Optional[float] = None,
+    total_ms: Optional[float] = None,
+) -> None:
+    """Cache and persist generated content, replacing older versions."""
+    rows = [
+        {
+            "word_id": word["id"],
+            "practice_type": practice_type,
+            "korean": word["korean"],
+            "english": word["english"],
+            "content": contents[word["id"]],
+            "first_token_ms": first_token_ms,
+            "total_ms": total_ms,
+            "created_at": datetime.utcnow(),
+        }
+        for word in words
+        if word["id"] in contents
+    ]
+    if not rows:
+        return
+    for row in rows:
+        practice_cache.put(row["word_id"], practice_type, row["content"])
+
+    stmt = sqlite_insert(PracticeContent)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["word_id", "practice_type"],
+        set_={
+            column: stmt.excluded[column]
+            for column in (
+                "korean",
+                "english",
+                "content",
+                "first_token_ms",
+                "total_ms",
+                "created_at",
+            )
+        },
+    )
+    async with async_session_factory() as db:
+        await db.execute(stmt, rows)
+        await db.commit()
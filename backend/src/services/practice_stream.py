@@ -0,0 +1,134 @@
+"""
+Server-sent events for AI practice content.
+
+Relays Groq's streamed completion as it arrives, so the first words show
+up long before the whole answer is done::
+
+    data: {"delta": "..."}                      (repeated)
+
+    event: done
+    data: {"word_id", "type", "cached", "first_token_ms", "total_ms"}
+
+    event: error
+    data: {"detail": "..."}
+
+The finished text is saved like any other practice content, so a repeat
+request for the same word and type replays it in a single delta. Time to
+the first token and to the end of the stream are tracked separately.
+"""
+
+import json
+import logging
+import time
+from typing import AsyncIterator, Dict, Optional
+
+from tools.latency_sketch import LatencySketch
+from .groq_service import groq_service
+from .practice_cache import save_practice
+
+logger = logging.getLogger(__name__)
+
+
+class StreamLatency:
+    """First-token and total latency of generated (not replayed) streams"""
+
+    def __init__(self):
+        self.first_token = LatencySketch()
+        self.total = LatencySketch()
+        self.streams = 0
+        self.replayed = 0
+        self.failed = 0
+
+    def record(self, first_token_ms: float, total_ms: float) -> None:
+        self.streams += 1
+        self.first_token.add(first_token_ms)
+        self.total.add(total_ms)
+
+    def metrics(self) -> Dict:
+        return {
+            "streams": self.streams,
+            "replayed": self.replayed,
+            "failed": self.failed,
+            "first_token_ms": {
+                "p50": self.first_token.quantile(0.5),
+                "p90": self.first_token.quantile(0.9),
+                "p99": self.first_token.quantile(0.99),
+            },
+            "total_ms": {
+                "p50": self.total.quantile(0.5),
+                "p90": self.total.quantile(0.9),
+                "p99": self.total.quantile(0.99),
+            },
+        }
+
+
+# Global instance
+stream_latency = StreamLatency()
+
+
+def sse(data: Dict, event: Optional[str] = None) -> str:
+    """One server-sent event with a JSON payload."""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def practice_events(
+    word: Dict, practice_type: str, stored: Optional[str] = None
+) -> AsyncIterator[str]:
+    """SSE stream of practice content for ``word`` (id, korean, english).
+
+    ``stored`` is previously generated content to replay instead.
+    """
+    done = {"word_id": word["id"], "type": practice_type}
+    if stored is not None:
+        stream_latency.replayed += 1
+        yield sse({"delta": stored})
+        yield sse(
+            {**done, "cached": True, "first_token_ms": None, "total_ms": None},
+            event="done",
+        )
+        return
+
+    start = time.perf_counter()
+    first_token_ms = None
+    parts = []
+    try:
+        async for delta in groq_service.stream_practice_content(
+            word["korean"], word["english"], practice_type
+        ):
+            if first_token_ms is None:
+                first_token_ms = (time.perf_counter() - start) * 1000
+            parts.append(delta)
+            yield sse({"delta": delta})
+    except Exception as e:
+        stream_latency.failed += 1
+        logger.error(f"Practice stream failed for word {word['id']}: {e}")
+        yield sse({"detail": f"AI service error: {e}"}, event="error")
+        return
+    total_ms = (time.perf_counter() - start) * 1000
+
+    content = "".join(parts).strip()
+    if content:
+        stream_latency.record(first_token_ms, total_ms)
+        try:
+            await save_practice(
+                [word],
+                practice_type,
+                {word["id"]: content},
+                first_token_ms=first_token_ms,
+                total_ms=total_ms,
+            )
+        except Exception as e:
+            logger.error(
+                f"Failed to save practice content for word {word['id']}: {e}"
+            )
+
+    yield sse(
+        {
+            **done,
+            "cached": False,
+            "first_token_ms": first_token_ms,
+            "total_ms": total_ms,
+        },
+        event="done",
+    )
@@ -0,0 +1,382 @@
+"""
+Pool of pre-built game rounds.
+
+Building a round means sampling words and, with ``enhance``, a Groq call
+for hints and distractors - far too slow to do per request. The pool keeps
+up to ``size`` ready rounds per (level, count, enhance) key, already
+serialized to JSON, and refills a key in the background whenever a round is
+taken from it. Each pooled round is served once, so players still get fresh
+random words.
+
+Pooled rounds are dropped whenever ``catalog_generation()`` changes, i.e.
+after any catalog write or artifact rebuild. Until ``start()`` is called
+(scripts, tests without app startup) every request builds its round inline.
+
+``stream()`` serves the same rounds item by item: an enhanced round built
+on a miss is parsed out of Groq's streamed answer, so the first card can be
+played while the rest are still being written.
+"""
+
+import asyncio
+import json
+import logging
+from collections import OrderedDict, deque
+from typing import AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
+
+from tools.agent_quiz import AgentQuizGenerator
+from ..config import ROUND_POOL_BUILDERS, ROUND_POOL_MAX_KEYS, ROUND_POOL_SIZE
+from ..database import async_session_factory
+from ..models.word import Word
+from ..schemas.game import GameRoundItem, GameRoundResponse
+from .groq_service import groq_service
+from .llm_scheduler import Priority, llm_priority
+from .ngram_index import load_ngram_index
+from .vocab_artifact import catalog_generation, get_vocab_artifact
+
+logger = logging.getLogger(__name__)
+
+# Look-alike words considered when filling in missing distractors
+DISTRACTOR_CANDIDATES = 12
+
+# (level, count, enhance)
+RoundKey = Tuple[Optional[str], int, bool]
+
+
+def round_levels(level: Optional[str]) -> Optional[List[int]]:
+    """Map a round's level filter to TOPIK levels (None means all words)."""
+    if not level:
+        return None
+    if level.upper() == "TOPIK1":
+        return [1, 2]
+    if level.upper() == "TOPIK2":
+        return [3, 4, 5, 6]
+    # Try to parse as integer
+    try:
+        return [int(level)]
+    except ValueError:
+        return None  # Ignore invalid level, use all words
+
+
+async def sample_round_words(count: int, level: Optional[str]) -> List[dict]:
+    levels = round_levels(level)
+    artifact = get_vocab_artifact()
+    if artifact is not None:
+        # Serve from the memory-mapped catalog snapshot
+        return artifact.sample_words(count, levels)
+
+    query = select(Word.id, Word.korean, Word.english)
+    if levels is not None:
+        query = query.where(Word.topik_level.in_(levels))
+    query = query.order_by(func.random()).limit(count)
+
+    async with async_session_factory() as db:
+        result = await db.execute(query)
+        return [row._asdict() for row in result.all()]
+
+
+def _basic_items(words: List[dict]) -> List[GameRoundItem]:
+    return [
+        GameRoundItem(
+            word_id=word["id"],
+            korean=word["korean"],
+            english=word["english"],
+            hint=None,
+            distractors=None,
+        )
+        for word in words
+    ]
+
+
+async def fill_distractors(items: List[GameRoundItem]) -> None:
+    """Give enhanced items Groq left bare look-alike words as distractors.
+
+    Candidates are the words spelled most like the answer (n-gram index),
+    skipping any that share its meaning.
+    """
+    bare = [item for item in items if not item.distractors]
+    if not bare:
+        return
+    try:
+        index = await load_ngram_index()
+        neighbours = index.related(
+            [item.word_id for item in bare], DISTRACTOR_CANDIDATES
+        )
+    except Exception as e:
+        logger.error(f"Distractor lookup failed: {e}")
+        return
+    for item, related in zip(bare, neighbours):
+        picks = []
+        for word_id, _ in related or []:
+            english = index.word(word_id)[1]
+            if english.lower() == item.english.lower():
+                continue
+            if english not in picks:
+                picks.append(english)
+            if len(picks) == 3:
+                item.distractors = picks
+                break
+
+
+async def build_round(
+    count: int, level: Optional[str], enhance: bool
+) -> Tuple[Optional[GameRoundResponse], bool]:
+    """Build one round from scratch.
+
+    Returns:
+        The round (None if no words match) and whether it is complete, i.e.
+        enhancement, if requested, actually produced hints or distractors
+    """
+    words = await sample_round_words(count, level)
+    if not words:
+        return None, False
+
+    complete = True
+    if enhance:
+        # Use AI to generate hints and distractors
+        try:
+            agent_generator = AgentQuizGenerator(groq_service)
+            quiz_items = await agent_generator.generate_quiz_items(
+                [
+                    {
+                        "id": word["id"],
+                        "korean": word["korean"],
+                        "english": word["english"],
+                    }
+                    for word in words
+                ],
+                level or "TOPIK1",
+            )
+            items = [
+                GameRoundItem(
+                    word_id=item.word_id,
+                    korean=item.korean,
+                    english=item.answer_en,
+                    hint=item.hint,
+                    distractors=item.distractors,
+                )
+                for item in quiz_items
+            ]
+            # The generator quietly falls back to plain items on errors
+            complete = any(item.hint or item.distractors for item in items)
+        except Exception as e:
+            logger.error(
+                f"AI enhancement failed, falling back to basic items: {e}"
+            )
+            items = _basic_items(words)
+            complete = False
+        await fill_distractors(items)
+    else:
+        items = _basic_items(words)
+
+    return GameRoundResponse(items=items, count=len(items), level=level), complete
+
+
+async def stream_round_items(
+    count: int, level: Optional[str], enhance: bool
+) -> AsyncIterator[List[Dict]]:
+    """Build one round from scratch, yielding items as they become ready."""
+    words = await sample_round_words(count, level)
+    if not enhance:
+        if words:
+            yield [item.model_dump() for item in _basic_items(words)]
+        return
+
+    agent_generator = AgentQuizGenerator(groq_service)
+    async for item in agent_generator.stream_quiz_items(
+        [
+            {
+                "id": word["id"],
+                "korean": word["korean"],
+                "english": word["english"],
+            }
+            for word in words
+        ],
+        level or "TOPIK1",
+    ):
+        round_item = GameRoundItem(
+            word_id=item.word_id,
+            korean=item.korean,
+            english=item.answer_en,
+            hint=item.hint,
+            distractors=item.distractors,
+        )
+        await fill_distractors([round_item])
+        yield [round_item.model_dump()]
+
+
+async def build_round_payload(
+    count: int, level: Optional[str], enhance: bool
+) -> Tuple[Optional[bytes], bool]:
+    round_data, complete = await build_round(count, level, enhance)
+    if round_data is None:
+        return None, False
+    return round_data.model_dump_json().encode(), complete
+
+
+class RoundPool:
+    """Bounded per-key pools of serialized rounds with background refill"""
+
+    def __init__(
+        self,
+        size: int = ROUND_POOL_SIZE,
+        max_keys: int = ROUND_POOL_MAX_KEYS,
+        builders: int = ROUND_POOL_BUILDERS,
+    ):
+        self.size = size
+        self.max_keys = max_keys
+        self.builders = builders
+        self._pools: "OrderedDict[RoundKey, Deque[bytes]]" = OrderedDict()
+        self._refills: Dict[RoundKey, asyncio.Task] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._generation = None
+        self._running = False
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    async def start(self, warm: Optional[List[RoundKey]] = None) -> None:
+        self._semaphore = asyncio.Semaphore(self.builders)
+        self._generation = catalog_generation()
+        self._running = True
+        self.hits = self.misses = 0
+        for key in warm or []:
+            self._track(key)
+            self._schedule_refill(key)
+
+    async def stop(self) -> None:
+        self._running = False
+        for task in list(self._refills.values()):
+            task.cancel()
+        await asyncio.gather(*self._refills.values(), return_exceptions=True)
+        self._refills.clear()
+
+    def invalidate(self) -> None:
+        """Drop every pooled round; keys refill on their next request."""
+        for task in self._refills.values():
+            task.cancel()
+        self._refills.clear()
+        for pool in self._pools.values():
+            pool.clear()
+
+    async def get(
+        self, count: int, level: Optional[str], enhance: bool
+    ) -> Optional[bytes]:
+        """Serialized round for a key, or None if no words match."""
+        if not self._running:
+            payload, _ = await build_round_payload(count, level, enhance)
+            return payload
+
+        generation = catalog_generation()
+        if generation != self._generation:
+            self.invalidate()
+            self._generation = generation
+
+        key = (level, count, enhance)
+        pool = self._track(key)
+        if pool:
+            self.hits += 1
+            payload = pool.popleft()
+            self._schedule_refill(key)
+            return payload
+
+        self.misses += 1
+        self._schedule_refill(key)
+        payload, _ = await build_round_payload(count, level, enhance)
+        return payload
+
+    async def stream(
+        self, count: int, level: Optional[str], enhance: bool
+    ) -> AsyncIterator[List[Dict]]:
+        """A round's items in the batches they become ready in.
+
+        A pooled round comes out whole; yields nothing if no words match.
+        """
+        if self._running:
+            generation = catalog_generation()
+            if generation != self._generation:
+                self.invalidate()
+                self._generation = generation
+
+            key = (level, count, enhance)
+            pool = self._track(key)
+            if pool:
+                self.hits += 1
+                payload = pool.popleft()
+                self._schedule_refill(key)
+                yield json.loads(payload)["items"]
+                return
+            self.misses += 1
+            self._schedule_refill(key)
+
+        async for items in stream_round_items(count, level, enhance):
+            yield items
+
+    def metrics(self) -> Dict:
+        return {
+            "running": self._running,
+            "hits": self.hits,
+            "misses": self.misses,
+            "keys": len(self._pools),
+            "pooled": {
+                f"{level}:{count}:{'enhanced' if enhance else 'basic'}": len(pool)
+                for (level, count, enhance), pool in self._pools.items()
+            },
+            "refilling": len(self._refills),
+        }
+
+    def _track(self, key: RoundKey) -> Deque[bytes]:
+        pool = self._pools.get(key)
+        if pool is not None:
+            self._pools.move_to_end(key)
+            return pool
+        pool = self._pools[key] = deque(maxlen=self.size)
+        while len(self._pools) > self.max_keys:
+            evicted, _ = self._pools.popitem(last=False)
+            task = self._refills.pop(evicted, None)
+            if task is not None:
+                task.cancel()
+        return pool
+
+    def _schedule_refill(self, key: RoundKey) -> None:
+        if key in self._refills or len(self._pools[key]) >= self.size:
+            return
+        task = asyncio.create_task(self._refill(key, self._pools[key]))
+        self._refills[key] = task
+        task.add_done_callback(lambda t: self._refill_done(key, t))
+
+    def _refill_done(self, key: RoundKey, task: asyncio.Task) -> None:
+        if self._refills.get(key) is task:
+            del self._refills[key]
+
+    async def _refill(self, key: RoundKey, pool: Deque[bytes]) -> None:
+        level, count, enhance = key
+
+        async def build():
+            async with self._semaphore:
+                # Nobody is waiting on these yet; learners' calls go first
+                with llm_priority(Priority.PREFETCH):
+                    return await build_round_payload(count, level, enhance)
+
+        while len(pool) < self.size and self._pools.get(key) is pool:
+            missing = min(self.builders, self.size - len(pool))
+            results = await asyncio.gather(
+                *(build() for _ in range(missing)), return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error(f"Round pool refill for {key} failed: {result}")
+                    return
+                payload, complete = result
+                # Degraded rounds are served on a miss but never pooled
+                if payload is None or not complete:
+                    return
+                pool.append(payload)
+
+
+# Global instance, started with the app
+round_pool = RoundPool()
@@ -0,0 +1,390 @@
+"""
+Inverted index from words to every sample sentence that uses them.
+
+Each sample sentence is seeded for one word, but most sentences use several
+catalog words. Sentences are split into eojeol (the space-separated units
+of Korean), and each eojeol is matched to words with light stripping:
+
+    nouns       the eojeol minus a trailing particle (주머니에 -> 주머니)
+    predicates  the dictionary form minus 다, followed by an ending
+                (얻고 -> 얻다), including endings fused onto the last
+                syllable (편리합니다 -> 편리하다, 켰고 -> 켜다)
+    phrases     multi-eojeol words, matched as substrings
+
+The longest match wins, so 사무실은 is 사무실 and not 사무. Postings are
+kept per word sorted by sentence length - short sentences first, the ones
+a learner reads most easily - so a lookup is a dict access and a slice.
+
+The index is built from SQLite on first use (a fraction of a second for
+the seeded catalog, run in a worker thread from request handlers) and
+keyed on ``catalog_generation()``, so a write made by another worker gets
+it rebuilt. Writes made by this process are applied in place: an added
+sentence is matched and inserted, and an added, edited or deleted word
+re-matches only the eojeol it could change. Reseeds drop the index.
+"""
+
+import asyncio
+import bisect
+import logging
+import re
+import sqlite3
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from tools.hangul import compose, decompose
+from ..config import SQLITE_DB_PATH
+from .vocab_artifact import catalog_generation
+
+logger = logging.getLogger(__name__)
+
+_EOJEOL = re.compile(r"[가-힣]+")
+_SPACES = re.compile(r"\s+")
+
+# Particles (and copula forms) that may follow a noun, "" for none
+PARTICLES = {
+    "", "이", "가", "은", "는", "을", "를", "의", "에", "도", "만", "와",
+    "과", "로", "으로", "에서", "에게", "한테", "께", "께서", "까지",
+    "부터", "처럼", "보다", "만큼", "마다", "이나", "나", "이랑", "랑",
+    "하고", "에는", "에도", "에서는", "에서도", "으로는", "로는", "에게는",
+    "이다", "입니다", "이에요", "예요", "이야", "야", "이었다", "였다",
+    "이었습니다", "였습니다", "이라고", "라고", "이라는", "라는", "들",
+    "들이", "들은", "들을", "들의", "들에게", "들도",
+}  # fmt: skip
+
+# First syllables of verb/adjective endings after a bare stem
+ENDING_STARTS = set(
+    "고다어아았었였는은을게지면니네세습시셨서도요기음며자러려겠던든라래냐나"
+    "여워와"
+)
+
+# Finals an ending fuses onto the stem's last syllable: 합니다, 할, 한, 함, 했
+_FUSED_FINALS = {4, 8, 16, 17, 20}
+
+NON_PREDICATE_POS = {
+    "n", "noun", "adverb", "pronoun", "determiner", "number", "counter",
+    "interjection",
+}  # fmt: skip
+
+Posting = Tuple[int, int]  # (sentence length, sentence id)
+
+
+def eojeols(sentence: str) -> List[str]:
+    """Hangul runs of a sentence, punctuation and digits dropped."""
+    return _EOJEOL.findall(sentence)
+
+
+class SentenceIndex:
+    """Words to the sentences that use them"""
+
+    def __init__(self, words: Iterable[Tuple[int, str, Optional[str]]]):
+        """Index (id, korean, part_of_speech) rows for matching."""
+        self.nouns: Dict[str, List[int]] = {}
+        self.stems: Dict[str, List[int]] = {}
+        self.phrases: List[Tuple[str, int]] = []
+        # word_id -> (kind, form): how the word is matched
+        self.forms: Dict[int, Tuple[str, str]] = {}
+        for word_id, korean, pos in words:
+            self._register(word_id, korean, pos)
+
+        self.sentences: Dict[int, Tuple[int, str, str]] = {}
+        self.postings: Dict[int, List[Posting]] = {}
+        # sentence_id -> words it is posted under, to re-match on word edits
+        self.uses: Dict[int, Set[int]] = {}
+        self.tokens: Dict[str, Set[int]] = {}  # eojeol -> sentence ids
+        # Eojeol repeat a lot across sentences; match each form once
+        self._matches: Dict[str, List[int]] = {}
+
+    @classmethod
+    def build(
+        cls,
+        words: Iterable[Tuple[int, str, Optional[str]]],
+        sentences: Iterable[Tuple[int, int, str, str]],
+    ) -> "SentenceIndex":
+        """Index (id, word_id, korean, english) sentence rows."""
+        index = cls(words)
+        for row in sentences:
+            index._insert(*row, sort=False)
+        for postings in index.postings.values():
+            postings.sort()
+        return index
+
+    def add(
+        self, sentence_id: int, word_id: int, korean: str, english: str
+    ) -> None:
+        """Index a newly added sentence."""
+        self._insert(sentence_id, word_id, korean, english, sort=True)
+
+    def index_word(
+        self, word_id: int, korean: str, pos: Optional[str] = None
+    ) -> None:
+        """Add or re-spell a word, updating the sentences it changes."""
+        affected = self._unregister(word_id)
+        self._register(word_id, korean, pos)
+        self._rematch(affected | self._touched_by(word_id))
+
+    def unindex_word(self, word_id: int) -> None:
+        """Forget a deleted word along with the sentences seeded for it."""
+        owned = [
+            sentence_id
+            for sentence_id, (owner, _, _) in self.sentences.items()
+            if owner == word_id
+        ]
+        for sentence_id in owned:
+            self._drop(sentence_id)
+        self._rematch(self._unregister(word_id))
+
+    def words_in(self, sentence: str) -> Set[int]:
+        """Catalog words a sentence uses."""
+        found = set()
+        for token in eojeols(sentence):
+            matches = self._matches.get(token)
+            if matches is None:
+                matches = self._matches[token] = self._match(token)
+            found.update(matches)
+        if self.phrases:
+            text = _SPACES.sub(" ", sentence)
+            found.update(wid for phrase, wid in self.phrases if phrase in text)
+        return found
+
+    def sentences_for(
+        self, word_id: int, limit: Optional[int] = None
+    ) -> List[Dict]:
+        """Sentences using a word, shortest first."""
+        postings = self.postings.get(word_id, ())
+        if limit is not None:
+            postings = postings[:limit]
+        out = []
+        for _, sentence_id in postings:
+            owner, korean, english = self.sentences[sentence_id]
+            out.append(
+                {
+                    "id": sentence_id,
+                    "word_id": owner,
+                    "sentence_korean": korean,
+                    "sentence_english": english,
+                }
+            )
+        return out
+
+    def _insert(
+        self,
+        sentence_id: int,
+        word_id: int,
+        korean: str,
+        english: str,
+        sort: bool,
+    ) -> None:
+        self.sentences[sentence_id] = (word_id, korean, english)
+        for token in eojeols(korean):
+            self.tokens.setdefault(token, set()).add(sentence_id)
+        posting = (len(korean), sentence_id)
+        uses = self.uses[sentence_id] = self.words_in(korean) | {word_id}
+        for wid in uses:
+            postings = self.postings.setdefault(wid, [])
+            if sort:
+                bisect.insort(postings, posting)
+            else:
+                postings.append(posting)
+
+    def _drop(self, sentence_id: int) -> None:
+        _, korean, _ = self.sentences.pop(sentence_id)
+        for token in eojeols(korean):
+            self.tokens.get(token, set()).discard(sentence_id)
+        for wid in self.uses.pop(sentence_id):
+            self._unpost(wid, (len(korean), sentence_id))
+
+    def _unpost(self, word_id: int, posting: Posting) -> None:
+        postings = self.postings.get(word_id, [])
+        i = bisect.bisect_left(postings, posting)
+        if i < len(postings) and postings[i] == posting:
+            del postings[i]
+        if not postings:
+            self.postings.pop(word_id, None)
+
+    def _register(self, word_id: int, korean: str, pos: Optional[str]) -> None:
+        korean = _SPACES.sub(" ", korean or "").strip()
+        if " " in korean:
+            self.phrases.append((korean, word_id))
+            self.forms[word_id] = ("phrase", korean)
+        elif (
+            len(korean) > 1
+            and korean.endswith("다")
+            and (pos or "").lower() not in NON_PREDICATE_POS
+        ):
+            self.stems.setdefault(korean[:-1], []).append(word_id)
+            self.forms[word_id] = ("stem", korean[:-1])
+        elif korean:
+            self.nouns.setdefault(korean, []).append(word_id)
+            self.forms[word_id] = ("noun", korean)
+
+    def _unregister(self, word_id: int) -> Set[int]:
+        """Remove a word from matching; the sentences it was found in."""
+        form = self.forms.pop(word_id, None)
+        if form is None:
+            return set()
+        kind, text = form
+        if kind == "phrase":
+            self.phrases.remove((text, word_id))
+        else:
+            table = self.nouns if kind == "noun" else self.stems
+            table[text].remove(word_id)
+            if not table[text]:
+                del table[text]
+            for token in [t for t, m in self._matches.items() if word_id in m]:
+                del self._matches[token]
+        return {
+            sentence_id for _, sentence_id in self.postings.get(word_id, ())
+        }
+
+    def _touched_by(self, word_id: int) -> Set[int]:
+        """Sentences a newly registered word may now match in."""
+        form = self.forms.get(word_id)
+        if form is None:
+            return set()
+        kind, text = form
+        if kind == "phrase":
+            return {
+                sentence_id
+                for sentence_id, (_, korean, _) in self.sentences.items()
+                if text in _SPACES.sub(" ", korean)
+            }
+        # Fused endings only change the stem's last syllable, so every
+        # eojeol the word can match starts with the rest of it
+        lead = text if kind == "noun" else text[:-1]
+        touched = set()
+        for token, sentence_ids in self.tokens.items():
+            if token.startswith(lead):
+                self._matches.pop(token, None)
+                touched |= sentence_ids
+        return touched
+
+    def _rematch(self, sentence_ids: Iterable[int]) -> None:
+        """Re-derive the words of sentences and move their postings."""
+        for sentence_id in sentence_ids:
+            if sentence_id not in self.sentences:
+                continue
+            owner, korean, _ = self.sentences[sentence_id]
+            posting = (len(korean), sentence_id)
+            before = self.uses[sentence_id]
+            now = self.words_in(korean) | {owner}
+            for wid in before - now:
+                self._unpost(wid, posting)
+            for wid in now - before:
+                bisect.insort(self.postings.setdefault(wid, []), posting)
+            self.uses[sentence_id] = now
+
+    def _match(self, token: str) -> List[int]:
+        """Words an eojeol is a form of, by the longest matching prefix."""
+        for cut in range(len(token), 0, -1):
+            prefix, rest = token[:cut], token[cut:]
+            found = []
+            if rest in PARTICLES:
+                found += self.nouns.get(prefix, ())
+            if not rest or rest[0] in ENDING_STARTS:
+                found += self._predicates(prefix, bare=bool(rest))
+            if found:
+                return found
+        return []
+
+    def _predicates(self, prefix: str, bare: bool) -> List[int]:
+        """Predicates whose stem ``prefix`` is, alone or with an ending
+        fused on; a bare stem needs an ending after it (내 is "my", not
+        내다)."""
+        found = list(self.stems.get(prefix, ())) if bare else []
+        initial, medial, final = decompose(prefix[-1])
+        if final in _FUSED_FINALS:
+            found += self.stems.get(prefix[:-1] + compose(initial, medial), ())
+        if prefix[-1] in ("해", "했"):
+            found += self.stems.get(prefix[:-1] + "하", ())
+        return found
+
+
+_index: Optional[SentenceIndex] = None
+_generation = None  # catalog_generation() the index was built for
+
+
+def build_sentence_index(
+    db_path: str = SQLITE_DB_PATH, generation=None
+) -> SentenceIndex:
+    """Index the sentences of ``db_path`` and serve them from now on."""
+    global _index, _generation
+    if generation is None:
+        generation = catalog_generation()
+    conn = sqlite3.connect(db_path)
+    try:
+        words = conn.execute(
+            "SELECT id, korean, part_of_speech FROM words"
+        ).fetchall()
+        sentences = conn.execute(
+            "SELECT id, word_id, sentence_korean, sentence_english "
+            "FROM sample_sentences"
+        ).fetchall()
+    finally:
+        conn.close()
+    _index, _generation = SentenceIndex.build(words, sentences), generation
+    return _index
+
+
+def get_sentence_index() -> SentenceIndex:
+    """The index, rebuilt from SQLite when the catalog changed."""
+    if _index is None or _generation != catalog_generation():
+        build_sentence_index()
+    return _index
+
+
+async def load_sentence_index() -> SentenceIndex:
+    """``get_sentence_index`` for handlers: rebuilds run in a thread."""
+    generation = catalog_generation()
+    if _index is None or _generation != generation:
+        await asyncio.to_thread(
+            build_sentence_index, SQLITE_DB_PATH, generation
+        )
+    return _index
+
+
+def _apply(change: Callable[[SentenceIndex], None], what: str) -> None:
+    """Apply this process's own catalog write to a built index.
+
+    The write bumped ``catalog_generation()``; the index already has it,
+    so it is marked current instead of being rebuilt.
+    """
+    global _index, _generation
+    if _index is None:
+        return
+    try:
+        change(_index)
+    except Exception as e:
+        logger.error(f"Failed to index {what}: {e}")
+        invalidate_sentence_index()
+        return
+    _generation = catalog_generation()
+
+
+def sentence_index_add(
+    sentence_id: int, word_id: int, korean: str, english: str
+) -> None:
+    """Apply a sentence added through the API, if the index is built."""
+    _apply(
+        lambda index: index.add(sentence_id, word_id, korean, english),
+        f"sentence {sentence_id}",
+    )
+
+
+def sentence_index_word(
+    word_id: int, korean: str, pos: Optional[str] = None
+) -> None:
+    """Apply a created or edited word, if the index is built."""
+    _apply(
+        lambda index: index.index_word(word_id, korean, pos),
+        f"word {word_id}",
+    )
+
+
+def sentence_unindex_word(word_id: int) -> None:
+    """Apply a deleted word, if the index is built."""
+    _apply(lambda index: index.unindex_word(word_id), f"word {word_id}")
+
+
+def invalidate_sentence_index() -> None:
+    """Forget the index after a reseed; the next query rebuilds it."""
+    global _index
+    _index = None
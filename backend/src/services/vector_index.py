@@ -0,0 +1,584 @@
+"""
+Local embedding index over words and sample sentences.
+
+The index is built from the SQLite database by
+``scripts/build_vector_index.py``: every word ("korean english") and every
+sample sentence is embedded on the CPU and stored, L2-normalised, in one
+memory-mapped file. Vectors are float32, or int8 with a float32 scale per
+row (a quarter of the size, cosine scores within about 1%).
+
+Search is exact by default - one blocked ``vectors @ query`` matmul. An
+index built with ``n_lists`` also stores k-means centroids with its rows
+grouped by nearest centroid (IVF), and a query then only scores the rows of
+its ``nprobe`` closest lists.
+
+Words created, edited or deleted through the API are applied to an
+in-memory delta on top of the mapped file, so related-word lookups see them
+at once; the delta is per process and is dropped when the file is rebuilt.
+
+Layout (little endian, every section 8-byte aligned)::
+
+    header        magic, version, dim, rows, dtype, lists, embedder name
+    word_ids      i32 per row (the word a row belongs to)
+    kinds         u8 per row (0 word, 1 sentence)
+    scales        f32 per row (int8 only)
+    vectors       f32 or i8, rows x dim
+    centroids     f32, lists x dim
+    list_start    i32, lists + 1 (CSR over rows)
+"""
+
+import logging
+import os
+import sqlite3
+import struct
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..config import (
+    EMBEDDING_BACKEND,
+    EMBEDDING_MODEL,
+    VECTOR_INDEX_PATH,
+    VECTOR_IVF_NPROBE,
+)
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"HXVEC\x00\x00\x00"
+VERSION = 1
+FLOAT32 = 0
+INT8 = 1
+KIND_WORD = 0
+KIND_SENTENCE = 1
+
+_HEADER = struct.Struct("<8s5I32s")
+_HEADER_SIZE = 64
+
+# Rows scored per matmul in exact search, bounding the temporary arrays
+_BLOCK_ROWS = 32768
+
+
+class HashingEmbedder:
+    """Feature-hashed character n-grams; needs no model download.
+
+    Captures spelling overlap (shared syllables, shared English words)
+    rather than meaning, which is enough to group word families.
+    """
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+        self.name = f"hashing:{dim}"
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in text.lower().split():
+                padded = f" {token} "
+                grams = [token] + [
+                    padded[i : i + n]
+                    for n in (2, 3)
+                    for i in range(len(padded) - n + 1)
+                ]
+                for gram in grams:
+                    h = zlib.crc32(gram.encode("utf-8"))
+                    vectors[row, h % self.dim] += (
+                        -1.0 if h & 0x80000000 else 1.0
+                    )
+        return _normalize(vectors)
+
+
+class SentenceTransformerEmbedder:
+    """A sentence-transformers model (optional dependency)"""
+
+    def __init__(self, model_name: str = EMBEDDING_MODEL):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError(
+                "EMBEDDING_BACKEND=sentence-transformers needs the "
+                "sentence-transformers package"
+            ) from e
+        self.model = SentenceTransformer(model_name, device="cpu")
+        self.dim = self.model.get_sentence_embedding_dimension()
+        self.name = f"sentence-transformers:{model_name}"
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = self.model.encode(
+            list(texts),
+            batch_size=64,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+        )
+        return vectors.astype(np.float32)
+
+
+def create_embedder(name: str = EMBEDDING_BACKEND):
+    """Embedder for a backend ("hashing", "sentence-transformers") or the
+    name an index was built with ("hashing:256", ...)."""
+    backend, _, arg = name.partition(":")
+    if backend == "hashing":
+        return HashingEmbedder(int(arg) if arg else 256)
+    if backend == "sentence-transformers":
+        return SentenceTransformerEmbedder(arg or EMBEDDING_MODEL)
+    raise ValueError(f"Unknown embedding backend: {name}")
+
+
+def word_text(korean: str, english: str) -> str:
+    return f"{korean} {english}"
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _align(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def _layout(
+    dim: int, rows: int, dtype: int, lists: int
+) -> Dict[str, Tuple[int, np.dtype, Tuple[int, ...]]]:
+    """(offset, dtype, shape) of every section."""
+    sections = [
+        ("word_ids", np.dtype("<i4"), (rows,)),
+        ("kinds", np.dtype("u1"), (rows,)),
+        ("scales", np.dtype("<f4"), (rows if dtype == INT8 else 0,)),
+        (
+            "vectors",
+            np.dtype("i1") if dtype == INT8 else np.dtype("<f4"),
+            (rows, dim),
+        ),
+        ("centroids", np.dtype("<f4"), (lists, dim)),
+        ("list_start", np.dtype("<i4"), (lists + 1 if lists else 0,)),
+    ]
+    layout = {}
+    offset = _HEADER_SIZE
+    for name, np_dtype, shape in sections:
+        layout[name] = (offset, np_dtype, shape)
+        offset = _align(offset + np_dtype.itemsize * int(np.prod(shape)))
+    return layout
+
+
+def quantize_int8(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Symmetric per-row int8 codes and the scales that undo them."""
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.rint(vectors / scales[:, None]).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def kmeans(
+    vectors: np.ndarray, n_lists: int, iterations: int = 10, seed: int = 0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Spherical k-means: unit centroids and each row's list."""
+    rng = np.random.default_rng(seed)
+    n_lists = min(n_lists, len(vectors))
+    centroids = vectors[rng.choice(len(vectors), n_lists, replace=False)]
+    for _ in range(iterations):
+        assign = np.argmax(vectors @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, vectors)
+        empty = ~sums.any(axis=1)
+        # Re-seed empty lists from random rows
+        sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()))]
+        centroids = _normalize(sums)
+    assign = np.argmax(vectors @ centroids.T, axis=1)
+    return centroids.astype(np.float32), assign
+
+
+def build_vector_index(
+    db_path: str,
+    out_path: str,
+    embedder=None,
+    quantize: str = "float32",
+    n_lists: int = 0,
+    batch_size: int = 256,
+) -> Dict[str, int]:
+    """Embed the catalog of ``db_path`` into an index file.
+
+    Args:
+        quantize: "float32" or "int8"
+        n_lists: IVF lists (0 builds an exact-search-only index)
+
+    Written next to ``out_path`` and atomically renamed into place.
+    """
+    if quantize not in ("float32", "int8"):
+        raise ValueError(f"Unknown quantization: {quantize}")
+    embedder = embedder or create_embedder()
+
+    conn = sqlite3.connect(db_path)
+    try:
+        words = conn.execute(
+            "SELECT id, korean, english FROM words ORDER BY id"
+        ).fetchall()
+        sentences = conn.execute(
+            "SELECT word_id, sentence_korean, sentence_english "
+            "FROM sample_sentences ORDER BY id"
+        ).fetchall()
+    finally:
+        conn.close()
+
+    docs = [(wid, KIND_WORD, word_text(k, e)) for wid, k, e in words] + [
+        (wid, KIND_SENTENCE, f"{k} {e}") for wid, k, e in sentences
+    ]
+    rows = len(docs)
+    vectors = np.zeros((rows, embedder.dim), dtype=np.float32)
+    for start in range(0, rows, batch_size):
+        batch = [text for _, _, text in docs[start : start + batch_size]]
+        vectors[start : start + len(batch)] = embedder.embed(batch)
+    word_ids = np.array([d[0] for d in docs], dtype=np.int32)
+    kinds = np.array([d[1] for d in docs], dtype=np.uint8)
+
+    lists = min(n_lists, rows)
+    centroids = np.zeros((0, embedder.dim), dtype=np.float32)
+    list_start = np.zeros(0, dtype=np.int32)
+    if lists:
+        centroids, assign = kmeans(vectors, lists)
+        lists = len(centroids)
+        # Group rows by list so each list is one contiguous slice
+        order = np.argsort(assign, kind="stable")
+        vectors, word_ids, kinds = (
+            vectors[order],
+            word_ids[order],
+            kinds[order],
+        )
+        counts = np.bincount(assign, minlength=lists)
+        list_start = np.concatenate([[0], np.cumsum(counts)]).astype(np.int32)
+
+    dtype = INT8 if quantize == "int8" else FLOAT32
+    sections = {
+        "word_ids": word_ids,
+        "kinds": kinds,
+        "scales": np.zeros(0, dtype=np.float32),
+        "vectors": vectors,
+        "centroids": centroids,
+        "list_start": list_start,
+    }
+    if dtype == INT8:
+        sections["vectors"], sections["scales"] = quantize_int8(vectors)
+
+    layout = _layout(embedder.dim, rows, dtype, lists)
+    out = Path(out_path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_suffix(out.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(
+            _HEADER.pack(
+                MAGIC,
+                VERSION,
+                embedder.dim,
+                rows,
+                dtype,
+                lists,
+                embedder.name.encode("utf-8")[:32],
+            ).ljust(_HEADER_SIZE, b"\x00")
+        )
+        for name, (offset, np_dtype, _) in layout.items():
+            f.write(b"\x00" * (offset - f.tell()))
+            f.write(sections[name].astype(np_dtype, copy=False).tobytes())
+    os.replace(tmp, out)
+    return {
+        "n_words": len(words),
+        "n_sentences": len(sentences),
+        "dim": embedder.dim,
+        "n_lists": lists,
+    }
+
+
+class VectorIndex:
+    """Read-only mapped index plus this process's in-memory changes"""
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        with open(self.path, "rb") as f:
+            header = f.read(_HEADER_SIZE)
+        if len(header) < _HEADER_SIZE:
+            raise ValueError(f"{self.path} is not a v{VERSION} vector index")
+        magic, version, dim, rows, dtype, lists, name = _HEADER.unpack_from(
+            header
+        )
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{self.path} is not a v{VERSION} vector index")
+        self.dim = dim
+        self.rows = rows
+        self.quantized = dtype == INT8
+        self.n_lists = lists
+        self.embedder_name = name.rstrip(b"\x00").decode("utf-8")
+        self._embedder = None
+
+        self._mm = np.memmap(self.path, dtype=np.uint8, mode="r")
+        self._cols = {}
+        for col, (offset, np_dtype, shape) in _layout(
+            dim, rows, dtype, lists
+        ).items():
+            count = int(np.prod(shape))
+            if count == 0:
+                self._cols[col] = np.zeros(shape, dtype=np_dtype)
+                continue
+            self._cols[col] = np.frombuffer(
+                self._mm, dtype=np_dtype, count=count, offset=offset
+            ).reshape(shape)
+
+        word_rows = np.flatnonzero(self._cols["kinds"] == KIND_WORD)
+        ids = self._cols["word_ids"][word_rows]
+        order = np.argsort(ids, kind="stable")
+        self._word_ids_sorted = ids[order]
+        self._word_rows_sorted = word_rows[order]
+
+        # Delta: rows added since the build, words deleted since (all their
+        # rows) and words edited since (their word row)
+        self._removed = set()
+        self._replaced = set()
+        self._delta_ids: List[int] = []
+        self._delta_kinds: List[int] = []
+        self._delta_vectors: List[np.ndarray] = []
+        self._delta_matrix: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return self.rows + len(self._delta_ids)
+
+    @property
+    def embedder(self):
+        if self._embedder is None:
+            self._embedder = create_embedder(self.embedder_name)
+        return self._embedder
+
+    def add_word(self, word_id: int, korean: str, english: str) -> None:
+        """Index a created or edited word, replacing its old vector."""
+        self._replaced.add(word_id)
+        # Only the word's own row; sentences added since stay indexed
+        self._drop_delta(word_id, (KIND_WORD,))
+        self._add_delta(word_id, KIND_WORD, word_text(korean, english))
+
+    def add_text(self, word_id: int, text: str) -> None:
+        """Index more text (e.g. a new sample sentence) for a word."""
+        self._add_delta(word_id, KIND_SENTENCE, text)
+
+    def remove_word(self, word_id: int) -> None:
+        """Drop a deleted word and its sentences."""
+        self._removed.add(word_id)
+        self._drop_delta(word_id, (KIND_WORD, KIND_SENTENCE))
+
+    def _add_delta(self, word_id: int, kind: int, text: str) -> None:
+        self._delta_ids.append(word_id)
+        self._delta_kinds.append(kind)
+        self._delta_vectors.append(self.embedder.embed([text])[0])
+        self._delta_matrix = None
+
+    def _drop_delta(self, word_id: int, kinds: Tuple[int, ...]) -> None:
+        keep = [
+            i
+            for i, (wid, kind) in enumerate(
+                zip(self._delta_ids, self._delta_kinds)
+            )
+            if wid != word_id or kind not in kinds
+        ]
+        if len(keep) != len(self._delta_ids):
+            self._delta_ids = [self._delta_ids[i] for i in keep]
+            self._delta_kinds = [self._delta_kinds[i] for i in keep]
+            self._delta_vectors = [self._delta_vectors[i] for i in keep]
+            self._delta_matrix = None
+
+    def word_vector(self, word_id: int) -> Optional[np.ndarray]:
+        """The vector a word was indexed with, or None if it isn't."""
+        if word_id in self._replaced:
+            for wid, kind, vector in zip(
+                self._delta_ids, self._delta_kinds, self._delta_vectors
+            ):
+                if wid == word_id and kind == KIND_WORD:
+                    return vector
+            return None
+        if word_id in self._removed:
+            return None
+        pos = np.searchsorted(self._word_ids_sorted, word_id)
+        if (
+            pos == len(self._word_ids_sorted)
+            or self._word_ids_sorted[pos] != word_id
+        ):
+            return None
+        row = int(self._word_rows_sorted[pos])
+        return self._dequantize(row, row + 1)[0]
+
+    def search(
+        self,
+        queries: np.ndarray,
+        k: int = 10,
+        nprobe: Optional[int] = None,
+    ) -> List[List[Tuple[int, float]]]:
+        """Top ``k`` (word_id, score) rows for each query vector.
+
+        Uses IVF when the index has lists and ``nprobe`` (default
+        VECTOR_IVF_NPROBE) is below their number; exact search otherwise.
+        A word can appear more than once (its own row and its sentences).
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        if nprobe is None:
+            nprobe = VECTOR_IVF_NPROBE
+        if self.n_lists and 0 < nprobe < self.n_lists:
+            scores = [self._search_ivf(q, nprobe) for q in queries]
+        else:
+            scores = self._search_exact(queries)
+
+        delta = self._delta()
+        results = []
+        for i, (rows, row_scores) in enumerate(scores):
+            ids = self._cols["word_ids"][rows]
+            if self._removed or self._replaced:
+                stale = np.isin(ids, list(self._removed)) | (
+                    np.isin(ids, list(self._replaced))
+                    & (self._cols["kinds"][rows] == KIND_WORD)
+                )
+                ids, row_scores = ids[~stale], row_scores[~stale]
+            if delta is not None:
+                ids = np.concatenate([ids, np.array(self._delta_ids)])
+                row_scores = np.concatenate([row_scores, delta @ queries[i]])
+            top = _top_k(row_scores, k)
+            results.append([(int(ids[j]), float(row_scores[j])) for j in top])
+        return results
+
+    def related_words(
+        self, word_id: int, k: int = 10, nprobe: Optional[int] = None
+    ) -> Optional[List[Tuple[int, float]]]:
+        """Words closest to a word, best score per word, itself excluded.
+
+        Returns None if the word is not indexed.
+        """
+        vector = self.word_vector(word_id)
+        if vector is None:
+            return None
+        # Over-fetch: rows repeat words and include the word itself
+        hits = self.search(vector, k * 4 + 8, nprobe)[0]
+        best: Dict[int, float] = {}
+        for wid, score in hits:
+            if wid != word_id and score > best.get(wid, -2.0):
+                best[wid] = score
+        return sorted(best.items(), key=lambda item: -item[1])[:k]
+
+    def _dequantize(self, start: int, stop: int) -> np.ndarray:
+        block = self._cols["vectors"][start:stop]
+        if not self.quantized:
+            return block
+        return (
+            block.astype(np.float32) * self._cols["scales"][start:stop, None]
+        )
+
+    def _score_rows(self, start: int, stop: int, queries: np.ndarray):
+        block = self._cols["vectors"][start:stop]
+        if not self.quantized:
+            return block @ queries.T
+        # Score the int8 codes, then apply each row's scale
+        scores = block.astype(np.float32) @ queries.T
+        return scores * self._cols["scales"][start:stop, None]
+
+    def _search_exact(self, queries: np.ndarray):
+        parts = [
+            self._score_rows(
+                start, min(start + _BLOCK_ROWS, self.rows), queries
+            )
+            for start in range(0, self.rows, _BLOCK_ROWS)
+        ]
+        scores = (
+            np.vstack(parts)
+            if parts
+            else np.zeros((0, len(queries)), dtype=np.float32)
+        )
+        rows = np.arange(self.rows)
+        return [(rows, scores[:, i]) for i in range(len(queries))]
+
+    def _search_ivf(self, query: np.ndarray, nprobe: int):
+        starts = self._cols["list_start"]
+        probes = _top_k(self._cols["centroids"] @ query, nprobe)
+        ranges = [(int(starts[p]), int(starts[p + 1])) for p in probes]
+        rows = np.concatenate(
+            [np.arange(a, b) for a, b in ranges] + [np.zeros(0, dtype=int)]
+        )
+        scores = np.concatenate(
+            [self._score_rows(a, b, query[None, :])[:, 0] for a, b in ranges]
+            + [np.zeros(0, dtype=np.float32)]
+        )
+        return rows, scores
+
+    def _delta(self) -> Optional[np.ndarray]:
+        if not self._delta_ids:
+            return None
+        if self._delta_matrix is None:
+            self._delta_matrix = np.vstack(self._delta_vectors)
+        return self._delta_matrix
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the ``k`` highest scores, best first."""
+    if len(scores) > k:
+        top = np.argpartition(-scores, k)[:k]
+    else:
+        top = np.arange(len(scores))
+    return top[np.argsort(-scores[top], kind="stable")]
+
+
+_index: Optional[VectorIndex] = None
+_index_stat: Optional[tuple] = None
+
+
+def get_vector_index() -> Optional[VectorIndex]:
+    """Return the mapped index, or None if none has been built.
+
+    Re-checked with one ``stat`` per call, so a rebuild is picked up without
+    a restart (dropping the in-memory delta, which the rebuild includes).
+    """
+    global _index, _index_stat
+    try:
+        st = os.stat(VECTOR_INDEX_PATH)
+    except OSError:
+        st = None
+
+    key = (st.st_ino, st.st_mtime_ns, st.st_size) if st else None
+    if key != _index_stat:
+        _index = None
+        if key is not None:
+            try:
+                _index = VectorIndex(VECTOR_INDEX_PATH)
+            except (OSError, ValueError) as e:
+                logger.error(f"Failed to open vector index: {e}")
+        _index_stat = key
+    return _index
+
+
+def index_word(word_id: int, korean: str, english: str) -> None:
+    """Apply a created or edited word to the loaded index, if any."""
+    index = get_vector_index()
+    if index is None:
+        return
+    try:
+        index.add_word(word_id, korean, english)
+    except Exception as e:
+        logger.error(f"Failed to index word {word_id}: {e}")
+
+
+def index_sentence(word_id: int, korean: str, english: str) -> None:
+    index = get_vector_index()
+    if index is None or index.word_vector(word_id) is None:
+        return
+    try:
+        index.add_text(word_id, f"{korean} {english}")
+    except Exception as e:
+        logger.error(f"Failed to index sentence for word {word_id}: {e}")
+
+
+def unindex_word(word_id: int) -> None:
+    index = get_vector_index()
+    if index is not None:
+        index.remove_word(word_id)
+
+
+def invalidate_vector_index() -> None:
+    """Remove the index after the catalog was replaced wholesale (reset or
+    reseed), when word ids no longer match what it was built from."""
+    try:
+        os.remove(VECTOR_INDEX_PATH)
+        logger.info("Vector index invalidated by catalog reload")
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,436 @@
+"""
+Compact, memory-mapped snapshot of the word catalog for read-only serving.
+
+The artifact is built from the SQLite database by
+``scripts/build_vocab_artifact.py`` and holds words, sample sentences, group
+membership and a TOPIK-level index as fixed-width uint32/int32 columns plus a
+single UTF-8 string blob. Every uvicorn worker maps the same file, so the
+pages are shared by the OS page cache and lookups never touch the ORM.
+
+Layout (little endian, every section 8-byte aligned)::
+
+    header        magic, version, section counts
+    words         word_id u32, topik i32, 8 string ids u32, sent_start u32
+    sentences     sentence_id u32, korean sid u32, english sid u32
+    groups        group_id u32, name sid u32, member_start u32
+    members       word index u32 (CSR over groups)
+    levels        level_start u32 x 8, level_members u32 (CSR over TOPIK 0-6)
+    strings       str_start u32 (n_strings + 1), blob bytes
+"""
+
+import bisect
+import logging
+import mmap
+import os
+import random
+import sqlite3
+import struct
+import time
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..config import CATALOG_VERSION_PATH, VOCAB_ARTIFACT_PATH
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"HXVOCAB\x00"
+VERSION = 1
+NONE_SID = 0xFFFFFFFF
+MAX_LEVEL = 6
+
+_HEADER = struct.Struct("<8s8I")
+_HEADER_SIZE = 64
+
+# String columns stored per word, in WordResponse field order
+WORD_STRING_FIELDS = (
+    "korean",
+    "english",
+    "part_of_speech",
+    "romanization",
+    "source_type",
+    "source_details",
+    "added_by_agent",
+    "created_at",
+)
+
+
+def _align(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def _layout(counts: Dict[str, int]) -> Dict[str, tuple]:
+    """Compute (offset, typecode, length) for every column from the counts."""
+    n_words = counts["n_words"]
+    n_sentences = counts["n_sentences"]
+    n_groups = counts["n_groups"]
+    columns = [
+        ("word_ids", "I", n_words),
+        ("word_topik", "i", n_words),
+        *((f"word_{f}", "I", n_words) for f in WORD_STRING_FIELDS),
+        ("sent_start", "I", n_words + 1),
+        ("sent_ids", "I", n_sentences),
+        ("sent_korean", "I", n_sentences),
+        ("sent_english", "I", n_sentences),
+        ("group_ids", "I", n_groups),
+        ("group_name", "I", n_groups),
+        ("member_start", "I", n_groups + 1),
+        ("members", "I", counts["n_members"]),
+        ("level_start", "I", MAX_LEVEL + 2),
+        ("level_members", "I", counts["n_level_members"]),
+        ("str_start", "I", counts["n_strings"] + 1),
+    ]
+    layout = {}
+    offset = _HEADER_SIZE
+    for name, typecode, length in columns:
+        layout[name] = (offset, typecode, length)
+        offset = _align(offset + 4 * length)
+    layout["blob"] = (offset, "B", counts["blob_len"])
+    return layout
+
+
+class _StringTable:
+    """Interns strings into one UTF-8 blob."""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.starts = array("I", [0])
+        self.blob = bytearray()
+
+    def add(self, value: Optional[Any]) -> int:
+        if value is None:
+            return NONE_SID
+        value = str(value)
+        sid = self.ids.get(value)
+        if sid is None:
+            sid = len(self.starts) - 1
+            self.ids[value] = sid
+            self.blob += value.encode("utf-8")
+            self.starts.append(len(self.blob))
+        return sid
+
+
+def build_vocab_artifact(db_path: str, out_path: str) -> Dict[str, int]:
+    """Compile the catalog tables of ``db_path`` into an artifact file.
+
+    The file is written next to ``out_path`` and atomically renamed into
+    place, so workers that already mapped the previous version keep a valid
+    mapping until they reopen.
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        strings = _StringTable()
+        cols = {name: array("I") for name in ("word_ids", "sent_start")}
+        cols["word_topik"] = array("i")
+        for field in WORD_STRING_FIELDS:
+            cols[f"word_{field}"] = array("I")
+        for name in (
+            "sent_ids",
+            "sent_korean",
+            "sent_english",
+            "group_ids",
+            "group_name",
+            "member_start",
+            "members",
+            "level_members",
+        ):
+            cols[name] = array("I")
+
+        # Words, ordered by id for binary search
+        word_index: Dict[int, int] = {}
+        levels: List[List[int]] = [[] for _ in range(MAX_LEVEL + 1)]
+        rows = conn.execute(
+            f"SELECT id, topik_level, {', '.join(WORD_STRING_FIELDS)} "
+            "FROM words ORDER BY id"
+        )
+        for idx, (word_id, topik, *fields) in enumerate(rows):
+            word_index[word_id] = idx
+            cols["word_ids"].append(word_id)
+            cols["word_topik"].append(-1 if topik is None else topik)
+            for field, value in zip(WORD_STRING_FIELDS, fields):
+                cols[f"word_{field}"].append(strings.add(value))
+            level = topik if topik is not None and 0 < topik <= MAX_LEVEL else 0
+            levels[level].append(idx)
+
+        # Sentences, grouped by word so each word owns a contiguous range
+        n_words = len(cols["word_ids"])
+        sentence_counts = [0] * n_words
+        rows = conn.execute(
+            "SELECT id, word_id, sentence_korean, sentence_english "
+            "FROM sample_sentences ORDER BY word_id, id"
+        )
+        for sent_id, word_id, korean, english in rows:
+            idx = word_index.get(word_id)
+            if idx is None:
+                continue  # orphaned sentence
+            sentence_counts[idx] += 1
+            cols["sent_ids"].append(sent_id)
+            cols["sent_korean"].append(strings.add(korean))
+            cols["sent_english"].append(strings.add(english))
+        total = 0
+        for count in sentence_counts:
+            cols["sent_start"].append(total)
+            total += count
+        cols["sent_start"].append(total)
+
+        # Group membership as CSR over word indices
+        members: Dict[int, List[int]] = {}
+        for word_id, group_id in conn.execute(
+            "SELECT word_id, group_id FROM word_group_map ORDER BY rowid"
+        ):
+            if word_id in word_index:
+                members.setdefault(group_id, []).append(word_index[word_id])
+        for group_id, name in conn.execute(
+            "SELECT id, name FROM word_groups ORDER BY id"
+        ):
+            cols["group_ids"].append(group_id)
+            cols["group_name"].append(strings.add(name))
+            cols["member_start"].append(len(cols["members"]))
+            cols["members"].extend(members.get(group_id, []))
+        cols["member_start"].append(len(cols["members"]))
+
+        cols["level_start"] = array("I")
+        for level_words in levels:
+            cols["level_start"].append(len(cols["level_members"]))
+            cols["level_members"].extend(level_words)
+        cols["level_start"].append(len(cols["level_members"]))
+        cols["str_start"] = strings.starts
+    finally:
+        conn.close()
+
+    counts = {
+        "n_words": n_words,
+        "n_sentences": len(cols["sent_ids"]),
+        "n_groups": len(cols["group_ids"]),
+        "n_members": len(cols["members"]),
+        "n_level_members": len(cols["level_members"]),
+        "n_strings": len(strings.starts) - 1,
+        "blob_len": len(strings.blob),
+    }
+    layout = _layout(counts)
+
+    out = Path(out_path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_name(out.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(
+            _HEADER.pack(
+                MAGIC,
+                VERSION,
+                *(counts[k] for k in (
+                    "n_words",
+                    "n_sentences",
+                    "n_groups",
+                    "n_members",
+                    "n_level_members",
+                    "n_strings",
+                    "blob_len",
+                )),
+            ).ljust(_HEADER_SIZE, b"\x00")
+        )
+        for name, (offset, _, _) in layout.items():
+            f.write(b"\x00" * (offset - f.tell()))
+            f.write(strings.blob if name == "blob" else cols[name].tobytes())
+    os.replace(tmp, out)
+    return counts
+
+
+class VocabArtifact:
+    """Read-only view over a memory-mapped vocabulary artifact."""
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buf = memoryview(self._mm)
+
+        magic, version, *values = _HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{self.path} is not a v{VERSION} vocab artifact")
+        self.counts = dict(
+            zip(
+                (
+                    "n_words",
+                    "n_sentences",
+                    "n_groups",
+                    "n_members",
+                    "n_level_members",
+                    "n_strings",
+                    "blob_len",
+                ),
+                values,
+            )
+        )
+        self._cols = {}
+        for name, (offset, typecode, length) in _layout(self.counts).items():
+            view = self._buf[offset : offset + length * (1 if name == "blob" else 4)]
+            self._cols[name] = view if name == "blob" else view.cast(typecode)
+
+    def close(self) -> None:
+        cols = getattr(self, "_cols", {})
+        for view in cols.values():
+            view.release()
+        self._cols = {}
+        self._buf.release()
+        self._mm.close()
+
+    def __len__(self) -> int:
+        return self.counts["n_words"]
+
+    def _str(self, sid: int) -> Optional[str]:
+        if sid == NONE_SID:
+            return None
+        starts = self._cols["str_start"]
+        return str(self._cols["blob"][starts[sid] : starts[sid + 1]], "utf-8")
+
+    def _word_index(self, word_id: int) -> Optional[int]:
+        ids = self._cols["word_ids"]
+        idx = bisect.bisect_left(ids, word_id)
+        if idx < len(ids) and ids[idx] == word_id:
+            return idx
+        return None
+
+    def _word(self, idx: int) -> Dict[str, Any]:
+        cols = self._cols
+        topik = cols["word_topik"][idx]
+        word = {
+            "id": cols["word_ids"][idx],
+            "topik_level": None if topik < 0 else topik,
+        }
+        for field in WORD_STRING_FIELDS:
+            word[field] = self._str(cols[f"word_{field}"][idx])
+        return word
+
+    def get_word(self, word_id: int) -> Optional[Dict[str, Any]]:
+        idx = self._word_index(word_id)
+        return None if idx is None else self._word(idx)
+
+    def list_words(self, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+        start = max(0, skip)
+        stop = min(len(self), start + max(0, limit))
+        return [self._word(idx) for idx in range(start, stop)]
+
+    def get_sentences(self, word_id: int) -> Optional[List[Dict[str, Any]]]:
+        """Sentences for a word, or None if the word does not exist."""
+        idx = self._word_index(word_id)
+        if idx is None:
+            return None
+        cols = self._cols
+        return [
+            {
+                "id": cols["sent_ids"][s],
+                "word_id": word_id,
+                "sentence_korean": self._str(cols["sent_korean"][s]),
+                "sentence_english": self._str(cols["sent_english"][s]),
+            }
+            for s in range(cols["sent_start"][idx], cols["sent_start"][idx + 1])
+        ]
+
+    def get_group_words(
+        self, group_id: int, skip: int = 0, limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        cols = self._cols
+        ids = cols["group_ids"]
+        g = bisect.bisect_left(ids, group_id)
+        if g >= len(ids) or ids[g] != group_id:
+            return []
+        start = cols["member_start"][g] + max(0, skip)
+        stop = min(cols["member_start"][g + 1], start + max(0, limit))
+        return [self._word(cols["members"][m]) for m in range(start, stop)]
+
+    def sample_words(
+        self, count: int, levels: Optional[Sequence[int]] = None
+    ) -> List[Dict[str, Any]]:
+        """Random words, optionally restricted to TOPIK levels."""
+        cols = self._cols
+        if levels is None:
+            population = range(len(self))
+        else:
+            starts = cols["level_start"]
+            population = [
+                cols["level_members"][m]
+                for level in levels
+                if 0 < level <= MAX_LEVEL
+                for m in range(starts[level], starts[level + 1])
+            ]
+        picked = random.sample(population, min(count, len(population)))
+        return [self._word(idx) for idx in picked]
+
+
+_artifact: Optional[VocabArtifact] = None
+_artifact_stat: Optional[tuple] = None
+# Bumped on every catalog write made by this process
+_generation = 0
+
+
+def get_vocab_artifact() -> Optional[VocabArtifact]:
+    """Return the mapped artifact, or None if there is no current one.
+
+    The file is re-checked with a single ``stat`` per call so a rebuild (or
+    an invalidation from another worker) is picked up without a restart.
+    """
+    global _artifact, _artifact_stat
+    try:
+        st = os.stat(VOCAB_ARTIFACT_PATH)
+    except OSError:
+        st = None
+
+    key = (st.st_ino, st.st_mtime_ns, st.st_size) if st else None
+    if key != _artifact_stat:
+        if _artifact is not None:
+            _artifact.close()
+            _artifact = None
+        if key is not None:
+            try:
+                _artifact = VocabArtifact(VOCAB_ARTIFACT_PATH)
+            except (OSError, ValueError) as e:
+                logger.error(f"Failed to open vocab artifact: {e}")
+        _artifact_stat = key
+    return _artifact
+
+
+def _stat_key(path: str) -> Optional[Tuple[int, int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+def catalog_generation() -> Tuple[int, Optional[tuple], Optional[tuple]]:
+    """Token that changes whenever the catalog may have changed.
+
+    Combines this process's invalidation count with the identity of the
+    artifact file and of the CATALOG_VERSION_PATH marker, which every
+    catalog write replaces. A rebuild or a write by another worker is
+    therefore seen too, artifact or not. Caches derived from the catalog
+    compare it to decide when to drop data.
+    """
+    get_vocab_artifact()
+    return _generation, _artifact_stat, _stat_key(CATALOG_VERSION_PATH)
+
+
+def _bump_catalog_version() -> None:
+    """Replace the marker file; a new inode changes its stat even when two
+    writes land within one mtime tick."""
+    tmp = f"{CATALOG_VERSION_PATH}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "w") as f:
+            f.write(f"{os.getpid()} {time.time_ns()}\n")
+        os.replace(tmp, CATALOG_VERSION_PATH)
+    except OSError as e:
+        logger.error(f"Failed to bump catalog version: {e}")
+
+
+def invalidate_vocab_artifact() -> None:
+    """Remove the artifact after a catalog write so reads fall back to SQL,
+    and tell every worker the catalog changed."""
+    global _generation
+    _generation += 1
+    _bump_catalog_version()
+    try:
+        os.remove(VOCAB_ARTIFACT_PATH)
+        logger.info("Vocab artifact invalidated by catalog change")
+    except FileNotFoundError:
+        pass
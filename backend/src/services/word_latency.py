@@ -0,0 +1,134 @@
+"""
+Per-word answer latency and correctness, maintained incrementally.
+
+Each word keeps a serialized LatencySketch plus running counters in
+``word_latency``. Submitting a round merges its items into the affected
+rows and refreshes the cached p50/p90, so reads never scan game_items.
+"""
+
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import desc, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tools.latency_sketch import LatencySketch
+from ..models.game_item import GameItem
+from ..models.word import Word
+from ..models.word_latency import WordLatency
+
+
+async def record_latencies(
+    db: AsyncSession, items: Iterable[Tuple[int, bool, int]]
+) -> None:
+    """Fold (word_id, correct, time_ms) answers into per-word sketches.
+
+    Loads all affected rows with one IN query; the caller commits.
+    """
+    by_word: Dict[int, List[Tuple[bool, int]]] = {}
+    for word_id, correct, time_ms in items:
+        by_word.setdefault(word_id, []).append((correct, time_ms))
+    if not by_word:
+        return
+
+    result = await db.execute(
+        select(WordLatency).where(WordLatency.word_id.in_(by_word))
+    )
+    rows = {row.word_id: row for row in result.scalars()}
+
+    for word_id, answers in by_word.items():
+        row = rows.get(word_id)
+        if row is None:
+            row = WordLatency(word_id=word_id)
+            db.add(row)
+
+        sketch = LatencySketch.from_bytes(row.sketch)
+        times = [time_ms for _, time_ms in answers]
+        sketch.add_all(times)
+
+        row.count = (row.count or 0) + len(answers)
+        row.correct_count = (row.correct_count or 0) + sum(
+            1 for correct, _ in answers if correct
+        )
+        row.total_ms = (row.total_ms or 0) + sum(times)
+        if row.min_ms is None or min(times) < row.min_ms:
+            row.min_ms = min(times)
+        if row.max_ms is None or max(times) > row.max_ms:
+            row.max_ms = max(times)
+        row.p50_ms = sketch.quantile(0.5)
+        row.p90_ms = sketch.quantile(0.9)
+        row.sketch = sketch.to_bytes()
+        row.updated_at = datetime.utcnow()
+
+
+def latency_summary(word_id: int, row: WordLatency | None) -> Dict:
+    """Response payload for a word's latency row (zeros if unseen)."""
+    if row is None or not row.count:
+        return {
+            "word_id": word_id,
+            "count": 0,
+            "correct_count": 0,
+            "accuracy": 0.0,
+            "mean_ms": None,
+            "p50_ms": None,
+            "p90_ms": None,
+            "min_ms": None,
+            "max_ms": None,
+        }
+    return {
+        "word_id": word_id,
+        "count": row.count,
+        "correct_count": row.correct_count,
+        "accuracy": row.correct_count / row.count * 100.0,
+        "mean_ms": row.total_ms / row.count,
+        "p50_ms": row.p50_ms,
+        "p90_ms": row.p90_ms,
+        "min_ms": row.min_ms,
+        "max_ms": row.max_ms,
+    }
+
+
+async def slowest_words(
+    db: AsyncSession, limit: int = 10, min_count: int = 1
+) -> List[Dict]:
+    """Words with the highest p90 recall time, walking the p90 index."""
+    query = (
+        select(WordLatency, Word.korean, Word.english)
+        .join(Word, Word.id == WordLatency.word_id)
+        .where(WordLatency.count >= min_count)
+        .where(WordLatency.p90_ms.is_not(None))
+        .order_by(desc(WordLatency.p90_ms))
+        .limit(limit)
+    )
+    result = await db.execute(query)
+    return [
+        {
+            **latency_summary(row.word_id, row),
+            "korean": korean,
+            "english": english,
+        }
+        for row, korean, english in result.all()
+    ]
+
+
+async def rebuild_latencies(db: AsyncSession, chunk_size: int = 5000) -> int:
+    """Recompute every word's sketch from game_items (caller commits).
+
+    Items are streamed in chunks, so memory is bounded by the number of
+    distinct words rather than by history size.
+
+    Returns:
+        Number of items folded in
+    """
+    await db.execute(WordLatency.__table__.delete())
+    result = await db.stream(
+        select(GameItem.word_id, GameItem.correct, GameItem.time_ms)
+        .order_by(GameItem.id)
+        .execution_options(yield_per=chunk_size)
+    )
+    count = 0
+    async for rows in result.partitions():
+        await record_latencies(db, rows)
+        await db.flush()
+        count += len(rows)
+    return count
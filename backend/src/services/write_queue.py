@@ -0,0 +1,247 @@
+"""
+In-process write-behind queue for high-frequency inserts.
+
+Activity logs and wrong inputs used to be committed one request at a time,
+so under load every request waited its turn for SQLite's single writer.
+Here requests put their rows on a bounded asyncio queue and a single
+worker drains it, writing everything that arrived within ``flush_ms`` (or up
+to ``batch_rows`` rows) in one transaction with executemany inserts.
+
+Each submitted row gets a future that resolves with its new primary key once
+the batch commits, so routes that must return the created row can await it
+(group commit) while fire-and-forget writers simply don't. A full queue makes
+``submit`` wait, which pushes back on producers instead of growing memory.
+When the worker isn't running (scripts, tests without app startup, or once
+``stop`` has begun) rows are written immediately through the same handlers.
+
+Rows a request must not lose if the process dies right after it answers -
+game items, which rescoring and the latency rebuild read back next to their
+result - are not queued; they go in the transaction that needs them.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from ..config import (
+    WRITE_QUEUE_BATCH_ROWS,
+    WRITE_QUEUE_FLUSH_MS,
+    WRITE_QUEUE_MAX_SIZE,
+)
+from .ingest import insert_activity_logs, insert_wrong_inputs
+
+logger = logging.getLogger(__name__)
+
+# Writes one batch of rows of a kind; returns one result per row (or None)
+BatchHandler = Callable[
+    [AsyncConnection, List[Dict[str, Any]]], Awaitable[Optional[Sequence[Any]]]
+]
+
+_STOP = object()
+
+
+class WriteBehindQueue:
+    """Bounded queue coalescing row inserts into batched transactions"""
+
+    def __init__(
+        self,
+        max_size: int = WRITE_QUEUE_MAX_SIZE,
+        batch_rows: int = WRITE_QUEUE_BATCH_ROWS,
+        flush_ms: int = WRITE_QUEUE_FLUSH_MS,
+        engine: Optional[AsyncEngine] = None,
+    ):
+        self.max_size = max_size
+        self.batch_rows = batch_rows
+        self.flush_ms = flush_ms
+        self._engine = engine
+        self._handlers: Dict[str, BatchHandler] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._stopping = False
+
+        self.enqueued = 0
+        self.flushed_rows = 0
+        self.failed_rows = 0
+        self.batches = 0
+        self.last_batch_size = 0
+        self.max_batch_size = 0
+        self.last_flush_ms = 0.0
+
+    @property
+    def engine(self) -> AsyncEngine:
+        if self._engine is None:
+            from ..database import engine
+
+            self._engine = engine
+        return self._engine
+
+    @property
+    def running(self) -> bool:
+        return (
+            self._worker is not None
+            and not self._worker.done()
+            and not self._stopping
+        )
+
+    def register(self, kind: str, handler: BatchHandler) -> None:
+        self._handlers[kind] = handler
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._worker = asyncio.create_task(self._run())
+        logger.info(
+            f"Write queue started (max {self.max_size} rows, "
+            f"flush every {self.flush_ms}ms or {self.batch_rows} rows)"
+        )
+
+    async def stop(self) -> None:
+        """Flush everything still queued, then stop the worker."""
+        if not self.running:
+            return
+        # Rows submitted from here on would queue behind _STOP, where the
+        # worker never sees them; they are written inline instead
+        self._stopping = True
+        await self._queue.put(_STOP)
+        await self._worker
+        self._worker = None
+        self._stopping = False
+        logger.info(f"Write queue stopped after {self.flushed_rows} rows")
+
+    async def submit(self, kind: str, row: Dict[str, Any]) -> asyncio.Future:
+        """Queue a row for insertion.
+
+        Waits while the queue is full. The returned future resolves with the
+        row's result (its new id, for kinds that return one) after commit,
+        or raises the error that made its insert fail.
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"No write handler registered for '{kind}'")
+        future = asyncio.get_running_loop().create_future()
+        self.enqueued += 1
+        if not self.running:
+            await self._flush([(kind, row, future)])
+            return future
+        await self._queue.put((kind, row, future))
+        return future
+
+    async def submit_many(
+        self, kind: str, rows: Sequence[Dict[str, Any]]
+    ) -> List[asyncio.Future]:
+        if not self.running:
+            futures = [
+                asyncio.get_running_loop().create_future() for _ in rows
+            ]
+            self.enqueued += len(rows)
+            await self._flush(
+                [(kind, row, future) for row, future in zip(rows, futures)]
+            )
+            return futures
+        return [await self.submit(kind, row) for row in rows]
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "depth": self._queue.qsize() if self._queue else 0,
+            "max_size": self.max_size,
+            "enqueued": self.enqueued,
+            "flushed_rows": self.flushed_rows,
+            "failed_rows": self.failed_rows,
+            "batches": self.batches,
+            "last_batch_size": self.last_batch_size,
+            "max_batch_size": self.max_batch_size,
+            "avg_batch_size": round(self.flushed_rows / self.batches, 2)
+            if self.batches
+            else 0.0,
+            "last_flush_ms": round(self.last_flush_ms, 2),
+        }
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            entry = await self._queue.get()
+            if entry is _STOP:
+                break
+            batch = [entry]
+            deadline = loop.time() + self.flush_ms / 1000
+            while len(batch) < self.batch_rows:
+                try:
+                    entry = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        entry = await asyncio.wait_for(
+                            self._queue.get(), remaining
+                        )
+                    except asyncio.TimeoutError:
+                        break
+                if entry is _STOP:
+                    stopping = True
+                    break
+                batch.append(entry)
+            try:
+                await self._flush(batch)
+            except Exception as e:  # never let the worker die
+                logger.error(f"Write queue flush crashed: {e}")
+
+    async def _flush(self, batch: List[tuple]) -> None:
+        start = time.perf_counter()
+        by_kind: Dict[str, List[tuple]] = {}
+        for entry in batch:
+            by_kind.setdefault(entry[0], []).append(entry)
+
+        try:
+            async with self.engine.begin() as conn:
+                results = {
+                    kind: await self._handlers[kind](
+                        conn, [row for _, row, _ in entries]
+                    )
+                    for kind, entries in by_kind.items()
+                }
+        except Exception as e:
+            logger.warning(
+                f"Batch of {len(batch)} rows failed ({e}); retrying one by one"
+            )
+            for entry in batch:
+                await self._flush_one(*entry)
+        else:
+            for kind, entries in by_kind.items():
+                values = results[kind] or [None] * len(entries)
+                for (_, _, future), value in zip(entries, values):
+                    if not future.done():
+                        future.set_result(value)
+            self.flushed_rows += len(batch)
+
+        self.batches += 1
+        self.last_batch_size = len(batch)
+        self.max_batch_size = max(self.max_batch_size, len(batch))
+        self.last_flush_ms = (time.perf_counter() - start) * 1000
+
+    async def _flush_one(
+        self, kind: str, row: Dict[str, Any], future: asyncio.Future
+    ) -> None:
+        try:
+            async with self.engine.begin() as conn:
+                values = await self._handlers[kind](conn, [row])
+        except Exception as e:
+            logger.error(f"Failed to write {kind} row: {e}")
+            self.failed_rows += 1
+            if not future.done():
+                future.set_exception(e)
+            return
+        self.flushed_rows += 1
+        if not future.done():
+            future.set_result(values[0] if values else None)
+
+
+# Global instance, started and drained with the app
+write_queue = WriteBehindQueue()
+write_queue.register("activity_logs", insert_activity_logs)
+write_queue.register("wrong_inputs", insert_wrong_inputs)
@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""
+Shared test setup: the suite runs against a scratch copy of the database.
+
+Runs before any test module imports ``src``, so the engine and every path
+derived from SQLITE_DB_PATH (n-gram index, vocab artifact) point at a temp
+directory instead of the tracked ``data/hagxwon.db``. Set SQLITE_DB_PATH to
+use a database of your own.
+"""
+
+import atexit
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+if "SQLITE_DB_PATH" not in os.environ:
+    _scratch = Path(tempfile.mkdtemp(prefix="hagxwon-tests-"))
+    atexit.register(shutil.rmtree, _scratch, ignore_errors=True)
+    shutil.copy(
+        Path(__file__).resolve().parent.parent / "data" / "hagxwon.db",
+        _scratch / "hagxwon.db",
+    )
+    os.environ["SQLITE_DB_PATH"] = str(_scratch / "hagxwon.db")
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Tests for vectorized batch scoring, checked against the per-round scorer.
+"""
+import random
+
+import numpy as np
+import pytest
+
+from tools.batch_score import score_sessions
+from tools.score import score_round, GameItem
+
+
+def _random_items(n_sessions, seed=0):
+    rng = random.Random(seed)
+    rows = []
+    for session_id in range(1, n_sessions + 1):
+        for _ in range(rng.randint(1, 15)):
+            rows.append(
+                (session_id, rng.random() < 0.6, rng.choice([0, 1500, 2999, 3000, 4999, 5000, 8000]))
+            )
+    rng.shuffle(rows)
+    return rows
+
+
+class TestScoreSessions:
+    """Test score_sessions against score_round."""
+
+    @pytest.mark.parametrize("durations", [None, "mapping", "per_item"])
+    def test_matches_score_round(self, durations):
+        """Every session scores exactly as score_round would."""
+        rows = _random_items(200)
+        session_ids, correct, time_ms = map(list, zip(*rows))
+        duration_map = {s: (s % 3) * 45 for s in set(session_ids)}
+
+        if durations == "mapping":
+            duration_arg = duration_map
+        elif durations == "per_item":
+            duration_arg = [duration_map[s] for s in session_ids]
+        else:
+            duration_arg = None
+        result = score_sessions(session_ids, correct, time_ms, duration_arg)
+
+        by_session = {}
+        for s, c, t in rows:
+            by_session.setdefault(s, []).append(GameItem(word_id=0, correct=c, time_ms=t))
+        assert list(result.session_id) == sorted(by_session)
+        for row in result.rows():
+            expected = score_round(
+                by_session[row["session_id"]],
+                duration_map[row["session_id"]] if duration_arg is not None else None,
+            )
+            assert row["total"] == expected.total
+            assert row["correct"] == expected.correct
+            assert row["score"] == expected.score
+            assert row["accuracy"] == pytest.approx(expected.accuracy)
+            assert row["wpm"] == pytest.approx(expected.wpm)
+
+    def test_zero_time_without_duration(self):
+        """Sessions with no timing information have zero WPM."""
+        result = score_sessions([7, 7], [True, False], [0, 0])
+
+        assert result.wpm[0] == 0.0
+        assert result.accuracy[0] == 50.0
+
+    def test_empty_input(self):
+        """No items means no sessions."""
+        result = score_sessions([], [], [])
+
+        assert len(result) == 0
+        assert list(result.rows()) == []
+
+    def test_misaligned_columns(self):
+        """Columns of different lengths are rejected."""
+        with pytest.raises(ValueError):
+            score_sessions([1, 2], [True], [100, 200])
+        with pytest.raises(ValueError):
+            score_sessions([1, 2], [True, False], [100, 200], [60])
+
+    def test_numpy_input(self):
+        """NumPy arrays are accepted directly."""
+        result = score_sessions(
+            np.array([3, 1, 3]), np.array([1, 1, 0]), np.array([1000, 4000, 9000])
+        )
+
+        assert list(result.session_id) == [1, 3]
+        assert list(result.total) == [1, 2]
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Tests for the Groq circuit breaker and hedged requests.
+"""
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from src.database import init_db
+from src.main import app
+from src.services.circuit_breaker import CircuitBreaker
+from src.services.groq_service import GroqService, groq_service
+from src.services.llm_scheduler import Priority, llm_priority
+from src.services.practice_cache import practice_cache
+
+
+def _completion(text):
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=text))],
+        usage=SimpleNamespace(total_tokens=10),
+    )
+
+
+class ScriptedCompletions:
+    """Blocking client whose calls follow a script of (delay, outcome)."""
+
+    def __init__(self, script):
+        self.script = list(script)
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def create(self, **kwargs):
+        with self._lock:
+            delay, outcome = self.script[min(self.calls, len(self.script) - 1)]
+            self.calls += 1
+        time.sleep(delay)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return _completion(outcome)
+
+
+def _service(script, hedge_after_ms=0):
+    service = GroqService()
+    service.api_key = "test"
+    service.completions = ScriptedCompletions(script)
+    service.client = SimpleNamespace(
+        chat=SimpleNamespace(completions=service.completions)
+    )
+    service.breaker = CircuitBreaker(
+        failure_threshold=2, latency_slo_ms=100, reset_timeout_s=0.05
+    )
+    service.hedge_after_ms = hedge_after_ms
+    return service
+
+
+class TestCircuitBreaker:
+    """Test breaker state transitions."""
+
+    def test_opens_after_consecutive_failures(self):
+        """Threshold failures in a row open the breaker."""
+        breaker = CircuitBreaker(3, latency_slo_ms=100, reset_timeout_s=60)
+        for _ in range(3):
+            assert breaker.allow()
+            breaker.record_failure()
+
+        assert breaker.state == "open"
+        assert breaker.allow() is False
+        assert breaker.metrics()["rejected"] == 1
+
+    def test_success_resets_the_count(self):
+        """Failures must be consecutive."""
+        breaker = CircuitBreaker(2, latency_slo_ms=100, reset_timeout_s=60)
+        breaker.record_failure()
+        breaker.record_success(10)
+        breaker.record_failure()
+
+        assert breaker.state == "closed"
+
+    def test_slow_calls_count_as_failures(self):
+        """Successes beyond the latency SLO trip the breaker too."""
+        breaker = CircuitBreaker(2, latency_slo_ms=100, reset_timeout_s=60)
+        breaker.record_success(500)
+        breaker.record_success(500)
+
+        assert breaker.state == "open"
+        assert breaker.metrics()["slow_calls"] == 2
+
+    def test_half_open_allows_one_probe(self):
+        """After the reset timeout a single probe decides the state."""
+        breaker = CircuitBreaker(1, latency_slo_ms=100, reset_timeout_s=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+
+        assert breaker.allow() is True
+        assert breaker.allow() is False
+        breaker.record_success(10)
+        assert breaker.state == "closed"
+
+    def test_failed_probe_reopens(self):
+        """A failing probe opens the breaker for another timeout."""
+        breaker = CircuitBreaker(5, latency_slo_ms=100, reset_timeout_s=0.01)
+        for _ in range(5):
+            breaker.record_failure()
+        time.sleep(0.02)
+        breaker.allow()
+        breaker.record_failure()
+
+        assert breaker.state == "open"
+
+
+class TestGroqServiceDegradation:
+    """Test fallbacks and hedging in GroqService."""
+
+    def test_open_circuit_fails_fast(self):
+        """Once open, calls return at once without reaching Groq."""
+        service = _service([(0, RuntimeError("503 from upstream"))])
+
+        async def run():
+            for _ in range(2):
+                await service.generate_completion("hello")
+            start = time.monotonic()
+            result = await service.generate_completion("hello")
+            return result, time.monotonic() - start
+
+        result, elapsed = asyncio.run(run())
+
+        assert result["error"] == "groq_circuit_open"
+        assert service.completions.calls == 2
+        assert elapsed < 0.05
+
+    def test_recovers_after_probe(self):
+        """A successful probe closes the circuit again."""
+        service = _service(
+            [(0, RuntimeError("down")), (0, RuntimeError("down")), (0, "ok")]
+        )
+
+        async def run():
+            for _ in range(2):
+                await service.generate_completion("hello")
+            await asyncio.sleep(0.06)
+            return await service.generate_completion("hello")
+
+        result = asyncio.run(run())
+
+        assert result["content"] == "ok"
+        assert service.breaker.state == "closed"
+
+    def test_hedge_wins_over_stuck_attempt(self):
+        """A slow first attempt is overtaken by the hedge."""
+        service = _service([(0.5, "slow"), (0, "fast")], hedge_after_ms=20)
+
+        async def run():
+            start = time.monotonic()
+            result = await service.generate_completion(
+                "hello", max_tokens=10, temperature=0, hedge=True
+            )
+            return result, time.monotonic() - start
+
+        result, elapsed = asyncio.run(run())
+
+        assert result["content"] == "fast"
+        assert elapsed < 0.3
+        assert service.metrics()["hedges"] == 1
+        assert service.metrics()["hedge_wins"] == 1
+
+    def test_calls_are_not_hedged_unless_asked(self):
+        """Hedging is opt-in per call; a plain call waits out its attempt."""
+        service = _service([(0.1, "slow"), (0, "fast")], hedge_after_ms=20)
+
+        result = asyncio.run(service.generate_completion("hello"))
+
+        assert result["content"] == "slow"
+        assert service.completions.calls == 1
+        assert service.metrics()["hedges"] == 0
+
+    def test_long_generations_get_a_longer_slo(self):
+        """A slow call for many tokens is not a latency breach."""
+        service = _service([(0.15, "long"), (0.15, "short")])
+
+        asyncio.run(service.generate_completion("round", max_tokens=3000))
+        assert service.breaker.metrics()["slow_calls"] == 0
+
+        asyncio.run(service.generate_completion("word", max_tokens=100))
+        assert service.breaker.metrics()["slow_calls"] == 1
+
+    def test_background_calls_are_not_hedged(self):
+        """Prefetch and batch calls wait out their single attempt."""
+        service = _service([(0.1, "slow"), (0, "fast")], hedge_after_ms=20)
+
+        async def run():
+            with llm_priority(Priority.BATCH):
+                return await service.generate_completion(
+                    "hello", temperature=0, hedge=True
+                )
+
+        result = asyncio.run(run())
+
+        assert result["content"] == "slow"
+        assert service.completions.calls == 1
+        # Slow background calls don't count against the latency SLO
+        assert service.breaker.state == "closed"
+
+    def test_practice_endpoint_returns_503_when_open(self, monkeypatch):
+        """The practice route turns an open circuit into a quick 503."""
+
+        async def refuse(**kwargs):
+            return {"error": "groq_circuit_open", "message": "Groq is down"}
+
+        monkeypatch.setattr(groq_service, "generate_practice_content", refuse)
+        practice_cache.clear()
+        asyncio.run(init_db())
+        response = TestClient(app).post(
+            "/api/words/2/practice", json={"practice_type": "quiz"}
+        )
+
+        assert response.status_code == 503
+        assert "Retry-After" in response.headers
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Tests for confusion-pair mining over wrong inputs.
+"""
+
+import asyncio
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, delete, select
+from sqlmodel import SQLModel
+
+from src import models
+from src.database import async_session_factory, init_db
+from src.main import app
+from src.models.word import Word
+from src.models.word_confusion import WordConfusion
+from src.services.confusions import ConfusionMatcher, mine_confusions
+
+WORDS = [
+    (1, "눈", "eye", "nun"),
+    (2, "눈", "snow", "nun"),
+    (3, "학교", "school", "hakgyo"),
+    (4, "학생", "student", "haksaeng"),
+    (5, "인삼", "ginseng", "insam"),
+    (6, "인상", "impression", "insang"),
+]
+
+
+@pytest.fixture
+def matcher():
+    return ConfusionMatcher(WORDS)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """A catalog of WORDS with no wrong inputs yet."""
+    path = str(tmp_path / "confusions.db")
+    SQLModel.metadata.create_all(
+        create_engine(f"sqlite:///{path}"),
+        tables=[
+            SQLModel.metadata.tables[name]
+            for name in (
+                "words",
+                "wrong_inputs",
+                "word_confusions",
+                "job_watermarks",
+            )
+        ],
+    )
+    with sqlite3.connect(path) as conn:
+        conn.executemany(
+            "INSERT INTO words (id, korean, english, romanization, "
+            "created_at) VALUES (?, ?, ?, ?, datetime('now'))",
+            WORDS,
+        )
+    return path
+
+
+def _log(path, mistakes):
+    with sqlite3.connect(path) as conn:
+        conn.executemany(
+            "INSERT INTO wrong_inputs (word_id, input_text, timestamp) "
+            "VALUES (?, ?, datetime('now'))",
+            mistakes,
+        )
+
+
+def _pairs(path):
+    with sqlite3.connect(path) as conn:
+        return conn.execute(
+            "SELECT word_id, confused_with_id, count FROM word_confusions "
+            "ORDER BY word_id, confused_with_id"
+        ).fetchall()
+
+
+class TestConfusionMatcher:
+    """Test mapping wrong answers to the word they name."""
+
+    def test_exact_answer_of_another_word(self, matcher):
+        """Korean or English of another word maps to it."""
+        assert matcher.match([(5, "인상"), (6, "ginseng")]) == [6, 5]
+
+    def test_fuzzy_match_by_jamo(self, matcher):
+        """A slightly misspelled other word still maps to it."""
+        assert matcher.match([(3, "학셍"), (3, "studen")]) == [4, 4]
+
+    def test_typos_and_unknown_answers_are_not_confusions(self, matcher):
+        """Near misses of the asked word and random text map to None."""
+        assert matcher.match([(3, "학꾜"), (3, "zzzzzz"), (99, "눈")]) == [
+            None,
+            None,
+            None,
+        ]
+
+
+class TestMineConfusions:
+    """Test the incremental batch job."""
+
+    def test_counts_pairs(self, db_path):
+        """Identical answers are grouped and counted per pair."""
+        _log(
+            db_path,
+            [(5, "인상"), (5, "인상 "), (5, "Impression"), (3, "학꾜")],
+        )
+
+        stats = mine_confusions(db_path, batch_size=2)
+
+        assert stats["rows"] == 4
+        assert stats["batches"] == 2
+        assert _pairs(db_path) == [(5, 6, 3)]
+
+    def test_resumes_from_watermark(self, db_path):
+        """A second run only reads rows added since the first."""
+        _log(db_path, [(6, "인삼")])
+        mine_confusions(db_path)
+        _log(db_path, [(6, "ginseng"), (3, "학생")])
+
+        stats = mine_confusions(db_path)
+
+        assert (stats["rows"], stats["watermark"]) == (2, 3)
+        assert _pairs(db_path) == [(3, 4, 1), (6, 5, 2)]
+
+
+    def test_overlapping_runs_count_once(self, db_path, monkeypatch):
+        """A run that read the same rows as a finished one adds nothing."""
+        _log(db_path, [(5, "인상"), (1, "snow")])
+        match = ConfusionMatcher.match
+        overlapped = []
+
+        def match_after_another_run(self, groups):
+            if not overlapped:
+                # The other run starts and finishes while this one matches
+                overlapped.append(None)
+                overlapped[0] = mine_confusions(db_path)
+            return match(self, groups)
+
+        monkeypatch.setattr(
+            ConfusionMatcher, "match", match_after_another_run
+        )
+
+        stats = mine_confusions(db_path)
+
+        assert overlapped[0]["confusions"] == 2
+        assert (stats["confusions"], stats["watermark"]) == (0, 2)
+        assert _pairs(db_path) == [(1, 2, 1), (5, 6, 1)]
+
+
+class TestConfusionsEndpoint:
+    """Test GET /api/words/{id}/confusions."""
+
+    @pytest.fixture
+    def client(self):
+        asyncio.run(init_db())
+        return TestClient(app)
+
+    def test_lists_most_confused_first(self, client):
+        """Stored pairs come back with the other word, by count."""
+
+        async def store():
+            async with async_session_factory() as db:
+                ids = (
+                    (await db.execute(select(Word.id).limit(3)))
+                    .scalars()
+                    .all()
+                )
+                await db.execute(
+                    delete(WordConfusion).where(
+                        WordConfusion.word_id == ids[0]
+                    )
+                )
+                db.add(
+                    WordConfusion(
+                        word_id=ids[0], confused_with_id=ids[1], count=2
+                    )
+                )
+                db.add(
+                    WordConfusion(
+                        word_id=ids[0], confused_with_id=ids[2], count=5
+                    )
+                )
+                await db.commit()
+            return ids
+
+        ids = asyncio.run(store())
+
+        response = client.get(f"/api/words/{ids[0]}/confusions")
+
+        assert response.status_code == 200
+        assert [(c["word_id"], c["count"]) for c in response.json()] == [
+            (ids[2], 5),
+            (ids[1], 2),
+        ]
+
+    def test_unknown_word_is_404(self, client):
+        """Confusions of a missing word are a 404."""
+        assert client.get("/api/words/999999/confusions").status_code == 404
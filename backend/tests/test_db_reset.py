@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tests for the scoped reset table lists and the reset itself.
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+
+from src.db import reset
+from src.db.reset import (
+    CATALOG_TABLES,
+    HISTORY_TABLES,
+    ResetScope,
+    reset_tables,
+    tables_for_scope,
+)
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    """A scratch database with every table, one word and one result."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/reset.db")
+
+    async def setup():
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+            await conn.execute(
+                text(
+                    "INSERT INTO words (id, korean, english, created_at) "
+                    "VALUES (1, '학교', 'school', CURRENT_TIMESTAMP)"
+                )
+            )
+            await conn.execute(
+                text(
+                    "INSERT INTO word_latency (word_id, count, "
+                    "correct_count, total_ms, updated_at) "
+                    "VALUES (1, 1, 1, 900, CURRENT_TIMESTAMP)"
+                )
+            )
+
+    asyncio.run(setup())
+    monkeypatch.setattr(reset, "engine", engine)
+    yield engine
+    asyncio.run(engine.dispose())
+
+
+def _count(engine, table):
+    async def count():
+        async with engine.connect() as conn:
+            result = await conn.execute(text(f"SELECT count(*) FROM {table}"))
+            return result.scalar()
+
+    return asyncio.run(count())
+
+
+class TestResetScopes:
+    """Test which tables each reset scope covers."""
+
+    def test_all_covers_every_model_table(self):
+        """A full reset touches every table except static activities."""
+        model_tables = set(SQLModel.metadata.tables) - {"study_activities"}
+
+        assert set(tables_for_scope(ResetScope.ALL)) == model_tables
+
+    def test_catalog_and_history_are_disjoint(self):
+        """Resetting one side never drops the other."""
+        assert not set(CATALOG_TABLES) & set(HISTORY_TABLES)
+
+    def test_history_includes_game_and_review_tables(self):
+        """Game and SRS tables count as learner history."""
+        history = tables_for_scope(ResetScope.HISTORY)
+
+        for table in ("game_sessions", "game_results", "game_items"):
+            assert table in history
+        assert "word_review_schedules" in history
+        assert "words" not in history
+
+
+class TestResetTables:
+    """Test what a reset keeps and that it is all or nothing."""
+
+    def test_catalog_reset_keeps_history(self, engine):
+        """History rows survive; catalog tables come back empty."""
+        names = asyncio.run(reset_tables(ResetScope.CATALOG))
+
+        assert names == CATALOG_TABLES
+        assert _count(engine, "words") == 0
+        assert _count(engine, "word_latency") == 1
+
+    def test_failed_recreate_rolls_back(self, engine, monkeypatch):
+        """A failure after the drops leaves every table and row in place."""
+
+        def broken_create_all(*args, **kwargs):
+            raise RuntimeError("create_all failed")
+
+        monkeypatch.setattr(
+            SQLModel.metadata, "create_all", broken_create_all
+        )
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(reset_tables(ResetScope.ALL))
+
+        assert _count(engine, "words") == 1
+        assert _count(engine, "word_latency") == 1
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Tests for the local fake Groq server.
+"""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from groq import Groq
+
+from src.services.groq_service import GroqService
+from tools.agent_practice import AgentPracticeGenerator
+from tools.agent_quiz import AgentQuizGenerator
+from tools.fake_groq import FakeGroqProfile, create_app, serve_in_thread
+
+WORDS = [
+    {"id": 1, "korean": "사과", "english": "apple"},
+    {"id": 2, "korean": "물", "english": "water"},
+    {"id": 3, "korean": "학교", "english": "school"},
+]
+
+
+def _fast_profile(**overrides):
+    settings = {
+        "latency_ms": 0,
+        "latency_dist": "fixed",
+        "tokens_per_second": 1_000_000,
+        "seed": 1,
+    }
+    settings.update(overrides)
+    return FakeGroqProfile(**settings)
+
+
+@pytest.fixture(scope="module")
+def fake_server():
+    """A fake Groq API on a local port."""
+    server, base_url = serve_in_thread(_fast_profile())
+    yield base_url
+    server.should_exit = True
+
+
+def _service(base_url):
+    service = GroqService()
+    service.api_key = "fake"
+    service.client = Groq(api_key="fake", base_url=base_url, max_retries=0)
+    return service
+
+
+class TestFakeGroqApp:
+    """Test the fake API's responses directly."""
+
+    def test_completion_shape(self):
+        """Plain completions carry choices and usage like the real API."""
+        client = TestClient(create_app(_fast_profile()))
+        response = client.post(
+            "/openai/v1/chat/completions",
+            json={
+                "model": "m",
+                "messages": [{"role": "user", "content": "hi"}],
+            },
+        )
+
+        data = response.json()
+        assert data["object"] == "chat.completion"
+        assert data["choices"][0]["message"]["content"]
+        assert data["usage"]["total_tokens"] > 0
+
+    def test_injected_errors(self):
+        """An error rate of 1 fails every call with the chosen status."""
+        client = TestClient(
+            create_app(_fast_profile(error_rate=1.0, error_status=429))
+        )
+        response = client.post(
+            "/openai/v1/chat/completions",
+            json={
+                "model": "m",
+                "messages": [{"role": "user", "content": "hi"}],
+            },
+        )
+
+        assert response.status_code == 429
+
+    def test_latency_distributions(self):
+        """Every distribution draws non-negative delays around the median."""
+        for dist in ("fixed", "normal", "lognormal", "exponential"):
+            profile = FakeGroqProfile(
+                latency_ms=100, latency_dist=dist, seed=3
+            )
+            delays = sorted(profile.first_token_delay() for _ in range(500))
+            assert delays[0] >= 0
+            assert 0.03 < delays[250] < 0.2
+
+
+class TestGroqServiceAgainstFake:
+    """Drive the real Groq client through GroqService at the fake."""
+
+    def test_generate_completion(self, fake_server):
+        """Completions round-trip through the SDK."""
+        result = asyncio.run(_service(fake_server).generate_completion("hi"))
+
+        assert "error" not in result
+        assert result["tokens_used"] > 0
+
+    def test_test_connection(self, fake_server):
+        """The health-check prompt gets its OK."""
+        result = asyncio.run(_service(fake_server).test_connection())
+
+        assert result["content"] == "OK"
+
+    def test_list_models(self, fake_server):
+        """The health probe's models call works against the fake."""
+        models = asyncio.run(_service(fake_server).list_models())
+
+        assert models == ["openai/gpt-oss-20b"]
+
+    def test_quiz_generation(self, fake_server):
+        """Canned quiz JSON gives every word a hint and 3 distractors."""
+        generator = AgentQuizGenerator(_service(fake_server))
+
+        items = asyncio.run(generator.generate_quiz_items(WORDS))
+
+        assert len(items) == 3
+        assert all(item.hint and len(item.distractors) == 3 for item in items)
+
+    def test_batched_practice(self, fake_server):
+        """Canned practice JSON covers every numbered word."""
+        generator = AgentPracticeGenerator(_service(fake_server))
+
+        contents = asyncio.run(generator.generate_practice(WORDS, "example"))
+
+        assert sorted(contents) == [1, 2, 3]
+
+    def test_streaming(self, fake_server):
+        """Streamed deltas join up to the full answer."""
+        service = _service(fake_server)
+
+        async def run():
+            return [
+                delta
+                async for delta in service.stream_practice_content(
+                    "사과", "apple"
+                )
+            ]
+
+        deltas = asyncio.run(run())
+
+        assert len(deltas) > 1
+        assert "".join(deltas).startswith("This word")
@@ -2,18 +2,40 @@
 """
 Tests for game API endpoints including session lifecycle, round generation, and stats.
 """
+import asyncio
+import sqlite3
+
 import pytest
 from fastapi.testclient import TestClient
 
+from src.config import SQLITE_DB_PATH
+from src.database import init_db
 from src.main import app
+from src.services import game_results, ngram_index
 
 
 @pytest.fixture
-def client():
+def client(tmp_path, monkeypatch):
     """Create a test client for the FastAPI app."""
+    asyncio.run(init_db())  # Tables added since the database was seeded
+    # Enhanced rounds may build and save the n-gram index for distractors
+    monkeypatch.setattr(
+        ngram_index, "NGRAM_INDEX_PATH", str(tmp_path / "ngram.npz")
+    )
     return TestClient(app)
 
 
+def _stored_items(session_id):
+    conn = sqlite3.connect(SQLITE_DB_PATH)
+    try:
+        return conn.execute(
+            "SELECT COUNT(*) FROM game_items WHERE session_id = ?",
+            (session_id,),
+        ).fetchone()[0]
+    finally:
+        conn.close()
+
+
 class TestGameSessionAPI:
     """Test game session creation and management."""
 
@@ -147,6 +169,33 @@ class TestGameStatsAPI:
         assert response.status_code in [200, 500]
 
 
+class TestLeaderboardAPI:
+    """Test leaderboard retrieval."""
+
+    def test_get_leaderboard(self, client):
+        """Test getting a leaderboard for a mode."""
+        response = client.get("/api/game/leaderboard?mode=flashcards&window=weekly")
+
+        assert response.status_code in [200, 500]
+
+        if response.status_code == 200:
+            data = response.json()
+            assert data["window"] == "weekly"
+            assert isinstance(data["entries"], list)
+
+    def test_get_leaderboard_invalid_window(self, client):
+        """Test getting a leaderboard with an unknown window."""
+        response = client.get("/api/game/leaderboard?mode=flashcards&window=monthly")
+
+        assert response.status_code == 422  # Validation error
+
+    def test_rank_unknown_session(self, client):
+        """Test ranking a session that has no result."""
+        response = client.get("/api/game/leaderboard/rank/999999")
+
+        assert response.status_code in [404, 500]
+
+
 class TestGameAPIIntegration:
     """Integration tests for complete game workflow."""
 
@@ -181,4 +230,61 @@ class TestGameAPIIntegration:
 
 
 if __name__ == "__main__":
-    pytest.main([__file__, "-v"])
\ No newline at end of file
+    pytest.main([__file__, "-v"])
+
+class TestDuplicateSubmit:
+    """Test that a game is scored once."""
+
+    @pytest.fixture
+    def submit(self, client):
+        """A submit payload for a fresh session."""
+        session_id = client.post(
+            "/api/game/sessions",
+            json={"mode": "flashcards", "duration_sec": 60},
+        ).json()["session_id"]
+        word_id = client.get("/api/words?limit=1").json()[0]["id"]
+        return {
+            "session_id": session_id,
+            "items": [{"word_id": word_id, "correct": True, "time_ms": 900}],
+            "score": 10,
+            "accuracy": 100.0,
+        }
+
+    def test_second_submit_is_rejected_and_rank_still_works(
+        self, client, submit
+    ):
+        """Submitting twice is a 409 and leaves one leaderboard entry."""
+        session_id = submit["session_id"]
+
+        first = client.post("/api/game/submit", json=submit)
+        second = client.post("/api/game/submit", json=submit)
+        rank = client.get(f"/api/game/leaderboard/rank/{session_id}")
+
+        assert first.status_code == 200
+        assert second.status_code == 409
+        assert rank.status_code == 200
+        assert rank.json()["session_id"] == session_id
+
+    def test_racing_submit_is_a_409(self, client, submit, monkeypatch):
+        """A submit that passes the check but loses to the unique index
+        (a concurrent duplicate) is a 409, not a 500."""
+        assert client.post("/api/game/submit", json=submit).status_code == 200
+
+        async def no_result(db, session_id):
+            return False
+
+        monkeypatch.setattr(game_results, "has_result", no_result)
+        monkeypatch.setattr(
+            "src.api.routes.game.has_result", no_result
+        )
+        response = client.post("/api/game/submit", json=submit)
+
+        assert response.status_code == 409
+        # The loser's items were rolled back with its result
+        assert _stored_items(submit["session_id"]) == 1
+
+    def test_items_are_stored_with_the_result(self, client, submit):
+        """The answered items are there as soon as the submit returns."""
+        assert client.post("/api/game/submit", json=submit).status_code == 200
+
+        assert _stored_items(submit["session_id"]) == 1
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Tests for the WebSocket game stream.
+"""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+from starlette.websockets import WebSocketDisconnect
+
+from src.database import async_session_factory, init_db
+from src.main import app
+from src.models.game_item import GameItem
+from src.models.game_session import GameSession
+from src.services import game_stream
+from src.services.game_stream import GameStream
+from src.services.groq_service import groq_service
+from tools.fake_groq import FakeGroqProfile, canned_content
+
+
+@pytest.fixture
+def client():
+    """Create a test client for the FastAPI app."""
+    asyncio.run(init_db())
+    return TestClient(app)
+
+
+@pytest.fixture
+def session_id(client):
+    """A fresh game session."""
+    response = client.post(
+        "/api/game/sessions", json={"mode": "flashcards", "duration_sec": 60}
+    )
+    return response.json()["session_id"]
+
+
+def _stored_items(session_id):
+    async def count():
+        async with async_session_factory() as db:
+            result = await db.execute(
+                select(func.count(GameItem.id)).where(
+                    GameItem.session_id == session_id
+                )
+            )
+            return result.scalar()
+
+    return asyncio.run(count())
+
+
+def _answer(ws, seq, item, correct=True):
+    ws.send_json(
+        {
+            "type": "answer",
+            "seq": seq,
+            "word_id": item["word_id"],
+            "correct": correct,
+            "time_ms": 1500,
+        }
+    )
+
+
+class ScriptedSocket:
+    """Stands in for a WebSocket: answers the first item, then drops."""
+
+    def __init__(self):
+        self.sent = []
+        self.answered = False
+
+    async def send_json(self, data):
+        self.sent.append(data)
+
+    async def receive_json(self):
+        if not self.answered:
+            self.answered = True
+            item = self.sent[0]["items"][0]
+            return {
+                "type": "answer",
+                "seq": 0,
+                "word_id": item["word_id"],
+                "correct": True,
+                "time_ms": 900,
+            }
+        raise WebSocketDisconnect(code=1001)
+
+    async def close(self, code=1000):
+        pass
+
+
+class SilentSocket(ScriptedSocket):
+    """Drops as soon as the server waits for an answer."""
+
+    async def receive_json(self):
+        raise WebSocketDisconnect(code=1001)
+
+
+class SteadySocket(ScriptedSocket):
+    """Answers every served item a few ms apart, then drops."""
+
+    def __init__(self, answers, gap_ms):
+        super().__init__()
+        self.answers = answers
+        self.gap_ms = gap_ms
+        self.received = 0
+        self.received_at_ack = []
+
+    async def send_json(self, data):
+        if data["type"] == "ack":
+            self.received_at_ack.append(self.received)
+        await super().send_json(data)
+
+    async def receive_json(self):
+        if self.received == self.answers:
+            raise WebSocketDisconnect(code=1001)
+        await asyncio.sleep(self.gap_ms / 1000)
+        items = [
+            i for m in self.sent if m["type"] == "items" for i in m["items"]
+        ]
+        item = items[self.received]
+        self.received += 1
+        return {
+            "type": "answer",
+            "seq": self.received,
+            "word_id": item["word_id"],
+            "correct": True,
+            "time_ms": 900,
+        }
+
+
+class TestGameStream:
+    """Test item prefetch, answer acks and scoring over the socket."""
+
+    def test_prefetches_items(self, client, session_id):
+        """The first message carries ``prefetch`` items in order."""
+        with client.websocket_connect(
+            f"/api/game/ws/{session_id}?prefetch=4"
+        ) as ws:
+            message = ws.receive_json()
+
+        assert message["type"] == "items"
+        assert [item["position"] for item in message["items"]] == [0, 1, 2, 3]
+
+    def test_answers_are_acked_in_batches(self, client, session_id):
+        """Answers are written and acked once a batch fills up."""
+        with client.websocket_connect(
+            f"/api/game/ws/{session_id}?prefetch=5"
+        ) as ws:
+            items = ws.receive_json()["items"]
+            acked = []
+            for seq, item in enumerate(items):
+                _answer(ws, seq, item)
+                message = ws.receive_json()
+                if message["type"] == "ack":
+                    acked.extend(message["seqs"])
+                    message = ws.receive_json()
+                # Every answer frees a slot for one more prefetched item
+                assert message["type"] == "items"
+                assert len(message["items"]) == 1
+
+        assert acked == [0, 1, 2, 3, 4]
+        assert _stored_items(session_id) == 5
+
+    def test_end_scores_the_game(self, client, session_id):
+        """Ending flushes remaining answers and returns the result."""
+        with client.websocket_connect(f"/api/game/ws/{session_id}") as ws:
+            items = ws.receive_json()["items"]
+            _answer(ws, 0, items[0], correct=True)
+            ws.receive_json()  # next item
+            _answer(ws, 1, items[1], correct=False)
+            ws.receive_json()
+            ws.send_json({"type": "end"})
+            ack = ws.receive_json()
+            result = ws.receive_json()
+
+        assert ack == {"type": "ack", "seqs": [0, 1]}
+        assert result["type"] == "result"
+        assert result["total"] == 2
+        assert result["correct"] == 1
+
+    def test_disconnect_keeps_received_answers(self, session_id):
+        """Answers not yet acked are still written when the socket drops."""
+        socket = ScriptedSocket()
+        stream = GameStream(
+            socket,
+            GameSession(id=session_id, mode="flashcards", duration_sec=60),
+            level=None,
+            enhance=False,
+            prefetch=2,
+        )
+
+        asyncio.run(stream.run())
+
+        assert not any(m["type"] == "ack" for m in socket.sent)
+        assert _stored_items(session_id) == 1
+
+    def test_enhanced_items_are_sent_as_generated(
+        self, session_id, monkeypatch
+    ):
+        """A generated round reaches the client one item at a time."""
+        socket = SilentSocket()
+        sent_while_streaming = []
+
+        async def stream_completion(messages, **kwargs):
+            text = canned_content(messages, FakeGroqProfile(seed=1))
+            for start in range(0, len(text), 10):
+                sent_while_streaming.append(len(socket.sent))
+                yield text[start : start + 10]
+
+        monkeypatch.setattr(
+            groq_service, "stream_completion", stream_completion
+        )
+        stream = GameStream(
+            socket,
+            GameSession(id=session_id, mode="flashcards", duration_sec=60),
+            level=None,
+            enhance=True,
+            prefetch=3,
+        )
+
+        asyncio.run(stream.run())
+
+        assert [len(m["items"]) for m in socket.sent] == [1, 1, 1]
+        assert all(m["items"][0]["hint"] for m in socket.sent)
+        # The first card went out while Groq was still writing
+        assert 1 in sent_while_streaming
+
+    def test_typed_answers_are_graded(self, client, session_id):
+        """A typed answer gets a verdict and is stored as graded."""
+        with client.websocket_connect(f"/api/game/ws/{session_id}") as ws:
+            items = ws.receive_json()["items"]
+            ws.send_json(
+                {
+                    "type": "answer",
+                    "seq": 0,
+                    "word_id": items[0]["word_id"],
+                    "input_text": items[0]["korean"],
+                    "time_ms": 1200,
+                }
+            )
+            graded = ws.receive_json()
+            ws.receive_json()  # next item
+            ws.send_json({"type": "end"})
+            ws.receive_json()  # ack
+            result = ws.receive_json()
+
+        assert graded["type"] == "graded"
+        assert (graded["seq"], graded["verdict"]) == (0, "correct")
+        assert result["correct"] == 1
+
+    def test_romanized_answers_are_graded_like_http(self, client, session_id):
+        """The socket accepts the romanization, as POST /game/grade does."""
+        with client.websocket_connect(f"/api/game/ws/{session_id}") as ws:
+            item = ws.receive_json()["items"][0]
+            word = client.get(f"/api/words/{item['word_id']}").json()
+            ws.send_json(
+                {
+                    "type": "answer",
+                    "seq": 0,
+                    "word_id": item["word_id"],
+                    "input_text": word["romanization"],
+                    "time_ms": 1200,
+                }
+            )
+            graded = ws.receive_json()
+        http = client.post(
+            "/api/game/grade",
+            json={
+                "items": [
+                    {
+                        "word_id": item["word_id"],
+                        "input_text": word["romanization"],
+                    }
+                ]
+            },
+        ).json()[0]
+
+        assert graded["verdict"] == http["verdict"] == "correct"
+
+    def test_duplicate_answer_is_reacked_once_stored(self, client, session_id):
+        """A resent answer is acked again but stored only once."""
+        with client.websocket_connect(f"/api/game/ws/{session_id}") as ws:
+            items = ws.receive_json()["items"]
+            _answer(ws, 0, items[0])
+            ws.receive_json()
+            ws.send_json({"type": "flush"})
+            assert ws.receive_json() == {"type": "ack", "seqs": [0]}
+            _answer(ws, 0, items[0])
+            assert ws.receive_json() == {"type": "ack", "seqs": [0]}
+
+        assert _stored_items(session_id) == 1
+
+    def test_rejects_unserved_word(self, client, session_id):
+        """Answers must refer to an item the server sent."""
+        with client.websocket_connect(f"/api/game/ws/{session_id}") as ws:
+            ws.receive_json()
+            ws.send_json(
+                {
+                    "type": "answer",
+                    "seq": 0,
+                    "word_id": -1,
+                    "correct": True,
+                    "time_ms": 10,
+                }
+            )
+            message = ws.receive_json()
+
+        assert message["type"] == "error"
+        assert message["seq"] == 0
+
+    def test_ack_deadline_starts_at_first_unacked_answer(self, session_id):
+        """Answers arriving faster than ack_ms still get acked in time."""
+        socket = SteadySocket(answers=12, gap_ms=20)
+        stream = GameStream(
+            socket,
+            GameSession(id=session_id, mode="flashcards", duration_sec=60),
+            level=None,
+            enhance=False,
+            prefetch=12,
+            ack_batch=100,
+            ack_ms=60,
+        )
+
+        asyncio.run(stream.run())
+
+        assert socket.received_at_ack
+        assert socket.received_at_ack[0] < 12
+        assert _stored_items(session_id) == 12
+
+    def test_typed_answer_for_deleted_word(
+        self, client, session_id, monkeypatch
+    ):
+        """A word gone since it was served gets an error, not a dropped
+        socket, and its slot is refilled."""
+
+        async def word_deleted(db, answers, expected="any"):
+            return [None for _ in answers]
+
+        monkeypatch.setattr(game_stream, "grade_answers", word_deleted)
+        with client.websocket_connect(f"/api/game/ws/{session_id}") as ws:
+            items = ws.receive_json()["items"]
+            ws.send_json(
+                {
+                    "type": "answer",
+                    "seq": 0,
+                    "word_id": items[0]["word_id"],
+                    "input_text": items[0]["korean"],
+                    "time_ms": 1200,
+                }
+            )
+            error = ws.receive_json()
+            refill = ws.receive_json()
+            _answer(ws, 1, items[1])
+            ws.receive_json()  # next item
+            ws.send_json({"type": "flush"})
+            ack = ws.receive_json()
+
+        assert error == {
+            "type": "error",
+            "detail": "Word not found",
+            "seq": 0,
+        }
+        assert refill["type"] == "items" and len(refill["items"]) == 1
+        assert ack == {"type": "ack", "seqs": [1]}
+        assert _stored_items(session_id) == 1
+
+    def test_unknown_session_is_refused(self, client):
+        """Connecting to a missing session closes with 4404."""
+        with pytest.raises(WebSocketDisconnect) as exc_info:
+            with client.websocket_connect("/api/game/ws/999999") as ws:
+                ws.receive_json()
+
+        assert exc_info.value.code == 4404
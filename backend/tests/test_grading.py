@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Tests for server-side answer grading.
+"""
+
+import asyncio
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from src.database import async_session_factory, init_db
+from src.main import app
+from src.models.word import Word
+from tools.grading import (
+    CORRECT,
+    NEAR_MISS,
+    WRONG,
+    AnswerKey,
+    catalog_answers,
+    english_variants,
+    grade_many,
+    levenshtein,
+)
+
+
+def _reference_distance(a, b):
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (char_a != char_b),
+                )
+            )
+        previous = current
+    return previous[-1]
+
+
+@pytest.fixture
+def client():
+    """Create a test client for the FastAPI app."""
+    asyncio.run(init_db())
+    return TestClient(app)
+
+
+@pytest.fixture
+def word(client):
+    """A word from the catalog."""
+
+    async def first():
+        async with async_session_factory() as db:
+            result = await db.execute(select(Word).order_by(Word.id).limit(1))
+            return result.scalar_one()
+
+    return asyncio.run(first())
+
+
+class TestEditDistance:
+    """Test the bit-parallel distance against the textbook DP."""
+
+    def test_matches_dynamic_programming(self):
+        """Random strings, including ones longer than a machine word."""
+        rng = random.Random(7)
+        for _ in range(2000):
+            a = "".join(rng.choices("abcd", k=rng.randrange(0, 80)))
+            b = "".join(rng.choices("abcd", k=rng.randrange(0, 80)))
+            assert levenshtein(a, b) == _reference_distance(a, b)
+
+    def test_english_variants(self):
+        """Alternatives, notes and leading articles are all accepted."""
+        variants = english_variants("to be happy, glad (feeling)")
+
+        assert {"to be happy", "happy", "glad"} <= set(variants)
+
+
+class TestAnswerKey:
+    """Test verdicts for typed answers."""
+
+    @pytest.fixture
+    def key(self):
+        return AnswerKey("학교", "school; academy", "hakgyo")
+
+    def test_exact_answers(self, key):
+        """Korean, any gloss and the romanization are all correct."""
+        for answer in ("학교", "School!", "academy", "hakgyo"):
+            assert key.grade(answer).verdict == CORRECT
+
+    def test_one_jamo_off_is_a_near_miss(self, key):
+        """학꾜 is one jamo from 학교, not a wrong syllable."""
+        grade = key.grade("학꾜")
+
+        assert grade.verdict == NEAR_MISS
+        assert (grade.distance, grade.reason) == (1, "jamo")
+        assert grade.accepted
+
+    def test_spelling_and_spacing(self, key):
+        """Latin slips are near misses with their reason."""
+        assert key.grade("schol").reason == "spelling"
+        spaced = AnswerKey("행복하다", "to be happy").grade("tobehappy")
+        assert (spaced.verdict, spaced.reason) == (NEAR_MISS, "spacing")
+
+    def test_wrong_answer(self, key):
+        """A different word is wrong and not accepted."""
+        grade = key.grade("경제")
+
+        assert grade.verdict == WRONG
+        assert not grade.accepted
+
+    def test_one_syllable_words_must_be_exact(self):
+        """One jamo turns a one-syllable word into a different word."""
+        pairs = [("물", "water", "불"), ("나", "I", "너"), ("말", "horse", "발")]
+        for korean, english, typed in pairs:
+            grade = AnswerKey(korean, english).grade(typed)
+
+            assert grade.verdict == WRONG, typed
+            assert grade.distance == 1
+
+    def test_another_catalog_word_is_never_a_near_miss(self):
+        """사고 is one jamo from 사과, but it is a word of its own."""
+        key = AnswerKey("사과", "apple", "sagwa")
+        others = catalog_answers(
+            [("사과", "apple", "sagwa"), ("사고", "accident", "sago")]
+        )
+
+        assert key.grade("사고").verdict == NEAR_MISS
+        assert key.grade("사고", others=others).verdict == WRONG
+        assert key.grade("사궈", others=others).verdict == NEAR_MISS
+        assert key.grade("사과", others=others).verdict == CORRECT
+
+    def test_expected_target(self, key):
+        """Restricting the target ignores the other scripts."""
+        assert key.grade("hakgyo", expected="english").verdict == WRONG
+        assert key.grade("hakgyo", expected="romanization").verdict == CORRECT
+
+    def test_grade_many(self, key):
+        """A round grades each answer against its own key."""
+        other = AnswerKey("사과", "apple")
+
+        grades = grade_many([key, other], ["school", "aple"])
+
+        assert [g.verdict for g in grades] == [CORRECT, NEAR_MISS]
+
+
+class TestGradeEndpoint:
+    """Test batch grading and graded mistakes over HTTP."""
+
+    def test_grades_a_round(self, client, word):
+        """Each item comes back with its verdict, in order."""
+        response = client.post(
+            "/api/game/grade",
+            json={
+                "items": [
+                    {"word_id": word.id, "input_text": word.korean},
+                    {"word_id": word.id, "input_text": "zzzzzzzzzzzz"},
+                ]
+            },
+        )
+
+        assert response.status_code == 200
+        results = response.json()
+        assert [r["verdict"] for r in results] == [CORRECT, WRONG]
+        assert results[0]["correct"] and not results[1]["correct"]
+        assert results[0]["matched"] == word.korean
+
+    def test_unknown_word_is_404(self, client):
+        """Nothing is graded if any word does not exist."""
+        response = client.post(
+            "/api/game/grade",
+            json={"items": [{"word_id": 999999, "input_text": "x"}]},
+        )
+
+        assert response.status_code == 404
+
+    def test_logged_mistake_is_graded(self, client, word):
+        """Logging a mistake reports how far off it was."""
+        response = client.post(
+            "/api/mistakes",
+            json={"word_id": word.id, "input_text": "zzzzzzzzzzzz"},
+        )
+
+        assert response.status_code == 201
+        assert response.json()["verdict"] == WRONG
+        assert response.json()["distance"] > 0
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Tests for single-flight coalescing of identical Groq requests.
+"""
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.services.groq_service import GroqService
+
+
+class FakeCompletions:
+    """Blocking stand-in for ``client.chat.completions``."""
+
+    def __init__(self, delay=0.05, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def create(self, model, messages, temperature, max_tokens):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("upstream down")
+        return SimpleNamespace(
+            choices=[
+                SimpleNamespace(
+                    message=SimpleNamespace(content=messages[-1]["content"])
+                )
+            ],
+            usage=SimpleNamespace(total_tokens=42),
+        )
+
+
+@pytest.fixture
+def service():
+    """A GroqService wired to the fake client."""
+    service = GroqService()
+    service.api_key = "test"
+    service.completions = FakeCompletions()
+    service.client = SimpleNamespace(
+        chat=SimpleNamespace(completions=service.completions)
+    )
+    return service
+
+
+class TestSingleFlight:
+    """Test that concurrent identical requests share one upstream call."""
+
+    def test_identical_requests_share_one_call(self, service):
+        """Concurrent practice requests for one word hit Groq once."""
+
+        async def run():
+            return await asyncio.gather(
+                *(
+                    service.generate_practice_content("사과", "apple", "quiz")
+                    for _ in range(20)
+                )
+            )
+
+        results = asyncio.run(run())
+
+        assert service.completions.calls == 1
+        assert all(result == results[0] for result in results)
+        metrics = service.metrics()
+        assert metrics["upstream_calls"] == 1
+        assert metrics["coalesced"] == 19
+        assert metrics["in_flight"] == 0
+
+    def test_whitespace_differences_are_coalesced(self, service):
+        """Prompts that differ only in whitespace count as identical."""
+
+        async def run():
+            await asyncio.gather(
+                service.generate_completion("translate  사과"),
+                service.generate_completion(" translate 사과\n"),
+            )
+
+        asyncio.run(run())
+
+        assert service.completions.calls == 1
+
+    def test_different_requests_are_not_coalesced(self, service):
+        """Different words or practice types each get their own call."""
+
+        async def run():
+            await asyncio.gather(
+                service.generate_practice_content("사과", "apple", "quiz"),
+                service.generate_practice_content("사과", "apple", "example"),
+                service.generate_practice_content("물", "water", "quiz"),
+            )
+
+        asyncio.run(run())
+
+        assert service.completions.calls == 3
+        assert service.metrics()["coalesced"] == 0
+
+    def test_sequential_requests_call_again(self, service):
+        """Only in-flight calls are shared; nothing is cached afterwards."""
+
+        async def run():
+            await service.generate_completion("hello")
+            await service.generate_completion("hello")
+
+        asyncio.run(run())
+
+        assert service.completions.calls == 2
+
+    def test_errors_are_shared(self, service):
+        """Every waiter gets the upstream error."""
+        service.completions.fail = True
+
+        async def run():
+            return await asyncio.gather(
+                *(service.generate_completion("hello") for _ in range(3))
+            )
+
+        results = asyncio.run(run())
+
+        assert service.completions.calls == 1
+        assert all(r["error"] == "groq_generation_error" for r in results)
+
+    def test_cancelled_waiter_does_not_cancel_others(self, service):
+        """One caller going away leaves the shared call running."""
+
+        async def run():
+            first = asyncio.create_task(service.generate_completion("hi"))
+            second = asyncio.create_task(service.generate_completion("hi"))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            return await second
+
+        result = asyncio.run(run())
+
+        assert result["content"] == "hi"
+        assert service.completions.calls == 1
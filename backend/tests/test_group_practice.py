@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Tests for batched group practice generation.
+"""
+
+import asyncio
+import json
+import math
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+
+from sqlalchemy import delete
+
+from src.database import async_session_factory, init_db
+from src.main import app
+from src.models.practice_content import PracticeContent
+from src.services.groq_service import groq_service
+from src.services.practice_cache import practice_cache
+from tools.agent_practice import AgentPracticeGenerator
+
+
+class FakeGroq:
+    """Answers batched prompts, optionally dropping the last item."""
+
+    def __init__(self, drop_last=False):
+        self.drop_last = drop_last
+        self.batch_calls = []
+        self.single_calls = []
+
+    async def generate_completion(self, prompt, max_tokens=1000):
+        numbered = re.findall(r"^(\d+)\. (\S+) → ", prompt, re.MULTILINE)
+        self.batch_calls.append(len(numbered))
+        if self.drop_last:
+            numbered = numbered[:-1]
+        items = [
+            {"n": int(n), "content": f"about {korean}"}
+            for n, korean in numbered
+        ]
+        return {"content": json.dumps({"items": items})}
+
+    async def generate_practice_content(
+        self, korean_word, english_translation, practice_type
+    ):
+        self.single_calls.append(korean_word)
+        return {"content": f"single {korean_word}"}
+
+
+def _words(n):
+    return [
+        {"id": i, "korean": f"단어{i}", "english": f"word {i}"}
+        for i in range(1, n + 1)
+    ]
+
+
+@pytest.fixture
+def client():
+    """Create a test client for the FastAPI app."""
+    asyncio.run(init_db())
+    return TestClient(app)
+
+
+async def _clear_stored_practice():
+    async with async_session_factory() as db:
+        await db.execute(delete(PracticeContent))
+        await db.commit()
+
+
+@pytest.fixture
+def fake_groq(monkeypatch):
+    """Route Groq calls to the fake and start from an empty cache."""
+    fake = FakeGroq()
+    monkeypatch.setattr(
+        groq_service, "generate_completion", fake.generate_completion
+    )
+    monkeypatch.setattr(
+        groq_service,
+        "generate_practice_content",
+        fake.generate_practice_content,
+    )
+    practice_cache.clear()
+    asyncio.run(_clear_stored_practice())
+    yield fake
+    practice_cache.clear()
+
+
+class TestAgentPracticeGenerator:
+    """Test prompt packing, chunking and retries."""
+
+    def test_packs_words_into_one_call(self):
+        """A small group needs a single completion."""
+        fake = FakeGroq()
+        generator = AgentPracticeGenerator(fake, max_tokens=4000)
+
+        contents = asyncio.run(generator.generate_practice(_words(20)))
+
+        assert fake.batch_calls == [20]
+        assert contents[7] == "about 단어7"
+
+    def test_chunks_to_fit_max_tokens(self):
+        """Chunks hold as many words as the token budget allows."""
+        fake = FakeGroq()
+        generator = AgentPracticeGenerator(fake, max_tokens=1500)
+
+        contents = asyncio.run(
+            generator.generate_practice(_words(25), "definition")
+        )
+
+        assert sorted(fake.batch_calls) == [5, 10, 10]
+        assert len(contents) == 25
+
+    def test_incomplete_answer_is_retried_smaller(self):
+        """Words missing from a truncated answer are asked for again."""
+        fake = FakeGroq(drop_last=True)
+        generator = AgentPracticeGenerator(fake, max_tokens=4000)
+
+        contents = asyncio.run(generator.generate_practice(_words(4)))
+
+        assert len(contents) == 4
+        assert fake.batch_calls == [4]
+        assert fake.single_calls == ["단어4"]
+
+
+class TestGroupPracticeAPI:
+    """Test POST /api/groups/{group_id}/practice."""
+
+    def test_generates_practice_for_group(self, client, fake_groq):
+        """Every word in the group gets content from a few batched calls."""
+        words = client.get("/api/groups/1/words").json()
+        response = client.post(
+            "/api/groups/1/practice", json={"practice_type": "example"}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["type"] == "example"
+        assert len(data["items"]) == len(words)
+        assert data["failed_word_ids"] == []
+        # 4000 tokens at ~200 per example word: 20 words per call
+        assert sum(fake_groq.batch_calls) == len(words)
+        assert len(fake_groq.batch_calls) == math.ceil(len(words) / 20)
+
+    def test_results_are_cached_per_word(self, client, fake_groq):
+        """Single-word practice reuses what the group request generated."""
+        data = client.post(
+            "/api/groups/1/practice", json={"practice_type": "quiz"}
+        ).json()
+        calls = len(fake_groq.batch_calls)
+        item = data["items"][0]
+
+        response = client.post(
+            f"/api/words/{item['word_id']}/practice",
+            json={"practice_type": "quiz"},
+        )
+        again = client.post(
+            "/api/groups/1/practice", json={"practice_type": "quiz"}
+        )
+
+        assert response.json()["content"] == item["content"]
+        assert again.json()["items"] == data["items"]
+        assert fake_groq.single_calls == []
+        assert len(fake_groq.batch_calls) == calls
+
+    def test_missing_group(self, client, fake_groq):
+        """Unknown groups return 404."""
+        response = client.post("/api/groups/999999/practice", json={})
+
+        assert response.status_code == 404
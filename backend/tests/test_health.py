@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Tests for liveness and cached readiness probes.
+"""
+
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.services.circuit_breaker import CircuitBreaker
+from src.services.groq_service import groq_service
+from src.services.health import HealthMonitor
+
+
+@pytest.fixture
+def client():
+    """Create a test client for the FastAPI app."""
+    return TestClient(app)
+
+
+@pytest.fixture
+def groq_up(monkeypatch):
+    """Groq configured and listing models; returns the probe count."""
+    probes = {"count": 0}
+
+    async def list_models():
+        probes["count"] += 1
+        return ["openai/gpt-oss-20b"]
+
+    monkeypatch.setattr(groq_service, "is_available", lambda: True)
+    monkeypatch.setattr(groq_service, "list_models", list_models)
+    monkeypatch.setattr(
+        groq_service,
+        "breaker",
+        CircuitBreaker(1, latency_slo_ms=100, reset_timeout_s=60),
+    )
+    return probes
+
+
+class TestHealthEndpoints:
+    """Test /health/live, /health/ready and /health."""
+
+    def test_live(self, client):
+        """Liveness needs nothing but the process."""
+        response = client.get("/health/live")
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "alive"}
+
+    def test_ready(self, client, groq_up):
+        """Readiness reports each dependency and the snapshot age."""
+        response = client.get("/health/ready")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["ready"] is True
+        assert data["database"] == "ok"
+        assert data["groq_api"] == "ok"
+        assert data["groq_breaker"] == "closed"
+
+    def test_groq_outage_degrades_but_stays_ready(self, client, groq_up):
+        """An open breaker marks Groq degraded without failing readiness."""
+        groq_service.breaker.record_failure()
+
+        data = client.get("/health/ready").json()
+
+        assert data["ready"] is True
+        assert data["groq_api"] == "degraded"
+
+    def test_database_failure_is_not_ready(self, client, groq_up, monkeypatch):
+        """A failed database probe returns 503."""
+
+        async def broken(self):
+            raise RuntimeError("database is locked")
+
+        monkeypatch.setattr(HealthMonitor, "_check_database", broken)
+        response = client.get("/health/ready")
+
+        assert response.status_code == 503
+        assert response.json()["database"] == "error"
+
+    def test_legacy_health_never_calls_completions(
+        self, client, groq_up, monkeypatch
+    ):
+        """/health no longer spends tokens on a test completion."""
+
+        async def fail():
+            raise AssertionError("test_connection called")
+
+        monkeypatch.setattr(groq_service, "test_connection", fail)
+        data = client.get("/health").json()
+
+        assert data == {
+            "status": "healthy",
+            "database": "ok",
+            "groq_api": "ok",
+        }
+
+
+class TestHealthMonitor:
+    """Test the background probe and its cache."""
+
+    def test_reads_are_served_from_cache(self, groq_up):
+        """Once started, status() reads memory without probing."""
+
+        async def run():
+            monitor = HealthMonitor(interval_s=60)
+            await monitor.start()
+            await asyncio.sleep(0.05)
+            timings = []
+            for _ in range(100):
+                start = time.perf_counter()
+                status = await monitor.status()
+                timings.append(time.perf_counter() - start)
+            await monitor.stop()
+            return status, sorted(timings)[50]
+
+        status, median_s = asyncio.run(run())
+
+        assert status["ready"] is True
+        assert groq_up["count"] == 1
+        assert median_s < 0.001
+
+    def test_stale_snapshot_is_not_ready(self, groq_up):
+        """A probe loop that stopped refreshing fails readiness."""
+
+        async def run():
+            monitor = HealthMonitor(interval_s=0.01)
+            await monitor.refresh()
+            monitor._task = asyncio.create_task(asyncio.sleep(1))
+            await asyncio.sleep(0.05)
+            status = await monitor.status()
+            await monitor.stop()
+            return status
+
+        status = asyncio.run(run())
+
+        assert status["ready"] is False
+        assert status["status"] == "stale"
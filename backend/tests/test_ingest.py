@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests for the set-based ingestion helpers.
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.models.word import Word
+from src.models.word_stats import WordStats
+from src.services.ingest import apply_mistake_penalties, missing_word_ids
+
+
+def _penalize_sequentially(ease, interval, mistakes):
+    """The original one-mistake-at-a-time rule from log_mistake."""
+    for _ in range(mistakes):
+        ease = max(1.3, ease - 0.2)
+        interval = max(1, interval // 2)
+    return ease, interval
+
+
+async def _with_stats(tmp_path, stats, body):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'i.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Word.metadata.create_all, tables=[Word.__table__, WordStats.__table__])
+        await conn.execute(
+            insert(Word),
+            [{"id": word_id, "korean": f"w{word_id}", "english": "[]"} for word_id in stats],
+        )
+        await conn.execute(
+            insert(WordStats),
+            [
+                {"word_id": word_id, "current_streak": 4, "ease_factor": ease, "interval_days": interval}
+                for word_id, (ease, interval) in stats.items()
+            ],
+        )
+        result = await body(conn)
+        rows = await conn.execute(select(WordStats))
+        after = {row.word_id: row for row in rows}
+    await engine.dispose()
+    return result, after
+
+
+class TestMistakePenalties:
+    """Test the single UPDATE applied for a batch of mistakes."""
+
+    def test_matches_sequential_rule(self, tmp_path):
+        """k mistakes in one UPDATE equal k sequential penalties."""
+        stats = {1: (2.5, 16), 2: (1.5, 7), 3: (2.0, 1), 4: (2.5, 30)}
+        word_ids = [1, 1, 2, 2, 2, 3, 1]
+
+        async def body(conn):
+            await apply_mistake_penalties(conn, word_ids)
+
+        _, after = asyncio.run(_with_stats(tmp_path, stats, body))
+
+        for word_id, (ease, interval) in stats.items():
+            expected_ease, expected_interval = _penalize_sequentially(
+                ease, interval, word_ids.count(word_id)
+            )
+            assert after[word_id].ease_factor == pytest.approx(expected_ease)
+            assert after[word_id].interval_days == expected_interval
+        # Words without mistakes keep their streak
+        assert after[4].current_streak == 4
+        assert all(after[w].current_streak == 0 for w in (1, 2, 3))
+
+    def test_many_mistakes_hit_the_floor(self, tmp_path):
+        """A long run of mistakes clamps at the minimum ease and interval."""
+
+        async def body(conn):
+            await apply_mistake_penalties(conn, [1] * 100)
+
+        _, after = asyncio.run(_with_stats(tmp_path, {1: (2.5, 365)}, body))
+
+        assert after[1].ease_factor == pytest.approx(1.3)
+        assert after[1].interval_days == 1
+
+
+class TestMissingIds:
+    """Test foreign-key validation for batches."""
+
+    def test_reports_only_unknown_ids(self, tmp_path):
+        """Known ids are filtered out with a single IN query."""
+
+        async def body(conn):
+            return await missing_word_ids(conn, [1, 2, 2, 99, 100])
+
+        missing, _ = asyncio.run(_with_stats(tmp_path, {1: (2.5, 1), 2: (2.5, 1)}, body))
+
+        assert missing == {99, 100}
+
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Tests for the latency quantile sketch.
+"""
+import random
+
+import pytest
+
+from tools.latency_sketch import LatencySketch, DEFAULT_RELATIVE_ACCURACY
+
+
+def _exact_quantile(values, q):
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+class TestLatencySketch:
+    """Test quantile accuracy, merging and serialization."""
+
+    def test_empty_sketch(self):
+        """An empty sketch has no quantiles."""
+        sketch = LatencySketch()
+
+        assert sketch.count == 0
+        assert sketch.quantile(0.5) is None
+
+    @pytest.mark.parametrize("q", [0.0, 0.25, 0.5, 0.9, 0.99, 1.0])
+    def test_relative_error_bound(self, q):
+        """Quantiles stay within the configured relative error."""
+        rng = random.Random(42)
+        values = [rng.lognormvariate(7.5, 0.8) for _ in range(5000)]
+        sketch = LatencySketch()
+        sketch.add_all(values)
+
+        exact = _exact_quantile(values, q)
+        approx = sketch.quantile(q)
+
+        assert abs(approx - exact) / exact <= DEFAULT_RELATIVE_ACCURACY + 1e-9
+
+    def test_merge_equals_combined(self):
+        """Merging two sketches equals sketching all values at once."""
+        left, right, combined = LatencySketch(), LatencySketch(), LatencySketch()
+        for i, value in enumerate(range(100, 20000, 37)):
+            (left if i % 2 else right).add(value)
+            combined.add(value)
+
+        left.merge(right)
+
+        assert left.buckets == combined.buckets
+        assert left.count == combined.count
+
+    def test_merge_rejects_different_accuracy(self):
+        """Sketches with different bucket widths cannot be merged."""
+        with pytest.raises(ValueError):
+            LatencySketch(0.01).merge(LatencySketch(0.05))
+
+    def test_serialization_round_trip(self):
+        """to_bytes/from_bytes preserve every bucket."""
+        sketch = LatencySketch()
+        sketch.add_all([0, 1, 250, 250, 3000, 61000])
+
+        restored = LatencySketch.from_bytes(sketch.to_bytes())
+
+        assert restored.buckets == sketch.buckets
+        assert restored.count == 6
+        assert restored.relative_accuracy == sketch.relative_accuracy
+        assert restored.quantile(0.5) == sketch.quantile(0.5)
+
+    def test_compact_encoding(self):
+        """Size depends on the number of buckets, not on sample count."""
+        sketch = LatencySketch()
+        sketch.add_all(range(1000, 10000))
+
+        assert len(sketch.to_bytes()) < 1024
+
+    def test_from_empty_bytes(self):
+        """Missing data decodes to an empty sketch."""
+        assert LatencySketch.from_bytes(None).count == 0
+        assert LatencySketch.from_bytes(b"").count == 0
+
+    def test_invalid_quantile(self):
+        """Quantiles outside [0, 1] are rejected."""
+        sketch = LatencySketch()
+        sketch.add(100)
+
+        with pytest.raises(ValueError):
+            sketch.quantile(1.5)
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests for leaderboard period keys and entry construction.
+"""
+from datetime import datetime
+
+from src.models.game_result import GameResult
+from src.models.game_session import GameSession
+from src.services.leaderboard import (
+    LeaderboardWindow,
+    build_entries,
+    period_key,
+)
+
+
+class TestPeriodKey:
+    """Test how results are bucketed into periods."""
+
+    def test_daily_key(self):
+        """Daily boards are keyed by calendar date."""
+        at = datetime(2025, 5, 5, 23, 59)
+
+        assert period_key(LeaderboardWindow.DAILY, at) == "2025-05-05"
+
+    def test_weekly_key_uses_iso_weeks(self):
+        """Weekly boards follow ISO weeks, including across new year."""
+        assert period_key(LeaderboardWindow.WEEKLY, datetime(2025, 5, 5)) == "2025-W19"
+        assert period_key(LeaderboardWindow.WEEKLY, datetime(2024, 12, 30)) == "2025-W01"
+
+    def test_all_time_key(self):
+        """All-time boards have a single period."""
+        assert period_key(LeaderboardWindow.ALL_TIME, datetime(2025, 5, 5)) == "all"
+
+
+class TestBuildEntries:
+    """Test entries created for a finished game."""
+
+    def test_one_entry_per_window(self):
+        """A result lands on the daily, weekly and all-time boards."""
+        session = GameSession(id=7, mode="flashcards", duration_sec=60)
+        result = GameResult(
+            session_id=7,
+            total=10,
+            correct=8,
+            accuracy=80.0,
+            score=1100,
+            ended_at=datetime(2025, 5, 5, 12, 0),
+        )
+
+        entries = build_entries(session, result)
+
+        assert {e.time_window for e in entries} == {w.value for w in LeaderboardWindow}
+        assert {e.period_key for e in entries} == {"2025-05-05", "2025-W19", "all"}
+        assert all(e.session_id == 7 and e.mode == "flashcards" for e in entries)
+        assert all(e.score == 1100 for e in entries)
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Tests for the priority token-bucket LLM scheduler.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from src.services.groq_service import GroqService
+from src.services.llm_scheduler import (
+    LLMScheduler,
+    Priority,
+    current_priority,
+    llm_priority,
+)
+
+GENEROUS_SLO = {priority: 60_000 for priority in Priority}
+
+
+def _scheduler(rpm=600, tpm=1_000_000, slo=None):
+    return LLMScheduler(rpm, tpm, slo_ms=slo or GENEROUS_SLO)
+
+
+class TestLLMScheduler:
+    """Test admission, priority order and load shedding."""
+
+    def test_admits_immediately_under_budget(self):
+        """Calls within both budgets do not queue."""
+        scheduler = _scheduler()
+
+        async def run():
+            return [await scheduler.acquire(100) for _ in range(5)]
+
+        assert asyncio.run(run()) == [True] * 5
+        metrics = scheduler.metrics()
+        assert metrics["admitted"]["interactive"] == 5
+        # The sketch reports anything under a millisecond as ~1ms
+        assert metrics["queue_ms"]["interactive"]["p99"] <= 1
+
+    def test_interactive_goes_before_queued_batch(self):
+        """Higher priority calls overtake lower ones already queued."""
+        scheduler = _scheduler(rpm=600)  # one request per 100ms
+        scheduler.requests.level = 0
+        order = []
+
+        async def call(name, priority):
+            await scheduler.acquire(10, priority)
+            order.append(name)
+
+        async def run():
+            batch = [
+                asyncio.create_task(call(f"batch{i}", Priority.BATCH))
+                for i in range(2)
+            ]
+            await asyncio.sleep(0.01)
+            interactive = asyncio.create_task(
+                call("interactive", Priority.INTERACTIVE)
+            )
+            await asyncio.gather(*batch, interactive)
+
+        asyncio.run(run())
+
+        assert order == ["interactive", "batch0", "batch1"]
+
+    def test_token_budget_limits_admission(self):
+        """A call waits until the token bucket holds its estimate."""
+        scheduler = _scheduler(tpm=60_000)  # 1000 tokens per second
+        scheduler.tokens.level = 0
+
+        async def run():
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            await scheduler.acquire(100)
+            return loop.time() - start
+
+        assert asyncio.run(run()) >= 0.08
+
+    def test_sheds_when_wait_exceeds_slo(self):
+        """Calls that could not start within their SLO are refused."""
+        scheduler = _scheduler(
+            rpm=60,
+            slo={
+                Priority.INTERACTIVE: 50,
+                Priority.PREFETCH: 50,
+                Priority.BATCH: 50,
+            },
+        )
+        scheduler.requests.level = 0
+
+        admitted = asyncio.run(scheduler.acquire(10, Priority.BATCH))
+
+        assert admitted is False
+        assert scheduler.metrics()["shed"]["batch"] == 1
+
+    def test_settle_returns_unused_tokens(self):
+        """Tokens reserved beyond actual usage go back to the bucket."""
+        scheduler = _scheduler(tpm=10_000)
+
+        asyncio.run(scheduler.acquire(4000))
+        scheduler.settle(4000, 1000)
+
+        assert scheduler.tokens.level >= 9000
+
+    def test_cancelled_waiter_is_skipped(self):
+        """A caller that gives up does not hold up the queue."""
+        scheduler = _scheduler(rpm=600)
+        scheduler.requests.level = 0
+
+        async def run():
+            gone = asyncio.create_task(scheduler.acquire(10))
+            await asyncio.sleep(0.01)
+            gone.cancel()
+            return await scheduler.acquire(10)
+
+        assert asyncio.run(run()) is True
+        assert scheduler.metrics()["queued"]["interactive"] == 0
+
+
+class TestPriorityContext:
+    """Test the priority context variable."""
+
+    def test_default_and_override(self):
+        """Calls are interactive unless marked otherwise."""
+        assert current_priority() == Priority.INTERACTIVE
+        with llm_priority(Priority.BATCH):
+            assert current_priority() == Priority.BATCH
+        assert current_priority() == Priority.INTERACTIVE
+
+    def test_spawned_tasks_inherit_priority(self):
+        """Tasks created under llm_priority keep it."""
+
+        async def run():
+            with llm_priority(Priority.PREFETCH):
+                task = asyncio.create_task(
+                    asyncio.sleep(0, current_priority())
+                )
+            return await task
+
+        assert asyncio.run(run()) == Priority.PREFETCH
+
+
+class TestGroqServiceShedding:
+    """Test GroqService's fallback when a call is shed."""
+
+    def test_shed_call_returns_overloaded_error(self):
+        """Shed completions never reach the client."""
+        calls = []
+        service = GroqService()
+        service.api_key = "test"
+        service.client = SimpleNamespace(
+            chat=SimpleNamespace(
+                completions=SimpleNamespace(
+                    create=lambda **kwargs: calls.append(kwargs)
+                )
+            )
+        )
+        service.scheduler = _scheduler(
+            rpm=1, slo={priority: 0 for priority in Priority}
+        )
+        service.scheduler.requests.level = 0
+
+        result = asyncio.run(service.generate_completion("hello"))
+
+        assert result["error"] == "groq_overloaded"
+        assert calls == []
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Tests for the character/jamo n-gram similarity index.
+"""
+
+import asyncio
+import os
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.config import SQLITE_DB_PATH
+from src.api.routes import words
+from src.main import app
+from src.schemas.game import GameRoundItem
+from src.services import ngram_index, round_pool
+from src.services.ngram_index import NgramIndex
+from src.services.vocab_artifact import catalog_generation
+from tools.hangul import compose, decompose, to_jamo
+
+WORDS = [
+    (1, "사과", "apple", "sagwa"),
+    (2, "사과나무", "apple tree", "sagwanamu"),
+    (3, "학교", "school", "hakgyo"),
+    (4, "학생", "student", "haksaeng"),
+    (5, "경제", "economy", "gyeongje"),
+    (6, "행복하다", "to be happy", "haengbokhada"),
+]
+
+
+@pytest.fixture
+def index():
+    return NgramIndex.build(WORDS)
+
+
+class TestHangul:
+    """Test syllable decomposition."""
+
+    def test_round_trip(self):
+        """Decomposed indices compose back to the syllable."""
+        assert decompose("한") == (18, 0, 4)
+        assert compose(*decompose("쀍")) == "쀍"
+        assert decompose("a") is None
+
+    def test_to_jamo(self):
+        """Syllables spell out as jamo, other characters pass through."""
+        assert to_jamo("한국") == "한국"
+        assert to_jamo("a가!") == "a가!"
+
+
+class TestNgramIndex:
+    """Test lookups, related words and updates."""
+
+    def test_typo_tolerant_lookup(self, index):
+        """Misspellings in any script still find the word."""
+        results = index.lookup(["학꾜", "scool", "hapy", "gyungje"], k=1)
+
+        assert [hits[0][0] for hits in results] == [3, 3, 6, 5]
+
+    def test_batch_matches_single_lookups(self, index):
+        """A batch scores each query as if it were alone."""
+        queries = ["사과", "student", "xyz"]
+
+        batch = index.lookup(queries, k=3)
+
+        assert batch == [index.lookup([q], k=3)[0] for q in queries]
+        assert batch[2] == []
+
+    def test_related_excludes_itself(self, index):
+        """A word's nearest neighbour is its family, never itself."""
+        related = index.related([1, 3, 99], k=2)
+
+        assert related[0][0][0] == 2
+        assert related[1][0][0] == 4
+        assert 3 not in [wid for wid, _ in related[1]]
+        assert related[2] is None
+
+    def test_incremental_updates(self, index):
+        """Upserted words are found at once, removed ones disappear."""
+        index.upsert(7, "학교버스", "school bus", "hakgyobeoseu")
+        assert 7 in [wid for wid, _ in index.lookup(["학교"], k=3)[0]]
+
+        index.upsert(3, "학원", "academy", "hagwon")
+        assert index.word(3) == ("학원", "academy", "hagwon")
+        assert index.lookup(["academy"], k=1)[0][0][0] == 3
+
+        index.remove(2)
+        assert 2 not in [wid for wid, _ in index.lookup(["사과"])[0]]
+
+    def test_save_and_load(self, index, tmp_path):
+        """A saved index answers exactly like the original."""
+        index.remove(4)
+        path = str(tmp_path / "ngram.npz")
+        index.save(path)
+
+        loaded = NgramIndex.load(path)
+
+        assert len(loaded) == 5
+        assert loaded.word(1) == ("사과", "apple", "sagwa")
+        assert loaded.lookup(["학교"]) == index.lookup(["학교"])
+
+
+class TestNgramUsage:
+    """Test search, related fallback and distractor selection."""
+
+    @pytest.fixture
+    def client(self, index, monkeypatch):
+        monkeypatch.setattr(ngram_index, "_index", index)
+        monkeypatch.setattr(ngram_index, "_generation", catalog_generation())
+        return TestClient(app)
+
+    def test_search_endpoint(self, client, monkeypatch):
+        """Search answers with scored words, best first."""
+        real = ngram_index.build_ngram_index(out_path=None)
+        monkeypatch.setattr(ngram_index, "_generation", catalog_generation())
+        monkeypatch.setattr(ngram_index, "_index", real)
+        word = client.get("/api/words?limit=1").json()[0]
+
+        response = client.get(
+            "/api/words/search", params={"q": word["korean"]}
+        )
+
+        assert response.status_code == 200
+        assert response.json()[0]["korean"] == word["korean"]
+        assert "score" in response.json()[0]
+
+    def test_fill_distractors(self, client, index):
+        """Bare items get three look-alike, differently meant words."""
+        index.upsert(7, "학기", "semester", "hakgi")
+        index.upsert(8, "학교", "school", "hakgyo")
+        index.upsert(9, "학원", "academy", "hagwon")
+        items = [
+            GameRoundItem(word_id=3, korean="학교", english="school"),
+            GameRoundItem(
+                word_id=1,
+                korean="사과",
+                english="apple",
+                distractors=["a", "b", "c"],
+            ),
+        ]
+
+        asyncio.run(round_pool.fill_distractors(items))
+
+        assert len(items[0].distractors) == 3
+        assert set(items[0].distractors) == {"student", "semester", "academy"}
+        assert "school" not in items[0].distractors
+        assert items[1].distractors == ["a", "b", "c"]
+
+    def test_failed_index_update_keeps_the_write(self, client, monkeypatch):
+        """A hook failing after the commit still answers with the word."""
+
+        def broken(*args):
+            raise RuntimeError("index unavailable")
+
+        monkeypatch.setattr(words, "ngram_index_word", broken)
+
+        response = client.post(
+            "/api/words", json={"korean": "갈팡질팡", "english": "dithering"}
+        )
+
+        assert response.status_code == 201
+        word_id = response.json()["id"]
+        try:
+            assert client.get(f"/api/words/{word_id}").status_code == 200
+        finally:
+            client.delete(f"/api/words/{word_id}")
+
+
+# A word created on another worker: the row plus the hooks
+# POST /api/words runs after its commit
+CREATE_ELSEWHERE = """
+import sqlite3
+from src.config import SQLITE_DB_PATH
+from src.services.ngram_index import ngram_index_word
+from src.services.vocab_artifact import invalidate_vocab_artifact
+
+conn = sqlite3.connect(SQLITE_DB_PATH)
+with conn:
+    word_id = conn.execute(
+        "INSERT INTO words (korean, english, romanization, created_at) "
+        "VALUES ('뚜벅뚜벅걸음', 'plodding steps', 'ttubeokttubeok', "
+        "CURRENT_TIMESTAMP)"
+    ).lastrowid
+conn.close()
+invalidate_vocab_artifact()
+ngram_index_word(word_id, "뚜벅뚜벅걸음", "plodding steps", "ttubeokttubeok")
+print(word_id)
+"""
+
+
+class TestCrossWorkerReload:
+    """Test that a write on another worker reaches this one."""
+
+    @pytest.fixture
+    def index_path(self, tmp_path, monkeypatch):
+        path = str(tmp_path / "ngram_index.npz")
+        monkeypatch.setattr(ngram_index, "NGRAM_INDEX_PATH", path)
+        monkeypatch.setattr(ngram_index, "_index", None)
+        monkeypatch.setattr(ngram_index, "_generation", None)
+        return path
+
+    def test_word_created_by_another_process_is_found(self, index_path):
+        """The other process's write invalidates; this one rebuilds."""
+        before = ngram_index.build_ngram_index(out_path=index_path)
+        assert ngram_index.get_ngram_index() is before
+
+        created = subprocess.run(
+            [sys.executable, "-c", CREATE_ELSEWHERE],
+            cwd=Path(__file__).resolve().parent.parent,
+            env={**os.environ, "NGRAM_INDEX_PATH": index_path},
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        word_id = int(created.stdout.split()[-1])
+        try:
+            after = ngram_index.get_ngram_index()
+
+            assert after is not before
+            assert after.lookup(["뚜벅뚜벅걸음"])[0][0][0] == word_id
+        finally:
+            conn = sqlite3.connect(SQLITE_DB_PATH)
+            with conn:
+                conn.execute("DELETE FROM words WHERE id = ?", (word_id,))
+            conn.close()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Tests for server-sent-event practice streaming.
+"""
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, select
+
+from src.database import async_session_factory, init_db
+from src.main import app
+from src.models.practice_content import PracticeContent
+from src.services.groq_service import GroqService, groq_service
+from src.services.practice_cache import practice_cache
+
+
+def _events(body):
+    """Parse an SSE body into (event, data) pairs."""
+    events = []
+    for block in body.strip().split("\n\n"):
+        event = "message"
+        for line in block.splitlines():
+            if line.startswith("event: "):
+                event = line[len("event: ") :]
+            elif line.startswith("data: "):
+                data = json.loads(line[len("data: ") :])
+        events.append((event, data))
+    return events
+
+
+def _stored(word_id, practice_type):
+    async def load():
+        async with async_session_factory() as db:
+            result = await db.execute(
+                select(PracticeContent).where(
+                    PracticeContent.word_id == word_id,
+                    PracticeContent.practice_type == practice_type,
+                )
+            )
+            return result.scalar_one_or_none()
+
+    return asyncio.run(load())
+
+
+async def _clear_stored_practice():
+    async with async_session_factory() as db:
+        await db.execute(delete(PracticeContent))
+        await db.commit()
+
+
+@pytest.fixture
+def client():
+    """Create a test client for the FastAPI app."""
+    asyncio.run(init_db())
+    asyncio.run(_clear_stored_practice())
+    practice_cache.clear()
+    yield TestClient(app)
+    practice_cache.clear()
+
+
+@pytest.fixture
+def fake_stream(monkeypatch):
+    """Stream three deltas per request; returns the request log."""
+    calls = []
+
+    async def stream(korean_word, english_translation, practice_type):
+        calls.append((korean_word, practice_type))
+        for delta in ("Hello", " there", "!"):
+            yield delta
+
+    monkeypatch.setattr(groq_service, "stream_practice_content", stream)
+    return calls
+
+
+class TestPracticeStreamAPI:
+    """Test GET /api/words/{word_id}/practice/stream."""
+
+    def test_streams_deltas_then_done(self, client, fake_stream):
+        """Deltas arrive as events, followed by timings in ``done``."""
+        response = client.get("/api/words/1/practice/stream")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = _events(response.text)
+        deltas = [data["delta"] for event, data in events[:-1]]
+        assert deltas == ["Hello", " there", "!"]
+        event, done = events[-1]
+        assert event == "done"
+        assert done["cached"] is False
+        assert done["first_token_ms"] <= done["total_ms"]
+
+    def test_finished_text_is_persisted_and_replayed(
+        self, client, fake_stream
+    ):
+        """A repeat request replays the stored text without the LLM."""
+        client.get("/api/words/1/practice/stream?practice_type=example")
+        practice_cache.clear()  # Force the read from the database
+        response = client.get(
+            "/api/words/1/practice/stream?practice_type=example"
+        )
+
+        events = _events(response.text)
+        assert events[0] == ("message", {"delta": "Hello there!"})
+        assert events[-1][1]["cached"] is True
+        assert len(fake_stream) == 1
+        assert _stored(1, "example").content == "Hello there!"
+
+    def test_post_practice_reuses_streamed_text(self, client, fake_stream):
+        """The non-streaming endpoint serves what a stream produced."""
+        client.get("/api/words/1/practice/stream?practice_type=quiz")
+        response = client.post(
+            "/api/words/1/practice", json={"practice_type": "quiz"}
+        )
+
+        assert response.json()["content"] == "Hello there!"
+
+    def test_upstream_failure_sends_error_event(self, client, monkeypatch):
+        """Errors mid-stream end it with an error event and store nothing."""
+
+        async def stream(korean_word, english_translation, practice_type):
+            yield "partial"
+            raise RuntimeError("connection reset")
+
+        monkeypatch.setattr(groq_service, "stream_practice_content", stream)
+        response = client.get("/api/words/1/practice/stream")
+
+        event, data = _events(response.text)[-1]
+        assert event == "error"
+        assert "connection reset" in data["detail"]
+        assert _stored(1, "definition") is None
+
+    def test_unknown_practice_type_is_rejected(self, client, fake_stream):
+        """Only types with a prompt are accepted, streamed or not."""
+        streamed = client.get(
+            "/api/words/1/practice/stream?practice_type=nonsense"
+        )
+        posted = client.post(
+            "/api/words/1/practice", json={"practice_type": "nonsense"}
+        )
+
+        assert streamed.status_code == posted.status_code == 422
+        assert fake_stream == []
+        assert _stored(1, "nonsense") is None
+
+    def test_missing_word(self, client, fake_stream):
+        """Unknown words return 404 before any stream starts."""
+        response = client.get("/api/words/999999/practice/stream")
+
+        assert response.status_code == 404
+
+
+class TestStreamCompletion:
+    """Test relaying the blocking Groq stream onto the event loop."""
+
+    def test_yields_deltas_in_order(self):
+        """Chunks from the client's stream are yielded as they come."""
+
+        def create(**kwargs):
+            assert kwargs["stream"] is True
+            for text in ("안녕", None, "하세요"):
+                time.sleep(0.01)
+                yield SimpleNamespace(
+                    choices=[
+                        SimpleNamespace(delta=SimpleNamespace(content=text))
+                    ]
+                )
+
+        service = GroqService()
+        service.api_key = "test"
+        service.client = SimpleNamespace(
+            chat=SimpleNamespace(completions=SimpleNamespace(create=create))
+        )
+
+        async def run():
+            return [
+                delta
+                async for delta in service.stream_completion(
+                    [{"role": "user", "content": "hi"}]
+                )
+            ]
+
+        assert asyncio.run(run()) == ["안녕", "하세요"]
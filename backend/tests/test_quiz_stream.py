@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental parsing of streamed quiz JSON.
+"""
+
+import asyncio
+import json
+
+from tools.agent_quiz import AgentQuizGenerator, QuizStreamParser
+
+
+def _words(n):
+    return [
+        {"id": i, "korean": f"단어{i}", "english": f"word {i}"}
+        for i in range(1, n + 1)
+    ]
+
+
+def _quiz_json(words):
+    return json.dumps(
+        {
+            "items": [
+                {
+                    "korean": word["korean"],
+                    "hint": f"Think of {{{word['english']}}}",
+                    "distractors": ["a", "b", "c"],
+                }
+                for word in words
+            ]
+        },
+        ensure_ascii=False,
+    )
+
+
+class StreamingGroq:
+    """Streams a quiz answer in small pieces, recording what was read."""
+
+    def __init__(self, text, fail_after=None):
+        self.text = text
+        self.fail_after = fail_after
+        self.read = 0
+
+    async def stream_completion(self, messages, **kwargs):
+        for start in range(0, len(self.text), 7):
+            if self.fail_after is not None and start >= self.fail_after:
+                raise RuntimeError("connection reset")
+            self.read = start + 7
+            yield self.text[start : start + 7]
+
+
+class TestQuizStreamParser:
+    """Test pulling finished items out of partial JSON."""
+
+    def test_items_come_out_as_they_close(self):
+        """Each element is returned by the feed that completes it."""
+        text = _quiz_json(_words(3))
+        parser = QuizStreamParser()
+
+        seen = []
+        for i, char in enumerate(text):
+            for item in parser.feed(char):
+                seen.append((item["korean"], i))
+
+        assert [korean for korean, _ in seen] == ["단어1", "단어2", "단어3"]
+        # Item 1 is complete well before the answer is
+        assert seen[0][1] < len(text) // 2
+
+    def test_ignores_fences_and_braces_in_strings(self):
+        """Code fences and quoted braces or brackets don't confuse it."""
+        text = '```json\n{"items": [{"korean": "}]\\"x", "hint": "[{"}]}\n```'
+        parser = QuizStreamParser()
+
+        items = parser.feed(text[:20]) + parser.feed(text[20:])
+
+        assert items == [{"korean": '}]"x', "hint": "[{"}]
+
+    def test_skips_malformed_items(self):
+        """An element that isn't valid JSON is dropped, the rest kept."""
+        parser = QuizStreamParser()
+
+        items = parser.feed('{"items": [{"korean": 1,}, {"korean": "단어2"}]}')
+
+        assert items == [{"korean": "단어2"}]
+
+
+class TestStreamQuizItems:
+    """Test AgentQuizGenerator.stream_quiz_items."""
+
+    def test_first_item_before_stream_ends(self):
+        """Item 1 is yielded while the rest is still being generated."""
+        words = _words(5)
+        groq = StreamingGroq(_quiz_json(words))
+
+        async def first():
+            stream = AgentQuizGenerator(groq).stream_quiz_items(words)
+            item = await stream.__anext__()
+            await stream.aclose()
+            return item
+
+        item = asyncio.run(first())
+
+        assert item.word_id == 1
+        assert item.hint == "Think of {word 1}"
+        assert groq.read < len(groq.text) // 2
+
+    def test_unfinished_words_fall_back(self):
+        """Words cut off by an error still come out, without hints."""
+        words = _words(4)
+        text = _quiz_json(words)
+        groq = StreamingGroq(text, fail_after=len(text) // 2)
+
+        async def collect():
+            generator = AgentQuizGenerator(groq)
+            return [item async for item in generator.stream_quiz_items(words)]
+
+        items = asyncio.run(collect())
+
+        assert sorted(item.word_id for item in items) == [1, 2, 3, 4]
+        assert items[0].hint is not None
+        assert items[-1].hint is None
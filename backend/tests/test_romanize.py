@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tests for the Revised Romanization engine and romanization backfill.
+"""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from src.database import async_session_factory, init_db
+from src.db.seed.romanization import backfill_romanization
+from src.main import app
+from src.models.word import Word
+from tools.romanize import BOUNDARY, romanize
+
+
+class TestRomanize:
+    """Test sound changes across syllable boundaries."""
+
+    @pytest.mark.parametrize(
+        "korean, expected",
+        [
+            ("학교", "hakgyo"),
+            ("한국어", "hangugeo"),  # Liaison
+            ("학년", "hangnyeon"),  # Nasalization
+            ("독립", "dongnip"),
+            ("종로", "jongno"),
+            ("실내", "sillae"),  # ㄹ assimilation
+            ("관련하다", "gwallyeonhada"),
+            ("같이", "gachi"),  # Palatalization
+            ("좋다", "jota"),  # ㅎ merging
+            ("좋아", "joa"),
+            ("없어", "eopseo"),  # Double finals
+            ("밝히다", "balkida"),
+            ("짧다", "jjalda"),
+            ("의미", "uimi"),
+            ("요구 사항", "yogu sahang"),
+            ("카페 latte!", "kape latte!"),
+        ],
+    )
+    def test_words(self, korean, expected):
+        """Known words romanize as in the catalog's own data."""
+        assert romanize(korean) == expected
+
+    def test_boundary_table_is_complete(self):
+        """Every final/initial pair has a precomputed spelling."""
+        assert len(BOUNDARY) == 28 * 19
+
+
+class TestRomanizationOnWrite:
+    """Test generated romanization for new and backfilled words."""
+
+    @pytest.fixture
+    def client(self):
+        asyncio.run(init_db())
+        return TestClient(app)
+
+    def test_created_and_edited_words_get_romanization(self, client):
+        """Missing romanization is generated, and regenerated on edits."""
+        response = client.post(
+            "/api/words", json={"korean": "로마자표기", "english": "test"}
+        )
+        assert response.status_code == 201
+        word = response.json()
+        try:
+            assert word["romanization"] == "romajapyogi"
+
+            updated = client.put(
+                f"/api/words/{word['id']}", json={"korean": "신라"}
+            ).json()
+            assert updated["romanization"] == "silla"
+        finally:
+            client.delete(f"/api/words/{word['id']}")
+
+    def test_backfill(self, client):
+        """Words without romanization are filled in one pass."""
+
+        async def run():
+            async with async_session_factory() as db:
+                word = Word(korean="국물", english="soup", romanization="")
+                db.add(word)
+                await db.commit()
+                updated = await backfill_romanization(db)
+                result = await db.execute(
+                    select(Word.romanization).where(Word.id == word.id)
+                )
+                romanization = result.scalar_one()
+                await db.delete(word)
+                await db.commit()
+            return updated, romanization
+
+        updated, romanization = asyncio.run(run())
+
+        assert updated >= 1
+        assert romanization == "gungmul"
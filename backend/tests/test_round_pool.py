@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Tests for the pre-built game round pool.
+"""
+import asyncio
+import itertools
+
+import pytest
+
+from src.services import round_pool as round_pool_module
+from src.services.round_pool import RoundPool, round_levels
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    """Replace round building with a counter; returns the build log."""
+    log = {"count": 0, "complete": True, "generation": 0}
+    counter = itertools.count(1)
+
+    async def fake_build(count, level, enhance):
+        log["count"] += 1
+        return f"round-{next(counter)}".encode(), log["complete"]
+
+    monkeypatch.setattr(round_pool_module, "build_round_payload", fake_build)
+    monkeypatch.setattr(
+        round_pool_module, "catalog_generation", lambda: log["generation"]
+    )
+    return log
+
+
+async def _settle():
+    # Let background refill tasks run to completion
+    for _ in range(20):
+        await asyncio.sleep(0)
+
+
+class TestRoundPool:
+    """Test pooling, refill and invalidation."""
+
+    def test_builds_inline_when_not_started(self, builds):
+        """Without start() every request builds its own round."""
+
+        async def run():
+            pool = RoundPool(size=4)
+            return await pool.get(10, None, False), pool.metrics()
+
+        payload, metrics = asyncio.run(run())
+
+        assert payload == b"round-1"
+        assert metrics["hits"] == metrics["misses"] == 0
+
+    def test_warm_key_is_served_from_pool(self, builds):
+        """Warmed keys hit the pool and refill after each pop."""
+
+        async def run():
+            pool = RoundPool(size=3, builders=2)
+            await pool.start(warm=[(None, 10, False)])
+            await _settle()
+            first = await pool.get(10, None, False)
+            await _settle()
+            metrics = pool.metrics()
+            await pool.stop()
+            return first, metrics
+
+        first, metrics = asyncio.run(run())
+
+        assert first.startswith(b"round-")
+        assert metrics["hits"] == 1
+        assert metrics["misses"] == 0
+        assert metrics["pooled"]["None:10:basic"] == 3
+
+    def test_rounds_are_served_once(self, builds):
+        """Every request gets a different pre-built round."""
+
+        async def run():
+            pool = RoundPool(size=4)
+            await pool.start(warm=[(None, 5, False)])
+            await _settle()
+            served = [await pool.get(5, None, False) for _ in range(4)]
+            await pool.stop()
+            return served
+
+        served = asyncio.run(run())
+
+        assert len(set(served)) == 4
+
+    def test_catalog_change_drops_pooled_rounds(self, builds):
+        """A new catalog generation empties the pools before serving."""
+
+        async def run():
+            pool = RoundPool(size=2)
+            await pool.start(warm=[(None, 10, False)])
+            await _settle()
+            builds["generation"] += 1
+            await pool.get(10, None, False)
+            metrics = pool.metrics()
+            await pool.stop()
+            return metrics
+
+        metrics = asyncio.run(run())
+
+        assert metrics["misses"] == 1
+
+    def test_degraded_rounds_are_not_pooled(self, builds):
+        """Rounds whose enhancement failed are served but never kept."""
+        builds["complete"] = False
+
+        async def run():
+            pool = RoundPool(size=4)
+            await pool.start(warm=[(None, 10, True)])
+            await _settle()
+            metrics = pool.metrics()
+            await pool.stop()
+            return metrics
+
+        metrics = asyncio.run(run())
+
+        assert metrics["pooled"]["None:10:enhanced"] == 0
+
+    def test_key_count_is_bounded(self, builds):
+        """The least recently used key is evicted past max_keys."""
+
+        async def run():
+            pool = RoundPool(size=1, max_keys=2)
+            await pool.start()
+            for count in (1, 2, 3):
+                await pool.get(count, None, False)
+            metrics = pool.metrics()
+            await pool.stop()
+            return metrics
+
+        metrics = asyncio.run(run())
+
+        assert metrics["keys"] == 2
+        assert "None:1:basic" not in metrics["pooled"]
+
+
+class TestRoundLevels:
+    """Test level filter parsing."""
+
+    def test_named_levels(self):
+        """TOPIK1/TOPIK2 expand to their level ranges."""
+        assert round_levels("topik1") == [1, 2]
+        assert round_levels("TOPIK2") == [3, 4, 5, 6]
+
+    def test_numeric_and_invalid_levels(self):
+        """Numbers select one level; anything else means all words."""
+        assert round_levels("3") == [3]
+        assert round_levels("beginner") is None
+        assert round_levels(None) is None
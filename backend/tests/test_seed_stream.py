@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Tests for the incremental seed file readers.
+"""
+import io
+import json
+
+import pytest
+
+from src.db.seed.stream import (
+    _JsonStream,
+    batched,
+    iter_json_array,
+    iter_json_object,
+    iter_records,
+)
+
+
+WORDS = [
+    {"id": i, "word": f"단어{i}", "meaning": f"word {i}", "level": i * 1.5}
+    for i in range(1, 40)
+]
+
+
+class TestJsonStream:
+    """Test the sliding-window JSON scanner."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 7, 64, 4096])
+    def test_array_elements_across_chunk_boundaries(self, chunk_size):
+        """Elements are decoded intact regardless of chunk size."""
+        fp = io.StringIO(json.dumps(WORDS, ensure_ascii=False, indent=2))
+        stream = _JsonStream(fp, chunk_size=chunk_size)
+
+        assert list(stream.elements()) == WORDS
+
+    def test_numbers_split_at_buffer_end(self):
+        """A number cut at the end of a chunk is not decoded early."""
+        fp = io.StringIO("[12345, 678, 9]")
+        stream = _JsonStream(fp, chunk_size=3)
+
+        assert list(stream.elements()) == [12345, 678, 9]
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 5])
+    def test_brackets_and_escapes_inside_strings(self, chunk_size):
+        """Quotes, backslashes and brackets in strings don't end a value."""
+        records = [
+            {"word": 'say "]}"', "note": "back\\slash \\\" [{"},
+            "\\",
+            ["}", {"]": "\"{"}],
+            -1.5e3,
+            True,
+            None,
+        ]
+        fp = io.StringIO(json.dumps(records))
+        stream = _JsonStream(fp, chunk_size=chunk_size)
+
+        assert list(stream.elements()) == records
+
+    def test_large_value_is_decoded_once(self):
+        """A value spanning many chunks is decoded once it is complete."""
+        doc = {"groups": {"Big": {"words": WORDS * 50}, "Small": {}}}
+        fp = io.StringIO(json.dumps(doc, ensure_ascii=False))
+        stream = _JsonStream(fp, chunk_size=64)
+        decoder = stream.decoder
+        calls = []
+
+        class CountingDecoder:
+            def raw_decode(self, s, idx=0):
+                calls.append(idx)
+                return decoder.raw_decode(s, idx)
+
+        stream.decoder = CountingDecoder()
+        stream.descend("groups")
+
+        assert list(stream.items()) == list(doc["groups"].items())
+        # Two keys and two values after "groups" itself
+        assert len(calls) == 5
+
+    def test_empty_containers(self):
+        """Empty arrays and objects yield nothing."""
+        assert list(iter_json_array(io.StringIO(" [ ] "))) == []
+        assert list(iter_json_object(io.StringIO("{}"))) == []
+
+    def test_nested_path(self):
+        """Sibling keys are skipped until the requested path is reached."""
+        doc = {
+            "meta": {"version": 2, "tags": ["a", "b"]},
+            "groups": {"Body": {"words": [1, 2]}, "Food": {"words": []}},
+        }
+        fp = io.StringIO(json.dumps(doc))
+
+        assert list(iter_json_object(fp, ("groups",))) == [
+            ("Body", {"words": [1, 2]}),
+            ("Food", {"words": []}),
+        ]
+
+    def test_missing_path_raises(self):
+        """An absent key raises KeyError."""
+        with pytest.raises(KeyError):
+            list(iter_json_array(io.StringIO('{"other": []}'), ("items",)))
+
+    def test_malformed_document_raises(self):
+        """Truncated documents raise instead of yielding partial records."""
+        with pytest.raises(ValueError):
+            list(iter_json_array(io.StringIO('[{"id": 1}, {"id": ')))
+
+
+class TestIterRecords:
+    """Test file-level record streaming."""
+
+    def test_json_and_ndjson_agree(self, tmp_path):
+        """JSON arrays and NDJSON files yield the same records."""
+        json_path = tmp_path / "words.json"
+        ndjson_path = tmp_path / "words.ndjson"
+        json_path.write_text(json.dumps(WORDS, ensure_ascii=False), "utf-8")
+        ndjson_path.write_text(
+            "\n".join(json.dumps(w, ensure_ascii=False) for w in WORDS)
+            + "\n\n",
+            "utf-8",
+        )
+
+        assert list(iter_records(json_path)) == WORDS
+        assert list(iter_records(ndjson_path)) == WORDS
+
+
+class TestBatched:
+    """Test batch grouping."""
+
+    def test_batch_sizes(self):
+        """Batches are bounded and cover every record."""
+        batches = list(batched(range(10), 4))
+
+        assert [len(b) for b in batches] == [4, 4, 2]
+        assert sum(batches, []) == list(range(10))
+
+    def test_empty_input(self):
+        """No batches for empty input."""
+        assert list(batched([], 4)) == []
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Tests for the sentence inverted index.
+"""
+
+import asyncio
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.config import SQLITE_DB_PATH
+from src.database import init_db
+from src.main import app
+from src.services import sentence_index
+from src.services.sentence_index import SentenceIndex
+
+WORDS = [
+    (1, "주머니", "n"),
+    (2, "넣다", "verb"),
+    (3, "편리하다", "adjective"),
+    (4, "사무실", "n"),
+    (5, "사무", "n"),
+    (6, "켜다", "verb"),
+    (7, "내다", "verb"),
+    (8, "요구 사항", "n"),
+    (9, "바다", "n"),
+]
+
+SENTENCES = [
+    (11, 1, "이 휴대폰은 주머니에 넣기에 편리합니다.", "It fits a pocket."),
+    (12, 4, "사무실은 육 층에 있습니다.", "The office is on six."),
+    (13, 6, "아빠가 난방기를 켰고 방이 따뜻해졌습니다.", "Dad turned it on."),
+    (14, 9, "내 요구 사항은 바다가 보이는 방입니다.", "A sea view."),
+    (15, 2, "넣어요.", "Put it in."),
+]
+
+
+@pytest.fixture
+def index():
+    return SentenceIndex.build(WORDS, SENTENCES)
+
+
+class TestSentenceIndex:
+    """Test eojeol matching and postings."""
+
+    def test_particles_and_endings_are_stripped(self, index):
+        """Nouns lose particles; predicates match conjugated forms."""
+        assert index.words_in(SENTENCES[0][2]) == {1, 2, 3}
+        assert index.words_in("켰고") == {6}
+
+    def test_longest_match_wins(self, index):
+        """사무실은 is 사무실, not 사무 with a stray ending."""
+        assert index.words_in("사무실은") == {4}
+
+    def test_bare_stem_and_phrases(self, index):
+        """내 alone is not 내다; multi-eojeol words match as phrases."""
+        assert index.words_in(SENTENCES[3][2]) == {8, 9}
+
+    def test_sentences_shortest_first(self, index):
+        """A word lists every sentence using it, shortest first."""
+        sentences = index.sentences_for(2)
+
+        assert [s["id"] for s in sentences] == [15, 11]
+        assert sentences[1]["word_id"] == 1  # Seeded for 주머니
+        assert index.sentences_for(2, limit=1)[0]["id"] == 15
+
+    def test_added_sentence_is_indexed(self, index):
+        """Sentences added later land in order in every posting list."""
+        index.add(16, 4, "주머니가 편리해요.", "Handy pocket.")
+
+        assert [s["id"] for s in index.sentences_for(1)] == [16, 11]
+        assert [s["id"] for s in index.sentences_for(3)] == [16, 11]
+
+    def test_added_word_finds_existing_sentences(self, index):
+        """A new word is matched in place, without a rebuild."""
+        index.index_word(10, "휴대폰", "n")
+
+        assert [s["id"] for s in index.sentences_for(10)] == [11]
+        assert 10 in index.words_in(SENTENCES[0][2])
+
+    def test_edited_word_is_rematched(self, index):
+        """A word re-tagged as a noun no longer matches conjugations."""
+        index.index_word(2, "넣다", "noun")
+
+        assert [s["id"] for s in index.sentences_for(2)] == [15]
+        assert index.words_in(SENTENCES[0][2]) == {1, 3}
+
+    def test_deleted_word_drops_its_sentences(self, index):
+        """Sentences seeded for a deleted word go with it."""
+        index.unindex_word(1)
+
+        assert index.sentences_for(1) == []
+        assert [s["id"] for s in index.sentences_for(2)] == [15]
+        assert index.sentences_for(3) == []
+
+
+class TestSentencesEndpoint:
+    """Test GET /api/words/{id}/sentences over the index."""
+
+    @pytest.fixture
+    def client(self):
+        asyncio.run(init_db())
+        sentence_index.invalidate_sentence_index()
+        return TestClient(app)
+
+    def test_added_sentence_is_listed_for_every_word(self, client):
+        """A sentence added to one word shows up for the others it uses."""
+        words = client.get("/api/words?limit=2").json()
+        sentence = f"{words[0]['korean']} {words[1]['korean']}"
+        client.get(f"/api/words/{words[1]['id']}/sentences")  # Build index
+
+        added = client.post(
+            f"/api/words/{words[0]['id']}/sentences",
+            json={"sentence_korean": sentence, "sentence_english": "x"},
+        ).json()
+        listed = client.get(
+            f"/api/words/{words[1]['id']}/sentences?limit=500"
+        ).json()
+
+        assert added["id"] in [s["id"] for s in listed]
+        lengths = [len(s["sentence_korean"]) for s in listed]
+        assert lengths == sorted(lengths)
+
+    def test_other_workers_writes_rebuild_the_index(
+        self, client, monkeypatch
+    ):
+        """A new catalog generation (another worker's write) rebuilds."""
+        word = client.get("/api/words?limit=1").json()[0]
+        client.get(f"/api/words/{word['id']}/sentences")  # Build index
+        conn = sqlite3.connect(SQLITE_DB_PATH)
+        with conn:
+            cursor = conn.execute(
+                "INSERT INTO sample_sentences "
+                "(word_id, sentence_korean, sentence_english) "
+                "VALUES (?, ?, 'x')",
+                (word["id"], word["korean"]),
+            )
+        conn.close()
+        monkeypatch.setattr(
+            sentence_index, "catalog_generation", lambda: ("elsewhere",)
+        )
+
+        listed = client.get(
+            f"/api/words/{word['id']}/sentences?limit=500"
+        ).json()
+
+        assert cursor.lastrowid in [s["id"] for s in listed]
+
+    def test_unknown_word_is_404(self, client):
+        """Sentences of a missing word are a 404."""
+        assert client.get("/api/words/999999/sentences").status_code == 404
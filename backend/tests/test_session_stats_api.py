@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Tests for atomic session stats increments.
+"""
+import asyncio
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from src.database import async_session_factory, init_db
+from src.main import app
+from src.models.session_stats import SessionStats
+from src.models.study_session import StudySession
+
+
+async def _create_session() -> int:
+    await init_db()
+    async with async_session_factory() as db:
+        session = StudySession()
+        db.add(session)
+        await db.flush()
+        db.add(SessionStats(session_id=session.id))
+        await db.commit()
+        return session.id
+
+
+@pytest.fixture
+def client():
+    """Create a test client for the FastAPI app."""
+    return TestClient(app)
+
+
+@pytest.fixture
+def session_id():
+    """A fresh study session with zeroed stats."""
+    return asyncio.run(_create_session())
+
+
+class TestIncrementSessionStats:
+    """Test POST /api/sessions/{id}/stats/increment."""
+
+    def test_increments_and_derives_accuracy(self, client, session_id):
+        """Deltas accumulate and accuracy is recomputed from the totals."""
+        url = f"/api/sessions/{session_id}/stats/increment"
+
+        client.post(url, json={"shown": 3, "correct": 2})
+        response = client.post(url, json={"shown": 1})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_shown"] == 4
+        assert data["total_correct"] == 2
+        assert data["accuracy"] == pytest.approx(0.5)
+
+    def test_empty_increment_keeps_zero_accuracy(self, client, session_id):
+        """No answers yet means an accuracy of zero, not a division error."""
+        response = client.post(
+            f"/api/sessions/{session_id}/stats/increment", json={}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["accuracy"] == 0.0
+
+    def test_concurrent_increments_are_not_lost(self, session_id):
+        """Parallel clients each add their delta; none overwrite another."""
+        url = f"/api/sessions/{session_id}/stats/increment"
+
+        async def run():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://test"
+            ) as client:
+                await asyncio.gather(
+                    *(
+                        client.post(url, json={"shown": 1, "correct": i % 2})
+                        for i in range(50)
+                    )
+                )
+                return (await client.post(url, json={})).json()
+
+        data = asyncio.run(run())
+
+        assert data["total_shown"] == 50
+        assert data["total_correct"] == 25
+
+    def test_correct_cannot_exceed_shown(self, client, session_id):
+        """A delta with more correct than shown answers is rejected."""
+        response = client.post(
+            f"/api/sessions/{session_id}/stats/increment",
+            json={"shown": 1, "correct": 2},
+        )
+
+        assert response.status_code == 400
+
+    def test_negative_delta_rejected(self, client, session_id):
+        """Counters only ever grow."""
+        response = client.post(
+            f"/api/sessions/{session_id}/stats/increment", json={"shown": -1}
+        )
+
+        assert response.status_code == 422
+
+    def test_unknown_session(self, client):
+        """Incrementing a missing session returns 404."""
+        response = client.post(
+            "/api/sessions/999999/stats/increment", json={"shown": 1}
+        )
+
+        assert response.status_code == 404
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Tests for the local embedding index and related-word lookups.
+"""
+
+import sqlite3
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlmodel import SQLModel
+
+import src.models  # noqa: F401  (registers tables on the metadata)
+from src.config import SQLITE_DB_PATH
+from src.main import app
+from src.services import ngram_index, vector_index
+from src.services.vector_index import (
+    HashingEmbedder,
+    VectorIndex,
+    build_vector_index,
+)
+
+
+@pytest.fixture
+def catalog_db(tmp_path):
+    """A small catalog with two word families and some sentences."""
+    db_path = tmp_path / "catalog.db"
+    engine = create_engine(f"sqlite:///{db_path}")
+    SQLModel.metadata.create_all(engine)
+    engine.dispose()
+
+    conn = sqlite3.connect(db_path)
+    conn.executemany(
+        "INSERT INTO words (id, korean, english, created_at) "
+        "VALUES (?, ?, ?, '2025-01-01 00:00:00')",
+        [
+            (1, "사과", "apple"),
+            (2, "사과나무", "apple tree"),
+            (3, "학교", "school"),
+            (4, "학교생활", "school life"),
+            (5, "경제", "economy"),
+            (6, "경제학", "economics"),
+        ],
+    )
+    conn.executemany(
+        "INSERT INTO sample_sentences (id, word_id, sentence_korean, sentence_english) "
+        "VALUES (?, ?, ?, ?)",
+        [
+            (10, 5, "경제가 좋아요.", "The economy is good."),
+            (11, 1, "사과를 먹어요.", "I eat an apple."),
+        ],
+    )
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+def _index(catalog_db, tmp_path, **kwargs):
+    out = tmp_path / "catalog.hxe"
+    build_vector_index(
+        str(catalog_db), str(out), embedder=HashingEmbedder(64), **kwargs
+    )
+    return VectorIndex(str(out))
+
+
+class TestVectorIndex:
+    """Test building, searching and updating the index."""
+
+    def test_counts(self, catalog_db, tmp_path):
+        """Build reports what was embedded."""
+        counts = build_vector_index(
+            str(catalog_db), str(tmp_path / "v.hxe"), HashingEmbedder(64)
+        )
+
+        assert counts == {
+            "n_words": 6,
+            "n_sentences": 2,
+            "dim": 64,
+            "n_lists": 0,
+        }
+
+    def test_related_words(self, catalog_db, tmp_path):
+        """A word's family ranks first, the word itself is excluded."""
+        index = _index(catalog_db, tmp_path)
+
+        related = index.related_words(3, k=3)
+
+        assert related[0][0] == 4
+        assert 3 not in [wid for wid, _ in related]
+        assert index.related_words(99) is None
+
+    def test_int8_scores_match_float32(self, catalog_db, tmp_path):
+        """Quantized scores stay close to the float32 ones."""
+        exact = _index(catalog_db, tmp_path)
+        query = exact.word_vector(1)
+        quantized = _index(catalog_db, tmp_path, quantize="int8")
+
+        a = dict(exact.search(query, k=8)[0])
+        b = dict(quantized.search(query, k=8)[0])
+
+        assert quantized.quantized
+        assert set(a) == set(b)
+        assert max(abs(a[wid] - b[wid]) for wid in a) < 0.02
+
+    def test_ivf_probing_every_list_is_exact(self, catalog_db, tmp_path):
+        """IVF over all lists returns the exact search results."""
+        exact = _index(catalog_db, tmp_path)
+        ivf = _index(catalog_db, tmp_path, n_lists=3)
+        query = exact.word_vector(5)
+
+        assert ivf.n_lists == 3
+        assert ivf.search(query, 4, nprobe=3) == exact.search(query, 4)
+        assert len(ivf.search(query, 4, nprobe=1)[0]) >= 1
+
+    def test_batched_queries(self, catalog_db, tmp_path):
+        """Several queries are answered by one matmul, each on its own."""
+        index = _index(catalog_db, tmp_path)
+        queries = np.stack([index.word_vector(1), index.word_vector(3)])
+
+        results = index.search(queries, k=1)
+
+        assert results == [index.search(q, k=1)[0] for q in queries]
+
+    def test_incremental_updates(self, catalog_db, tmp_path):
+        """Added, edited and deleted words apply without a rebuild."""
+        index = _index(catalog_db, tmp_path)
+
+        index.add_word(7, "학교버스", "school bus")
+        assert 7 in [wid for wid, _ in index.related_words(3)]
+
+        index.add_word(7, "경제위기", "economic crisis")
+        assert 7 not in [wid for wid, _ in index.related_words(3, k=2)]
+        assert 7 in [wid for wid, _ in index.related_words(5, k=2)]
+
+        index.remove_word(4)
+        assert 4 not in [wid for wid, _ in index.related_words(3)]
+
+    def test_editing_a_word_keeps_its_new_sentences(
+        self, catalog_db, tmp_path
+    ):
+        """A sentence added since the build survives an edit of its word."""
+        index = _index(catalog_db, tmp_path)
+        sentence = "학교에 가요. I go to school."
+        query = index.embedder.embed([sentence])[0]
+
+        index.add_text(2, sentence)
+        index.add_word(2, "사과나무", "apple trees")
+
+        assert index.search(query, k=1)[0][0] == (2, pytest.approx(1.0))
+        assert np.allclose(
+            index.word_vector(2),
+            index.embedder.embed(["사과나무 apple trees"])[0],
+        )
+
+
+class TestRelatedEndpoint:
+    """Test GET /api/words/{id}/related."""
+
+    @pytest.fixture
+    def client(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(
+            vector_index, "VECTOR_INDEX_PATH", str(tmp_path / "catalog.hxe")
+        )
+        monkeypatch.setattr(vector_index, "_index_stat", None)
+        # The spelling fallback may build and save the n-gram index
+        monkeypatch.setattr(
+            ngram_index, "NGRAM_INDEX_PATH", str(tmp_path / "ngram.npz")
+        )
+        return TestClient(app)
+
+    def test_no_index_falls_back_to_spelling(self, client):
+        """Without a built index, related words come from the n-gram index."""
+        word_id = client.get("/api/words?limit=1").json()[0]["id"]
+
+        response = client.get(f"/api/words/{word_id}/related?limit=3")
+
+        assert response.status_code == 200
+        assert 0 < len(response.json()) <= 3
+
+    def test_related(self, client):
+        """Related words come back with their scores, best first."""
+        build_vector_index(SQLITE_DB_PATH, vector_index.VECTOR_INDEX_PATH)
+        word_id = client.get("/api/words?limit=1").json()[0]["id"]
+
+        response = client.get(f"/api/words/{word_id}/related?limit=5")
+
+        assert response.status_code == 200
+        related = response.json()
+        assert 0 < len(related) <= 5
+        assert word_id not in [word["id"] for word in related]
+        scores = [word["score"] for word in related]
+        assert scores == sorted(scores, reverse=True)
+        assert client.get("/api/words/999999/related").status_code == 404
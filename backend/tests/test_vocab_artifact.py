@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Tests for the memory-mapped vocabulary artifact.
+"""
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlmodel import SQLModel
+
+import src.models  # noqa: F401  (registers tables on the metadata)
+from src.services.vocab_artifact import (
+    VocabArtifact,
+    build_vocab_artifact,
+    catalog_generation,
+)
+
+BACKEND = Path(__file__).resolve().parent.parent
+
+
+def invalidate_in_another_process():
+    """What a catalog write on another uvicorn worker does."""
+    subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "from src.services.vocab_artifact import "
+            "invalidate_vocab_artifact; invalidate_vocab_artifact()",
+        ],
+        cwd=BACKEND,
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.fixture
+def catalog_db(tmp_path):
+    """A small catalog database with words, sentences and groups."""
+    db_path = tmp_path / "catalog.db"
+    engine = create_engine(f"sqlite:///{db_path}")
+    SQLModel.metadata.create_all(engine)
+    engine.dispose()
+
+    conn = sqlite3.connect(db_path)
+    conn.executemany(
+        "INSERT INTO words (id, korean, english, romanization, topik_level, created_at) "
+        "VALUES (?, ?, ?, ?, ?, '2025-01-01 00:00:00')",
+        [
+            (1, "사과", "apple", "sagwa", 1),
+            (2, "학교", "school", None, 2),
+            (5, "경제", "economy", "gyeongje", 4),
+            (9, "것", "thing", "geot", None),
+        ],
+    )
+    conn.executemany(
+        "INSERT INTO sample_sentences (id, word_id, sentence_korean, sentence_english) "
+        "VALUES (?, ?, ?, ?)",
+        [
+            (10, 5, "경제가 좋아요.", "The economy is good."),
+            (11, 1, "사과를 먹어요.", "I eat an apple."),
+            (12, 1, "사과가 빨개요.", "The apple is red."),
+        ],
+    )
+    conn.executemany(
+        "INSERT INTO word_groups (id, name, created_at, is_editable) "
+        "VALUES (?, ?, '2025-01-01 00:00:00', 1)",
+        [(3, "Food"), (4, "Empty")],
+    )
+    conn.executemany(
+        "INSERT INTO word_group_map (word_id, group_id) VALUES (?, ?)",
+        [(1, 3), (9, 3)],
+    )
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+@pytest.fixture
+def artifact(catalog_db, tmp_path):
+    out = tmp_path / "vocab.hxv"
+    build_vocab_artifact(str(catalog_db), str(out))
+    vocab = VocabArtifact(str(out))
+    yield vocab
+    vocab.close()
+
+
+class TestVocabArtifact:
+    """Test building and reading the artifact."""
+
+    def test_counts(self, catalog_db, tmp_path):
+        """Build reports the number of records written."""
+        counts = build_vocab_artifact(str(catalog_db), str(tmp_path / "v.hxv"))
+
+        assert counts["n_words"] == 4
+        assert counts["n_sentences"] == 3
+        assert counts["n_groups"] == 2
+        assert counts["n_members"] == 2
+
+    def test_get_word(self, artifact):
+        """Words round-trip with optional fields preserved."""
+        word = artifact.get_word(2)
+
+        assert word["korean"] == "학교"
+        assert word["english"] == "school"
+        assert word["romanization"] is None
+        assert word["topik_level"] == 2
+        assert word["created_at"] == "2025-01-01 00:00:00"
+        assert artifact.get_word(9)["topik_level"] is None
+
+    def test_missing_word(self, artifact):
+        """Unknown ids return None."""
+        assert artifact.get_word(3) is None
+        assert artifact.get_word(100) is None
+        assert artifact.get_sentences(3) is None
+
+    def test_list_words_pagination(self, artifact):
+        """Words are listed in id order with skip/limit."""
+        assert [w["id"] for w in artifact.list_words(0, 10)] == [1, 2, 5, 9]
+        assert [w["id"] for w in artifact.list_words(1, 2)] == [2, 5]
+        assert artifact.list_words(10, 5) == []
+
+    def test_sentences(self, artifact):
+        """Each word sees exactly its own sentences."""
+        sentences = artifact.get_sentences(1)
+
+        assert [s["id"] for s in sentences] == [11, 12]
+        assert all(s["word_id"] == 1 for s in sentences)
+        assert artifact.get_sentences(2) == []
+        assert artifact.get_sentences(5)[0]["sentence_english"] == (
+            "The economy is good."
+        )
+
+    def test_group_words(self, artifact):
+        """Group membership resolves to words."""
+        assert [w["korean"] for w in artifact.get_group_words(3)] == [
+            "사과",
+            "것",
+        ]
+        assert artifact.get_group_words(4) == []
+        assert artifact.get_group_words(99) == []
+
+    def test_sample_words_by_level(self, artifact):
+        """Level-filtered samples only contain words of those levels."""
+        sample = artifact.sample_words(10, [1, 2])
+
+        assert sorted(w["id"] for w in sample) == [1, 2]
+        assert artifact.sample_words(10, [6]) == []
+        assert len(artifact.sample_words(3)) == 3
+
+    def test_rejects_foreign_file(self, tmp_path):
+        """Files without the artifact header are refused."""
+        bogus = tmp_path / "bogus.hxv"
+        bogus.write_bytes(b"\x00" * 128)
+
+        with pytest.raises(ValueError):
+            VocabArtifact(str(bogus))
+
+
+class TestCatalogGeneration:
+    """Test that catalog writes are seen across processes."""
+
+    def test_another_process_write_changes_the_generation(self):
+        """Without any artifact file, another worker's write still shows."""
+        invalidate_in_another_process()  # No artifact from here on
+        before = catalog_generation()
+
+        assert catalog_generation() == before
+        invalidate_in_another_process()
+        assert catalog_generation() != before
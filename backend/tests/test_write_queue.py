@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Tests for the write-behind batching queue.
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.services.write_queue import WriteBehindQueue
+
+
+async def _make_queue(tmp_path, **kwargs):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'q.db'}")
+    async with engine.begin() as conn:
+        await conn.execute(
+            text("CREATE TABLE rows (id INTEGER PRIMARY KEY, value INTEGER UNIQUE)")
+        )
+
+    async def write_rows(conn, rows):
+        result = await conn.execute(
+            text("INSERT INTO rows (value) VALUES (:value) RETURNING id"), rows
+        )
+        return [row[0] for row in result] or None
+
+    async def insert_rows(conn, rows):
+        await conn.execute(text("INSERT INTO rows (value) VALUES (:value)"), rows)
+
+    queue = WriteBehindQueue(engine=engine, **kwargs)
+    queue.register("rows", insert_rows)
+    queue.register("row_ids", write_rows)
+    return queue, engine
+
+
+async def _count(engine):
+    async with engine.connect() as conn:
+        return (await conn.execute(text("SELECT count(*) FROM rows"))).scalar()
+
+
+class TestWriteBehindQueue:
+    """Test batching, flushing and failure isolation."""
+
+    def test_coalesces_concurrent_rows(self, tmp_path):
+        """Rows submitted together are written in a few large batches."""
+
+        async def run():
+            queue, engine = await _make_queue(tmp_path, batch_rows=100, flush_ms=50)
+            await queue.start()
+            futures = await asyncio.gather(
+                *(queue.submit("rows", {"value": i}) for i in range(250))
+            )
+            await asyncio.gather(*futures)
+            await queue.stop()
+            return queue.metrics(), await _count(engine)
+
+        metrics, count = asyncio.run(run())
+
+        assert count == 250
+        assert metrics["flushed_rows"] == 250
+        assert metrics["batches"] <= 5
+        assert metrics["max_batch_size"] == 100
+
+    def test_stop_flushes_pending_rows(self, tmp_path):
+        """Rows still queued at shutdown are written, not dropped."""
+
+        async def run():
+            queue, engine = await _make_queue(tmp_path, flush_ms=10_000)
+            await queue.start()
+            for i in range(20):
+                await queue.submit("rows", {"value": i})
+            await queue.stop()
+            return await _count(engine)
+
+        assert asyncio.run(run()) == 20
+
+    def test_rows_submitted_while_stopping_are_written(self, tmp_path):
+        """A row arriving after stop() began is written, not stranded."""
+
+        async def run():
+            queue, engine = await _make_queue(tmp_path, flush_ms=10_000)
+            await queue.start()
+            await queue.submit("rows", {"value": 1})
+            stopping = asyncio.create_task(queue.stop())
+            await asyncio.sleep(0)  # stop() is now waiting on the worker
+            future = await queue.submit("row_ids", {"value": 2})
+            await stopping
+            return future.done(), await _count(engine)
+
+        done, count = asyncio.run(run())
+
+        assert done
+        assert count == 2
+
+    def test_failed_row_does_not_sink_batch(self, tmp_path):
+        """A bad row fails alone; the rest of its batch is committed."""
+
+        async def run():
+            queue, engine = await _make_queue(tmp_path, flush_ms=50)
+            await queue.start()
+            futures = [
+                await queue.submit("row_ids", {"value": value})
+                for value in (1, 2, 2, 3)
+            ]
+            results = await asyncio.gather(*futures, return_exceptions=True)
+            await queue.stop()
+            return results, queue.metrics(), await _count(engine)
+
+        results, metrics, count = asyncio.run(run())
+
+        assert count == 3
+        assert metrics["failed_rows"] == 1
+        assert isinstance(results[2], Exception)
+        assert all(isinstance(r, int) for r in results[:2] + results[3:])
+
+    def test_writes_inline_when_not_started(self, tmp_path):
+        """Without a running worker rows are written immediately."""
+
+        async def run():
+            queue, engine = await _make_queue(tmp_path)
+            future = await queue.submit("row_ids", {"value": 5})
+            return future.result(), await _count(engine)
+
+        row_id, count = asyncio.run(run())
+
+        assert row_id == 1
+        assert count == 1
+
+    def test_unknown_kind(self, tmp_path):
+        """Submitting a kind without a handler is rejected."""
+
+        async def run():
+            queue, _ = await _make_queue(tmp_path)
+            await queue.submit("missing", {})
+
+        with pytest.raises(ValueError):
+            asyncio.run(run())
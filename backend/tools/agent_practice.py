@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Batched practice content generation using Groq API.
+Packs many words into one structured prompt instead of one call per word.
+"""
+
+from typing import List, Dict, Any
+import asyncio
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# What each practice type asks for, per word
+PRACTICE_TASKS = {
+    "definition": "A clear definition, any relevant grammar notes and common usage context.",
+    "example": "2-3 example sentences, each in Korean with its English translation and a note on how the word is used.",
+    "quiz": "One quiz question for intermediate learners (multiple choice with 4 options, fill-in-the-blank or translation challenge), including the correct answer.",
+}
+
+# Rough completion tokens one word's content takes, by practice type
+TOKENS_PER_WORD = {"definition": 150, "example": 200, "quiz": 150}
+
+DEFAULT_MAX_TOKENS = 4000
+
+
+class AgentPracticeGenerator:
+    """
+    Generates practice content for many words per Groq call.
+
+    Words are chunked so each chunk's expected output fits in ``max_tokens``.
+    A chunk whose answer comes back truncated or incomplete is split in half
+    and the missing words retried; a lone word goes through the per-word
+    ``generate_practice_content`` prompt.
+    """
+
+    def __init__(self, groq_service, max_tokens: int = DEFAULT_MAX_TOKENS):
+        self.groq_service = groq_service
+        self.max_tokens = max_tokens
+        self.calls = 0
+
+    async def generate_practice(
+        self, words: List[Dict[str, Any]], practice_type: str = "definition"
+    ) -> Dict[int, str]:
+        """
+        Generate practice content for the given words.
+
+        Args:
+            words: List of word dicts with keys: id, korean, english
+            practice_type: Type of practice content ("definition", "example", "quiz")
+
+        Returns:
+            Content keyed by word id; words that could not be generated are missing
+        """
+        if not words:
+            return {}
+        if practice_type not in PRACTICE_TASKS:
+            practice_type = "definition"
+
+        per_word = TOKENS_PER_WORD[practice_type]
+        chunk_size = max(1, self.max_tokens // per_word)
+        chunks = [
+            words[i : i + chunk_size] for i in range(0, len(words), chunk_size)
+        ]
+        results = await asyncio.gather(
+            *(self._generate_chunk(chunk, practice_type) for chunk in chunks)
+        )
+
+        contents = {}
+        for result in results:
+            contents.update(result)
+        return contents
+
+    async def _generate_chunk(
+        self, words: List[Dict[str, Any]], practice_type: str
+    ) -> Dict[int, str]:
+        if len(words) == 1:
+            return await self._generate_single(words[0], practice_type)
+
+        self.calls += 1
+        response = await self.groq_service.generate_completion(
+            self._create_practice_prompt(words, practice_type),
+            max_tokens=self.max_tokens,
+        )
+        if "error" in response:
+            # Retrying piecemeal would only multiply failing calls
+            logger.error(f"Groq API error: {response}")
+            return {}
+
+        contents = self._parse_groq_response(response["content"], words)
+
+        missing = [word for word in words if word["id"] not in contents]
+        if missing:
+            # Most likely truncated: retry the rest in smaller chunks
+            half = (len(missing) + 1) // 2
+            halves = [missing[:half], missing[half:]]
+            results = await asyncio.gather(
+                *(
+                    self._generate_chunk(part, practice_type)
+                    for part in halves
+                    if part
+                )
+            )
+            for result in results:
+                contents.update(result)
+        return contents
+
+    async def _generate_single(
+        self, word: Dict[str, Any], practice_type: str
+    ) -> Dict[int, str]:
+        self.calls += 1
+        response = await self.groq_service.generate_practice_content(
+            korean_word=word["korean"],
+            english_translation=word["english"],
+            practice_type=practice_type,
+        )
+        if "error" in response:
+            logger.error(f"Groq API error for word {word['id']}: {response}")
+            return {}
+        return {word["id"]: response["content"]}
+
+    def _create_practice_prompt(
+        self, words: List[Dict[str, Any]], practice_type: str
+    ) -> str:
+        """Create one prompt covering every word in the chunk."""
+
+        words_list = "\n".join(
+            [
+                f"{i+1}. {word['korean']} → {word['english']}"
+                for i, word in enumerate(words)
+            ]
+        )
+
+        prompt = f"""You are a Korean language tutor. For each Korean word below, write:
+{PRACTICE_TASKS[practice_type]}
+
+Words:
+{words_list}
+
+Please respond in this exact JSON format, one item per word, in order:
+{{
+  "items": [
+    {{"n": 1, "content": "Practice content for word 1"}},
+    {{"n": 2, "content": "Practice content for word 2"}}
+  ]
+}}
+
+Guidelines:
+- Keep each item concise and educational
+- Write the content in English, with Korean where examples need it
+- Do not skip any word"""
+
+        return prompt
+
+    def _parse_groq_response(
+        self, content: str, words: List[Dict[str, Any]]
+    ) -> Dict[int, str]:
+        """Map each numbered item in Groq's JSON response to its word."""
+        try:
+            content = content.strip()
+            if content.startswith("```json"):
+                content = content[7:]
+            if content.endswith("```"):
+                content = content[:-3]
+            content = content.strip()
+
+            data = json.loads(content)
+            contents = {}
+            for item in data.get("items", []):
+                n = item.get("n")
+                text = item.get("content")
+                if isinstance(n, int) and 1 <= n <= len(words) and text:
+                    contents[words[n - 1]["id"]] = str(text).strip()
+            return contents
+
+        except (json.JSONDecodeError, AttributeError) as e:
+            logger.error(f"Failed to parse Groq response: {e}")
+            return {}
@@ -3,13 +3,17 @@
 Agentic quiz generation tool using Groq API.
 Generates hints and distractors for quiz items while keeping answers deterministic.
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator
 import json
 import logging
+import re
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
+# Start of the items array in the quiz JSON response
+_ITEMS_ARRAY = re.compile(r'"items"\s*:\s*\[')
+
 
 @dataclass
 class QuizItem:
@@ -22,6 +26,88 @@ class QuizItem:
     distractors: Optional[List[str]] = None
 
 
+class QuizStreamParser:
+    """
+    Incremental parser for the quiz JSON response.
+
+    Feed it the completion as it streams in; each call returns the
+    ``items[]`` elements that have been closed since the last call, decoded.
+    Text outside the array (code fences, the wrapping object) is ignored,
+    and an element that fails to decode is skipped.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0  # Next character to scan
+        self._in_array = False
+        self._done = False
+        self._start = None  # Offset of the element being scanned
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, text: str) -> List[Dict[str, Any]]:
+        self._buffer += text
+        items = []
+        if self._done:
+            return items
+        if not self._in_array:
+            match = _ITEMS_ARRAY.search(self._buffer)
+            if not match:
+                return items
+            self._in_array = True
+            self._pos = match.end()
+
+        buffer = self._buffer
+        while self._pos < len(buffer):
+            char = buffer[self._pos]
+            self._pos += 1
+            if self._start is None:
+                if char == "{":
+                    self._start = self._pos - 1
+                    self._depth = 1
+                elif char == "]":
+                    self._done = True
+                    break
+                continue
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    item = self._decode(buffer[self._start : self._pos])
+                    if item is not None:
+                        items.append(item)
+                    self._start = None
+
+        # Keep only the unfinished element
+        keep = self._start if self._start is not None else self._pos
+        self._buffer = buffer[keep:]
+        self._pos -= keep
+        if self._start is not None:
+            self._start = 0
+        return items
+
+    @staticmethod
+    def _decode(text: str) -> Optional[Dict[str, Any]]:
+        try:
+            item = json.loads(text)
+        except json.JSONDecodeError as e:
+            logger.error(f"Skipping malformed quiz item: {e}")
+            return None
+        return item if isinstance(item, dict) else None
+
+
 class AgentQuizGenerator:
     """
     Generates quiz items with AI-powered hints and distractors using Groq.
@@ -70,6 +156,52 @@ class AgentQuizGenerator:
             # Fallback to basic items
             return self._create_basic_items(base_words)
 
+    async def stream_quiz_items(
+        self, base_words: List[Dict[str, Any]], level: str = "TOPIK1"
+    ) -> AsyncIterator[QuizItem]:
+        """
+        Like generate_quiz_items, but yield each item as soon as Groq has
+        finished writing it.
+
+        Words Groq never gets to (errors, truncation) are yielded at the end
+        without hints or distractors, so every word comes out exactly once.
+        """
+        if not base_words:
+            return
+
+        word_lookup = {word["korean"]: word for word in base_words}
+        emitted = set()
+        parser = QuizStreamParser()
+        try:
+            async for delta in self.groq_service.stream_completion(
+                [
+                    {
+                        "role": "user",
+                        "content": self._create_quiz_prompt(base_words, level),
+                    }
+                ]
+            ):
+                for item_data in parser.feed(delta):
+                    korean = item_data.get("korean", "")
+                    if korean not in word_lookup or korean in emitted:
+                        continue
+                    emitted.add(korean)
+                    base_word = word_lookup[korean]
+                    yield QuizItem(
+                        word_id=base_word["id"],
+                        korean=korean,
+                        answer_en=base_word["english"],
+                        hint=item_data.get("hint"),
+                        distractors=item_data.get("distractors", []),
+                    )
+        except Exception as e:
+            logger.error(f"Error streaming quiz items: {e}")
+
+        for item in self._create_basic_items(
+            [word for word in base_words if word["korean"] not in emitted]
+        ):
+            yield item
+
     def _create_quiz_prompt(
         self, words: List[Dict[str, Any]], level: str
     ) -> str:
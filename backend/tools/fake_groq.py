@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Groq chat completions API.
+Serves /openai/v1/chat/completions (plain and stream=true) and
+/openai/v1/models with configurable latency, token throughput and error
+rate, answering the app's own prompts with well-formed canned payloads:
+quiz hints/distractors JSON, batched practice JSON, or filler text. Point
+the app at it with GROQ_BASE_URL.
+
+Usage:
+    python tools/fake_groq.py --port 8765 --latency-ms 400 --error-rate 0.02
+    GROQ_BASE_URL=http://127.0.0.1:8765 GROQ_API_KEY=fake uvicorn src.main:app
+"""
+
+from typing import Any, Dict, List, Optional
+from dataclasses import dataclass
+import asyncio
+import json
+import random
+import re
+import socket
+import threading
+import time
+import uuid
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+LATENCY_DISTRIBUTIONS = ("fixed", "normal", "lognormal", "exponential")
+
+# Numbered "1. 한국어 → english" lines, as the quiz and practice prompts list words
+_WORD_LINE = re.compile(r"^\s*(\d+)\.\s+(.+?)\s+→\s+(.+?)\s*$", re.MULTILINE)
+
+_SPARE_DISTRACTORS = ["a small animal", "to wait", "yesterday"]
+
+_FILLER = (
+    "This word is common in everyday Korean and appears in both formal "
+    "and casual speech. "
+)
+
+
+@dataclass
+class FakeGroqProfile:
+    """How the fake upstream behaves"""
+
+    latency_ms: float = 300.0  # Time to first token (median for lognormal)
+    latency_dist: str = "lognormal"
+    latency_sigma: float = 0.5  # Spread: stddev ratio (normal) or log sigma
+    tokens_per_second: float = 500.0  # Output rate after the first token
+    completion_tokens: int = 150  # Length of filler answers
+    error_rate: float = 0.0
+    error_status: int = 503
+    seed: Optional[int] = None
+
+    def __post_init__(self):
+        if self.latency_dist not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown latency distribution: {self.latency_dist}"
+            )
+        self.rng = random.Random(self.seed)
+
+    def first_token_delay(self) -> float:
+        """Seconds until the first token, drawn from the distribution."""
+        mean = self.latency_ms / 1000
+        if self.latency_dist == "fixed" or mean <= 0:
+            return max(0.0, mean)
+        if self.latency_dist == "normal":
+            return max(0.0, self.rng.gauss(mean, mean * self.latency_sigma))
+        if self.latency_dist == "exponential":
+            return self.rng.expovariate(1 / mean)
+        return self.rng.lognormvariate(0, self.latency_sigma) * mean
+
+    def should_fail(self) -> bool:
+        return self.rng.random() < self.error_rate
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def canned_content(
+    messages: List[Dict[str, Any]], profile: FakeGroqProfile
+) -> str:
+    """An answer in the shape the app's prompt asks for."""
+    prompt = messages[-1].get("content", "") if messages else ""
+    words = _WORD_LINE.findall(prompt)
+
+    if "respond with 'OK'" in prompt:
+        return "OK"
+    if words and '"distractors"' in prompt:
+        # AgentQuizGenerator: hints and distractors per word
+        english = [meaning for _, _, meaning in words]
+        items = []
+        for _, korean, meaning in words:
+            wrong = [e for e in english if e != meaning] + _SPARE_DISTRACTORS
+            items.append(
+                {
+                    "korean": korean,
+                    "hint": f"Starts with '{meaning[:1]}', {len(meaning)} letters",
+                    "distractors": profile.rng.sample(wrong, 3),
+                }
+            )
+        return json.dumps({"items": items}, ensure_ascii=False)
+    if words and '"n": 1' in prompt:
+        # AgentPracticeGenerator: one numbered item per word
+        items = [
+            {"n": int(n), "content": f"{korean} means '{meaning}'. {_FILLER}"}
+            for n, korean, meaning in words
+        ]
+        return json.dumps({"items": items}, ensure_ascii=False)
+
+    chars = profile.completion_tokens * 4
+    return (_FILLER * (chars // len(_FILLER) + 1))[:chars].strip()
+
+
+def create_app(profile: Optional[FakeGroqProfile] = None) -> FastAPI:
+    """The fake API; ``app.state.requests`` counts calls served."""
+    profile = profile or FakeGroqProfile()
+    app = FastAPI(title="Fake Groq")
+    app.state.profile = profile
+    app.state.requests = 0
+
+    @app.get("/openai/v1/models")
+    async def list_models():
+        await asyncio.sleep(profile.first_token_delay())
+        if profile.should_fail():
+            return JSONResponse(
+                status_code=profile.error_status,
+                content={"error": {"message": "Injected failure"}},
+            )
+        return {
+            "object": "list",
+            "data": [
+                {
+                    "id": "openai/gpt-oss-20b",
+                    "object": "model",
+                    "created": 0,
+                    "owned_by": "fake",
+                }
+            ],
+        }
+
+    @app.post("/openai/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        app.state.requests += 1
+        messages = body.get("messages", [])
+        model = body.get("model", "fake")
+
+        await asyncio.sleep(profile.first_token_delay())
+        if profile.should_fail():
+            return JSONResponse(
+                status_code=profile.error_status,
+                content={
+                    "error": {
+                        "message": "Injected failure from fake Groq",
+                        "type": "internal_server_error",
+                    }
+                },
+            )
+
+        content = canned_content(messages, profile)
+        max_tokens = body.get("max_tokens") or body.get(
+            "max_completion_tokens"
+        )
+        if max_tokens and estimate_tokens(content) > max_tokens:
+            content = content[: max_tokens * 4]
+            finish_reason = "length"
+        else:
+            finish_reason = "stop"
+        prompt_tokens = sum(
+            estimate_tokens(m.get("content", "")) for m in messages
+        )
+        completion_tokens = estimate_tokens(content)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        created = int(time.time())
+
+        if body.get("stream"):
+
+            async def chunks():
+                # ~4 characters per token, paced at tokens_per_second
+                step = 16
+                for start in range(0, len(content), step):
+                    piece = content[start : start + step]
+                    await asyncio.sleep(
+                        estimate_tokens(piece) / profile.tokens_per_second
+                    )
+                    yield _sse(
+                        completion_id, created, model, {"content": piece}, None
+                    )
+                yield _sse(
+                    completion_id, created, model, {}, finish_reason, usage
+                )
+                yield "data: [DONE]\n\n"
+
+            return StreamingResponse(chunks(), media_type="text/event-stream")
+
+        await asyncio.sleep(completion_tokens / profile.tokens_per_second)
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": finish_reason,
+                }
+            ],
+            "usage": usage,
+        }
+
+    return app
+
+
+def _sse(
+    completion_id, created, model, delta, finish_reason, usage=None
+) -> str:
+    chunk = {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": created,
+        "model": model,
+        "choices": [
+            {"index": 0, "delta": delta, "finish_reason": finish_reason}
+        ],
+    }
+    if usage:
+        chunk["x_groq"] = {"usage": usage}
+    return f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+
+
+def serve_in_thread(profile: Optional[FakeGroqProfile] = None, port: int = 0):
+    """Run the fake API on a background thread (for tests and benchmarks).
+
+    Returns:
+        (server, base_url); call ``server.should_exit = True`` to stop it
+    """
+    import uvicorn
+
+    if port == 0:
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+
+    server = uvicorn.Server(
+        uvicorn.Config(
+            create_app(profile),
+            host="127.0.0.1",
+            port=port,
+            log_level="warning",
+        )
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError(f"Fake Groq failed to start on port {port}")
+        time.sleep(0.01)
+    return server, f"http://127.0.0.1:{port}"
+
+
+if __name__ == "__main__":
+    import argparse
+
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run a local fake Groq API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument(
+        "--latency-dist", choices=LATENCY_DISTRIBUTIONS, default="lognormal"
+    )
+    parser.add_argument("--latency-sigma", type=float, default=0.5)
+    parser.add_argument("--tokens-per-second", type=float, default=500.0)
+    parser.add_argument("--completion-tokens", type=int, default=150)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    profile = FakeGroqProfile(
+        latency_ms=args.latency_ms,
+        latency_dist=args.latency_dist,
+        latency_sigma=args.latency_sigma,
+        tokens_per_second=args.tokens_per_second,
+        completion_tokens=args.completion_tokens,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        seed=args.seed,
+    )
+    print(f"🤖 Fake Groq listening on http://{args.host}:{args.port}")
+    uvicorn.run(
+        create_app(profile),
+        host=args.host,
+        port=args.port,
+        log_level="warning",
+    )
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Fuzzy answer grading against a word's Korean, English and romanization.
+Korean is compared jamo by jamo, so 학꾜 for 학교 is one edit rather than a
+wrong syllable. Distances use Myers' bit-parallel algorithm: the answer is
+compiled once into per-character bit masks, then each typed answer costs a
+handful of integer operations per character.
+"""
+
+from typing import AbstractSet, Dict, List, Optional, Sequence, Tuple
+from dataclasses import dataclass
+import re
+import unicodedata
+
+from tools.hangul import to_jamo
+
+CORRECT = "correct"
+NEAR_MISS = "near_miss"
+WRONG = "wrong"
+
+# Edits tolerated as a near miss, per character of the answer (at least 1)
+NEAR_MISS_RATIO = 0.2
+# Korean is budgeted per syllable, not per jamo: one jamo turns 물 into 불
+# or 나 into 너, so one-syllable words must be typed exactly
+NEAR_MISS_MIN_SYLLABLES = 2
+# Latin answers this short are mostly other words one letter away
+NEAR_MISS_MIN_LETTERS = 4
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_SPACES = re.compile(r"\s+")
+_PARENTHESES = re.compile(r"\([^)]*\)")
+_VARIANT_SPLIT = re.compile(r"[,;/]")
+_ARTICLES = ("to be ", "to ", "a ", "an ", "the ")
+_HANGUL = re.compile("[가-힣]")
+
+
+def normalize(text: str) -> str:
+    """Lowercase, NFC, no punctuation, single spaces."""
+    text = unicodedata.normalize("NFC", text).lower()
+    text = _PUNCTUATION.sub(" ", text)
+    return _SPACES.sub(" ", text).strip()
+
+
+def english_variants(english: str) -> List[str]:
+    """Accepted spellings of a gloss like "to be happy, glad (feeling)".
+
+    Each comma/semicolon/slash alternative counts, with parenthesized
+    notes dropped and with or without a leading "to be"/"to"/"a"/"an"/
+    "the".
+    """
+    variants = []
+    for part in _VARIANT_SPLIT.split(_PARENTHESES.sub(" ", english)):
+        part = normalize(part)
+        if not part:
+            continue
+        variants.append(part)
+        for article in _ARTICLES:
+            if part.startswith(article) and len(part) > len(article):
+                variants.append(part[len(article) :])
+    return list(dict.fromkeys(variants)) or [normalize(english)]
+
+
+class Pattern:
+    """An answer compiled for Myers' bit-parallel edit distance"""
+
+    __slots__ = ("text", "length", "peq", "mask")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.length = len(text)
+        self.peq: Dict[str, int] = {}
+        for i, char in enumerate(text):
+            self.peq[char] = self.peq.get(char, 0) | (1 << i)
+        self.mask = (1 << self.length) - 1
+
+    def distance(self, text: str) -> int:
+        """Levenshtein distance from this answer to ``text``."""
+        if text == self.text:
+            return 0
+        if not self.length:
+            return len(text)
+        # Python ints act as unbounded two's complement and every step
+        # only carries or shifts information upwards, so the low
+        # ``length`` bits stay exact without masking
+        get = self.peq.get
+        pv, mv = self.mask, 0
+        for char in text:
+            eq = get(char, 0)
+            xv = eq | mv
+            xh = (((eq & pv) + pv) ^ pv) | eq
+            ph = ((mv | ~(xh | pv)) << 1) | 1
+            pv = ((pv & xh) << 1) | ~(xv | ph)
+            mv = ph & xv
+        # The last column is len(text) at the top plus its vertical deltas
+        mask = self.mask
+        return len(text) + (pv & mask).bit_count() - (mv & mask).bit_count()
+
+
+def levenshtein(a: str, b: str) -> int:
+    return Pattern(a).distance(b)
+
+
+def near_miss_budget(target: str, accepted: str) -> int:
+    """Edits an answer may be off by and still count as a near miss."""
+    if target == "korean":
+        syllables = len(_HANGUL.findall(accepted))
+        if syllables < NEAR_MISS_MIN_SYLLABLES:
+            return 0
+        return max(1, int(syllables * NEAR_MISS_RATIO))
+    if len(accepted) < NEAR_MISS_MIN_LETTERS:
+        return 0
+    return max(1, int(len(accepted) * NEAR_MISS_RATIO))
+
+
+def catalog_answers(
+    words: Sequence[Tuple[str, str, Optional[str]]],
+) -> AbstractSet[str]:
+    """Every normalized answer of (korean, english, romanization) rows.
+
+    Passed to ``AnswerKey.grade`` as ``others``: typing another word of the
+    catalog is never a near miss, however close it is.
+    """
+    answers = set()
+    for korean, english, romanization in words:
+        answers.add(normalize(korean))
+        answers.update(english_variants(english))
+        if romanization:
+            answers.add(normalize(romanization))
+    answers.discard("")
+    return frozenset(answers)
+
+
+@dataclass
+class Grade:
+    """How a typed answer compares to the closest accepted answer"""
+
+    verdict: str  # correct, near_miss or wrong
+    distance: int
+    target: str  # korean, english or romanization
+    matched: str  # The accepted answer it was closest to
+    similarity: float  # 1 - distance / length of the longer string
+    reason: Optional[str] = None  # Near misses: spacing, jamo or spelling
+
+    @property
+    def accepted(self) -> bool:
+        """Whether the answer counts as right; near misses do, the learner
+        knew the word and is shown the correction."""
+        return self.verdict != WRONG
+
+
+class AnswerKey:
+    """A word's accepted answers, compiled once and graded many times"""
+
+    def __init__(
+        self,
+        korean: str,
+        english: str,
+        romanization: Optional[str] = None,
+    ):
+        korean = normalize(korean)
+        self.patterns: Dict[str, List[Tuple[str, Pattern]]] = {
+            "korean": [(korean, Pattern(to_jamo(korean)))],
+            "english": [(v, Pattern(v)) for v in english_variants(english)],
+            "romanization": [
+                (v, Pattern(v))
+                for v in dict.fromkeys(
+                    [
+                        normalize(romanization or ""),
+                        normalize(romanization or "").replace(" ", ""),
+                    ]
+                )
+                if v
+            ],
+        }
+        # Exact answers are a dict lookup; only misses run the distance
+        self.exact: Dict[str, Tuple[str, str]] = {}
+        for target, patterns in self.patterns.items():
+            for accepted, _ in patterns:
+                self.exact.setdefault(
+                    korean if target == "korean" else accepted,
+                    (target, accepted),
+                )
+
+    def grade(
+        self,
+        answer: str,
+        expected: str = "any",
+        others: Optional[AbstractSet[str]] = None,
+    ) -> Grade:
+        """Grade a typed answer.
+
+        Args:
+            expected: "korean", "english", "romanization", or "any" to
+                pick by script - Hangul is graded against the Korean, Latin
+                against the English glosses and the romanization
+            others: Answers of the whole catalog (``catalog_answers``); an
+                answer that is exactly another word is wrong, not a near
+                miss
+        """
+        typed = normalize(answer)
+        if expected == "any":
+            if _HANGUL.search(typed):
+                targets = ("korean",)
+            else:
+                targets = ("english", "romanization")
+        else:
+            targets = (expected,)
+
+        exact = self.exact.get(typed)
+        if exact is not None and exact[0] in targets:
+            return Grade(CORRECT, 0, exact[0], exact[1], 1.0)
+
+        best = None
+        for target in targets:
+            text = to_jamo(typed) if target == "korean" else typed
+            for accepted, pattern in self.patterns[target]:
+                # Length difference is a lower bound; skip hopeless variants
+                if (
+                    best is not None
+                    and abs(pattern.length - len(text)) >= best[0]
+                ):
+                    continue
+                distance = pattern.distance(text)
+                if best is None or distance < best[0]:
+                    best = (distance, target, accepted, pattern, text)
+                    if distance == 0:
+                        break
+        if best is None:
+            return Grade(WRONG, len(typed), targets[0], "", 0.0)
+
+        distance, target, accepted, pattern, text = best
+        longest = max(pattern.length, len(text), 1)
+        grade = Grade(
+            verdict=WRONG,
+            distance=distance,
+            target=target,
+            matched=accepted,
+            similarity=round(1 - distance / longest, 3),
+        )
+        if distance == 0:
+            grade.verdict = CORRECT
+        elif others is not None and typed in others:
+            pass  # Another word the learner knows, not a typo of this one
+        elif typed.replace(" ", "") == accepted.replace(" ", ""):
+            grade.verdict, grade.reason = NEAR_MISS, "spacing"
+        elif distance <= near_miss_budget(target, accepted):
+            grade.verdict = NEAR_MISS
+            grade.reason = "jamo" if target == "korean" else "spelling"
+        return grade
+
+
+def grade_many(
+    keys: Sequence[AnswerKey],
+    answers: Sequence[str],
+    expected: str = "any",
+    others: Optional[AbstractSet[str]] = None,
+) -> List[Grade]:
+    """Grade a whole round: ``answers[i]`` against ``keys[i]``."""
+    return [
+        key.grade(answer, expected, others)
+        for key, answer in zip(keys, answers)
+    ]
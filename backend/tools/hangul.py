@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Hangul syllable arithmetic.
+Precomposed syllables (U+AC00-U+D7A3) are laid out as
+0xAC00 + (initial * 21 + medial) * 28 + final, so splitting one into its
+jamo is three integer divisions - no Unicode database needed.
+"""
+
+from typing import Optional, Tuple
+
+SYLLABLE_BASE = 0xAC00
+SYLLABLE_LAST = 0xD7A3
+N_MEDIALS = 21
+N_FINALS = 28  # Including "no final consonant"
+
+# Conjoining jamo blocks, indexed like the syllable components
+INITIAL_BASE = 0x1100
+MEDIAL_BASE = 0x1161
+FINAL_BASE = 0x11A7  # Index 0 means no final, so finals start at +1
+
+
+def is_syllable(char: str) -> bool:
+    return SYLLABLE_BASE <= ord(char) <= SYLLABLE_LAST
+
+
+def decompose(char: str) -> Optional[Tuple[int, int, int]]:
+    """(initial, medial, final) indices of a syllable, or None.
+
+    ``final`` is 0 for a syllable without a final consonant.
+    """
+    if not is_syllable(char):
+        return None
+    index = ord(char) - SYLLABLE_BASE
+    return (
+        index // (N_MEDIALS * N_FINALS),
+        index // N_FINALS % N_MEDIALS,
+        index % N_FINALS,
+    )
+
+
+def compose(initial: int, medial: int, final: int = 0) -> str:
+    return chr(
+        SYLLABLE_BASE + (initial * N_MEDIALS + medial) * N_FINALS + final
+    )
+
+
+def _spell(char: str) -> str:
+    initial, medial, final = decompose(char)
+    jamo = chr(INITIAL_BASE + initial) + chr(MEDIAL_BASE + medial)
+    return jamo + chr(FINAL_BASE + final) if final else jamo
+
+
+# Every syllable spelled out once, so to_jamo is a single str.translate
+_JAMO = {
+    code: _spell(chr(code)) for code in range(SYLLABLE_BASE, SYLLABLE_LAST + 1)
+}
+
+
+def to_jamo(text: str) -> str:
+    """Spell syllables out as conjoining jamo; other characters pass through.
+
+    "한국" becomes six jamo, so one wrong consonant costs one character of
+    difference instead of a whole syllable.
+    """
+    return text.translate(_JAMO)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Streaming quantile sketch for answer latencies.
+A DDSketch-style log-bucketed histogram: every quantile it reports is within
+a fixed relative error of the true value, it merges by adding bucket
+counts, and it serializes to a few hundred bytes regardless of sample count.
+"""
+from typing import Dict, Iterable, Optional
+from dataclasses import dataclass, field
+import math
+import struct
+
+# Relative accuracy of reported quantiles (2%)
+DEFAULT_RELATIVE_ACCURACY = 0.02
+
+_BUCKET = struct.Struct("<hI")  # bucket index, count
+_HEADER = struct.Struct("<f")  # relative accuracy
+
+
+@dataclass
+class LatencySketch:
+    """Log-bucketed histogram of millisecond latencies"""
+
+    relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY
+    buckets: Dict[int, int] = field(default_factory=dict)
+    count: int = 0
+
+    def __post_init__(self):
+        self._gamma = (1 + self.relative_accuracy) / (
+            1 - self.relative_accuracy
+        )
+        self._log_gamma = math.log(self._gamma)
+
+    def _index(self, value_ms: float) -> int:
+        # Sub-millisecond answers are clamped into the 1ms bucket
+        return math.ceil(math.log(max(value_ms, 1.0)) / self._log_gamma)
+
+    def _value(self, index: int) -> float:
+        # Midpoint (in relative terms) of bucket (gamma^(i-1), gamma^i]
+        return 2 * self._gamma**index / (self._gamma + 1)
+
+    def add(self, value_ms: float, weight: int = 1) -> None:
+        index = self._index(value_ms)
+        self.buckets[index] = self.buckets.get(index, 0) + weight
+        self.count += weight
+
+    def add_all(self, values_ms: Iterable[float]) -> None:
+        for value in values_ms:
+            self.add(value)
+
+    def merge(self, other: "LatencySketch") -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += other.count
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate q-quantile (0 <= q <= 1), or None if empty."""
+        if not 0 <= q <= 1:
+            raise ValueError("Quantile must be between 0 and 1")
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                return self._value(index)
+        return self._value(max(self.buckets))
+
+    def to_bytes(self) -> bytes:
+        """Compact encoding: accuracy header plus (index, count) pairs."""
+        parts = [_HEADER.pack(self.relative_accuracy)]
+        parts.extend(
+            _BUCKET.pack(index, count)
+            for index, count in sorted(self.buckets.items())
+        )
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: Optional[bytes]) -> "LatencySketch":
+        if not data:
+            return cls()
+        (accuracy,) = _HEADER.unpack_from(data, 0)
+        # float32 round-trip; snap back to the canonical python float
+        sketch = cls(relative_accuracy=round(accuracy, 6))
+        for index, count in _BUCKET.iter_unpack(data[_HEADER.size :]):
+            sketch.buckets[index] = count
+            sketch.count += count
+        return sketch
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    import random
+
+    random.seed(0)
+    samples = [random.lognormvariate(8, 0.6) for _ in range(100_000)]
+
+    sketch = LatencySketch()
+    sketch.add_all(samples)
+    encoded = sketch.to_bytes()
+
+    samples.sort()
+    print("Latency Sketch Test:")
+    for q in (0.5, 0.9, 0.99):
+        exact = samples[int(q * (len(samples) - 1))]
+        approx = LatencySketch.from_bytes(encoded).quantile(q)
+        print(
+            f"  p{int(q * 100)}: exact={exact:.0f}ms sketch={approx:.0f}ms "
+            f"error={abs(approx - exact) / exact:.2%}"
+        )
+    print(f"  {len(samples)} samples in {len(encoded)} bytes")
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Revised Romanization of Korean, table driven.
+Syllables are split with tools.hangul's codepoint arithmetic. What a final
+consonant and the next initial sound like together (liaison, nasalization,
+ㄹ assimilation, ㅎ merging) is precomputed into a 28 x 19 table at import,
+so romanizing a word is one table lookup per syllable boundary.
+
+Like the catalog's own romanizations, aspiration across a boundary keeps
+its h (축하 chukha) and tensing is not written (학교 hakgyo).
+"""
+
+from typing import List
+
+from tools.hangul import decompose
+
+INITIALS = [
+    "g", "kk", "n", "d", "tt", "r", "m", "b", "pp", "s",
+    "ss", "", "j", "jj", "ch", "k", "t", "p", "h",
+]  # fmt: skip
+MEDIALS = [
+    "a", "ae", "ya", "yae", "eo", "e", "yeo", "ye", "o", "wa", "wae",
+    "oe", "yo", "u", "wo", "we", "wi", "yu", "eu", "ui", "i",
+]  # fmt: skip
+
+# Initial indices the rules refer to
+_G, _N, _D, _R, _M, _B, _S, _SILENT, _J, _H = 0, 2, 3, 5, 6, 7, 9, 11, 12, 18
+_I = 20  # Medial ㅣ, which palatalizes a preceding ㄷ/ㅌ
+
+# Per final (index 0 = none): the sound it makes before a consonant or at
+# the end of a word, and before a vowel - what stays, and which initial
+# moves over into the next syllable (None: nothing does)
+_CODA = [
+    "", "k", "k", "k", "n", "n", "n", "t", "l", "k", "m", "l", "l", "l",
+    "p", "l", "m", "p", "p", "t", "t", "ng", "t", "t", "k", "t", "p", "t",
+]  # fmt: skip
+_LIAISON = [
+    ("", None), ("", 0), ("", 1), ("k", 9), ("", 2), ("n", 12), ("n", None),
+    ("", 3), ("", 5), ("l", 0), ("l", 6), ("l", 7), ("l", 9), ("l", 16),
+    ("l", 17), ("", 5), ("", 6), ("", 7), ("p", 9), ("", 9), ("", 10),
+    ("ng", None), ("", 12), ("", 14), ("", 15), ("", 16), ("", 17),
+    ("", None),
+]  # fmt: skip
+# Finals with a ㅎ, and what is left of them once the ㅎ merges away
+_WITH_H = {6: "n", 15: "l", 27: ""}
+# ㄷ, ㄾ, ㅌ before 이 (and ㄷ before 히): 같이 gachi, 굳이 guji
+_PALATAL = {(7, _SILENT): "j", (25, _SILENT): "ch", (13, _SILENT): "lch"}
+_PALATAL[(7, _H)] = "ch"
+
+_NASAL = {"k": "ng", "t": "n", "p": "m"}
+_ASPIRATED = {_G: "k", _D: "t", _J: "ch"}
+_ASPIRATED_CODA = {_G: "k", _B: "p", 16: "t", 17: "p"}
+
+
+def _join(final: int, initial: int) -> str:
+    """How a final and the next syllable's initial are written together."""
+    if initial == _SILENT:
+        kept, moved = _LIAISON[final]
+        return kept + (INITIALS[moved] if moved is not None else "")
+    if final in _WITH_H:
+        rest = _WITH_H[final]
+        if initial in _ASPIRATED:
+            return rest + _ASPIRATED[initial]  # 좋다 jota, 많다 manta
+        if initial == _N:
+            return rest + ("l" if rest == "l" else "n") if rest else "nn"
+        if initial == _S:
+            return rest + "ss"
+        return rest + INITIALS[initial]
+
+    kept, moved = _LIAISON[final]
+    if initial == _H and kept and moved in _ASPIRATED_CODA:
+        # The second consonant of a double final merges: 밝히다 balkida
+        return kept + _ASPIRATED_CODA[moved]
+
+    coda, onset = _CODA[final], INITIALS[initial]
+    if initial in (_N, _M):
+        coda = _NASAL.get(coda, coda)  # 학년 hangnyeon, 입니다 imnida
+        if coda == "l" and initial == _N:
+            onset = "l"  # 실내 sillae
+    elif initial == _R:
+        if coda in _NASAL:
+            coda, onset = _NASAL[coda], "n"  # 독립 dongnip
+        elif coda in ("ng", "m"):
+            onset = "n"  # 종로 jongno
+        elif coda in ("n", "l"):
+            coda, onset = "l", "l"  # 신라 silla
+    return coda + onset
+
+
+# BOUNDARY[final * 19 + initial]
+BOUNDARY: List[str] = [
+    _join(final, initial) for final in range(28) for initial in range(19)
+]
+
+
+def romanize(text: str) -> str:
+    """Revised Romanization of ``text``; non-Hangul passes through."""
+    out = []
+    parts = [decompose(char) for char in text]
+    onset_done = False
+    for i, (char, syllable) in enumerate(zip(text, parts)):
+        if syllable is None:
+            out.append(char)
+            onset_done = False
+            continue
+        initial, medial, final = syllable
+        if not onset_done:
+            out.append(INITIALS[initial])
+        out.append(MEDIALS[medial])
+
+        following = parts[i + 1] if i + 1 < len(parts) else None
+        if following is None:
+            out.append(_CODA[final])
+            onset_done = False
+            continue
+        next_initial, next_medial, _ = following
+        if next_medial == _I and (final, next_initial) in _PALATAL:
+            out.append(_PALATAL[(final, next_initial)])
+        else:
+            out.append(BOUNDARY[final * 19 + next_initial])
+        onset_done = True
+    return "".join(out)